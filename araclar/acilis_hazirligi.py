@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Açılış hazırlığı: kullanıcı giriş ekranında bilgilerini yazarken arka
+planda Google istemcisi yetkilendirilir, veritabanı dosyaları açılır ve
+ana pencere ile ilk formların hemen ihtiyaç duyduğu tablolar önbelleğe
+alınır. Her açılış aşamasının süresi tek bir raporda toplanır.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QThread, Signal
+
+try:
+    from google_baglanti import (_get_sheets_client, spreadsheet_getir, veritabani_getir,
+                                 veritabani_getir_cached)
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from google_baglanti import (_get_sheets_client, spreadsheet_getir, veritabani_getir,
+                                 veritabani_getir_cached)
+
+from araclar.yetki_yonetimi import YetkiYoneticisi
+from services.kimlik_deposu import kimlik_deposu
+
+logger = logging.getLogger("AcilisHazirligi")
+
+# Girişte açılacak dosyalar ve sayfa nesneleri (veri çekilmez)
+ACILIS_SAYFALARI: Tuple[Tuple[str, str], ...] = (
+    ('user', 'user_login'),
+)
+# Önbelleğe alınacak sık kullanılan tablolar (sabitler, personel). Rol
+# yetkileri ayrı bir aşamada, disk önbelleği ve sürüm damgasıyla hazırlanır.
+ACILIS_TABLOLARI: Tuple[Tuple[str, str], ...] = (
+    ('sabit', 'Sabitler'),
+    ('personel', 'Personel'),
+)
+
+
+# =============================================================================
+# 1. AŞAMA SÜRELERİ
+# =============================================================================
+class AcilisZamanlayici:
+    """Açılış aşamalarının sürelerini toplar (ana thread ve ısıtma thread'i)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._baslangic = time.perf_counter()
+        # (aşama, süre sn, programın başından itibaren bitiş sn)
+        self._asamalar: List[Tuple[str, float, float]] = []
+
+    def kaydet(self, asama: str, sure: float):
+        with self._lock:
+            self._asamalar.append((asama, sure, time.perf_counter() - self._baslangic))
+        logger.info(f"Açılış: {asama} {sure * 1000:.0f} ms")
+
+    @contextmanager
+    def olc(self, asama: str):
+        bas = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.kaydet(asama, time.perf_counter() - bas)
+
+    def sureler(self) -> Dict[str, float]:
+        with self._lock:
+            return {asama: sure for asama, sure, _ in self._asamalar}
+
+    def rapor(self) -> str:
+        with self._lock:
+            asamalar = sorted(self._asamalar, key=lambda a: a[2])
+        satirlar = ["Açılış süreleri (ms):"]
+        for asama, sure, bitis in asamalar:
+            satirlar.append(f"  {asama:<24}{sure * 1000:>8.0f}   (t={bitis * 1000:.0f})")
+        return "\n".join(satirlar)
+
+
+acilis_zamanlari = AcilisZamanlayici()
+
+
+# =============================================================================
+# 2. ISITMA THREAD'İ
+# =============================================================================
+class AcilisHazirligi(QThread):
+    """
+    Bağlantı ve sık kullanılan tabloları arka planda hazırlar.
+    Hatalar açılışı durdurmaz: ilgili form verisini yine kendisi çeker.
+    Giriş bu iş bitmeden yapılırsa, aynı tabloyu isteyen kod
+    veritabani_getir_cached içinde bekleyip buradaki sonucu kullanır.
+    """
+    asama_tamamlandi = Signal(str, float)  # (aşama, süre sn)
+    tamamlandi = Signal(dict)              # aşama -> hata mesajı (boşsa sorunsuz)
+
+    def __init__(self, sayfalar=ACILIS_SAYFALARI, tablolar=ACILIS_TABLOLARI, yetkiler: bool = True,
+                 kimlikler: bool = True, zamanlayici: Optional[AcilisZamanlayici] = None, parent=None):
+        super().__init__(parent)
+        self.sayfalar = tuple(sayfalar)
+        self.tablolar = tuple(tablolar)
+        self.yetkiler = yetkiler
+        self.kimlikler = kimlikler
+        self.zamanlayici = zamanlayici or acilis_zamanlari
+
+    def _asama(self, ad: str, islem, hatalar: Dict[str, str]) -> bool:
+        bas = time.perf_counter()
+        try:
+            islem()
+            return True
+        except Exception as e:
+            logger.warning(f"Açılış hazırlığı '{ad}' başarısız: {e}")
+            hatalar[ad] = str(e)
+            return False
+        finally:
+            sure = time.perf_counter() - bas
+            self.zamanlayici.kaydet(ad, sure)
+            self.asama_tamamlandi.emit(ad, sure)
+
+    def run(self):
+        hatalar: Dict[str, str] = {}
+        # İstemci yoksa (internet/kimlik hatası) diğer aşamalar aynı hatayı tekrarlar
+        if self._asama("istemci", _get_sheets_client, hatalar):
+            vt_tipleri = ([vt for vt, _ in self.sayfalar + self.tablolar] + (['user'] if self.kimlikler else [])
+                          + (['sabit'] if self.yetkiler else []))
+            for vt_tipi in dict.fromkeys(vt_tipleri):
+                self._asama(f"dosya:{vt_tipi}", lambda v=vt_tipi: spreadsheet_getir(v), hatalar)
+            for vt_tipi, sayfa in self.sayfalar:
+                self._asama(f"sayfa:{sayfa}", lambda v=vt_tipi, s=sayfa: veritabani_getir(v, s), hatalar)
+            if self.kimlikler:
+                # Giriş düğmesine basıldığında doğrulama yerel indeksle yapılır
+                self._asama("kimlikler", kimlik_deposu.senkronize, hatalar)
+            if self.yetkiler:
+                # Girişten sonra yetkileri_yukle yalnızca bellekten seçim yapar
+                self._asama("yetkiler", YetkiYoneticisi.kurallari_hazirla, hatalar)
+            for vt_tipi, sayfa in self.tablolar:
+                self._asama(f"tablo:{sayfa}", lambda v=vt_tipi, s=sayfa: veritabani_getir_cached(v, s), hatalar)
+        self.tamamlandi.emit(hatalar)
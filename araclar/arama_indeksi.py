@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+Liste formları için önceden kurulmuş arama indeksi.
+Metin Türkçe harfler katlanarak (İ/I/ı -> i, ş -> s, ...) kelimelere
+ayrılır; her kelimenin geçtiği satırlar tutulur. Arama, yazılan her
+kelime için önek eşleşmesi bulup satır kümelerini keser; tablo taranmaz.
+Sonuç, satır kümesiyle beslenen proxy modele verilir.
+"""
+
+import bisect
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from PySide6.QtCore import Qt, QAbstractProxyModel, QModelIndex
+
+try:
+    from araclar.metin_araclari import katla, sirala_anahtari
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from araclar.metin_araclari import katla, sirala_anahtari
+
+# ============================================================================
+# 1. KELİMELERE AYIRMA
+# ============================================================================
+
+_KELIME = re.compile(r"\w+")
+
+# Bu uzunluğa kadar olan öneklerin satır kümeleri indeks kurulurken hazırlanır
+HAZIR_ONEK_UZUNLUGU = 2
+
+
+def kelimeler(metin) -> List[str]:
+    return _KELIME.findall(katla(metin))
+
+
+# ============================================================================
+# 2. İNDEKS
+# ============================================================================
+
+class AramaIndeksi:
+    """
+    Kayıt listesinin (satır i -> kayitlar[i]) değişmez arama indeksi.
+    - metin_sutunlari: kelime/önek araması yapılan sütunlar
+    - esitlik_sutunlari: combo filtreleri gibi tam değer eşleşmesi yapılanlar
+    """
+
+    def __init__(self, kayitlar: Sequence[Dict], metin_sutunlari: Iterable[str],
+                 esitlik_sutunlari: Iterable[str] = ()):
+        self.satir_sayisi = len(kayitlar)
+        self._kelime_satirlari: Dict[str, Set[int]] = {}
+        self._esitlik: Dict[str, Dict[str, Set[int]]] = {s: {} for s in esitlik_sutunlari}
+
+        metin_sutunlari = tuple(metin_sutunlari)
+        for sira, row in enumerate(kayitlar):
+            for sutun in metin_sutunlari:
+                for kelime in kelimeler(row.get(sutun)):
+                    self._kelime_satirlari.setdefault(kelime, set()).add(sira)
+            for sutun, degerler in self._esitlik.items():
+                degerler.setdefault(str(row.get(sutun, "")).strip(), set()).add(sira)
+
+        # Sıralı sözlük: önek aralığı ikili aramayla bulunur
+        self._sozluk = sorted(self._kelime_satirlari)
+        # Kısa önekler çok kelimeyi kapsar; birleşimleri baştan hazırlanır
+        self._kisa_onekler: Dict[str, Set[int]] = {}
+        for kelime, satirlar in self._kelime_satirlari.items():
+            for n in range(1, min(HAZIR_ONEK_UZUNLUGU, len(kelime)) + 1):
+                self._kisa_onekler.setdefault(kelime[:n], set()).update(satirlar)
+
+    def __len__(self):
+        return self.satir_sayisi
+
+    def onek_satirlari(self, onek: str) -> Set[int]:
+        """Katlanmış `onek` ile başlayan bir kelime içeren satırlar."""
+        if len(onek) <= HAZIR_ONEK_UZUNLUGU:
+            return self._kisa_onekler.get(onek, set())
+        i = bisect.bisect_left(self._sozluk, onek)
+        sonuc: Set[int] = set()
+        for kelime in self._sozluk[i:]:
+            if not kelime.startswith(onek):
+                break
+            sonuc |= self._kelime_satirlari[kelime]
+        return sonuc
+
+    def ara(self, metin: str = "", **esitlikler) -> Optional[Set[int]]:
+        """
+        Aranan kelimelerin hepsini (önek olarak) ve verilen sütun değerlerini
+        sağlayan satırlar. Hiç koşul yoksa None (bütün satırlar) döner.
+        """
+        kumeler = []
+        for sutun, deger in esitlikler.items():
+            if deger is None:
+                continue
+            kumeler.append(self._esitlik.get(sutun, {}).get(str(deger).strip(), set()))
+        for kelime in set(kelimeler(metin)):
+            kumeler.append(self.onek_satirlari(kelime))
+        if not kumeler:
+            return None
+
+        kumeler.sort(key=len)
+        sonuc = set(kumeler[0])
+        for kume in kumeler[1:]:
+            if not sonuc:
+                break
+            sonuc &= kume
+        return sonuc
+
+
+# ============================================================================
+# 3. SATIR KÜMESİ PROXY MODELİ
+# ============================================================================
+
+class SatirKumesiModeli(QAbstractProxyModel):
+    """
+    Kaynak modelin verilen satırlarını gösteren proxy.
+    Filtre değişiminde satırlar tek tek sorgulanmaz (filterAcceptsRow yok);
+    indeksin döndürdüğü küme sıralanıp doğrudan kullanılır. Sıralama Türk
+    alfabesine göredir; anahtarlar sütun başına bir kez hesaplanır (kaynak
+    modelde `sutun_degerleri(sutun)` varsa sütun toplu okunur). Kaynağa
+    eklenen/silinen satırlar kümedeki satır numaralarına yansıtılır.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._satirlar: List[int] = []
+        self._konumlar: Optional[Dict[int, int]] = None
+        self._kume: Optional[Set[int]] = None
+        self._sirala = (-1, Qt.AscendingOrder)
+        self._sira_anahtarlari: Dict[int, List[str]] = {}
+
+    # --- Kaynak ---
+    def setSourceModel(self, model):
+        eski = self.sourceModel()
+        if eski is not None:
+            eski.modelReset.disconnect(self._kaynak_sifirlandi)
+            eski.dataChanged.disconnect(self._kaynak_degisti)
+            eski.rowsInserted.disconnect(self._kaynak_satir_eklendi)
+            eski.rowsRemoved.disconnect(self._kaynak_satir_silindi)
+        self.beginResetModel()
+        super().setSourceModel(model)
+        if model is not None:
+            model.modelReset.connect(self._kaynak_sifirlandi)
+            model.dataChanged.connect(self._kaynak_degisti)
+            model.rowsInserted.connect(self._kaynak_satir_eklendi)
+            model.rowsRemoved.connect(self._kaynak_satir_silindi)
+        self._sira_anahtarlari.clear()
+        self._satirlari_kur()
+        self.endResetModel()
+
+    def _kaynak_sifirlandi(self, anahtarlari_koru=False):
+        self.beginResetModel()
+        if not anahtarlari_koru:
+            self._sira_anahtarlari.clear()
+        self._satirlari_kur()
+        self.endResetModel()
+
+    def _kaynak_degisti(self, sol_ust, sag_alt, roller=()):
+        if not roller or Qt.DisplayRole in roller:
+            # Değişen satırların sıralama anahtarları tazelenir
+            for sutun, anahtarlar in self._sira_anahtarlari.items():
+                for satir in range(sol_ust.row(), sag_alt.row() + 1):
+                    anahtarlar[satir] = sirala_anahtari(self._kaynak_metni(satir, sutun))
+        # Görünen satırlara düşen değişiklikler (ör. yüklenen ikonlar) iletilir
+        for satir in range(sol_ust.row(), sag_alt.row() + 1):
+            bas = self.mapFromSource(sol_ust.siblingAtRow(satir))
+            if bas.isValid():
+                self.dataChanged.emit(bas, bas.siblingAtColumn(sag_alt.column()), roller)
+
+    def _kaynak_satir_eklendi(self, parent, bas, son):
+        adet = son - bas + 1
+        for sutun, anahtarlar in self._sira_anahtarlari.items():
+            anahtarlar[bas:bas] = [sirala_anahtari(self._kaynak_metni(r, sutun)) for r in range(bas, son + 1)]
+        if self._kume is not None:
+            # Sonraki satırlar kayar; yeni satırlar filtre yeniden çalışana kadar gösterilir
+            self._kume = {r if r < bas else r + adet for r in self._kume} | set(range(bas, son + 1))
+        self._kaynak_sifirlandi(anahtarlari_koru=True)
+
+    def _kaynak_satir_silindi(self, parent, bas, son):
+        adet = son - bas + 1
+        for anahtarlar in self._sira_anahtarlari.values():
+            del anahtarlar[bas:son + 1]
+        if self._kume is not None:
+            self._kume = {r if r < bas else r - adet for r in self._kume if not bas <= r <= son}
+        self._kaynak_sifirlandi(anahtarlari_koru=True)
+
+    def _kaynak_metni(self, satir, sutun):
+        kaynak = self.sourceModel()
+        return kaynak.data(kaynak.index(satir, sutun), Qt.DisplayRole)
+
+    # --- Filtre ---
+    def satirlari_ayarla(self, kume: Optional[Set[int]]):
+        """Gösterilecek kaynak satırları (None: hepsi). Aynı küme tekrar verilirse model sıfırlanmaz."""
+        if kume == self._kume:
+            return
+        self.beginResetModel()
+        self._kume = kume
+        self._satirlari_kur()
+        self.endResetModel()
+
+    def _satirlari_kur(self):
+        kaynak = self.sourceModel()
+        if kaynak is None:
+            self._satirlar, self._konumlar = [], None
+            return
+        toplam = kaynak.rowCount()
+        satirlar = range(toplam) if self._kume is None else [r for r in self._kume if r < toplam]
+        sutun, yon = self._sirala
+        if sutun >= 0:
+            anahtarlar = self._sira_anahtari(sutun)
+            satirlar = sorted(satirlar, key=anahtarlar.__getitem__, reverse=(yon == Qt.DescendingOrder))
+        else:
+            satirlar = sorted(satirlar)
+        self._satirlar = list(satirlar)
+        self._konumlar = None
+
+    def _sira_anahtari(self, sutun: int) -> List[str]:
+        anahtarlar = self._sira_anahtarlari.get(sutun)
+        if anahtarlar is None:
+            kaynak = self.sourceModel()
+            if hasattr(kaynak, "sutun_degerleri"):
+                # Kaynak sütunu toplu verebiliyorsa hücre hücre data() çağrılmaz
+                degerler = kaynak.sutun_degerleri(sutun)
+            else:
+                degerler = [kaynak.data(kaynak.index(r, sutun), Qt.DisplayRole) for r in range(kaynak.rowCount())]
+            anahtarlar = [sirala_anahtari(d) for d in degerler]
+            self._sira_anahtarlari[sutun] = anahtarlar
+        return anahtarlar
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.beginResetModel()
+        self._sirala = (column, order)
+        self._satirlari_kur()
+        self.endResetModel()
+
+    # --- Eşleme ---
+    def kaynak_satiri(self, satir: int) -> int:
+        return self._satirlar[satir]
+
+    def mapToSource(self, proxy_index):
+        kaynak = self.sourceModel()
+        if kaynak is None or not proxy_index.isValid():
+            return QModelIndex()
+        return kaynak.index(self._satirlar[proxy_index.row()], proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        if self._konumlar is None:
+            self._konumlar = {r: i for i, r in enumerate(self._satirlar)}
+        satir = self._konumlar.get(source_index.row())
+        if satir is None:
+            return QModelIndex()
+        return self.index(satir, source_index.column())
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < len(self._satirlar)) or not (0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._satirlar)
+
+    def columnCount(self, parent=QModelIndex()):
+        kaynak = self.sourceModel()
+        return 0 if parent.isValid() or kaynak is None else kaynak.columnCount()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        kaynak = self.sourceModel()
+        if kaynak is None:
+            return None
+        if orientation == Qt.Horizontal:
+            return kaynak.headerData(section, orientation, role)
+        if role == Qt.DisplayRole:
+            return str(section + 1)
+        return None
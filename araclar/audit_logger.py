@@ -1,94 +1,440 @@
-# araclar/audit_logger.py (YENİ)
+# -*- coding: utf-8 -*-
+"""
+Yerel denetim (audit) kaydı: logs/audit.db (SQLite).
+- Tek yazıcı thread'i kalıcı bir bağlantı tutar (WAL kipi); log() olayı
+  yalnızca kuyruğa koyar, yazıcı kuyruktakileri tek işlemde toplu ekler.
+- Kayıtlar aylık tablolara bölünür (audit_log_YYYYMM). Saklama süresini
+  aşan aylar bakım işinde tablo olarak silinir, boşalan sayfalar dosyaya
+  iade edilir; tek tek DELETE gerekmez.
+- Sorgular kullanıcı, tablo/kayıt ve zaman aralığına göre indekslidir ve
+  (timestamp, id) imleciyle sayfalanır: sorgula(..., once=son_kayit.imlec).
+- Okumalar her thread'in kendi salt okunur bağlantısıyla yapılır; WAL
+  sayesinde yazıcıyı beklemez.
+- Gün / modül / kullanıcı / işlem bazındaki olay sayıları (audit_gunluk)
+  aynı işlemde güncellenir; özet ekranı ham tabloları taramaz.
+"""
+from collections import Counter
+import atexit
+import logging
+import os
+import queue
 import sqlite3
-from datetime import datetime
-from typing import Optional
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger("AuditLogger")
+
+_KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AUDIT_DB_DOSYASI = os.path.join(_KOK_DIZIN, "logs", "audit.db")
+
+TABLO_ONEKI = "audit_log_"
+KUYRUK_KAPASITESI = 10000
+PARTI_BOYUTU = 500               # bir işlemde en fazla eklenen olay
+KUYRUK_BEKLEMESI_SN = 0.1        # kuyruk doluysa çağıranın en fazla bekleme süresi
+AUDIT_SAKLAMA_AY = 24            # bu kadar aydan eski bölümler bakımda silinir
+BAKIM_ARALIGI_SN = 24 * 3600     # otomatik bakım en fazla günde bir kez
+
+_SUTUNLAR = "timestamp, kullanici, islem_tipi, tablo, kayit_id, detay, basarili, modul"
+# Günlük özet tablosunun gruplanabilen sütunları
+OZET_SUTUNLARI = ("gun", "modul", "kullanici", "islem_tipi")
+
+
+class AuditKaydi(NamedTuple):
+    id: int
+    timestamp: str
+    kullanici: str
+    islem_tipi: str
+    tablo: Optional[str]
+    kayit_id: Optional[str]
+    detay: Optional[str]
+    basarili: bool
+    modul: Optional[str] = None
+
+    @property
+    def imlec(self) -> Tuple[str, int]:
+        """Sonraki sayfa için sorgula(once=...) değeri."""
+        return self.timestamp, self.id
+
+
+def _bolum_adi(zaman: str) -> str:
+    """'2026-10-19T...' -> 'audit_log_202610'"""
+    return f"{TABLO_ONEKI}{zaman[:4]}{zaman[5:7]}"
+
+
+def _ay_ekle(yil: int, ay: int, adet: int) -> Tuple[int, int]:
+    toplam = yil * 12 + (ay - 1) + adet
+    return toplam // 12, toplam % 12 + 1
+
 
 class AuditLogger:
     """Tüm kritik işlemleri logla"""
-    
-    def __init__(self, db_path='logs/audit.db'):
+
+    def __init__(self, db_path: str = AUDIT_DB_DOSYASI, kapasite: int = KUYRUK_KAPASITESI,
+                 saklama_ay: int = AUDIT_SAKLAMA_AY):
         self.db_path = db_path
-        self._init_db()
-    
-    def _init_db(self):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS audit_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    kullanici TEXT NOT NULL,
-                    islem_tipi TEXT NOT NULL,
-                    tablo TEXT,
-                    kayit_id TEXT,
-                    detay TEXT,
-                    ip_adresi TEXT,
-                    basarili INTEGER DEFAULT 1
-                )
-            ''')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON audit_log(timestamp)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_kullanici ON audit_log(kullanici)')
-    
-    def log(self, kullanici: str, islem_tipi: str, tablo: str = None, 
-            kayit_id: str = None, detay: str = None, basarili: bool = True):
-        """Audit kaydı oluştur"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                INSERT INTO audit_log 
-                (timestamp, kullanici, islem_tipi, tablo, kayit_id, detay, basarili)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                datetime.now().isoformat(),
-                kullanici,
-                islem_tipi,
-                tablo,
-                kayit_id,
-                detay,
-                1 if basarili else 0
-            ))
-    
-    def get_kullanici_loglari(self, kullanici: str, limit: int = 100):
-        """Kullanıcının son işlemleri"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute('''
-                SELECT timestamp, islem_tipi, tablo, detay 
-                FROM audit_log 
-                WHERE kullanici = ? 
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            ''', (kullanici, limit))
-            return cursor.fetchall()
-
-# main.py içinde global instance:
-audit_logger = AuditLogger()
+        self.saklama_ay = saklama_ay
+        # log() çağrısında kullanıcı verilmezse (ör. repository yazmaları) kullanılır
+        self.oturum_kullanicisi = "Sistem"
+        self._kuyruk: "queue.Queue[tuple]" = queue.Queue(maxsize=kapasite)
+        self._kilit = threading.Lock()
+        self._yazma_kilidi = threading.Lock()
+        self._yerel = threading.local()
+        self._thread = None
+        self._yazici = None
+        self._bolumler: set = set()
+        self._ekleme_sql: Dict[str, str] = {}
+        self._sayaclar = {"eklenen": 0, "yazilan": 0, "dusurulen": 0, "basarisiz_yazma": 0}
 
-# Kullanım örnekleri:
-class PersonelEkle(QWidget):
-    def kaydet(self):
-        # ... kayıt işlemi ...
-        
-        audit_logger.log(
-            kullanici=self.kullanici_adi,
-            islem_tipi='PERSONEL_EKLEME',
-            tablo='Personel',
-            kayit_id=yeni_sicil_no,
-            detay=f"Yeni personel: {ad_soyad}"
-        )
-
-class CihazSil(QWidget):
-    def sil(self):
-        try:
-            # ... silme işlemi ...
-            audit_logger.log(
-                kullanici=self.kullanici_adi,
-                islem_tipi='CIHAZ_SILME',
-                tablo='Cihazlar',
-                kayit_id=cihaz_id,
-                basarili=True
+    # =========================================================================
+    # 1. BAĞLANTILAR VE ŞEMA
+    # =========================================================================
+    def _baglan(self, salt_okunur: bool = False) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        # isolation_level=None: işlemler açıkça BEGIN/COMMIT ile yönetilir
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None,
+                               check_same_thread=False, cached_statements=256)
+        conn.execute("PRAGMA busy_timeout=10000")
+        if salt_okunur:
+            conn.execute("PRAGMA query_only=1")
+        return conn
+
+    def _yazici_baglantisi(self) -> sqlite3.Connection:
+        if self._yazici is None:
+            conn = self._baglan()
+            # auto_vacuum yalnızca boş veritabanında ayarlanabilir (dosya ilk kez oluşurken)
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS audit_meta (anahtar TEXT PRIMARY KEY, deger TEXT)")
+            self._bolumler = self._bolumleri_oku(conn)
+            self._sema_guncelle(conn)
+            self._yazici = conn
+        return self._yazici
+
+    @staticmethod
+    def _bolumleri_oku(conn) -> set:
+        satirlar = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE ?",
+                                (TABLO_ONEKI + "%",)).fetchall()
+        return {ad for (ad,) in satirlar if ad[len(TABLO_ONEKI):].isdigit()}
+
+    def _sema_guncelle(self, conn):
+        """Eski bölümlere modul sütununu ekler; günlük özet tablosunu kurar (ilk kez: mevcut olaylardan)."""
+        for tablo in sorted(self._bolumler):
+            sutunlar = {s[1] for s in conn.execute(f"PRAGMA table_info({tablo})")}
+            if "modul" not in sutunlar:
+                conn.execute(f"ALTER TABLE {tablo} ADD COLUMN modul TEXT")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{tablo}_modul ON {tablo}(modul, timestamp)")
+        ozet_var = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'audit_gunluk'").fetchone()
+        if ozet_var:
+            return
+        conn.execute('''
+            CREATE TABLE audit_gunluk (
+                gun TEXT NOT NULL,
+                modul TEXT NOT NULL,
+                kullanici TEXT NOT NULL,
+                islem_tipi TEXT NOT NULL,
+                adet INTEGER NOT NULL,
+                PRIMARY KEY (gun, modul, kullanici, islem_tipi)
             )
+        ''')
+        for tablo in self._bolumler:
+            conn.execute(f"INSERT INTO audit_gunluk (gun, modul, kullanici, islem_tipi, adet) "
+                         f"SELECT substr(timestamp, 1, 10), COALESCE(modul, ''), kullanici, islem_tipi, COUNT(*) "
+                         f"FROM {tablo} GROUP BY 1, 2, 3, 4")
+
+    def _bolum_olustur(self, conn, tablo: str):
+        if tablo in self._bolumler:
+            return
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {tablo} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                kullanici TEXT NOT NULL,
+                islem_tipi TEXT NOT NULL,
+                tablo TEXT,
+                kayit_id TEXT,
+                detay TEXT,
+                basarili INTEGER DEFAULT 1,
+                modul TEXT
+            )
+        ''')
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{tablo}_zaman ON {tablo}(timestamp)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{tablo}_kullanici ON {tablo}(kullanici, timestamp)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{tablo}_kayit ON {tablo}(tablo, kayit_id, timestamp)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{tablo}_modul ON {tablo}(modul, timestamp)")
+        with self._kilit:
+            self._bolumler = self._bolumler | {tablo}
+
+    # =========================================================================
+    # 2. YAZMA
+    # =========================================================================
+    def kullanici_ayarla(self, kullanici: str):
+        """Girişten sonra çağrılır; kullanıcısız olaylar bu kullanıcıya yazılır."""
+        self.oturum_kullanicisi = str(kullanici or "Sistem")
+
+    def log(self, kullanici: str = None, islem_tipi: str = "", tablo: str = None,
+            kayit_id: str = None, detay: str = None, basarili: bool = True, zaman: datetime = None,
+            modul: str = None) -> bool:
+        """Audit kaydı oluştur (kuyruğa koyar; arayüzü bekletmez)"""
+        kayit = ((zaman or datetime.now()).isoformat(timespec='microseconds'),
+                 str(kullanici or self.oturum_kullanicisi), str(islem_tipi),
+                 None if tablo is None else str(tablo), None if kayit_id is None else str(kayit_id),
+                 detay, 1 if basarili else 0, None if modul is None else str(modul))
+        self._baslat()
+        try:
+            self._kuyruk.put(kayit, timeout=KUYRUK_BEKLEMESI_SN)
+        except queue.Full:
+            self._say("dusurulen")
+            logger.warning(f"Audit kuyruğu dolu, olay düşürüldü: {islem_tipi} {kayit_id}")
+            return False
+        self._say("eklenen")
+        return True
+
+    def _say(self, sayac: str, adet: int = 1):
+        with self._kilit:
+            self._sayaclar[sayac] += adet
+
+    def istatistik(self) -> Dict[str, int]:
+        with self._kilit:
+            sonuc = dict(self._sayaclar)
+        sonuc["kuyrukta"] = self._kuyruk.qsize()
+        return sonuc
+
+    def _baslat(self):
+        if self._thread is not None:
+            return
+        with self._kilit:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._calis, name="AuditYazici", daemon=True)
+            self._thread.start()
+        # Program kapanırken kuyrukta kalan olaylar yazılır
+        atexit.register(self.bosalt)
+
+    def _calis(self):
+        try:
+            self._otomatik_bakim()
+        except Exception as e:
+            logger.warning(f"Audit bakımı yapılamadı: {e}")
+        while True:
+            try:
+                ilk = self._kuyruk.get(timeout=0.5)
+                parti = [ilk]
+            except queue.Empty:
+                parti = []
+            while len(parti) < PARTI_BOYUTU:
+                try:
+                    parti.append(self._kuyruk.get_nowait())
+                except queue.Empty:
+                    break
+            if parti:
+                self._yaz(parti)
+                for _ in parti:
+                    self._kuyruk.task_done()
+
+    def _yaz(self, parti: List[tuple]):
+        bolumler: Dict[str, List[tuple]] = {}
+        for kayit in parti:
+            bolumler.setdefault(_bolum_adi(kayit[0]), []).append(kayit)
+        try:
+            with self._yazma_kilidi:
+                conn = self._yazici_baglantisi()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for tablo, kayitlar in bolumler.items():
+                        self._bolum_olustur(conn, tablo)
+                        # Aynı SQL metni bağlantının deyim önbelleğinden (hazır deyim) kullanılır
+                        sql = self._ekleme_sql.get(tablo)
+                        if sql is None:
+                            sql = self._ekleme_sql[tablo] = f"INSERT INTO {tablo} ({_SUTUNLAR}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                        conn.executemany(sql, kayitlar)
+                    sayilar = Counter((k[0][:10], k[7] or "", k[1], k[2]) for k in parti)
+                    conn.executemany(
+                        "INSERT INTO audit_gunluk (gun, modul, kullanici, islem_tipi, adet) VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT (gun, modul, kullanici, islem_tipi) DO UPDATE SET adet = adet + excluded.adet",
+                        [(*anahtar, adet) for anahtar, adet in sayilar.items()])
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            self._say("yazilan", len(parti))
         except Exception as e:
-            audit_logger.log(
-                kullanici=self.kullanici_adi,
-                islem_tipi='CIHAZ_SILME',
-                detay=str(e),
-                basarili=False
-            )
\ No newline at end of file
+            self._say("basarisiz_yazma", len(parti))
+            logger.error(f"Audit kayıtları yazılamadı ({len(parti)} olay): {e}")
+
+    def bosalt(self, zaman_asimi: float = 5.0) -> bool:
+        """Kuyruktaki olayların yazılmasını bekler."""
+        if self._thread is None:
+            return True
+        with self._kuyruk.all_tasks_done:
+            return self._kuyruk.all_tasks_done.wait_for(lambda: not self._kuyruk.unfinished_tasks, zaman_asimi)
+
+    # =========================================================================
+    # 3. SORGULAMA
+    # =========================================================================
+    def _okuyucu(self) -> sqlite3.Connection:
+        conn = getattr(self._yerel, "conn", None)
+        if conn is None:
+            conn = self._yerel.conn = self._baglan(salt_okunur=True)
+        return conn
+
+    def _aralik_bolumleri(self, baslangic: Optional[str], bitis: Optional[str]) -> List[str]:
+        """Zaman aralığına düşen bölümler, yeniden eskiye."""
+        with self._kilit:
+            bolumler = self._bolumler
+        if not bolumler and os.path.exists(self.db_path):
+            bolumler = self._bolumleri_oku(self._okuyucu())
+        alt = _bolum_adi(baslangic) if baslangic else ""
+        ust = _bolum_adi(bitis) if bitis else "~"
+        return sorted((b for b in bolumler if alt <= b <= ust), reverse=True)
+
+    def sorgula(self, kullanici: str = None, tablo: str = None, kayit_id: str = None,
+                islem_tipi: str = None, baslangic: datetime = None, bitis: datetime = None,
+                limit: int = 100, once: Tuple[str, int] = None, modul: str = None) -> List[AuditKaydi]:
+        """
+        Filtrelere uyan olaylar, yeniden eskiye. `baslangic` dahil, `bitis`
+        hariçtir. Sonraki sayfa için son kaydın `imlec`'i `once` olarak verilir.
+        """
+        self.bosalt(1.0)  # bu süreçte yazılanlar da görünsün
+        baslangic_s = baslangic.isoformat(timespec='microseconds') if baslangic else None
+        bitis_s = bitis.isoformat(timespec='microseconds') if bitis else None
+        if once is not None:
+            bitis_s = min(bitis_s, once[0]) if bitis_s else once[0]
+
+        kosullar, parametreler = [], []
+        for sutun, deger in (("kullanici", kullanici), ("tablo", tablo),
+                             ("kayit_id", kayit_id), ("islem_tipi", islem_tipi), ("modul", modul)):
+            if deger is not None:
+                kosullar.append(f"{sutun} = ?")
+                parametreler.append(str(deger))
+        if baslangic_s:
+            kosullar.append("timestamp >= ?")
+            parametreler.append(baslangic_s)
+        if bitis:
+            kosullar.append("timestamp < ?")
+            parametreler.append(bitis.isoformat(timespec='microseconds'))
+        if once is not None:
+            kosullar.append("(timestamp < ? OR (timestamp = ? AND id < ?))")
+            parametreler.extend([once[0], once[0], int(once[1])])
+        where = " AND ".join(kosullar) or "1=1"
+
+        sonuc: List[AuditKaydi] = []
+        bolumler = self._aralik_bolumleri(baslangic_s, bitis_s)
+        conn = self._okuyucu() if bolumler else None
+        for bolum in bolumler:
+            kalan = limit - len(sonuc)
+            if kalan <= 0:
+                break
+            try:
+                satirlar = conn.execute(
+                    f"SELECT id, {_SUTUNLAR} FROM {bolum} WHERE {where} "
+                    f"ORDER BY timestamp DESC, id DESC LIMIT ?", (*parametreler, kalan)).fetchall()
+            except sqlite3.OperationalError as e:
+                # Bakım sırasında silinmiş bölüm
+                logger.debug(f"Audit bölümü okunamadı ({bolum}): {e}")
+                continue
+            sonuc.extend(AuditKaydi(s[0], s[1], s[2], s[3], s[4], s[5], s[6], bool(s[7]), s[8]) for s in satirlar)
+        return sonuc
+
+    def _ozet_var_mi(self) -> bool:
+        if self._yazici is not None:
+            return True
+        if not os.path.exists(self.db_path):
+            return False
+        return self._okuyucu().execute("SELECT 1 FROM sqlite_master WHERE name = 'audit_gunluk'").fetchone() is not None
+
+    def gunluk_sayilar(self, baslangic: date = None, bitis: date = None, grupla: Tuple[str, ...] = ("gun", "modul"),
+                       kullanici: str = None, modul: str = None, islem_tipi: str = None) -> List[tuple]:
+        """
+        Önceden toplanmış olay sayıları: `grupla` sütunlarının değerleri ve
+        adet, yeniden eskiye. `baslangic` ve `bitis` günleri dahildir.
+        """
+        grupla = tuple(g for g in grupla if g in OZET_SUTUNLARI) or ("gun",)
+        self.bosalt(1.0)
+        if not self._ozet_var_mi():
+            return []
+        kosullar, parametreler = [], []
+        for sutun, deger in (("kullanici", kullanici), ("modul", modul), ("islem_tipi", islem_tipi)):
+            if deger is not None:
+                kosullar.append(f"{sutun} = ?")
+                parametreler.append(str(deger))
+        if baslangic:
+            kosullar.append("gun >= ?")
+            parametreler.append(baslangic.isoformat())
+        if bitis:
+            kosullar.append("gun <= ?")
+            parametreler.append(bitis.isoformat())
+        where = " AND ".join(kosullar) or "1=1"
+        sutunlar = ", ".join(grupla)
+        siralama = ", ".join(f"{g} DESC" if g == "gun" else g for g in grupla)
+        return self._okuyucu().execute(
+            f"SELECT {sutunlar}, SUM(adet) FROM audit_gunluk WHERE {where} GROUP BY {sutunlar} ORDER BY {siralama}",
+            parametreler).fetchall()
+
+    def filtre_degerleri(self) -> Dict[str, List[str]]:
+        """Özet tablosundaki farklı kullanıcı, modül ve işlem adları (filtre listeleri için)."""
+        self.bosalt(1.0)
+        if not self._ozet_var_mi():
+            return {"kullanici": [], "modul": [], "islem_tipi": []}
+        conn = self._okuyucu()
+        return {sutun: [d for (d,) in conn.execute(f"SELECT DISTINCT {sutun} FROM audit_gunluk ORDER BY 1") if d]
+                for sutun in ("kullanici", "modul", "islem_tipi")}
+
+    def get_kullanici_loglari(self, kullanici: str, limit: int = 100):
+        """Kullanıcının son işlemleri"""
+        return [(k.timestamp, k.islem_tipi, k.tablo, k.detay)
+                for k in self.sorgula(kullanici=kullanici, limit=limit)]
+
+    def kayit_gecmisi(self, tablo: str, kayit_id: str, limit: int = 100) -> List[AuditKaydi]:
+        """Bir kaydın (ör. Personel / TC) üzerindeki işlemler."""
+        return self.sorgula(tablo=tablo, kayit_id=kayit_id, limit=limit)
+
+    # =========================================================================
+    # 4. SAKLAMA VE SIKIŞTIRMA
+    # =========================================================================
+    def bakim(self, simdi: datetime = None) -> List[str]:
+        """
+        Saklama süresini (saklama_ay) aşan aylık bölümleri siler, boşalan
+        sayfaları dosyaya iade eder ve WAL dosyasını küçültür. Silinen
+        bölümleri döndürür.
+        """
+        simdi = simdi or datetime.now()
+        yil, ay = _ay_ekle(simdi.year, simdi.month, -self.saklama_ay)
+        sinir = f"{TABLO_ONEKI}{yil:04d}{ay:02d}"
+        with self._yazma_kilidi:
+            conn = self._yazici_baglantisi()
+            silinecekler = sorted(b for b in self._bolumler if b < sinir)
+            for tablo in silinecekler:
+                conn.execute(f"DROP TABLE IF EXISTS {tablo}")
+                self._ekleme_sql.pop(tablo, None)
+            with self._kilit:
+                self._bolumler = self._bolumler - set(silinecekler)
+            conn.execute("DELETE FROM audit_gunluk WHERE gun < ?", (f"{yil:04d}-{ay:02d}-01",))
+            conn.execute("PRAGMA incremental_vacuum")
+            conn.execute("PRAGMA optimize")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("INSERT OR REPLACE INTO audit_meta (anahtar, deger) VALUES ('son_bakim', ?)",
+                         (simdi.isoformat(timespec='seconds'),))
+        if silinecekler:
+            logger.info(f"Audit bakımı: {len(silinecekler)} eski bölüm silindi ({', '.join(silinecekler)}).")
+        return silinecekler
+
+    def _otomatik_bakim(self):
+        with self._yazma_kilidi:
+            satir = self._yazici_baglantisi().execute(
+                "SELECT deger FROM audit_meta WHERE anahtar = 'son_bakim'").fetchone()
+        if satir:
+            try:
+                if datetime.now() - datetime.fromisoformat(satir[0]) < timedelta(seconds=BAKIM_ARALIGI_SN):
+                    return
+            except ValueError:
+                pass
+        bas = time.perf_counter()
+        self.bakim()
+        logger.debug(f"Audit bakımı {(time.perf_counter() - bas) * 1000:.0f} ms")
+
+
+# Uygulama genelinde tek örnek (dosya ilk olayda oluşturulur)
+audit_logger = AuditLogger()
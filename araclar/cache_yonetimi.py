@@ -2,7 +2,7 @@
 import threading
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List, Callable
 
 # Loglama
 logger = logging.getLogger("CacheYonetimi")
@@ -30,6 +30,30 @@ class VeritabaniOnbellegi:
         self._ttl_cache: Dict[str, datetime] = {}
         # Cache erişimi için ayrı kilit (Singleton kilidiyle karışmasın)
         self._data_lock = threading.RLock()
+        # Değişiklik dinleyicileri: callback(olay, key, value)
+        # olay: 'set' | 'invalidate' | 'clear'
+        self._listeners: List[Callable[[str, str, Any], None]] = []
+
+    def add_listener(self, callback: Callable[[str, str, Any], None]):
+        """Önbellek değişikliklerini dinleyecek fonksiyonu kaydeder."""
+        with self._data_lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, str, Any], None]):
+        with self._data_lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _bildir(self, olay: str, key: str, value: Any = None):
+        """Dinleyicileri kilit dışında çağırır; bir dinleyicinin hatası diğerlerini etkilemez."""
+        with self._data_lock:
+            dinleyiciler = list(self._listeners)
+        for callback in dinleyiciler:
+            try:
+                callback(olay, key, value)
+            except Exception as e:
+                logger.error(f"Cache dinleyici hatası ({key}): {e}")
 
     def get(self, key: str) -> Optional[Any]:
         """Önbellekten veri çeker. Süresi dolmuşsa None döner."""
@@ -38,14 +62,13 @@ class VeritabaniOnbellegi:
                 return None
             
             # Süre kontrolü
-            if key in self._ttl_cache:
-                if datetime.now() > self._ttl_cache[key]:
-                    logger.debug(f"Cache expired: {key}")
-                    self.invalidate(key) # Temizle
-                    return None
-            
-            logger.debug(f"Cache HIT: {key}")
-            return self._cache[key]
+            if key not in self._ttl_cache or datetime.now() <= self._ttl_cache[key]:
+                logger.debug(f"Cache HIT: {key}")
+                return self._cache[key]
+
+        logger.debug(f"Cache expired: {key}")
+        self.invalidate(key) # Temizle
+        return None
 
     def set(self, key: str, value: Any, ttl_seconds: int = 300):
         """Veriyi önbelleğe yazar."""
@@ -53,21 +76,25 @@ class VeritabaniOnbellegi:
             self._cache[key] = value
             self._ttl_cache[key] = datetime.now() + timedelta(seconds=ttl_seconds)
             logger.debug(f"Cache SET: {key} (TTL: {ttl_seconds}s)")
+        self._bildir('set', key, value)
 
     def invalidate(self, key: str):
         """Belirli bir anahtarı siler."""
         with self._data_lock:
+            vardi = key in self._cache
             self._cache.pop(key, None)
             self._ttl_cache.pop(key, None)
+        if vardi:
+            self._bildir('invalidate', key)
 
     def invalidate_pattern(self, pattern: str):
         """İsim desenine uyan (örn: 'personel:') tüm kayıtları siler."""
         with self._data_lock:
             keys_to_remove = [k for k in self._cache.keys() if pattern in k]
-            for k in keys_to_remove:
-                self.invalidate(k)
-            if keys_to_remove:
-                logger.info(f"Cache pattern '{pattern}' cleaned ({len(keys_to_remove)} items).")
+        for k in keys_to_remove:
+            self.invalidate(k)
+        if keys_to_remove:
+            logger.info(f"Cache pattern '{pattern}' cleaned ({len(keys_to_remove)} items).")
 
     def clear_all(self):
         """Tüm önbelleği temizler."""
@@ -75,6 +102,7 @@ class VeritabaniOnbellegi:
             self._cache.clear()
             self._ttl_cache.clear()
             logger.warning("All cache cleared.")
+        self._bildir('clear', '*')
 
 # Global erişim noktası
 cache = VeritabaniOnbellegi()
\ No newline at end of file
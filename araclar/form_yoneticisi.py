@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Ana penceredeki formların yaşam döngüsü.
+- Menüdeki (ayarlar.json > menu_yapilandirma) modüller, ana pencere
+  açıldıktan sonra boşta arka planda içe aktarılır.
+- Formlar veri bağımlılıklarını sınıf özniteliğiyle bildirir; tablolar
+  form oluşturulmadan önce önbelleğe çekilmeye başlanır.
+- Yeniden kullanılabilir formlar sekme kapatılınca silinmez; sınırlı bir
+  havuzda gizli tutulur ve tekrar açılışta aynı örnek gösterilir.
+- Her açılışın süresi (soğuk / modül hazır / havuzdan) kaydedilir.
+
+Formun bildirebileceği öznitelikler:
+    VERI_BAGIMLILIKLARI = (('personel', 'Personel'), ('sabit', 'Sabitler'))
+    YENIDEN_KULLANILABILIR = True
+    def yeniden_acildi(self): ...   # havuzdan açılınca (ör. önbellekten tazele)
+"""
+import importlib
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
+from PySide6.QtWidgets import QMdiSubWindow
+
+from araclar.tembel_yukleme import arka_planda_yukle, yuklendi_mi
+
+logger = logging.getLogger("FormYoneticisi")
+
+# Havuzda gizli tutulacak en fazla form sayısı
+VARSAYILAN_HAVUZ_BOYUTU = 3
+# Ana pencere açıldıktan sonra modül ön yüklemesine başlama gecikmesi (ms)
+ON_YUKLEME_GECIKMESI_MS = 1500
+
+
+# =============================================================================
+# 1. ALT PENCERE
+# =============================================================================
+class HavuzluAltPencere(QMdiSubWindow):
+    """
+    Kapatılınca içindeki formu kendisiyle birlikte silmek yerine ayırıp
+    `form_birakildi` ile yöneticiye veren MDI alt penceresi. Formun
+    closeEvent'i (thread durdurma vb.) her kapanışta yine çalışır.
+    """
+    form_birakildi = Signal(object)
+
+    def closeEvent(self, event):
+        super().closeEvent(event)
+        if not event.isAccepted():
+            return
+        form = self.widget()
+        if form is not None:
+            self.setWidget(None)
+            self.form_birakildi.emit(form)
+
+
+# =============================================================================
+# 2. YÖNETİCİ
+# =============================================================================
+class FormYoneticisi(QObject):
+    acildi = Signal(str, float, str)  # (başlık, süre ms, tür: soguk | hazir | havuz)
+
+    def __init__(self, mdi_area, menu_data: Dict, form_argumanlari: Optional[Dict] = None,
+                 havuz_boyutu: int = VARSAYILAN_HAVUZ_BOYUTU, parent=None):
+        super().__init__(parent)
+        self.mdi_area = mdi_area
+        self.form_argumanlari = dict(form_argumanlari or {})
+        self.havuz_boyutu = havuz_boyutu
+        self._moduller = list(dict.fromkeys(
+            item["modul"] for elemanlar in (menu_data or {}).values()
+            for item in elemanlar if item.get("modul") and item.get("sinif")
+        ))
+        # (modül, sınıf) -> gizli form örneği; en eski kullanılan başta
+        self._havuz: "OrderedDict[Tuple[str, str], object]" = OrderedDict()
+        # başlık -> [(süre ms, tür)]
+        self._gecikmeler: Dict[str, List[Tuple[float, str]]] = defaultdict(list)
+
+    # --- Ön yükleme ---
+    def modulleri_on_yukle(self, gecikme_ms: int = ON_YUKLEME_GECIKMESI_MS):
+        """
+        Menüdeki form modüllerini, ana pencere çizildikten sonra arka planda
+        içe aktarır. Modüller içe aktarılırken Qt nesnesi oluşturmaz
+        (servis tekilleri düz Python nesneleridir); yalnızca sınıflar tanımlanır.
+        """
+        QTimer.singleShot(gecikme_ms, lambda: arka_planda_yukle(self._moduller))
+
+    @staticmethod
+    def veri_on_yukle(form_sinifi) -> Optional[threading.Thread]:
+        """Formun bildirdiği tabloları önbelleğe çeker (form kurulurken arka planda)."""
+        bagimliliklar = tuple(getattr(form_sinifi, "VERI_BAGIMLILIKLARI", ()) or ())
+        if not bagimliliklar:
+            return None
+
+        def _calis():
+            from google_baglanti import veritabani_getir_cached
+            for vt_tipi, sayfa in bagimliliklar:
+                try:
+                    veritabani_getir_cached(vt_tipi, sayfa)
+                except Exception as e:
+                    # Form kendi yüklemesinde hatayı kullanıcıya gösterir
+                    logger.warning(f"Ön yükleme başarısız ({vt_tipi}/{sayfa}): {e}")
+
+        thread = threading.Thread(target=_calis, name=f"VeriOnYukleme-{form_sinifi.__name__}", daemon=True)
+        thread.start()
+        return thread
+
+    # --- Açma ---
+    def form_ac(self, baslik: str, modul_yolu: str, sinif_adi: str) -> QMdiSubWindow:
+        """
+        Formu MDI alanında açar ve alt pencereyi döndürür. Modül ya da sınıf
+        bulunamazsa ImportError / AttributeError yükseltir.
+        """
+        bas = time.perf_counter()
+        anahtar = (modul_yolu, sinif_adi)
+        form = self._havuz.pop(anahtar, None)
+        if form is not None:
+            tur = "havuz"
+            yeniden_acildi = getattr(form, "yeniden_acildi", None)
+            if callable(yeniden_acildi):
+                yeniden_acildi()
+        else:
+            tur = "hazir" if yuklendi_mi(modul_yolu) else "soguk"
+            modul = importlib.import_module(modul_yolu)
+            if not hasattr(modul, sinif_adi):
+                raise AttributeError(f"Modül içinde '{sinif_adi}' sınıfı bulunamadı.")
+            form_sinifi = getattr(modul, sinif_adi)
+            self.veri_on_yukle(form_sinifi)
+            form = self._olustur(form_sinifi)
+
+        sub = HavuzluAltPencere()
+        sub.setAttribute(Qt.WA_DeleteOnClose)
+        sub.setWidget(form)
+        if getattr(form, "YENIDEN_KULLANILABILIR", False):
+            sub.form_birakildi.connect(lambda f, a=anahtar: self._havuza_al(a, f))
+        self.mdi_area.addSubWindow(sub)
+        sub.setWindowTitle(baslik)
+        form.show()
+        sub.showMaximized()
+        # Bekleyen olaylar (ilk çizim dahil) işlendikten sonra süre kaydedilir
+        QTimer.singleShot(0, lambda: self._sure_kaydet(baslik, bas, tur))
+        return sub
+
+    def _olustur(self, form_sinifi):
+        # Parametre aktarımı denemesi (formların imzaları farklı)
+        try:
+            return form_sinifi(**self.form_argumanlari)
+        except TypeError:
+            try:
+                return form_sinifi(yetki=self.form_argumanlari.get("yetki"))
+            except TypeError:
+                return form_sinifi()
+
+    # --- Havuz ---
+    def _havuza_al(self, anahtar, form):
+        self._havuz[anahtar] = form
+        self._havuz.move_to_end(anahtar)
+        while len(self._havuz) > self.havuz_boyutu:
+            _, eski = self._havuz.popitem(last=False)
+            eski.deleteLater()
+
+    def havuzdakiler(self) -> List[Tuple[str, str]]:
+        return list(self._havuz)
+
+    def temizle(self):
+        """Havuzdaki formları siler (ana pencere kapanırken)."""
+        while self._havuz:
+            _, form = self._havuz.popitem()
+            form.deleteLater()
+
+    # --- Açılış süreleri ---
+    def _sure_kaydet(self, baslik: str, bas: float, tur: str):
+        sure = (time.perf_counter() - bas) * 1000
+        self._gecikmeler[baslik].append((sure, tur))
+        logger.info(f"Form açıldı: {baslik} {sure:.0f} ms ({tur})")
+        self.acildi.emit(baslik, sure, tur)
+
+    def gecikmeler(self) -> Dict[str, List[Tuple[float, str]]]:
+        return {baslik: list(l) for baslik, l in self._gecikmeler.items()}
+
+    def gecikme_raporu(self) -> str:
+        satirlar = ["Form açılış süreleri (ms):"]
+        for baslik, olcumler in sorted(self._gecikmeler.items()):
+            sureler = [s for s, _ in olcumler]
+            turler = ", ".join(f"{t}:{sum(1 for _, x in olcumler if x == t)}"
+                               for t in ("soguk", "hazir", "havuz") if any(x == t for _, x in olcumler))
+            satirlar.append(f"  {baslik:<24}son {sureler[-1]:>6.0f}  en çok {max(sureler):>6.0f}  ({turler})")
+        return "\n".join(satirlar)
@@ -1,27 +1,138 @@
 # -*- coding: utf-8 -*-
+"""
+Şifre saklama ve doğrulama.
+Şifreler tuzlu PBKDF2-HMAC-SHA256 ile saklanır:
+    pbkdf2_sha256$<iterasyon>$<tuz (base64)>$<özet (base64)>
+Maliyet (iterasyon) hash'in içinde durduğu için KDF_ITERASYON artırılınca
+eski hash'ler doğrulanmaya devam eder; kullanıcı bir sonraki girişinde
+yeni maliyetle yeniden hashlenir (yeniden_hash_gerekli). Eski sürümün
+tuzsuz SHA-256 (64 haneli hex) hash'leri de aynı şekilde doğrulanıp
+ilk girişte dönüştürülür.
+
+Maliyet ölçümü:
+    python -m araclar.guvenlik --hedef 100
+"""
+import argparse
+import base64
 import hashlib
+import hmac
+import os
+import sys
+import time
+
+KDF_ALGORITMA = "pbkdf2_sha256"
+# Bu makinede ~60 ms / doğrulama (maliyet_olc ile ölçüldü). Giriş başına bir
+# kez hesaplanır; artırılırsa mevcut hash'ler girişte yükseltilir.
+KDF_ITERASYON = 200_000
+# maliyet_olc'un önereceği en düşük değer (yavaş makinede bile)
+EN_AZ_ITERASYON = 100_000
+# Kayıtlı hash'teki maliyet bundan büyükse hash geçersiz sayılır; sayfaya
+# yazılmış bozuk bir değer girişi dakikalarca kilitleyemesin
+EN_FAZLA_ITERASYON = 10 * KDF_ITERASYON
+TUZ_UZUNLUGU = 16
+# Giriş ekranında doğrulamaya ayrılan süre hedefi (ms)
+HEDEF_DOGRULAMA_MS = 100
+
+
+def _b64(veri: bytes) -> str:
+    return base64.b64encode(veri).decode('ascii').rstrip('=')
+
+
+def _b64_coz(metin: str) -> bytes:
+    return base64.b64decode(metin + '=' * (-len(metin) % 4))
 
 
 class GuvenlikAraclari:
+    # Yeni hash'lerde kullanılan maliyet (testler ve ayar için değiştirilebilir)
+    iterasyon = KDF_ITERASYON
+
     @staticmethod
-    def sifrele(sifre):
+    def _turet(sifre, tuz: bytes, iterasyon: int) -> bytes:
+        return hashlib.pbkdf2_hmac('sha256', str(sifre).encode('utf-8'), tuz, iterasyon)
+
+    @staticmethod
+    def sifrele(sifre, iterasyon: int = None):
         """
-        Verilen şifreyi SHA-256 algoritması ile hashler.
+        Verilen şifreyi rastgele tuzla PBKDF2-SHA256 kullanarak hashler.
         """
         if not sifre: return ""
-        # Şifreyi byte'a çevir
-        sifre_bytes = str(sifre).encode('utf-8')
-        
-        # Hash nesnesi oluştur
-        hash_obj = hashlib.sha256(sifre_bytes)
-        
-        # Hexadecimal string olarak döndür
-        return hash_obj.hexdigest()
+        iterasyon = iterasyon or GuvenlikAraclari.iterasyon
+        tuz = os.urandom(TUZ_UZUNLUGU)
+        ozet = GuvenlikAraclari._turet(sifre, tuz, iterasyon)
+        return f"{KDF_ALGORITMA}${iterasyon}${_b64(tuz)}${_b64(ozet)}"
+
+    @staticmethod
+    def eski_hash(sifre):
+        """Önceki sürümün tuzsuz SHA-256 hash'i (yalnızca eski kayıtları doğrulamak için)."""
+        if not sifre: return ""
+        return hashlib.sha256(str(sifre).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _coz(kayitli_hash):
+        """KDF hash'ini (iterasyon, tuz, özet) olarak ayırır; biçim farklıysa ya da maliyet sınır dışıysa None."""
+        parcalar = str(kayitli_hash or "").split('$')
+        if (len(parcalar) != 4 or parcalar[0] != KDF_ALGORITMA or not parcalar[1].isdigit()
+                or not 1 <= int(parcalar[1]) <= EN_FAZLA_ITERASYON):
+            return None
+        try:
+            return int(parcalar[1]), _b64_coz(parcalar[2]), _b64_coz(parcalar[3])
+        except (ValueError, TypeError):
+            return None
 
     @staticmethod
     def dogrula(girilen_sifre, kayitli_hash):
         """
-        Girilen düz şifrenin hash'i ile kayıtlı hash'i karşılaştırır.
+        Girilen düz şifreyi kayıtlı hash ile sabit sürede karşılaştırır.
+        KDF ve eski SHA-256 biçimlerinin ikisini de kabul eder.
+        """
+        kayitli_hash = str(kayitli_hash or "").strip()
+        if not girilen_sifre or not kayitli_hash:
+            return False
+        cozulmus = GuvenlikAraclari._coz(kayitli_hash)
+        if cozulmus is not None:
+            iterasyon, tuz, ozet = cozulmus
+            return hmac.compare_digest(GuvenlikAraclari._turet(girilen_sifre, tuz, iterasyon), ozet)
+        # str karşılaştırması ASCII dışı karakterde TypeError verir; bayt olarak karşılaştırılır
+        return hmac.compare_digest(GuvenlikAraclari.eski_hash(girilen_sifre).encode('utf-8'),
+                                   kayitli_hash.lower().encode('utf-8'))
+
+    @staticmethod
+    def yeniden_hash_gerekli(kayitli_hash) -> bool:
+        """Hash eski biçimdeyse ya da maliyeti güncel değerin altındaysa True."""
+        cozulmus = GuvenlikAraclari._coz(kayitli_hash)
+        return cozulmus is None or cozulmus[0] < GuvenlikAraclari.iterasyon
+
+    @staticmethod
+    def maliyet_olc(hedef_ms: float = HEDEF_DOGRULAMA_MS, ornek_iterasyon: int = 50_000, tekrar: int = 3) -> int:
+        """
+        Bu makinede bir doğrulamanın `hedef_ms` sürmesi için gereken
+        iterasyon sayısını ölçer (10.000'e yuvarlanır, EN_AZ_ITERASYON altına inmez).
         """
-        girilen_hash = GuvenlikAraclari.sifrele(girilen_sifre)
-        return girilen_hash == kayitli_hash
\ No newline at end of file
+        tuz = os.urandom(TUZ_UZUNLUGU)
+        en_iyi = float('inf')
+        for _ in range(max(1, tekrar)):
+            bas = time.perf_counter()
+            GuvenlikAraclari._turet("olcum", tuz, ornek_iterasyon)
+            en_iyi = min(en_iyi, time.perf_counter() - bas)
+        iterasyon_ms = ornek_iterasyon / (en_iyi * 1000)
+        oneri = int(hedef_ms * iterasyon_ms) // 10_000 * 10_000
+        return max(EN_AZ_ITERASYON, oneri)
+
+
+def main(argv=None) -> int:
+    ayrac = argparse.ArgumentParser(description="Şifre KDF maliyet ölçümü")
+    ayrac.add_argument("--hedef", type=float, default=HEDEF_DOGRULAMA_MS, help="doğrulama süresi hedefi (ms)")
+    args = ayrac.parse_args(argv)
+
+    for iterasyon in sorted({EN_AZ_ITERASYON, KDF_ITERASYON, 2 * KDF_ITERASYON}):
+        hash_ = GuvenlikAraclari.sifrele("olcum", iterasyon)
+        bas = time.perf_counter()
+        GuvenlikAraclari.dogrula("olcum", hash_)
+        print(f"{iterasyon:>9} iterasyon: {(time.perf_counter() - bas) * 1000:>6.1f} ms")
+    print(f"{args.hedef:.0f} ms hedefi için önerilen: {GuvenlikAraclari.maliyet_olc(args.hedef)} "
+          f"(mevcut KDF_ITERASYON={KDF_ITERASYON})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
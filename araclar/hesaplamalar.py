@@ -4,11 +4,8 @@ import bisect
 from datetime import timedelta
 
 # --- YARDIMCI METİN FONKSİYONLARI ---
-def tr_upper(text):
-    """Türkçe karakter destekli büyük harfe çevirme."""
-    if not isinstance(text, str):
-        return str(text).upper()
-    return text.replace('i', 'İ').replace('ı', 'I').replace('ğ', 'Ğ').replace('ü', 'Ü').replace('ş', 'Ş').replace('ö', 'Ö').replace('ç', 'Ç').upper()
+# Metin dönüşümleri araclar.metin_araclari'ndadır; eski importlar için burada da sunulur
+from araclar.metin_araclari import tr_upper
 
 # --- HESAPLAMA MANTIĞI ---
 def sua_hak_edis_hesapla(toplam_saat):
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Açılış içe aktarma (import) süresi ölçümü ve bütçe kontrolü.
+Modül ayrı bir Python sürecinde `-X importtime` ile içe aktarılır; çıktı
+ayrıştırılıp en pahalı modüller raporlanır. Toplam süre bütçeyi aşarsa ya
+da açılışta yüklenmemesi gereken ağır bir kütüphane yüklenirse ihlal
+bildirilir. test/test_import_butcesi.py yasak kütüphaneleri her çalıştırmada,
+süre bütçesini ise yalnızca IMPORT_BUTCESI_OLC=1 ile denetler (paylaşılan
+makinelerde duvar saati ölçümü tutarsızdır).
+
+Kullanım:
+    python -m araclar.import_suresi                  # main için rapor
+    python -m araclar.import_suresi --modul formlar.login --butce 300 --ilk 20
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import namedtuple
+from typing import Iterable, List, Optional
+
+# Giriş ekranını açan `import main` için bütçe (ms). Ölçülen değer ~200 ms;
+# Google kütüphanelerinin tekrar açılışta yüklenmesi (~250 ms) bütçeyi aşar.
+BASLANGIC_BUTCESI_MS = 400
+
+# Açılışta yüklenmemesi gereken kütüphaneler (araclar.tembel_yukleme ile ilk
+# kullanımda ya da giriş ekranından sonra arka planda yüklenirler)
+ACILISTA_YASAK = (
+    "gspread", "googleapiclient", "google_auth_oauthlib", "google.oauth2",
+    "pandas", "numpy", "docxtpl", "docx", "qrcode", "docx2pdf",
+)
+
+KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tek satır: "import time:  kendi_us |  toplam_us | <girinti>modül"
+IceAktarma = namedtuple("IceAktarma", "ad kendi_us toplam_us derinlik")
+
+
+# =============================================================================
+# 1. ÖLÇÜM
+# =============================================================================
+def cozumle(cikti: str) -> List[IceAktarma]:
+    """-X importtime çıktısını (stderr) satır listesine çevirir."""
+    kayitlar = []
+    for satir in cikti.splitlines():
+        if not satir.startswith("import time:"):
+            continue
+        parcalar = satir[len("import time:"):].split("|")
+        if len(parcalar) != 3 or not parcalar[0].strip().isdigit():
+            continue  # başlık satırı
+        ad = parcalar[2].rstrip()
+        derinlik = (len(ad) - len(ad.lstrip())) // 2
+        kayitlar.append(IceAktarma(ad.strip(), int(parcalar[0]), int(parcalar[1]), derinlik))
+    return kayitlar
+
+
+def importtime_olc(modul: str = "main", tekrar: int = 1) -> List[IceAktarma]:
+    """
+    Modülü yeni bir süreçte içe aktarıp ölçer. `tekrar` > 1 ise en hızlı
+    ölçüm döner (disk önbelleği ve makine gürültüsünü ayıklamak için).
+    """
+    ortam = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    ortam.pop("PYTHONPROFILEIMPORTTIME", None)
+    en_iyi = None
+    for _ in range(max(1, tekrar)):
+        sonuc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modul}"],
+                               cwd=KOK_DIZIN, env=ortam, capture_output=True, text=True)
+        if sonuc.returncode != 0:
+            raise RuntimeError(f"'{modul}' içe aktarılamadı:\n{sonuc.stderr[-2000:]}")
+        kayitlar = cozumle(sonuc.stderr)
+        if en_iyi is None or toplam_ms(kayitlar, modul) < toplam_ms(en_iyi, modul):
+            en_iyi = kayitlar
+    return en_iyi
+
+
+def alt_kayitlar(kayitlar: List[IceAktarma], modul: str) -> List[IceAktarma]:
+    """
+    `modul`ün kendisi ve onun tetiklediği içe aktarmalar. Çıktıda alt
+    modüller üst modülden önce yazılır; yorumlayıcı açılışının (site,
+    encodings...) satırları dışarıda kalır.
+    """
+    for i in range(len(kayitlar) - 1, -1, -1):
+        if kayitlar[i].ad == modul and kayitlar[i].derinlik == 0:
+            bas = i
+            while bas > 0 and kayitlar[bas - 1].derinlik > 0:
+                bas -= 1
+            return kayitlar[bas:i + 1]
+    return []
+
+
+def toplam_ms(kayitlar: List[IceAktarma], modul: str) -> float:
+    """Modülün kendisi ve alt içe aktarmalarının toplam süresi."""
+    alt = alt_kayitlar(kayitlar, modul)
+    return alt[-1].toplam_us / 1000 if alt else 0.0
+
+
+# =============================================================================
+# 2. BÜTÇE VE RAPOR
+# =============================================================================
+def ihlaller(kayitlar: List[IceAktarma], modul: str, butce_ms: Optional[float] = BASLANGIC_BUTCESI_MS,
+             yasaklar: Iterable[str] = ACILISTA_YASAK) -> List[str]:
+    sonuc = []
+    toplam = toplam_ms(kayitlar, modul)
+    if butce_ms is not None and toplam > butce_ms:
+        sonuc.append(f"'{modul}' içe aktarma süresi {toplam:.0f} ms, bütçe {butce_ms:.0f} ms")
+    yuklenenler = {k.ad for k in alt_kayitlar(kayitlar, modul)}
+    for yasak in yasaklar:
+        if yasak in yuklenenler:
+            sonuc.append(f"'{yasak}' açılışta yükleniyor (tembel yüklenmeli)")
+    return sonuc
+
+
+def rapor(kayitlar: List[IceAktarma], modul: str, ilk: int = 15) -> str:
+    """En pahalı üst düzey modüller (alt içe aktarmalarıyla birlikte)."""
+    satirlar = [f"'{modul}' içe aktarma: {toplam_ms(kayitlar, modul):.0f} ms",
+                f"{'toplam ms':>10} {'kendi ms':>9}  modül"]
+    # `modul`ün doğrudan içe aktardıkları
+    ust_duzey = [k for k in alt_kayitlar(kayitlar, modul) if k.derinlik == 1]
+    for k in sorted(ust_duzey, key=lambda k: k.toplam_us, reverse=True)[:ilk]:
+        satirlar.append(f"{k.toplam_us / 1000:>10.1f} {k.kendi_us / 1000:>9.1f}  {k.ad}")
+    return "\n".join(satirlar)
+
+
+def main(argv=None) -> int:
+    ayrac = argparse.ArgumentParser(description="Açılış içe aktarma süresi ve bütçe kontrolü")
+    ayrac.add_argument("--modul", default="main")
+    ayrac.add_argument("--butce", type=float, default=BASLANGIC_BUTCESI_MS, help="ms (0: kontrol yok)")
+    ayrac.add_argument("--ilk", type=int, default=15, help="raporlanacak modül sayısı")
+    ayrac.add_argument("--tekrar", type=int, default=3)
+    args = ayrac.parse_args(argv)
+
+    kayitlar = importtime_olc(args.modul, args.tekrar)
+    print(rapor(kayitlar, args.modul, args.ilk))
+    # Yasak liste giriş ekranı içindir; formlar ağır kütüphaneleri zaten kullanır
+    yasaklar = ACILISTA_YASAK if args.modul == "main" else ()
+    bulunan = ihlaller(kayitlar, args.modul, args.butce or None, yasaklar)
+    for ihlal in bulunan:
+        print(f"BÜTÇE İHLALİ: {ihlal}")
+    return 1 if bulunan else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
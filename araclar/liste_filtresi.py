@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+Liste formları için ortak filtreleme altyapısı.
+Kaynak model (tablo_modeli.KayitModeli) veri gelince bir kez yüklenir.
+ListeFiltresi metin kutusunu geciktirerek (debounce) dinler, çok sütunlu
+koşulları toplu değerlendirir; büyük listelerde değerlendirme arka plan
+thread'inde yapılır. Sonuç satır kümesi SatirKumesiModeli'ne verilir;
+tablo öğeleri ve modeller filtre değişiminde yeniden oluşturulmaz.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from PySide6.QtCore import Qt, QObject, QThread, QTimer, Signal
+
+try:
+    from araclar.arama_indeksi import SatirKumesiModeli, kelimeler
+    from araclar.metin_araclari import katla
+    from araclar.tablo_modeli import alan_degeri
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from araclar.arama_indeksi import SatirKumesiModeli, kelimeler
+    from araclar.metin_araclari import katla
+    from araclar.tablo_modeli import alan_degeri
+
+logger = logging.getLogger("ListeFiltresi")
+
+# Yazma durduktan sonra filtrenin çalışması için beklenen süre
+GECIKME_MS = 250
+# Bu satır sayısından büyük listelerde koşullar arka planda değerlendirilir
+ARKA_PLAN_ESIGI = 5000
+# Arka plan taramasında iptal kontrolü bu kadar satırda bir yapılır
+_IPTAL_ADIMI = 2048
+
+Kosul = Callable[[Any], bool]
+
+# ============================================================================
+# 1. KOŞULLAR
+# ============================================================================
+
+def esit_kosulu(alan, deger) -> Kosul:
+    """Alan değeri (boşluklar kırpılarak) `deger` ile aynı olan kayıtlar."""
+    deger = str(deger).strip()
+    return lambda kayit: alan_degeri(kayit, alan).strip() == deger
+
+
+def icerir_kosulu(alan, deger) -> Kosul:
+    """Alan değeri `deger`i içeren kayıtlar (Türkçe harf ve büyük/küçük harf duyarsız)."""
+    deger = katla(deger)
+    return lambda kayit: deger in katla(alan_degeri(kayit, alan))
+
+
+def metin_anahtarlari(kayitlar: Sequence, alanlar: Sequence) -> List[str]:
+    """Her kayıt için aranan alanların katlanmış birleşimi (bir kez hesaplanır)."""
+    return ["\n".join(katla(alan_degeri(kayit, alan)) for alan in alanlar) for kayit in kayitlar]
+
+
+def satirlari_suz(kayitlar: Sequence, metinler: Optional[List[str]], aranan: Sequence[str],
+                  kosullar: Sequence[Kosul], aday: Optional[Set[int]] = None,
+                  iptal: Optional[Callable[[], bool]] = None) -> Optional[Set[int]]:
+    """
+    Aranan kelimelerin hepsini içeren ve bütün koşulları sağlayan satırlar.
+    `aday` verilirse yalnızca o satırlara bakılır. İptal edilirse None döner.
+    """
+    satirlar = range(len(kayitlar)) if aday is None else sorted(aday)
+    sonuc: Set[int] = set()
+    for sayac, i in enumerate(satirlar):
+        if iptal is not None and not sayac % _IPTAL_ADIMI and iptal():
+            return None
+        if aranan:
+            metin = metinler[i]
+            if not all(k in metin for k in aranan):
+                continue
+        kayit = kayitlar[i]
+        if all(kosul(kayit) for kosul in kosullar):
+            sonuc.add(i)
+    return sonuc
+
+
+# ============================================================================
+# 2. FİLTRE DENETLEYİCİSİ
+# ============================================================================
+
+class _FiltreWorker(QThread):
+    """Büyük listelerde koşulları GUI thread'ini bloklamadan değerlendirir."""
+    sonuc_hazir = Signal(int, object, object)  # nesil, satır kümesi, metin anahtarları
+
+    def __init__(self, nesil, kayitlar, metin_alanlari, metinler, aranan, kosullar, aday, iptal):
+        super().__init__()
+        self.nesil = nesil
+        self.kayitlar = kayitlar
+        self.metin_alanlari = metin_alanlari
+        self.metinler = metinler
+        self.aranan = aranan
+        self.kosullar = kosullar
+        self.aday = aday
+        self.iptal = iptal
+
+    def run(self):
+        try:
+            if self.aranan and self.metinler is None:
+                self.metinler = metin_anahtarlari(self.kayitlar, self.metin_alanlari)
+            kume = satirlari_suz(self.kayitlar, self.metinler, self.aranan, self.kosullar,
+                                 self.aday, self.iptal)
+            if kume is not None:
+                self.sonuc_hazir.emit(self.nesil, kume, self.metinler)
+        except Exception as e:
+            logger.error(f"Filtre hatası: {e}")
+
+
+class ListeFiltresi(QObject):
+    """
+    Bir SatirKumesiModeli'nin satırlarını yöneten filtre.
+    - metni_ayarla: metin kutusundan gelir, GECIKME_MS sonra uygulanır
+    - kosul_ayarla: combo/buton filtreleri, hemen uygulanır
+    - on_secim: varsa ilk adım olarak hazır satır kümesi verir (ör. AramaIndeksi)
+    - kaynak_modeli_bagla: kayıtlar KayitModeli'nden alınır; model yeniden
+      yüklenince ya da satır eklenip/silinip/değişince filtre kendiliğinden uygulanır
+    Eski aramaların sonuçları nesil numarasıyla ayıklanır; görünüme yalnızca
+    en son isteğin sonucu ulaşır.
+    """
+
+    filtrelendi = Signal(int)  # gösterilen satır sayısı
+
+    def __init__(self, proxy: SatirKumesiModeli, metin_alanlari: Sequence = (),
+                 gecikme_ms: int = GECIKME_MS, esik: int = ARKA_PLAN_ESIGI, parent=None):
+        super().__init__(parent if parent is not None else proxy)
+        self.proxy = proxy
+        self.metin_alanlari = tuple(metin_alanlari)
+        self.esik = esik
+        self.on_secim: Optional[Callable[[], Optional[Set[int]]]] = None
+
+        self._kayitlar: Sequence = []
+        self._metinler: Optional[List[str]] = None
+        self._metin = ""
+        self._kosullar: Dict[str, Kosul] = {}
+        self._nesil = 0
+        self._workerlar: List[_FiltreWorker] = []
+
+        self._zamanlayici = QTimer(self)
+        self._zamanlayici.setSingleShot(True)
+        self._zamanlayici.setInterval(gecikme_ms)
+        self._zamanlayici.timeout.connect(self.uygula)
+
+    # --- Girdiler ---
+    def kayitlari_ayarla(self, kayitlar: Sequence):
+        """Koşulların değerlendirileceği kayıtlar (kaynak modelle aynı sırada)."""
+        self._kayitlar = kayitlar if kayitlar is not None else []
+        self._metinler = None
+        self.uygula()
+
+    def kaynak_modeli_bagla(self, model):
+        """Kayıtları modelden izler: sıfırlamada yeniden süzer, satır değişiminde önbelleği bırakır."""
+        self._kayitlar = model.kayitlar
+        model.modelReset.connect(lambda: self.kayitlari_ayarla(model.kayitlar))
+        model.rowsInserted.connect(self._kayitlar_degisti)
+        model.rowsRemoved.connect(self._kayitlar_degisti)
+        model.dataChanged.connect(self._veri_degisti)
+
+    def _veri_degisti(self, sol_ust, sag_alt, roller=()):
+        if not roller or Qt.DisplayRole in roller:
+            self._kayitlar_degisti()
+
+    def _kayitlar_degisti(self, *args):
+        # Süren arka plan taraması eski satır numaralarıyla çalışıyor; sonucu bırakılır
+        self._nesil += 1
+        self._metinler = None
+        if self._etkin_mi():
+            # Eklenen/değişen satırlar da süzülsün; peş peşe değişiklikler tek taramada toplanır
+            self._zamanlayici.start()
+
+    def _etkin_mi(self) -> bool:
+        """Metin, koşul ya da ön seçimden biri satırları süzüyorsa True."""
+        return bool((self.metin_alanlari and kelimeler(self._metin)) or self._kosullar
+                    or self.on_secim is not None)
+
+    def metin_kutusuna_bagla(self, kutu):
+        kutu.textChanged.connect(self.metni_ayarla)
+
+    def metni_ayarla(self, metin: str):
+        self._metin = metin or ""
+        self._zamanlayici.start()
+
+    def kosul_ayarla(self, ad: str, kosul: Optional[Kosul], uygula: bool = True):
+        """Adlandırılmış koşulu ekler/değiştirir; None koşulu kaldırır."""
+        if kosul is None:
+            self._kosullar.pop(ad, None)
+        else:
+            self._kosullar[ad] = kosul
+        if uygula:
+            self.uygula()
+
+    # --- Değerlendirme ---
+    def uygula(self):
+        self._zamanlayici.stop()
+        self._nesil += 1
+        nesil = self._nesil
+
+        aday = self.on_secim() if self.on_secim is not None else None
+        aranan = kelimeler(self._metin) if self.metin_alanlari else []
+        kosullar = list(self._kosullar.values())
+        if not aranan and not kosullar:
+            self._sonuc_geldi(nesil, aday, None)
+            return
+
+        kayitlar = self._kayitlar
+        boyut = len(kayitlar) if aday is None else len(aday)
+        if boyut < self.esik:
+            if aranan and self._metinler is None:
+                self._metinler = metin_anahtarlari(kayitlar, self.metin_alanlari)
+            self._sonuc_geldi(nesil, satirlari_suz(kayitlar, self._metinler, aranan, kosullar, aday), None)
+            return
+
+        worker = _FiltreWorker(nesil, kayitlar, self.metin_alanlari, self._metinler, aranan,
+                               kosullar, aday, lambda: nesil != self._nesil)
+        worker.sonuc_hazir.connect(self._sonuc_geldi)
+        worker.finished.connect(lambda w=worker: self._worker_bitti(w))
+        self._workerlar.append(worker)
+        worker.start()
+
+    def _sonuc_geldi(self, nesil, kume, metinler):
+        if nesil != self._nesil:
+            return  # Bu arada yeni bir filtre istendi
+        if metinler is not None and self._metinler is None:
+            self._metinler = metinler
+        self.proxy.satirlari_ayarla(kume)
+        self.filtrelendi.emit(self.proxy.rowCount())
+
+    def _worker_bitti(self, worker):
+        if worker in self._workerlar:
+            self._workerlar.remove(worker)
+
+    def durdur(self):
+        """Form kapanırken bekleyen filtreyi iptal eder ve thread'leri bekler."""
+        self._zamanlayici.stop()
+        self._nesil += 1
+        for worker in list(self._workerlar):
+            worker.wait(1000)
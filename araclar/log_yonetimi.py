@@ -1,54 +1,285 @@
 # -*- coding: utf-8 -*-
-import sys
+"""
+Uygulama logu (Sabitler > Loglar sayfası).
+log_ekle çağrısı satırı yalnızca sınırlı bir kuyruğa koyar; tek bir arka
+plan gönderici thread'i satırları önce yerel biriktirme dosyasına
+(temp/log_kuyrugu.jsonl) yazar, sonra belirli aralıklarla ya da parti
+dolunca tek `append_rows` çağrısıyla sayfaya gönderir. İnternet yoksa
+satırlar dosyada bekler ve sonraki açılışta da gönderilir (en az bir kez:
+gönderim sonrası dosya güncellenemezse satır tekrar gönderilebilir).
+Aynı olay yerel audit deposuna da yazılır; denetim ekranı sayfayı
+indirmeden bu kopyayı sorgular.
+"""
+import atexit
+import json
+import logging
 import os
+import queue
 import threading
+import time
 from datetime import datetime
-from google_baglanti import veritabani_getir
+from typing import Dict, List
 
+try:
+    from google_baglanti import veritabani_getir
+    from araclar.audit_logger import audit_logger
+except ImportError:
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from google_baglanti import veritabani_getir
+    from araclar.audit_logger import audit_logger
+
+logger = logging.getLogger("LogYoneticisi")
+
+_KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_SAYFASI = ('sabit', 'Loglar')  # Sabitler spreadsheet'inde 'Loglar' sayfası
+LOG_BASLIKLARI = ["Tarih", "Saat", "Kullanıcı", "Modül", "İşlem", "Detay"]
+LOG_KUYRUK_DOSYASI = os.path.join(_KOK_DIZIN, "temp", "log_kuyrugu.jsonl")
+
+KUYRUK_KAPASITESI = 1000      # bellekteki en fazla satır
+PARTI_BOYUTU = 200            # bir append_rows çağrısındaki en fazla satır
+GONDERIM_ARALIGI_SN = 5.0     # parti dolmasa da en geç bu aralıkla gönderilir
+GERI_BASINC_BEKLEMESI_SN = 0.05  # kuyruk doluysa çağıranın en fazla bekleme süresi
+EN_UZUN_BEKLEME_SN = 300.0    # art arda başarısız gönderimde bekleme üst sınırı
+DOSYA_SINIRI = 20000          # biriktirme dosyasındaki en fazla satır (eskiler atılır)
+
+
+# =============================================================================
+# 1. GÖNDERİCİ
+# =============================================================================
+class LogGonderici:
+    """Log satırlarını kuyruktan alıp partiler halinde Loglar sayfasına yazan tek thread."""
+
+    def __init__(self, dosya: str = LOG_KUYRUK_DOSYASI, kapasite: int = KUYRUK_KAPASITESI,
+                 parti_boyutu: int = PARTI_BOYUTU, aralik: float = GONDERIM_ARALIGI_SN):
+        self.dosya = dosya
+        self.parti_boyutu = parti_boyutu
+        self.aralik = aralik
+        self._kuyruk: "queue.Queue[List[str]]" = queue.Queue(maxsize=kapasite)
+        self._kilit = threading.Lock()
+        self._uyandir = threading.Event()
+        self._durdur = threading.Event()
+        self._thread = None
+        # Yalnızca gönderici thread'i kullanır
+        self._bekleyenler: List[List[str]] = []
+        self._baslik_hazir = False
+        self._bosaltma_istekleri: List[threading.Event] = []
+        self._sayaclar = {"eklenen": 0, "gonderilen": 0, "dusurulen": 0,
+                          "geri_basinc": 0, "basarisiz_gonderim": 0}
+
+    # --- Kuyruğa ekleme (çağıran thread) ---
+    def ekle(self, satir: List[str]) -> bool:
+        """
+        Satırı kuyruğa koyar. Kuyruk doluysa çağıran en fazla
+        GERI_BASINC_BEKLEMESI_SN bekler; yine yer açılmazsa satır düşürülür.
+        """
+        self._baslat()
+        try:
+            self._kuyruk.put_nowait(satir)
+        except queue.Full:
+            self._say("geri_basinc")
+            self._uyandir.set()
+            try:
+                self._kuyruk.put(satir, timeout=GERI_BASINC_BEKLEMESI_SN)
+            except queue.Full:
+                self._say("dusurulen")
+                return False
+        self._say("eklenen")
+        self._uyandir.set()
+        return True
+
+    def _say(self, sayac: str, adet: int = 1):
+        with self._kilit:
+            self._sayaclar[sayac] += adet
+
+    def istatistik(self) -> Dict[str, int]:
+        with self._kilit:
+            sonuc = dict(self._sayaclar)
+        sonuc["kuyrukta"] = self._kuyruk.qsize()
+        sonuc["bekleyen"] = len(self._bekleyenler)
+        return sonuc
+
+    # --- Thread ---
+    def _baslat(self):
+        if self._thread is not None:
+            return
+        with self._kilit:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._calis, name="LogGonderici", daemon=True)
+            self._thread.start()
+        # Program kapanırken bekleyenler bir kez daha gönderilmeye çalışılır
+        atexit.register(self.durdur)
+
+    def _calis(self):
+        self._bekleyenler = self._dosyadan_oku()
+        bekleme = self.aralik
+        cevrimdisi = False
+        son_gonderim = time.monotonic()
+        while True:
+            # Bekleyen satır yoksa süre sayılmaz; yeni satır ya da istek gelene dek uyunur
+            kalan = max(0.0, bekleme - (time.monotonic() - son_gonderim)) if self._bekleyenler else None
+            self._uyandir.wait(timeout=kalan)
+            self._uyandir.clear()
+            with self._kilit:
+                istekler, self._bosaltma_istekleri = self._bosaltma_istekleri, []
+            bostu = not self._bekleyenler
+            self._kuyruktan_al()
+            if bostu and self._bekleyenler:
+                # Parti süresi boşta geçen zamandan değil, ilk bekleyen satırdan başlar
+                son_gonderim = time.monotonic()
+
+            # Başarısız gönderimden sonra parti dolsa da bekleme süresi dolmadan denenmez
+            dolu = len(self._bekleyenler) >= self.parti_boyutu and not cevrimdisi
+            zamani_geldi = time.monotonic() - son_gonderim >= bekleme
+            if self._bekleyenler and (dolu or zamani_geldi or istekler or self._durdur.is_set()):
+                son_gonderim = time.monotonic()
+                if self._gonder():
+                    bekleme, cevrimdisi = self.aralik, False
+                else:
+                    # Çevrimdışı: giderek seyrelen denemeler
+                    bekleme = min(bekleme * 2, EN_UZUN_BEKLEME_SN) if cevrimdisi else self.aralik
+                    cevrimdisi = True
+            for istek in istekler:
+                istek.set()
+            if self._durdur.is_set():
+                return
+
+    def _kuyruktan_al(self):
+        yeni = []
+        while True:
+            try:
+                yeni.append(self._kuyruk.get_nowait())
+            except queue.Empty:
+                break
+        if yeni:
+            self._bekleyenler.extend(yeni)
+            asan = len(self._bekleyenler) - DOSYA_SINIRI
+            if asan > 0:
+                del self._bekleyenler[:asan]
+                self._say("dusurulen", asan)
+                self._dosyaya_yaz(self._bekleyenler)
+            else:
+                self._dosyaya_ekle(yeni)
+
+    def _gonder(self) -> bool:
+        gonderilen = 0
+        try:
+            ws = veritabani_getir(*LOG_SAYFASI)
+            if not self._baslik_hazir:
+                # Başlık kontrolü süreç başına bir kez (yalnızca ilk satır okunur)
+                if not any(ws.row_values(1)):
+                    ws.append_row(LOG_BASLIKLARI)
+                self._baslik_hazir = True
+            while self._bekleyenler:
+                parti = self._bekleyenler[:self.parti_boyutu]
+                ws.append_rows(parti)
+                del self._bekleyenler[:len(parti)]
+                gonderilen += len(parti)
+                self._say("gonderilen", len(parti))
+            return True
+        except Exception as e:
+            # Loglama hatası programı durdurmamalı
+            self._say("basarisiz_gonderim")
+            logger.warning(f"Log gönderilemedi, {len(self._bekleyenler)} satır bekliyor: {e}")
+            return False
+        finally:
+            # Hiç satır gitmediyse dosya zaten bekleyenlerin tamamını içerir (yeniden yazılmaz)
+            if gonderilen:
+                self._dosyaya_yaz(self._bekleyenler)
+
+    # --- Biriktirme dosyası ---
+    def _dosyadan_oku(self) -> List[List[str]]:
+        satirlar = []
+        try:
+            with open(self.dosya, 'r', encoding='utf-8') as f:
+                for metin in f:
+                    try:
+                        satirlar.append(json.loads(metin))
+                    except ValueError:
+                        continue  # yarım yazılmış son satır
+        except OSError:
+            pass
+        if satirlar:
+            logger.info(f"Önceki oturumdan {len(satirlar)} log satırı gönderilecek.")
+        return satirlar[-DOSYA_SINIRI:]
+
+    def _dosyaya_ekle(self, satirlar: List[List[str]]):
+        try:
+            os.makedirs(os.path.dirname(self.dosya), exist_ok=True)
+            with open(self.dosya, 'a', encoding='utf-8') as f:
+                f.writelines(json.dumps(s, ensure_ascii=False) + "\n" for s in satirlar)
+        except OSError as e:
+            logger.warning(f"Log kuyruk dosyası yazılamadı: {e}")
+
+    def _dosyaya_yaz(self, satirlar: List[List[str]]):
+        try:
+            if not satirlar:
+                if os.path.exists(self.dosya):
+                    os.remove(self.dosya)
+                return
+            gecici = self.dosya + ".tmp"
+            with open(gecici, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(s, ensure_ascii=False) + "\n" for s in satirlar)
+            os.replace(gecici, self.dosya)
+        except OSError as e:
+            logger.warning(f"Log kuyruk dosyası yazılamadı: {e}")
+
+    # --- Boşaltma / kapatma ---
+    def bosalt(self, zaman_asimi: float = 10.0) -> bool:
+        """Bekleyen satırları hemen göndermeye çalışır; hepsi gittiyse True."""
+        if self._thread is None:
+            return True
+        istek = threading.Event()
+        with self._kilit:
+            self._bosaltma_istekleri.append(istek)
+        self._uyandir.set()
+        istek.wait(zaman_asimi)
+        return istek.is_set() and self._kuyruk.empty() and not self._bekleyenler
+
+    def durdur(self, zaman_asimi: float = 5.0):
+        """Son bir gönderim yapıp thread'i durdurur; gönderilemeyenler dosyada kalır."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._durdur.set()
+        self._uyandir.set()
+        self._thread.join(zaman_asimi)
+
+
+log_gonderici = LogGonderici()
+
+
+# =============================================================================
+# 2. MODÜLLERİN KULLANDIĞI ARAYÜZ
+# =============================================================================
 class LogYoneticisi:
     """
     Tüm modüller için merkezi loglama sistemi.
-    İşlemleri arka planda (Thread) yaparak arayüzü dondurmaz.
+    Satırlar tek bir arka plan göndericisiyle partiler halinde yazılır;
+    arayüz hiçbir zaman ağ işlemi beklemez.
     """
-    
+
     @staticmethod
     def log_ekle(modul, islem, detay, kullanici="Sistem"):
         """
         Log kaydı oluşturur.
-        
+
         Parametreler:
         - modul: İşlemin yapıldığı yer (Örn: "Personel", "FHSZ", "RKE", "Cihaz")
         - islem: Yapılan ana işlem (Örn: "Ekleme", "Güncelleme", "Silme", "Hesaplama")
         - detay: İşlemin sözel açıklaması (Örn: "Ahmet, Ayşe'nin soyadını değiştirdi.")
         - kullanici: İşlemi yapan kişi
         """
-        # İşlemi ayrı bir thread'de başlat (UI donmasın)
-        t = threading.Thread(target=LogYoneticisi._log_gonder_thread, args=(modul, islem, detay, kullanici))
-        t.daemon = True # Ana program kapanınca bu da kapansın
-        t.start()
+        # Zaman, gönderim anında değil işlem anında alınır
+        simdi = datetime.now()
+        satir = [simdi.strftime("%d.%m.%Y"), simdi.strftime("%H:%M:%S"),
+                 str(kullanici), str(modul), str(islem), str(detay)]
+        if not log_gonderici.ekle(satir):
+            logger.warning(f"Log kuyruğu dolu, kayıt düşürüldü: {detay}")
+        audit_logger.log(kullanici=str(kullanici), islem_tipi=str(islem), detay=str(detay),
+                         modul=str(modul), zaman=simdi)
 
     @staticmethod
-    def _log_gonder_thread(modul, islem, detay, kullanici):
-        try:
-            # 1. Log sayfasına bağlan
-            ws = veritabani_getir('sabit', 'Loglar') # Sabitler spreadsheet'inde 'Loglar' sayfası
-            
-            # Eğer sayfa yoksa oluşturma mantığı google_baglanti içindedir, 
-            # ancak biz burada başlık kontrolü yapalım.
-            if len(ws.get_all_values()) == 0:
-                ws.append_row(["Tarih", "Saat", "Kullanıcı", "Modül", "İşlem", "Detay"])
-            
-            # 2. Veriyi Hazırla
-            simdi = datetime.now()
-            tarih = simdi.strftime("%d.%m.%Y")
-            saat = simdi.strftime("%H:%M:%S")
-            
-            # 3. Kaydet
-            row = [tarih, saat, kullanici, modul, islem, detay]
-            ws.append_row(row)
-            
-            print(f"LOG KAYDEDİLDİ: {detay}")
-            
-        except Exception as e:
-            # Loglama hatası programı durdurmamalı, sadece konsola yazsın
-            print(f"LOG HATA: {e}")
\ No newline at end of file
+    def istatistik() -> Dict[str, int]:
+        """Gönderici sayaçları (eklenen, gönderilen, düşürülen, geri basınç...)."""
+        return log_gonderici.istatistik()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Türkçe metin normalleştirme ve sıralama yardımcıları.
+Tüm dönüşümler modül yüklenirken bir kez kurulan str.maketrans tablolarıyla
+yapılır; pandas Serileri için .str erişimcisiyle çalışan vektörel
+karşılıkları vardır.
+"""
+from typing import Callable, Iterable, List, Optional
+
+# --- DÖNÜŞÜM TABLOLARI ---
+# str.upper()/lower() Türkçe i/ı harflerini yanlış çevirir ('i' -> 'I', 'İ' -> 'i̇');
+# diğer Türkçe harfler (ç, ğ, ö, ş, ü) doğru çevrildiği için yalnız bu ikisi eşlenir.
+_BUYUK_TABLO = str.maketrans({"i": "İ", "ı": "I"})
+_KUCUK_TABLO = str.maketrans({"I": "ı", "İ": "i"})
+
+# Aramada harf farkı gözetilmez: Türkçe harfler ASCII karşılıklarına katlanır
+_KATLAMA_TABLOSU = str.maketrans({
+    "İ": "i", "I": "i", "ı": "i",
+    "Ç": "c", "ç": "c", "Ğ": "g", "ğ": "g",
+    "Ö": "o", "ö": "o", "Ş": "s", "ş": "s", "Ü": "u", "ü": "u",
+    "Â": "a", "â": "a", "Î": "i", "î": "i", "Û": "u", "û": "u",
+})
+
+# Türk alfabesi sırası (q, w, x yabancı adlar için araya eklendi)
+ALFABE = "abcçdefgğhıijklmnoöpqrsştuüvwxyz"
+# Harfler bu kod noktasından başlayarak sıralı karakterlere eşlenir; rakam,
+# boşluk ve noktalama bunlardan küçük kaldığı için harflerden önce sıralanır
+_SIRA_BASI = 0x3000
+_SIRA_TABLOSU = str.maketrans({
+    **{harf: chr(_SIRA_BASI + i) for i, harf in enumerate(ALFABE)},
+    "â": chr(_SIRA_BASI + ALFABE.index("a")),
+    "î": chr(_SIRA_BASI + ALFABE.index("i")),
+    "û": chr(_SIRA_BASI + ALFABE.index("u")),
+})
+
+
+def _metin(deger) -> str:
+    if deger is None:
+        return ""
+    return deger if isinstance(deger, str) else str(deger)
+
+
+# --- TEKİL DEĞERLER ---
+def tr_upper(text) -> str:
+    """Türkçe karakter destekli büyük harfe çevirme ('istanbul' -> 'İSTANBUL')."""
+    return _metin(text).translate(_BUYUK_TABLO).upper()
+
+
+def tr_lower(text) -> str:
+    """Türkçe karakter destekli küçük harfe çevirme ('IŞIK' -> 'ışık')."""
+    return _metin(text).translate(_KUCUK_TABLO).lower()
+
+
+def katla(metin) -> str:
+    """Aramada büyük/küçük harf ve Türkçe karakter farkını kaldırır ('IŞIK' -> 'isik')."""
+    return str(metin or "").translate(_KATLAMA_TABLOSU).lower()
+
+
+def sirala_anahtari(metin) -> str:
+    """
+    Türk alfabesine göre sıralama anahtarı ('Çelik' 'Cem'den sonra, 'Ilgaz'
+    'İlker'den önce gelir). Büyük/küçük harf farkı gözetilmez.
+    """
+    return tr_lower(metin).translate(_SIRA_TABLOSU)
+
+
+def tr_sirala(degerler: Iterable, key: Optional[Callable] = None, reverse: bool = False) -> List:
+    """Listeyi Türkçe sıralar; `key` verilirse önce o uygulanır (ör. kayıttan ad alanı)."""
+    if key is None:
+        return sorted(degerler, key=sirala_anahtari, reverse=reverse)
+    return sorted(degerler, key=lambda d: sirala_anahtari(key(d)), reverse=reverse)
+
+
+# --- VEKTÖREL (PANDAS) ---
+def _str_seri(seri):
+    return seri.fillna("").astype(str)
+
+
+def tr_upper_seri(seri):
+    """Seri için tr_upper; satır satır Python çağrısı yapılmaz."""
+    return _str_seri(seri).str.translate(_BUYUK_TABLO).str.upper()
+
+
+def tr_lower_seri(seri):
+    return _str_seri(seri).str.translate(_KUCUK_TABLO).str.lower()
+
+
+def katla_seri(seri):
+    return _str_seri(seri).str.translate(_KATLAMA_TABLOSU).str.lower()
+
+
+def sirala_anahtari_seri(seri):
+    """DataFrame.sort_values(..., key=sirala_anahtari_seri) ile Türkçe sıralama için."""
+    return tr_lower_seri(seri).str.translate(_SIRA_TABLOSU)
@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+"""
+HTML -> PDF -> Drive rapor hattı.
+
+Üç aşama ayrı çalışır ve aralarında sınırlı kuyruklar vardır:
+    1. HTML  : şablonlar ayrı bir thread'de üretilir
+    2. PDF   : QTextDocument çizimi süreç havuzunda (offscreen Qt) yapılır
+    3. Yükleme: biten PDF'ler, yeni PDF'ler çizilirken Drive'a gönderilir
+"""
+import os
+import queue
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger("PdfHatti")
+
+# Kullanıcıya sunulan çözünürlük seçenekleri
+RAPOR_KALITELERI = {
+    "Taslak (150 dpi)": 150,
+    "Standart (300 dpi)": 300,
+    "Yüksek (600 dpi)": 600,
+}
+VARSAYILAN_DPI = 300
+# Akışlı raporlarda bir sayfaya denenecek satır sayısı (sığmazsa azaltılır)
+SAYFA_BASINA_SATIR = 40
+
+_BITTI = object()
+
+# =============================================================================
+# 1. PDF ÇİZİMİ (SÜREÇ İÇİ VE HAVUZ)
+# =============================================================================
+def pdf_olustur(html_content, dosya_yolu, dpi=VARSAYILAN_DPI):
+    """HTML içeriğini A4 dikey PDF olarak yazar."""
+    from PySide6.QtCore import QMarginsF
+    from PySide6.QtGui import QTextDocument, QPdfWriter, QPageSize, QPageLayout
+    try:
+        document = QTextDocument()
+        document.setHtml(html_content)
+        writer = QPdfWriter(dosya_yolu)
+        writer.setPageSize(QPageSize(QPageSize.A4))
+        writer.setResolution(dpi)
+        layout = QPageLayout()
+        layout.setPageSize(QPageSize(QPageSize.A4))
+        layout.setOrientation(QPageLayout.Portrait)
+        layout.setMargins(QMarginsF(15, 15, 15, 15))
+        writer.setPageLayout(layout)
+        document.print_(writer)
+        return True
+    except Exception as e:
+        print(f"PDF Hatası: {e}")
+        return False
+
+_surec_uygulamasi = None
+
+def _surec_baslat():
+    """Havuz süreci başlatıcısı: ekransız bir QGuiApplication açar."""
+    global _surec_uygulamasi
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtGui import QGuiApplication
+    _surec_uygulamasi = QGuiApplication.instance() or QGuiApplication([])
+
+def _havuzda_pdf_olustur(icerik, dosya_yolu, dpi):
+    return rapor_pdf_yaz(icerik, dosya_yolu, dpi)
+
+def pdf_havuzu_olustur(surec_sayisi=None):
+    """
+    PDF çizimi için süreç havuzu. Qt, fork sonrası güvenli olmadığından 'spawn' kullanılır.
+    Havuz açılamazsa None döner (çağıran taraf aynı süreçte çizer).
+    """
+    surec_sayisi = surec_sayisi or max(1, min(4, (os.cpu_count() or 2) - 1))
+    try:
+        return ProcessPoolExecutor(max_workers=surec_sayisi,
+                                   mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_surec_baslat)
+    except Exception as e:
+        logger.warning(f"PDF süreç havuzu açılamadı, tek süreçte devam: {e}")
+        return None
+
+# =============================================================================
+# 2. AKIŞLI (SAYFALI) TABLO RAPORU
+# =============================================================================
+class SayfaliRapor:
+    """
+    Büyük tablo raporlarının parçaları. Satırlar (<tr>...</tr>) sayfa sayfa
+    akıtılır; tüm belge hiçbir zaman tek bir HTML metni olarak kurulmaz.
+    Süreç havuzuna gönderilecekse `satirlar` liste olmalıdır.
+    """
+    def __init__(self, css, ust_html, tablo_basi, satirlar, alt_html="", sayfa_basina_satir=SAYFA_BASINA_SATIR):
+        self.css = css
+        self.ust_html = ust_html
+        self.tablo_basi = tablo_basi
+        self.satirlar = satirlar
+        self.alt_html = alt_html
+        self.sayfa_basina_satir = max(1, sayfa_basina_satir)
+
+    def html(self):
+        """Tek parça HTML (önizleme ve eski pdf_olustur uyumluluğu için)."""
+        return self._belge_html(self.ust_html, self.satirlar, self.alt_html)
+
+    def _belge_html(self, ust, satirlar, alt):
+        return "".join((f"<html><head><style>{self.css}</style></head><body>", ust,
+                        "<table>", self.tablo_basi, "<tbody>", "".join(satirlar), "</tbody></table>",
+                        alt, "</body></html>"))
+
+
+def sayfali_pdf_olustur(rapor, dosya_yolu, dpi=VARSAYILAN_DPI, sayfa_bitti=None):
+    """
+    SayfaliRapor'u sayfa sayfa PDF'e yazar. Her sayfada yalnızca o sayfanın
+    satırları yerleşime (layout) girer; bellek satır sayısından bağımsız kalır.
+    Tablo başlığı her sayfada tekrarlanır. sayfa_bitti(sayfa_no) her sayfa yazıldığında çağrılır.
+    """
+    from PySide6.QtCore import QMarginsF
+    from PySide6.QtGui import QTextDocument, QPdfWriter, QPageSize, QPageLayout, QPainter
+    painter = None
+    try:
+        writer = QPdfWriter(dosya_yolu)
+        writer.setResolution(dpi)
+        layout = QPageLayout()
+        layout.setPageSize(QPageSize(QPageSize.A4))
+        layout.setOrientation(QPageLayout.Portrait)
+        layout.setMargins(QMarginsF(15, 15, 15, 15))
+        writer.setPageLayout(layout)
+        alan = writer.pageLayout().paintRectPixels(dpi)
+        genislik, yukseklik = alan.width(), alan.height()
+
+        painter = QPainter(writer)
+        kaynak = iter(rapor.satirlar)
+        bekleyen = deque()
+        kaynak_bitti = False
+        sayfa_no = 0
+
+        def doldur(adet):
+            nonlocal kaynak_bitti
+            while len(bekleyen) < adet and not kaynak_bitti:
+                try:
+                    bekleyen.append(next(kaynak))
+                except StopIteration:
+                    kaynak_bitti = True
+
+        def yerlestir(n, ust):
+            son_sayfa = kaynak_bitti and n == len(bekleyen)
+            doc = QTextDocument()
+            # Yazı ölçüleri PDF çözünürlüğünde hesaplansın
+            doc.documentLayout().setPaintDevice(writer)
+            doc.setDocumentMargin(0)
+            doc.setTextWidth(genislik)
+            doc.setHtml(rapor._belge_html(ust, islice(bekleyen, n), rapor.alt_html if son_sayfa else ""))
+            return doc, son_sayfa, doc.size().height()
+
+        # Sayfaya sığan satır sayısı ilk sayfalarda ölçülür, sonraki sayfalar bu tahminle başlar
+        tahmin = rapor.sayfa_basina_satir
+        while True:
+            doldur(tahmin)
+            ust = rapor.ust_html if sayfa_no == 0 else ""
+            n = min(tahmin, len(bekleyen))
+            doc, son_sayfa, h = yerlestir(n, ust)
+
+            if h > yukseklik:
+                # Taşdı: oranla küçült, sığana kadar (kalanlar sonraki sayfaya)
+                while h > yukseklik and n > 1:
+                    n = max(1, min(n - 1, int(n * yukseklik / h)))
+                    doc, son_sayfa, h = yerlestir(n, ust)
+            elif not son_sayfa:
+                # Boş yer kaldı: daha fazla satırla bir kez dene
+                buyuk = int(n * yukseklik / max(h, 1))
+                if buyuk > n:
+                    doldur(buyuk)
+                    buyuk = min(buyuk, len(bekleyen))
+                    doc2, son2, h2 = yerlestir(buyuk, ust)
+                    if h2 <= yukseklik:
+                        doc, son_sayfa, n = doc2, son2, buyuk
+
+            if sayfa_no:
+                writer.newPage()
+            doc.drawContents(painter)
+            sayfa_no += 1
+            for _ in range(n):
+                bekleyen.popleft()
+            tahmin = max(1, n)
+            if sayfa_bitti:
+                sayfa_bitti(sayfa_no)
+            if son_sayfa:
+                break
+        return True
+    except Exception as e:
+        print(f"PDF Hatası: {e}")
+        return False
+    finally:
+        if painter is not None:
+            painter.end()
+
+
+def rapor_pdf_yaz(icerik, dosya_yolu, dpi=VARSAYILAN_DPI):
+    """İçerik SayfaliRapor ise akışlı, düz HTML ise tek belge olarak yazar."""
+    if isinstance(icerik, SayfaliRapor):
+        return sayfali_pdf_olustur(icerik, dosya_yolu, dpi)
+    return pdf_olustur(icerik, dosya_yolu, dpi)
+
+# =============================================================================
+# 3. HAT
+# =============================================================================
+class RaporHatti:
+    """
+    isler: (dosya_yolu, html_uretici) çiftleri; html_uretici argümansız çağrılıp
+        HTML metni veya SayfaliRapor döndürür.
+    yukleyici_fabrikasi: Her yükleme thread'i için bir kez çağrılır ve
+        `yukle(dosya_yolu) -> link` fonksiyonu döndürür (Drive istemcisi thread'ler arasında paylaşılmaz).
+    ilerleme: ilerleme(asama, tamamlanan, toplam) ; asama: 'html' | 'pdf' | 'yukleme'
+    """
+    ASAMALAR = ("html", "pdf", "yukleme")
+
+    def __init__(self, dpi=VARSAYILAN_DPI, havuz=None, yukleyici_fabrikasi=None,
+                 kuyruk_boyu=4, yukleme_is_parcacigi=2, ilerleme=None, log=None):
+        self.dpi = dpi
+        self.havuz = havuz
+        self.yukleyici_fabrikasi = yukleyici_fabrikasi
+        self.kuyruk_boyu = max(1, kuyruk_boyu)
+        self.yukleme_is_parcacigi = max(1, yukleme_is_parcacigi)
+        self._ilerleme = ilerleme or (lambda asama, tamam, toplam: None)
+        self._log = log or (lambda msg: None)
+        self._durdur = threading.Event()
+        self._sayac_lock = threading.Lock()
+        self._sayaclar = dict.fromkeys(self.ASAMALAR, 0)
+        self.sonuclar = []  # (dosya_yolu, link | None, hata | None)
+
+    def durdur(self):
+        self._durdur.set()
+
+    def _ilerle(self, asama, toplam):
+        with self._sayac_lock:
+            self._sayaclar[asama] += 1
+            tamam = self._sayaclar[asama]
+        self._ilerleme(asama, tamam, toplam)
+
+    def _sonuc_ekle(self, dosya_yolu, link, hata):
+        with self._sayac_lock:
+            self.sonuclar.append((dosya_yolu, link, hata))
+
+    # --- Aşama 1: HTML ---
+    def _html_asamasi(self, isler, html_kuyrugu, toplam):
+        try:
+            for dosya_yolu, html_uretici in isler:
+                if self._durdur.is_set():
+                    break
+                try:
+                    html = html_uretici()
+                except Exception as e:
+                    self._sonuc_ekle(dosya_yolu, None, f"HTML: {e}")
+                    self._log(f"❌ {os.path.basename(dosya_yolu)} HTML hatası: {e}")
+                    continue
+                html_kuyrugu.put((dosya_yolu, html))
+                self._ilerle("html", toplam)
+        finally:
+            html_kuyrugu.put(_BITTI)
+
+    # --- Aşama 3: Yükleme ---
+    def _yukleme_asamasi(self, pdf_kuyrugu, toplam):
+        yukle, kurulum_hatasi = None, None
+        if self.yukleyici_fabrikasi:
+            try:
+                yukle = self.yukleyici_fabrikasi()
+            except Exception as e:
+                # Thread ölmemeli: kuyruk boşaltılmazsa PDF aşaması dolu kuyrukta kilitlenir
+                kurulum_hatasi = f"Yükleme: {e}"
+                logger.error(f"Yükleyici oluşturulamadı: {e}")
+        while True:
+            oge = pdf_kuyrugu.get()
+            if oge is _BITTI:
+                pdf_kuyrugu.put(_BITTI)  # Diğer yükleyiciler de dursun
+                return
+            dosya_yolu = oge
+            link, hata = None, kurulum_hatasi
+            if yukle and not self._durdur.is_set():
+                try:
+                    link = yukle(dosya_yolu)
+                    if link is None:
+                        hata = "Yükleme başarısız"
+                except Exception as e:
+                    hata = f"Yükleme: {e}"
+            self._sonuc_ekle(dosya_yolu, link, hata)
+            self._ilerle("yukleme", toplam)
+            if hata:
+                self._log(f"❌ {os.path.basename(dosya_yolu)} yüklenemedi: {hata}")
+            else:
+                self._log(f"✅ {os.path.basename(dosya_yolu)} yüklendi.")
+
+    # --- Aşama 2: PDF (çağıran thread'de yönetilir) ---
+    def calistir(self, isler):
+        isler = list(isler)
+        toplam = len(isler)
+        html_kuyrugu = queue.Queue(maxsize=self.kuyruk_boyu)
+        pdf_kuyrugu = queue.Queue(maxsize=self.kuyruk_boyu)
+
+        html_thread = threading.Thread(target=self._html_asamasi, args=(isler, html_kuyrugu, toplam), daemon=True)
+        yukleyiciler = [threading.Thread(target=self._yukleme_asamasi, args=(pdf_kuyrugu, toplam), daemon=True)
+                        for _ in range(self.yukleme_is_parcacigi)]
+        html_thread.start()
+        for t in yukleyiciler:
+            t.start()
+
+        try:
+            self._pdf_asamasi(html_kuyrugu, pdf_kuyrugu, toplam)
+        except Exception:
+            self._durdur.set()
+            raise
+        finally:
+            pdf_kuyrugu.put(_BITTI)
+            # Hata durumunda HTML aşaması dolu kuyrukta bekliyor olabilir
+            while html_thread.is_alive():
+                try:
+                    html_kuyrugu.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            html_thread.join()
+            for t in yukleyiciler:
+                t.join()
+        return self.sonuclar
+
+    def _pdf_bitti(self, dosya_yolu, basarili, pdf_kuyrugu, toplam):
+        self._ilerle("pdf", toplam)
+        if basarili:
+            pdf_kuyrugu.put(dosya_yolu)
+        else:
+            self._sonuc_ekle(dosya_yolu, None, "PDF oluşturulamadı")
+            self._log(f"❌ {os.path.basename(dosya_yolu)} PDF oluşturulamadı.")
+
+    def _pdf_asamasi(self, html_kuyrugu, pdf_kuyrugu, toplam):
+        if self.havuz is None:
+            while True:
+                oge = html_kuyrugu.get()
+                if oge is _BITTI:
+                    return
+                dosya_yolu, html = oge
+                if self._durdur.is_set():
+                    continue
+                self._pdf_bitti(dosya_yolu, rapor_pdf_yaz(html, dosya_yolu, self.dpi), pdf_kuyrugu, toplam)
+
+        # Havuzda aynı anda en fazla kuyruk_boyu iş bekletilir (bellek sınırı)
+        bekleyenler = {}
+        html_bitti = False
+        while not html_bitti or bekleyenler:
+            while not html_bitti and len(bekleyenler) < self.kuyruk_boyu:
+                try:
+                    oge = html_kuyrugu.get(timeout=0.05 if bekleyenler else None)
+                except queue.Empty:
+                    break
+                if oge is _BITTI:
+                    html_bitti = True
+                    break
+                dosya_yolu, html = oge
+                if self._durdur.is_set():
+                    continue
+                gelecek = self.havuz.submit(_havuzda_pdf_olustur, html, dosya_yolu, self.dpi)
+                bekleyenler[gelecek] = dosya_yolu
+
+            if not bekleyenler:
+                continue
+            biten, _ = wait(list(bekleyenler), timeout=0.05, return_when=FIRST_COMPLETED)
+            for gelecek in biten:
+                dosya_yolu = bekleyenler.pop(gelecek)
+                try:
+                    basarili = gelecek.result()
+                except Exception as e:
+                    logger.error(f"PDF süreci hatası: {e}")
+                    basarili = False
+                self._pdf_bitti(dosya_yolu, basarili, pdf_kuyrugu, toplam)
@@ -2,11 +2,13 @@
 import os
 from datetime import datetime
 
-try:
-    from docxtpl import DocxTemplate, InlineImage
-    from docx.shared import Mm
-except ImportError:
+from araclar.tembel_yukleme import tembel_modul, modul_var_mi
+
+# docxtpl/python-docx ilk rapor üretiminde yüklenir (personel formu açılışını yavaşlatmaz)
+if not modul_var_mi("docxtpl"):
     print("docx-tpl kütüphanesi eksik.")
+# Şablonlar önbellekte bir kez ayrıştırılır, her belge kopyadan üretilir
+_sablonlar = tembel_modul("araclar.sablon_onbellegi")
 
 class RaporYoneticisi:
     def __init__(self, sablon_klasoru_yolu):
@@ -19,39 +21,46 @@ class RaporYoneticisi:
     def word_olustur(self, sablon_adi, veri_sozlugu, cikti_yolu, resimler=None):
         """
         Word dosyasını oluşturur ve kaydeder.
-        
+
         Args:
             sablon_adi (str): 'ozluk_sablon.docx' gibi.
             veri_sozlugu (dict): {{Degisken}} alanları için veri.
             cikti_yolu (str): Oluşturulacak dosyanın tam yolu.
             resimler (dict): {'Worddeki_Etiket': 'Resim_Dosya_Yolu'} formatında.
-        
+
         Returns:
             bool: Başarılı ise True.
         """
         try:
             tam_sablon_yolu = os.path.join(self.sablon_dir, sablon_adi)
-            
+
             if not os.path.exists(tam_sablon_yolu):
                 raise Exception(f"Şablon bulunamadı: {tam_sablon_yolu}")
 
-            doc = DocxTemplate(tam_sablon_yolu)
-
-            # Resim İşleme
-            if resimler:
-                for etiket, dosya_yolu in resimler.items():
-                    if dosya_yolu and os.path.exists(dosya_yolu):
-                        # Resmi 35mm genişliğe sabitle (İhtiyaca göre parametre yapılabilir)
-                        img_obj = InlineImage(doc, dosya_yolu, width=Mm(35))
-                        veri_sozlugu[etiket] = img_obj
-                    else:
-                        veri_sozlugu[etiket] = "" # Resim yoksa boş bırak
-
-            # Render ve Kayıt
-            doc.render(veri_sozlugu)
-            doc.save(cikti_yolu)
+            # Resimler 35mm genişliğe sabitlenir; dosyası olmayan etiket boş kalır
+            _sablonlar.belge_olustur(tam_sablon_yolu, veri_sozlugu, cikti_yolu, resimler)
             return True
 
         except Exception as e:
             print(f"Rapor oluşturma hatası: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    def toplu_word_olustur(self, sablon_adi, isler, hedef, surec_sayisi=None, ilerleme=None):
+        """
+        Aynı şablondan çok sayıda Word belgesi üretir (örn. bir birimin tüm özlük dosyaları).
+
+        Args:
+            sablon_adi (str): 'personel_ozluk_sablon.docx' gibi.
+            isler (list): (dosya_adi, veri_sozlugu[, resimler]) demetleri.
+            hedef (str): Klasör ya da '.zip' ile biten arşiv yolu.
+            surec_sayisi (int): Süreç havuzu boyutu (1 = aynı süreçte).
+            ilerleme (callable): ilerleme(tamamlanan, toplam)
+
+        Returns:
+            list: Her belge için BelgeSonucu(ad, yol, sure_ms, hata).
+        """
+        tam_sablon_yolu = os.path.join(self.sablon_dir, sablon_adi)
+        if not os.path.exists(tam_sablon_yolu):
+            raise FileNotFoundError(f"Şablon bulunamadı: {tam_sablon_yolu}")
+        return _sablonlar.toplu_olustur(tam_sablon_yolu, isler, hedef,
+                                        surec_sayisi=surec_sayisi, ilerleme=ilerleme)
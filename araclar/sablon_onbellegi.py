@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+"""
+Word (.docx) şablon önbelleği ve toplu belge üretimi.
+
+docxtpl her belgede şablonu yeniden açar, gövde XML'ini düzenli ifadelerle
+temizler (patch_xml) ve Jinja şablonunu yeniden derler; belge başına sürenin
+çoğu buradadır. Önbellekte her şablon bir kez ayrıştırılır:
+    - el değmemiş Document nesnesi bellekte tutulur, her belge için kopyalanır
+    - temizlenmiş XML ve derlenmiş Jinja şablonları şablonla birlikte saklanır
+Şablon dosyası değişirse (değiştirilme zamanı/boyut) yeniden yüklenir.
+
+Toplu üretim işleri süreç havuzuna dağıtır (her süreç kendi önbelleğini
+tutar); çıktılar bir klasöre ya da tek bir .zip dosyasına yazılır ve her
+belgenin süresi ayrıca raporlanır.
+Bu modül docxtpl'i doğrudan yükler; formlar onu tembel_modul ile kullanır.
+"""
+import copy
+import io
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import jinja2
+from docxtpl import DocxTemplate, InlineImage
+from docx.shared import Mm
+
+logger = logging.getLogger("SablonOnbellegi")
+
+VARSAYILAN_RESIM_MM = 35
+ONBELLEK_KAPASITESI = 16  # bellekte tutulan en fazla şablon
+HAVUZ_ESIGI = 8           # bundan az belge aynı süreçte üretilir (süreç açmak daha pahalı)
+
+
+# =============================================================================
+# 1. DERLENMİŞ ŞABLON
+# =============================================================================
+class _DerleyenOrtam(jinja2.Environment):
+    """from_string sonuçlarını kaynak metne göre saklayan Jinja ortamı (şablon başına bir tane)."""
+
+    def __init__(self):
+        super().__init__()
+        self._derlenen: Dict[str, jinja2.Template] = {}
+
+    def from_string(self, source, globals=None, template_class=None):
+        if globals is not None or template_class is not None or not isinstance(source, str):
+            return super().from_string(source, globals, template_class)
+        sablon = self._derlenen.get(source)
+        if sablon is None:
+            sablon = self._derlenen[source] = super().from_string(source)
+        return sablon
+
+
+class DerlenmisSablon:
+    """Bir .docx şablonunun ayrıştırılmış hali; belgeler bunun kopyasından üretilir."""
+
+    def __init__(self, yol: str):
+        self.yol = yol
+        self.imza = _dosya_imzasi(yol)
+        # Bu nesne hiçbir zaman render edilmez, yalnızca kopyalanır
+        self._belge = DocxTemplate(yol).get_docx()
+        self.ortam = _DerleyenOrtam()
+        self._yamalar: Dict[str, str] = {}
+        self._kilit = threading.Lock()
+
+    def kopya(self):
+        with self._kilit:
+            return copy.deepcopy(self._belge)
+
+    def yama(self, kaynak: str, yamala: Callable[[str], str]) -> str:
+        """patch_xml sonucu; aynı XML (gövde, üst/alt bilgi) bir kez temizlenir."""
+        sonuc = self._yamalar.get(kaynak)
+        if sonuc is None:
+            sonuc = self._yamalar[kaynak] = yamala(kaynak)
+        return sonuc
+
+    def yeni_belge(self) -> "OnbellekliSablon":
+        return OnbellekliSablon(self)
+
+
+class OnbellekliSablon(DocxTemplate):
+    """
+    DocxTemplate ile aynı arayüz (render, save, InlineImage...); belgesini
+    dosyadan değil önbellekteki şablonun kopyasından alır.
+    """
+
+    def __init__(self, derlenmis: DerlenmisSablon):
+        super().__init__(derlenmis.yol)
+        self._derlenmis = derlenmis
+
+    def init_docx(self, reload: bool = True):
+        if not self.docx or (self.is_rendered and reload):
+            self.docx = self._derlenmis.kopya()
+            self.is_rendered = False
+
+    def patch_xml(self, src_xml):
+        return self._derlenmis.yama(src_xml, super().patch_xml)
+
+    def render(self, context, jinja_env=None, autoescape=False):
+        # Çağıran kendi ortamını vermediyse derlenmiş şablonları saklayan ortam kullanılır
+        if jinja_env is None and not autoescape:
+            jinja_env = self._derlenmis.ortam
+        super().render(context, jinja_env, autoescape)
+
+
+def _dosya_imzasi(yol: str):
+    bilgi = os.stat(yol)
+    return bilgi.st_mtime_ns, bilgi.st_size
+
+
+# =============================================================================
+# 2. ÖNBELLEK
+# =============================================================================
+class SablonOnbellegi:
+    """Yola göre derlenmiş şablonlar (en son kullanılanlar tutulur)."""
+
+    def __init__(self, kapasite: int = ONBELLEK_KAPASITESI):
+        self.kapasite = kapasite
+        self._sablonlar: "OrderedDict[str, DerlenmisSablon]" = OrderedDict()
+        self._kilit = threading.Lock()
+        self._sayaclar = {"isabet": 0, "yukleme": 0}
+
+    def sablon(self, yol: str) -> DerlenmisSablon:
+        """Derlenmiş şablonu döndürür; ilk kullanımda ya da dosya değiştiyse yükler."""
+        anahtar = os.path.abspath(yol)
+        imza = _dosya_imzasi(anahtar)  # dosya yoksa FileNotFoundError
+        with self._kilit:
+            sablon = self._sablonlar.get(anahtar)
+            if sablon is not None and sablon.imza == imza:
+                self._sablonlar.move_to_end(anahtar)
+                self._sayaclar["isabet"] += 1
+                return sablon
+        # Ayrıştırma kilit dışında yapılır; aynı anda iki kez yüklenirse sonuncusu kalır
+        sablon = DerlenmisSablon(anahtar)
+        with self._kilit:
+            self._sablonlar[anahtar] = sablon
+            self._sablonlar.move_to_end(anahtar)
+            while len(self._sablonlar) > self.kapasite:
+                self._sablonlar.popitem(last=False)
+            self._sayaclar["yukleme"] += 1
+        logger.debug(f"Şablon yüklendi: {os.path.basename(anahtar)}")
+        return sablon
+
+    def temizle(self):
+        with self._kilit:
+            self._sablonlar.clear()
+
+    def istatistik(self) -> Dict[str, int]:
+        with self._kilit:
+            return dict(self._sayaclar, sablon=len(self._sablonlar))
+
+
+sablon_onbellegi = SablonOnbellegi()
+
+
+# =============================================================================
+# 3. TEK BELGE
+# =============================================================================
+def _resim(belge, kaynak, genislik_mm):
+    """Yol ya da bayt olarak verilen resmi InlineImage'a çevirir; yoksa boş bırakır."""
+    if isinstance(kaynak, (bytes, bytearray)):
+        return InlineImage(belge, io.BytesIO(kaynak), width=Mm(genislik_mm))
+    if kaynak and os.path.exists(kaynak):
+        return InlineImage(belge, kaynak, width=Mm(genislik_mm))
+    return ""
+
+
+def belge_olustur(sablon_yolu: str, veri: dict, cikti: Optional[str] = None,
+                  resimler: Optional[dict] = None, resim_genisligi_mm: float = VARSAYILAN_RESIM_MM):
+    """
+    Şablonu önbellekten doldurur.
+    cikti verilirse belge oraya yazılır ve yol döner; verilmezse .docx baytları döner.
+    resimler: {'Worddeki_Etiket': dosya_yolu | bytes}
+    """
+    belge = sablon_onbellegi.sablon(sablon_yolu).yeni_belge()
+    baglam = dict(veri)
+    for etiket, kaynak in (resimler or {}).items():
+        baglam[etiket] = _resim(belge, kaynak, resim_genisligi_mm)
+    belge.render(baglam)
+    if cikti is None:
+        tampon = io.BytesIO()
+        belge.save(tampon)
+        return tampon.getvalue()
+    belge.save(cikti)
+    return cikti
+
+
+# =============================================================================
+# 4. TOPLU ÜRETİM
+# =============================================================================
+class BelgeIsi(NamedTuple):
+    ad: str                        # çıktı dosyasının adı (klasörde ya da arşivde)
+    veri: dict
+    resimler: Optional[dict] = None
+
+
+class BelgeSonucu(NamedTuple):
+    ad: str
+    yol: Optional[str]             # klasöre yazıldıysa dosya yolu, arşivdeyse arşivdeki ad
+    sure_ms: float
+    hata: Optional[str] = None
+
+
+def _dosya_adi(ad: str) -> str:
+    ad = re.sub(r'[\\/:*?"<>|]+', "_", str(ad)).strip() or "belge"
+    return ad if ad.lower().endswith(".docx") else ad + ".docx"
+
+
+def _benzersiz_adlar(adlar: Iterable[str]) -> List[str]:
+    """
+    Aynı ada sahip belgeler birbirinin üzerine yazılmasın diye ada sıra eklenir;
+    eklenen ad da (ör. 'a', 'a', 'a_2') kullanılmışsa boş bir ad bulunana dek artırılır.
+    """
+    sonuc, kullanilan, sayac = [], set(), {}
+    for ad in map(_dosya_adi, adlar):
+        anahtar = ad.lower()
+        if anahtar in kullanilan:
+            kok, uzanti = os.path.splitext(ad)
+            sira = sayac.get(anahtar, 1)
+            while True:
+                sira += 1
+                ad = f"{kok}_{sira}{uzanti}"
+                if ad.lower() not in kullanilan:
+                    break
+            sayac[anahtar] = sira
+        kullanilan.add(ad.lower())
+        sonuc.append(ad)
+    return sonuc
+
+
+def _parca_olustur(sablon_yolu, parca, klasor, hazirlayici, resim_genisligi_mm):
+    """
+    Süreçte (ya da aynı süreçte) bir grup belge üretir.
+    Dönüş: [(BelgeSonucu, bayt | None)]; klasör verildiyse belgeler oraya yazılır.
+    """
+    sonuclar = []
+    for is_ in parca:
+        bas = time.perf_counter()
+        try:
+            veri, resimler = dict(is_.veri), is_.resimler
+            if hazirlayici:
+                veri, ek = hazirlayici(veri)
+                resimler = dict(resimler or {}, **(ek or {}))
+            if klasor:
+                yol = belge_olustur(sablon_yolu, veri, os.path.join(klasor, is_.ad),
+                                    resimler, resim_genisligi_mm)
+                icerik = None
+            else:
+                icerik = belge_olustur(sablon_yolu, veri, None, resimler, resim_genisligi_mm)
+                yol = is_.ad
+            sonuclar.append((BelgeSonucu(is_.ad, yol, (time.perf_counter() - bas) * 1000), icerik))
+        except Exception as e:
+            sonuclar.append((BelgeSonucu(is_.ad, None, (time.perf_counter() - bas) * 1000, str(e)), None))
+    return sonuclar
+
+
+def _surec_baslat(sablon_yolu):
+    """Havuz süreci başlatıcısı: şablon ilk belgeden önce ayrıştırılır."""
+    try:
+        sablon_onbellegi.sablon(sablon_yolu)
+    except Exception as e:
+        logger.warning(f"Şablon süreçte yüklenemedi: {e}")
+
+
+def _havuz_olustur(sablon_yolu, surec_sayisi):
+    """Çocuk süreçlerde fork güvenli olmadığından (Qt) 'spawn' kullanılır; açılamazsa None."""
+    try:
+        return ProcessPoolExecutor(max_workers=surec_sayisi,
+                                   mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_surec_baslat, initargs=(sablon_yolu,))
+    except Exception as e:
+        logger.warning(f"Belge süreç havuzu açılamadı, tek süreçte devam: {e}")
+        return None
+
+
+def toplu_olustur(sablon_yolu: str, isler: Iterable, hedef: str,
+                  surec_sayisi: Optional[int] = None,
+                  hazirlayici: Optional[Callable[[dict], tuple]] = None,
+                  resim_genisligi_mm: float = VARSAYILAN_RESIM_MM,
+                  ilerleme: Optional[Callable[[int, int], None]] = None) -> List[BelgeSonucu]:
+    """
+    Aynı şablondan çok sayıda belge üretir.
+
+    isler: BelgeIsi ya da (ad, veri[, resimler]) demetleri.
+    hedef: '.zip' ile bitiyorsa tüm belgeler tek arşive, değilse bu klasöre yazılır.
+    surec_sayisi: 1 verilirse ya da iş sayısı HAVUZ_ESIGI'nden azsa aynı süreçte çalışır.
+    hazirlayici: veri -> (veri, ek_resimler); her belge için süreçte çağrılır
+        (örn. QR kodu üretimi). Süreçlere gönderileceği için modül düzeyinde tanımlı olmalıdır.
+    ilerleme: ilerleme(tamamlanan, toplam)
+    Dönüş: işlerle aynı sırada BelgeSonucu listesi (süreler ms).
+    """
+    bas = time.perf_counter()
+    isler = [BelgeIsi(*is_) for is_ in isler]
+    isler = [is_._replace(ad=ad) for is_, ad in zip(isler, _benzersiz_adlar(i.ad for i in isler))]
+    toplam = len(isler)
+    if not toplam:
+        return []
+    sablon_yolu = os.path.abspath(sablon_yolu)
+    arsiv = hedef.lower().endswith(".zip")
+    klasor = None if arsiv else hedef
+    os.makedirs(os.path.dirname(os.path.abspath(hedef)) if arsiv else hedef, exist_ok=True)
+
+    surec_sayisi = surec_sayisi or max(1, min(4, (os.cpu_count() or 2) - 1))
+    havuz = _havuz_olustur(sablon_yolu, surec_sayisi) \
+        if surec_sayisi > 1 and toplam >= HAVUZ_ESIGI else None
+    # Süreç başına birkaç parça: yük dengelenir, ilerleme de parça parça gelir
+    parca_sayisi = min(toplam, surec_sayisi * 4) if havuz else min(toplam, 10)
+    boyut = -(-toplam // parca_sayisi)
+    parcalar = [isler[i:i + boyut] for i in range(0, toplam, boyut)]
+
+    sonuclar: Dict[str, BelgeSonucu] = {}
+    zf = zipfile.ZipFile(hedef + ".tmp", "w", zipfile.ZIP_STORED) if arsiv else None
+    try:
+        def topla(parca_sonuclari):
+            for sonuc, icerik in parca_sonuclari:
+                if zf is not None and icerik is not None:
+                    # .docx zaten sıkıştırılmış; arşivde yeniden sıkıştırılmaz
+                    zf.writestr(sonuc.ad, icerik)
+                sonuclar[sonuc.ad] = sonuc
+            if ilerleme:
+                ilerleme(len(sonuclar), toplam)
+
+        if havuz is None:
+            for parca in parcalar:
+                topla(_parca_olustur(sablon_yolu, parca, klasor, hazirlayici, resim_genisligi_mm))
+        else:
+            with havuz:
+                gelecekler = {havuz.submit(_parca_olustur, sablon_yolu, parca, klasor,
+                                           hazirlayici, resim_genisligi_mm): parca for parca in parcalar}
+                kalanlar = []
+                for gelecek in as_completed(gelecekler):
+                    try:
+                        topla(gelecek.result())
+                    except Exception as e:
+                        logger.error(f"Belge süreci hatası: {e}")
+                        kalanlar.append(gelecekler[gelecek])
+            # Süreci çöken parçalar (örn. havuz açılışta bozulduysa) aynı süreçte üretilir
+            for parca in kalanlar:
+                topla(_parca_olustur(sablon_yolu, parca, klasor, hazirlayici, resim_genisligi_mm))
+    except BaseException:
+        if zf is not None:
+            zf.close()
+            os.remove(hedef + ".tmp")
+        raise
+    if zf is not None:
+        # Arşiv tamamlanınca yerine konur; yarım kalan .zip bırakılmaz
+        zf.close()
+        os.replace(hedef + ".tmp", hedef)
+
+    sirali = [sonuclar[is_.ad] for is_ in isler]
+    basarili = [s for s in sirali if not s.hata]
+    sure = (time.perf_counter() - bas) * 1000
+    logger.info(f"{len(basarili)}/{toplam} belge {sure:.0f} ms'de üretildi "
+                f"(belge başına ort. {sum(s.sure_ms for s in basarili) / max(len(basarili), 1):.0f} ms, "
+                f"{'havuz: ' + str(surec_sayisi) + ' süreç' if havuz else 'tek süreç'}).")
+    return sirali
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Liste formlarının ortak tablo modeli.
+Hücre metinleri çizim sırasında hesaplanmaz: her sütunun görüntü dizisi veri
+seti başına bir kez (yükleyici thread'inde ya da sütuna ilk erişimde)
+hazırlanır, data() yalnızca liste indekslemesi yapar. Renk, ipucu gibi
+kayda bağlı roller de sütun dizisi olarak tutulur. Satır ekleme/silme
+modeli yeniden kurmadan, dizileri yerinde güncelleyerek yapılır.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+# ============================================================================
+# 1. ALAN ERİŞİMİ
+# ============================================================================
+
+def alan_degeri(kayit, alan) -> str:
+    """
+    Kayıttan görüntülenecek değer. `alan` sözlük anahtarı, liste indeksi
+    veya kayıt alan bir fonksiyon olabilir.
+    """
+    if callable(alan):
+        deger = alan(kayit)
+    elif isinstance(alan, int):
+        deger = kayit[alan] if len(kayit) > alan else ""
+    else:
+        deger = kayit.get(alan, "")
+    return "" if deger is None else str(deger)
+
+
+def gosterim_sutunlari(df) -> Dict[str, List[str]]:
+    """
+    Sütun adı -> görüntü metinleri (arka plan thread'inde çağrılır).
+    Metinler sütun başına vektörel üretilir; hücre hücre iloc/notna yapılmaz.
+    """
+    if df is None or df.empty:
+        return {}
+    df = df.fillna("")
+    return {str(c): df[c].astype(str).tolist() for c in df.columns}
+
+
+def dataframe_hazirla(df) -> Tuple[List[Dict], Dict[str, List[str]]]:
+    """DataFrame'den modelin kayıt listesi ve hazır sütun metinleri."""
+    if df is None or df.empty:
+        return [], {}
+    return df.fillna("").to_dict('records'), gosterim_sutunlari(df)
+
+
+# ============================================================================
+# 2. MODEL
+# ============================================================================
+
+class KayitModeli(QAbstractTableModel):
+    """
+    Kayıt listesini (sözlük veya liste satırlar) gösteren kaynak model.
+    - sutunlar: (başlık, alan) çiftleri; alan için bkz. `alan_degeri`
+    - hizalama / hizalamalar: tüm sütunlar / sütun bazında metin hizası
+    - rol_ayarla: kayda bağlı roller (renk, ipucu...) sütun dizisi olarak
+    Dizilerle ifade edilemeyen roller (ör. sonradan yüklenen ikonlar) için
+    alt sınıflar `rol_verisi`ni ezer.
+    """
+
+    def __init__(self, sutunlar: Sequence[Tuple[str, Any]], hizalama=None,
+                 hizalamalar: Optional[Dict[int, Any]] = None, parent=None):
+        super().__init__(parent)
+        self._basliklar = [b for b, _ in sutunlar]
+        self._alanlar = [a for _, a in sutunlar]
+        self._hizalama = hizalama
+        self._hizalamalar = dict(hizalamalar or {})
+        self._kayitlar: List = []
+        # Sütun -> görüntü metinleri (None: henüz hesaplanmadı)
+        self._gosterim: List[Optional[List[str]]] = [None] * len(self._alanlar)
+        # (rol, sütun) -> kayıttan değer üreten fonksiyon / hesaplanmış dizi
+        self._rol_fonksiyonlari: Dict[Tuple[int, int], Callable] = {}
+        self._rol_dizileri: Dict[Tuple[int, int], List] = {}
+
+    # --- Veri seti ---
+    def kayitlari_ayarla(self, kayitlar: Sequence, gosterim: Optional[Sequence[List[str]]] = None):
+        """
+        Veri setini değiştirir. `gosterim` verilirse (sütun sırasıyla hazır
+        metin dizileri) hücreler hiç hesaplanmaz.
+        """
+        self.beginResetModel()
+        self._kayitlar = list(kayitlar) if kayitlar is not None else []
+        self._gosterim = list(gosterim) if gosterim is not None else [None] * len(self._alanlar)
+        self._rol_dizileri.clear()
+        self.endResetModel()
+
+    def rol_ayarla(self, role, sutun: int, fonksiyon: Optional[Callable]):
+        """`role` verisi `sutun` için fonksiyon(kayit) ile üretilir (None: kaldır)."""
+        anahtar = (int(role), sutun)
+        self._rol_dizileri.pop(anahtar, None)
+        if fonksiyon is None:
+            self._rol_fonksiyonlari.pop(anahtar, None)
+        else:
+            self._rol_fonksiyonlari[anahtar] = fonksiyon
+
+    @property
+    def kayitlar(self) -> List:
+        return self._kayitlar
+
+    def kayit(self, satir: int):
+        return self._kayitlar[satir]
+
+    def _sutun(self, sutun: int) -> List[str]:
+        dizi = self._gosterim[sutun]
+        if dizi is None:
+            alan = self._alanlar[sutun]
+            dizi = self._gosterim[sutun] = [alan_degeri(k, alan) for k in self._kayitlar]
+        return dizi
+
+    def _rol_dizisi(self, anahtar) -> List:
+        dizi = self._rol_dizileri.get(anahtar)
+        if dizi is None:
+            fonksiyon = self._rol_fonksiyonlari[anahtar]
+            dizi = self._rol_dizileri[anahtar] = [fonksiyon(k) for k in self._kayitlar]
+        return dizi
+
+    def deger(self, satir: int, sutun: int) -> str:
+        return self._sutun(sutun)[satir]
+
+    def sutun_degerleri(self, sutun: int) -> List[str]:
+        return self._sutun(sutun)
+
+    # --- Artımlı değişiklikler ---
+    def satirlari_ekle(self, kayitlar: Sequence, konum: Optional[int] = None):
+        """Kayıtları `konum`a (varsayılan: sona) ekler; mevcut satırlar yeniden hesaplanmaz."""
+        kayitlar = list(kayitlar)
+        if not kayitlar:
+            return
+        konum = len(self._kayitlar) if konum is None else konum
+        self.beginInsertRows(QModelIndex(), konum, konum + len(kayitlar) - 1)
+        self._kayitlar[konum:konum] = kayitlar
+        for sutun, dizi in enumerate(self._gosterim):
+            if dizi is not None:
+                alan = self._alanlar[sutun]
+                dizi[konum:konum] = [alan_degeri(k, alan) for k in kayitlar]
+        for anahtar, dizi in self._rol_dizileri.items():
+            fonksiyon = self._rol_fonksiyonlari[anahtar]
+            dizi[konum:konum] = [fonksiyon(k) for k in kayitlar]
+        self.endInsertRows()
+
+    def satirlari_sil(self, bas: int, adet: int = 1):
+        if adet <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), bas, bas + adet - 1)
+        del self._kayitlar[bas:bas + adet]
+        for dizi in self._gosterim:
+            if dizi is not None:
+                del dizi[bas:bas + adet]
+        for dizi in self._rol_dizileri.values():
+            del dizi[bas:bas + adet]
+        self.endRemoveRows()
+
+    def satir_guncelle(self, satir: int, kayit):
+        """Tek kaydı değiştirir; yalnızca o satırın metinleri yeniden üretilir."""
+        self._kayitlar[satir] = kayit
+        for sutun, dizi in enumerate(self._gosterim):
+            if dizi is not None:
+                dizi[satir] = alan_degeri(kayit, self._alanlar[sutun])
+        for anahtar, dizi in self._rol_dizileri.items():
+            dizi[satir] = self._rol_fonksiyonlari[anahtar](kayit)
+        self.satir_degisti(satir)
+
+    def satir_degisti(self, satir: int, roller: Sequence[int] = ()):
+        """Satır (ya da yalnız `roller`i, ör. ikon) değişti; görünüm yeniden çizer."""
+        self.dataChanged.emit(self.index(satir, 0), self.index(satir, self.columnCount() - 1), list(roller))
+
+    # --- Qt arayüzü ---
+    def rol_verisi(self, satir: int, sutun: int, role):
+        return None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._kayitlar)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._alanlar)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        satir, sutun = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            return self._sutun(sutun)[satir]
+        if role == Qt.UserRole:
+            return self._kayitlar[satir]
+        if role == Qt.TextAlignmentRole:
+            hiza = self._hizalamalar.get(sutun, self._hizalama)
+            if hiza is not None:
+                return hiza
+        anahtar = (int(role), sutun)
+        if anahtar in self._rol_fonksiyonlari:
+            return self._rol_dizisi(anahtar)[satir]
+        return self.rol_verisi(satir, sutun, role)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self._basliklar[section]
+        return None
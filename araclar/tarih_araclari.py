@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+# Sheets'te karşılaşılan tarih biçimleri (öncelik sırasıyla)
+TARIH_FORMATLARI = ("%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y")
+
+# --- TEKİL TARİH ÇÖZÜMLEME ---
+@lru_cache(maxsize=16384)
+def _metin_coz(s: str) -> Optional[date]:
+    # Hızlı yol: 10 karakterlik sabit biçimler strptime'a girmeden çözülür
+    if len(s) == 10:
+        try:
+            if s[2] == '.' and s[5] == '.':
+                return date(int(s[6:]), int(s[3:5]), int(s[:2]))
+            if s[4] == '-' and s[7] == '-':
+                return date(int(s[:4]), int(s[5:7]), int(s[8:]))
+            if s[2] == '/' and s[5] == '/':
+                return date(int(s[6:]), int(s[3:5]), int(s[:2]))
+        except ValueError:
+            pass
+
+    # Yavaş yol: tek haneli gün/ay (1.2.2024) gibi serbest yazımlar
+    for fmt in TARIH_FORMATLARI:
+        try:
+            return datetime.strptime(s, fmt).date()
+        except ValueError:
+            continue
+
+    # Saat içeren değerler ("2024-01-05 00:00:00")
+    if ' ' in s:
+        return _metin_coz(s.split(' ', 1)[0])
+    return None
+
+
+def tarih_coz(deger) -> Optional[date]:
+    """
+    Tarih metnini date nesnesine çevirir. Çözülemezse None döner.
+    Aynı metin tekrar geldiğinde sonuç önbellekten okunur.
+    """
+    if deger is None:
+        return None
+    if isinstance(deger, datetime):
+        return deger.date()
+    if isinstance(deger, date):
+        return deger
+    s = str(deger).strip()
+    if not s:
+        return None
+    return _metin_coz(s)
+
+
+# --- SÜTUN BAZLI (TOPLU) ÇÖZÜMLEME ---
+def tarih_formati_bul(degerler: Iterable, ornek: int = 50) -> Optional[str]:
+    """Sütundaki ilk dolu değerlere bakarak biçimi bir kez tespit eder."""
+    ornekler = []
+    for v in degerler:
+        s = str(v).strip() if v is not None else ""
+        if s and s.lower() not in ("nan", "nat", "none"):
+            ornekler.append(s)
+            if len(ornekler) >= ornek:
+                break
+    if not ornekler:
+        return None
+
+    for fmt in TARIH_FORMATLARI:
+        try:
+            for s in ornekler:
+                datetime.strptime(s, fmt)
+            return fmt
+        except ValueError:
+            continue
+    return None
+
+
+def _gma_coz(s):
+    return date(int(s[6:10]), int(s[3:5]), int(s[:2]))
+
+def _iso_coz(s):
+    return date(int(s[:4]), int(s[5:7]), int(s[8:10]))
+
+# Biçim -> sabit konumlu çözücü (biçim bir kez tespit edildikten sonra kullanılır)
+_BICIM_COZUCULERI = {"%d.%m.%Y": _gma_coz, "%Y-%m-%d": _iso_coz, "%d/%m/%Y": _gma_coz}
+
+
+def _sutun_cozucu(fmt):
+    hizli = _BICIM_COZUCULERI.get(fmt)
+    if not hizli:
+        return tarih_coz
+
+    def coz(v):
+        if isinstance(v, str) and len(v) == 10:
+            try:
+                return hizli(v)
+            except ValueError:
+                pass
+        return tarih_coz(v)
+    return coz
+
+
+def tarih_listesi_coz(degerler) -> List[Optional[date]]:
+    """Bir sütunun tüm değerlerini çözer (boş/hatalı değerler None olur)."""
+    degerler = list(degerler)
+    coz = _sutun_cozucu(tarih_formati_bul(degerler))
+    # Aynı tarih sütunda çok kez tekrarlanır; her farklı değer bir kez çözülür
+    benzersiz = {}
+    sonuc = []
+    for v in degerler:
+        try:
+            d = benzersiz[v]
+        except KeyError:
+            d = benzersiz[v] = coz(v)
+        except TypeError:
+            d = coz(v)
+        sonuc.append(d)
+    return sonuc
+
+
+def tarih_serisi_coz(seri):
+    """
+    pandas Serisi için vektörel çözümleme (datetime64 döner, hatalılar NaT).
+    Biçim sütun başına bir kez tespit edilir; değerler factorize edilip
+    yalnızca farklı olanlar çözülür, sonuç kodlarla geri yayılır.
+    """
+    import pandas as pd
+
+    kodlar, benzersiz = pd.factorize(seri)
+    coz = _sutun_cozucu(tarih_formati_bul(benzersiz))
+    cozulen = pd.to_datetime(pd.Series([coz(v) for v in benzersiz], dtype=object), errors='coerce')
+    sonuc = pd.Series(pd.NaT, index=seri.index, dtype='datetime64[ns]')
+    gecerli = kodlar >= 0
+    if len(cozulen):
+        sonuc[gecerli] = cozulen.to_numpy()[kodlar[gecerli]]
+    return sonuc
+
+
+# --- ÖNBELLEKLİ TABLO TARİHLERİ ---
+def tablo_tarihleri(vt_tipi: str, sayfa_adi: str, sutunlar: Tuple[str, ...],
+                    force_refresh: bool = False) -> Tuple[List[dict], dict]:
+    """
+    Önbellekteki tabloyu ve istenen sütunların çözülmüş tarihlerini döndürür.
+    Çözülmüş sütunlar tabloyla birlikte önbellekte tutulur; tablo değişmedikçe
+    hiçbir form aynı sütunu yeniden çözmez.
+    Dönüş: (kayitlar, {sutun: [date|None, ...]})
+    """
+    from google_baglanti import veritabani_getir_cached
+    from araclar.cache_yonetimi import cache
+
+    kayitlar = veritabani_getir_cached(vt_tipi, sayfa_adi, force_refresh=force_refresh)
+    tarihler = {}
+    for sutun in sutunlar:
+        # Anahtar tablo anahtarını içerir; invalidate_pattern ile birlikte temizlenir
+        anahtar = f"{vt_tipi}:{sayfa_adi}#tarih:{sutun}"
+        onceki = cache.get(anahtar) if cache else None
+        if onceki is not None and onceki[0] is kayitlar:
+            tarihler[sutun] = onceki[1]
+            continue
+        # Sheets başlıklarında kalan boşluklar için gerçek anahtarı bul
+        gercek = next((k for k in kayitlar[0] if str(k).strip() == sutun), sutun) if kayitlar else sutun
+        liste = tarih_listesi_coz(r.get(gercek) for r in kayitlar)
+        if cache:
+            cache.set(anahtar, (kayitlar, liste))
+        tarihler[sutun] = liste
+    return kayitlar, tarihler
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Ağır kütüphaneler için tembel (ilk kullanımda) modül yükleme.
+`gspread = tembel_modul("gspread")` modül düzeyinde hiçbir şey yüklemez;
+modül ilk öznitelik erişiminde (gspread.authorize ...) içe aktarılır.
+Böylece açılışta yalnızca giriş ekranının gerçekten kullandığı modüller
+yüklenir. Yüklemenin bekletmemesi için, ihtiyaç duyulmadan önce arka
+planda önceden yüklenebilirler (arka_planda_yukle).
+"""
+import importlib
+import importlib.util
+import logging
+import sys
+import threading
+import time
+from typing import Iterable
+
+logger = logging.getLogger("TembelYukleme")
+
+# Açılıştan sonra boşta önceden yüklenen, formların ortak kullandığı ağır modüller
+AGIR_MODULLER = (
+    "gspread",
+    "google.oauth2.credentials",
+    "google.auth.transport.requests",
+    "googleapiclient.discovery",
+    "pandas",
+)
+
+
+class TembelModul:
+    """Bir modülün yerine geçer; ilk öznitelik erişiminde gerçek modülü yükler."""
+
+    def __init__(self, ad: str):
+        self._ad = ad
+        self._modul = None
+
+    def _yukle(self):
+        modul = self._modul
+        if modul is None:
+            # import kilidi eşzamanlı ilk erişimlerde modülün bir kez yüklenmesini sağlar
+            modul = self._modul = importlib.import_module(self._ad)
+        return modul
+
+    def __getattr__(self, isim):
+        return getattr(self._yukle(), isim)
+
+    def __dir__(self):
+        return dir(self._yukle())
+
+    def __repr__(self):
+        durum = "yüklü" if self._modul is not None else "yüklenmedi"
+        return f"<TembelModul {self._ad} ({durum})>"
+
+
+def tembel_modul(ad: str) -> TembelModul:
+    return TembelModul(ad)
+
+
+def yuklendi_mi(ad: str) -> bool:
+    return ad in sys.modules
+
+
+def modul_var_mi(ad: str) -> bool:
+    """Modül kurulu mu? İçe aktarmadan (yalnızca yolu arayarak) kontrol eder."""
+    if yuklendi_mi(ad):
+        return True
+    try:
+        return importlib.util.find_spec(ad) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def arka_planda_yukle(modul_adlari: Iterable[str] = AGIR_MODULLER) -> threading.Thread:
+    """
+    Modülleri bir daemon thread'de sırayla içe aktarır. Yükleme bitmeden
+    aynı modülü isteyen kod, yarım modül görmez; import kilidinde bekler.
+    Eksik kütüphaneler yalnızca loglanır.
+    """
+    adlar = [ad for ad in modul_adlari if not yuklendi_mi(ad)]
+
+    def _calis():
+        for ad in adlar:
+            bas = time.perf_counter()
+            try:
+                importlib.import_module(ad)
+                logger.debug(f"Önceden yüklendi: {ad} ({(time.perf_counter() - bas) * 1000:.0f} ms)")
+            except (Exception, SystemExit) as e:
+                # Bazı formlar eksik bağımlılıkta sys.exit çağırır; yalnız bu thread'i bitirmesin
+                logger.warning(f"Modül önceden yüklenemedi ({ad}): {e}")
+
+    thread = threading.Thread(target=_calis, name="OnYukleme", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Google Sheets toplu hücre yazımı.
+Dağınık hücre güncellemeleri bitişik aralıklara birleştirilir ve tek bir
+batch_update isteğiyle gönderilir. Sütun harfleri Z'den sonra da (AA, AB, ...)
+doğru hesaplanır.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger("TopluYazici")
+
+# ============================================================================
+# 1. A1 ADRESLEME
+# ============================================================================
+
+def sutun_harfi(sutun: int) -> str:
+    """1 tabanlı sütun numarasını harfe çevirir (1 -> A, 26 -> Z, 27 -> AA, 703 -> AAA)."""
+    if sutun < 1:
+        raise ValueError(f"Geçersiz sütun numarası: {sutun}")
+    harfler = []
+    while sutun:
+        sutun, kalan = divmod(sutun - 1, 26)
+        harfler.append(chr(65 + kalan))
+    return "".join(reversed(harfler))
+
+
+def a1_araligi(satir: int, bas_sutun: int, bit_sutun: Optional[int] = None,
+               bit_satir: Optional[int] = None) -> str:
+    """Hücre ya da dikdörtgen aralık adresi (örn. 'C5' veya 'A2:AB2')."""
+    bit_sutun = bit_sutun or bas_sutun
+    bit_satir = bit_satir or satir
+    bas = f"{sutun_harfi(bas_sutun)}{satir}"
+    if bit_sutun == bas_sutun and bit_satir == satir:
+        return bas
+    return f"{bas}:{sutun_harfi(bit_sutun)}{bit_satir}"
+
+
+# ============================================================================
+# 2. HÜCRE BİRLEŞTİRME
+# ============================================================================
+
+def araliklari_birlestir(hucreler: Dict[Tuple[int, int], Any]) -> List[Dict]:
+    """
+    {(satir, sutun): deger} sözlüğünü batch_update veri listesine çevirir.
+    Önce aynı satırdaki bitişik sütunlar tek şeride, sonra aynı sütun
+    aralığını kapsayan ardışık satırların şeritleri tek bloğa birleşir.
+    """
+    satirlar: Dict[int, Dict[int, Any]] = {}
+    for (satir, sutun), deger in hucreler.items():
+        satirlar.setdefault(satir, {})[sutun] = deger
+
+    bloklar = []  # [bas_sutun, bit_sutun, bas_satir, bit_satir, degerler]
+    acik = {}     # (bas_sutun, bit_sutun) -> son satırda kalan blok
+    for satir in sorted(satirlar):
+        sutunlar = satirlar[satir]
+        sirali = sorted(sutunlar)
+        seritler = []
+        bas = onceki = sirali[0]
+        for sutun in sirali[1:]:
+            if sutun != onceki + 1:
+                seritler.append((bas, onceki))
+                bas = sutun
+            onceki = sutun
+        seritler.append((bas, onceki))
+
+        for bas, bit in seritler:
+            degerler = [sutunlar[s] for s in range(bas, bit + 1)]
+            blok = acik.get((bas, bit))
+            if blok and blok[3] == satir - 1:
+                blok[3] = satir
+                blok[4].append(degerler)
+            else:
+                blok = [bas, bit, satir, satir, [degerler]]
+                bloklar.append(blok)
+                acik[(bas, bit)] = blok
+
+    return [{'range': a1_araligi(bas_satir, bas, bit, bit_satir), 'values': degerler}
+            for bas, bit, bas_satir, bit_satir, degerler in bloklar]
+
+
+# ============================================================================
+# 3. TOPLU YAZICI
+# ============================================================================
+
+class TopluYazici:
+    """
+    Bir çalışma sayfasına yapılacak hücre güncellemelerini biriktirir.
+    Satır numaraları anahtar sütunun karma indeksinden bulunur (sütun bir kez
+    okunur); gonder() bütün güncellemeleri tek batch_update isteğiyle yazar.
+    """
+
+    def __init__(self, ws, anahtar_sutun: Optional[str] = None, basliklar: Optional[List[str]] = None):
+        self.ws = ws
+        if basliklar is None:
+            basliklar = ws.row_values(1)
+        self.sutunlar = {str(h).strip(): i + 1 for i, h in enumerate(basliklar)}
+        self.anahtar_sutun = anahtar_sutun
+        self._satir_indeksi: Optional[Dict[str, int]] = None
+        self._hucreler: Dict[Tuple[int, int], Any] = {}
+
+    def __len__(self):
+        return len(self._hucreler)
+
+    def sutun_no(self, sutun: Union[str, int]) -> Optional[int]:
+        """Başlık adını 1 tabanlı sütun numarasına çevirir; sayfada yoksa None."""
+        if isinstance(sutun, int):
+            return sutun
+        return self.sutunlar.get(str(sutun).strip())
+
+    def satir_bul(self, anahtar) -> Optional[int]:
+        """Anahtar sütunda değeri `anahtar` olan ilk satırın numarası."""
+        if self._satir_indeksi is None:
+            no = self.sutun_no(self.anahtar_sutun) if self.anahtar_sutun else None
+            if not no:
+                raise ValueError(f"Anahtar sütun bulunamadı: {self.anahtar_sutun}")
+            indeks = {}
+            for satir, deger in enumerate(self.ws.col_values(no)[1:], start=2):
+                indeks.setdefault(str(deger).strip(), satir)
+            self._satir_indeksi = indeks
+        return self._satir_indeksi.get(str(anahtar).strip())
+
+    def hucre(self, satir: int, sutun: Union[str, int], deger) -> bool:
+        """Tek hücre ekler. Sütun sayfada yoksa False döner."""
+        no = self.sutun_no(sutun)
+        if not no:
+            return False
+        self._hucreler[(satir, no)] = deger
+        return True
+
+    def satir_guncelle(self, anahtar, degerler: Dict[str, Any]) -> Optional[int]:
+        """Anahtarın satırındaki sütunları günceller. Satır bulunamazsa None döner."""
+        satir = self.satir_bul(anahtar)
+        if not satir:
+            return None
+        for sutun, deger in degerler.items():
+            self.hucre(satir, sutun, deger)
+        return satir
+
+    def satir_yaz(self, satir: int, degerler: Sequence, bas_sutun: int = 1):
+        """Satırın `bas_sutun`dan başlayan hücrelerini sırayla yazar."""
+        for i, deger in enumerate(degerler):
+            self._hucreler[(satir, bas_sutun + i)] = deger
+
+    def istekler(self) -> List[Dict]:
+        return araliklari_birlestir(self._hucreler)
+
+    def gonder(self, **kwargs) -> int:
+        """Biriken hücreleri tek istekle yazar; gönderilen aralık sayısını döndürür."""
+        veri = self.istekler()
+        if veri:
+            self.ws.batch_update(veri, **kwargs)
+            logger.info(f"{len(self._hucreler)} hücre {len(veri)} aralıkta yazıldı.")
+        self._hucreler.clear()
+        return len(veri)
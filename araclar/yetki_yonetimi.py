@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
 import sys
 import os
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # --- YOL AYARLARI ---
 # Bu dosya 'araclar' klasöründe olduğu için kök dizini buluyoruz
@@ -10,100 +15,226 @@ if root_dir not in sys.path:
     sys.path.append(root_dir)
 
 try:
-    from google_baglanti import veritabani_getir
+    from google_baglanti import veritabani_getir, spreadsheet_getir
 except ImportError:
     print("HATA: google_baglanti modülü bulunamadı.")
     def veritabani_getir(t, s): return None
+    def spreadsheet_getir(t): return None
+
+from PySide6.QtGui import QAction
+from PySide6.QtWidgets import QWidget
+
+logger = logging.getLogger("YetkiYoneticisi")
+
+# Son indirilen kurallar ve sürüm damgası (sayfanın Drive 'modifiedTime' değeri)
+YETKI_ONBELLEK_DOSYASI = os.path.join(root_dir, "temp", "yetki_kurallari.json")
+GECERLI_ISLEMLER = ("GIZLE", "PASIF")
+
+# Derlenmiş kural: (oge_adi, islem); bir (rol, form) için değişmez demet
+Kural = Tuple[str, str]
+
+
+def kurallari_derle(satirlar: Iterable[Dict]) -> Dict[Tuple[str, str], Tuple[Kural, ...]]:
+    """
+    Rol_Yetkileri satırlarını (Rol | Form_Kodu | Oge_Adi | Islem) rol ve
+    form bazında sıralı, tekrarsız kural demetlerine çevirir.
+    """
+    gruplar: Dict[Tuple[str, str], Dict[str, str]] = {}
+    for row in satirlar:
+        rol = str(row.get('Rol', '')).strip()
+        form_kodu = str(row.get('Form_Kodu', '')).strip()
+        oge_adi = str(row.get('Oge_Adi', '')).strip()
+        islem = str(row.get('Islem', '')).strip().upper()
+        if not rol or not form_kodu or not oge_adi or islem not in GECERLI_ISLEMLER:
+            continue
+        # Aynı öğe için son satır geçerli (eski sözlük davranışı)
+        gruplar.setdefault((rol, form_kodu), {})[oge_adi] = islem
+    return {anahtar: tuple(sorted(ogeler.items())) for anahtar, ogeler in gruplar.items()}
+
 
 class YetkiYoneticisi:
     """
-    Kullanıcı rollerine göre formlardaki nesneleri (buton, menü vb.) 
+    Kullanıcı rollerine göre formlardaki nesneleri (buton, menü vb.)
     gizleyen veya pasif yapan merkezi sınıf.
+
+    Kurallar diskte sürüm damgasıyla saklanır. Damga değişmediyse sayfa
+    hiç indirilmez; değiştiyse indirilen satırlardan yalnızca değişen
+    (rol, form) kural demetleri yeniden derlenir.
     """
-    
-    # Hafızada tutulacak yetki haritası
-    # Yapı: { 'form_kodu': { 'btn_adi': 'GIZLE', 'menu_adi': 'PASIF' } }
-    _yetki_cache = {} 
+
+    # Aktif rolün kuralları. Yapı: { 'form_kodu': (('btn_adi', 'GIZLE'), ('menu_adi', 'PASIF')) }
+    _yetki_cache: Dict[str, Tuple[Kural, ...]] = {}
     _aktif_rol = "viewer"
 
+    # Tüm roller: (rol, form_kodu) -> kurallar
+    _kurallar: Dict[Tuple[str, str], Tuple[Kural, ...]] = {}
+    _surum: Optional[str] = None
+    _hazir = False
+    _lock = threading.RLock()
+
+    # --- Kuralların hazırlanması ---
     @staticmethod
-    def yetkileri_yukle(aktif_rol):
+    def _uzak_surum() -> Optional[str]:
+        sh = spreadsheet_getir('sabit')
+        return sh.get_lastUpdateTime() if sh is not None else None
+
+    @staticmethod
+    def _diskten_yukle(dosya: str = None) -> bool:
+        dosya = dosya or YETKI_ONBELLEK_DOSYASI
+        try:
+            with open(dosya, 'r', encoding='utf-8') as f:
+                veri = json.load(f)
+            satirlar = [dict(zip(('Rol', 'Form_Kodu', 'Oge_Adi', 'Islem'), s)) for s in veri.get("kurallar", [])]
+        except (OSError, ValueError, TypeError) as e:
+            logger.debug(f"Yetki önbelleği okunamadı: {e}")
+            return False
+        YetkiYoneticisi._kurallar = kurallari_derle(satirlar)
+        YetkiYoneticisi._surum = veri.get("surum")
+        return True
+
+    @staticmethod
+    def _diske_yaz(dosya: str = None):
+        dosya = dosya or YETKI_ONBELLEK_DOSYASI
+        veri = {
+            "surum": YetkiYoneticisi._surum,
+            "kayit_tarihi": datetime.now().isoformat(timespec='seconds'),
+            "kurallar": [[rol, form_kodu, oge, islem]
+                         for (rol, form_kodu), kurallar in sorted(YetkiYoneticisi._kurallar.items())
+                         for oge, islem in kurallar],
+        }
+        try:
+            os.makedirs(os.path.dirname(dosya), exist_ok=True)
+            gecici = dosya + ".tmp"
+            with open(gecici, 'w', encoding='utf-8') as f:
+                json.dump(veri, f, ensure_ascii=False)
+            os.replace(gecici, dosya)
+        except OSError as e:
+            logger.warning(f"Yetki önbelleği yazılamadı: {e}")
+
+    @staticmethod
+    def kurallari_guncelle(satirlar: List[Dict], surum: Optional[str]) -> List[Tuple[str, str]]:
         """
-        Login işlemi sonrası çağrılır. Veritabanından o role ait kısıtlamaları çeker.
+        İndirilen satırları mevcut kurallarla karşılaştırır; yalnızca değişen
+        (rol, form) demetleri değiştirilir. Değişen anahtarları döndürür.
         """
-        YetkiYoneticisi._aktif_rol = aktif_rol
-        YetkiYoneticisi._yetki_cache = {}
+        yeni = kurallari_derle(satirlar)
+        with YetkiYoneticisi._lock:
+            eski = YetkiYoneticisi._kurallar
+            degisenler = [k for k in set(eski) | set(yeni) if eski.get(k) != yeni.get(k)]
+            if degisenler:
+                kurallar = dict(eski)
+                for anahtar in degisenler:
+                    if anahtar in yeni:
+                        kurallar[anahtar] = yeni[anahtar]
+                    else:
+                        kurallar.pop(anahtar, None)
+                YetkiYoneticisi._kurallar = kurallar
+            YetkiYoneticisi._surum = surum
+            YetkiYoneticisi._hazir = True
+        return sorted(degisenler)
 
-        print(f"Yetkiler yükleniyor... Rol: {aktif_rol}")
+    @staticmethod
+    def kurallari_hazirla(zorla: bool = False) -> List[Tuple[str, str]]:
+        """
+        Kuralları diskten yükler ve sayfanın sürüm damgasını kontrol eder;
+        damga değiştiyse (ya da `zorla`) sayfayı indirip günceller.
+        Açılış hazırlığı bunu giriş ekranındayken çağırır. Değişen
+        (rol, form) anahtarlarını döndürür.
+        """
+        with YetkiYoneticisi._lock:
+            if YetkiYoneticisi._hazir and not zorla:
+                return []
+            if not YetkiYoneticisi._kurallar and YetkiYoneticisi._surum is None:
+                YetkiYoneticisi._diskten_yukle()
 
-        try:
-            # Sabitler veritabanındaki 'Rol_Yetkileri' sayfasına bağlan
-            ws = veritabani_getir('sabit', 'Rol_Yetkileri')
-            
-            if not ws:
-                print("UYARI: 'Rol_Yetkileri' sayfasına erişilemedi veya sayfa yok.")
-                return
-
-            records = ws.get_all_records()
-            
-            count = 0
-            for row in records:
-                # Veritabanı Sütunları: Rol | Form_Kodu | Oge_Adi | Islem
-                db_rol = str(row.get('Rol', '')).strip()
-                
-                # Sadece şu anki kullanıcının rolüne ait kuralları al
-                if db_rol == aktif_rol:
-                    form_kodu = str(row.get('Form_Kodu', '')).strip()
-                    oge_adi = str(row.get('Oge_Adi', '')).strip()
-                    islem = str(row.get('Islem', '')).strip().upper() # GIZLE / PASIF
-                    
-                    if not form_kodu or not oge_adi:
-                        continue
-
-                    # Cache sözlüğünü hazırla
-                    if form_kodu not in YetkiYoneticisi._yetki_cache:
-                        YetkiYoneticisi._yetki_cache[form_kodu] = {}
-                    
-                    YetkiYoneticisi._yetki_cache[form_kodu][oge_adi] = islem
-                    count += 1
-            
-            print(f"-> {count} adet kısıtlama kuralı yüklendi.")
-
-        except Exception as e:
-            print(f"Yetki yükleme sırasında hata: {e}")
+            try:
+                surum = YetkiYoneticisi._uzak_surum()
+                if not zorla and surum is not None and surum == YetkiYoneticisi._surum:
+                    YetkiYoneticisi._hazir = True
+                    logger.info(f"Yetki kuralları güncel (sürüm {surum}), sayfa indirilmedi.")
+                    return []
+
+                # Sabitler veritabanındaki 'Rol_Yetkileri' sayfasına bağlan
+                ws = veritabani_getir('sabit', 'Rol_Yetkileri')
+                if not ws:
+                    logger.warning("'Rol_Yetkileri' sayfasına erişilemedi veya sayfa yok.")
+                    return []
+                degisenler = YetkiYoneticisi.kurallari_guncelle(ws.get_all_records(), surum)
+            except Exception as e:
+                # Çevrimdışı: diskteki son kurallarla devam edilir
+                logger.warning(f"Yetki kuralları güncellenemedi, önbellek kullanılıyor: {e}")
+                YetkiYoneticisi._hazir = bool(YetkiYoneticisi._kurallar)
+                return []
+
+            YetkiYoneticisi._diske_yaz()
+            logger.info(f"Yetki kuralları güncellendi: {len(degisenler)} (rol, form) değişti.")
+            return degisenler
+
+    @staticmethod
+    def yenile() -> List[Tuple[str, str]]:
+        """Sürüm damgasını yeniden kontrol eder; aktif rolün kurallarını tazeler."""
+        with YetkiYoneticisi._lock:
+            YetkiYoneticisi._hazir = False
+        degisenler = YetkiYoneticisi.kurallari_hazirla()
+        YetkiYoneticisi._aktif_rolu_ayarla(YetkiYoneticisi._aktif_rol)
+        return degisenler
+
+    @staticmethod
+    def _aktif_rolu_ayarla(aktif_rol):
+        with YetkiYoneticisi._lock:
+            YetkiYoneticisi._aktif_rol = aktif_rol
+            YetkiYoneticisi._yetki_cache = {
+                form_kodu: kurallar
+                for (rol, form_kodu), kurallar in YetkiYoneticisi._kurallar.items() if rol == aktif_rol
+            }
+
+    @staticmethod
+    def yetkileri_yukle(aktif_rol):
+        """
+        Login işlemi sonrası çağrılır. O role ait kısıtlamaları hazırlanmış
+        kural indeksinden seçer (indirme, açılış hazırlığında yapılmış olur).
+        """
+        YetkiYoneticisi.kurallari_hazirla()
+        YetkiYoneticisi._aktif_rolu_ayarla(aktif_rol)
+        adet = sum(len(k) for k in YetkiYoneticisi._yetki_cache.values())
+        logger.info(f"Rol '{aktif_rol}' için {adet} adet kısıtlama kuralı yüklendi.")
+
+    # --- Uygulama ---
+    @staticmethod
+    def _oge_haritasi(form_instance) -> Dict[str, object]:
+        """Formun widget/aksiyon öznitelikleri: ad -> nesne (tek geçişte)."""
+        return {ad: deger for ad, deger in vars(form_instance).items()
+                if isinstance(deger, (QWidget, QAction))}
 
     @staticmethod
     def uygula(form_instance, form_kodu):
         """
         Bir forma (pencereye) yetki kurallarını uygular.
         Formun __init__ veya setup_ui metodunun sonunda çağrılmalıdır.
-        
+
         Args:
             form_instance (self): Formun kendisi (QWidget)
             form_kodu (str): Veritabanındaki 'Form_Kodu' (örn: 'personel_listesi')
         """
         # Eğer bu form için hiç kural yoksa çık
-        if form_kodu not in YetkiYoneticisi._yetki_cache:
-            return 
-
-        kurallar = YetkiYoneticisi._yetki_cache[form_kodu]
-
-        for oge_adi, islem in kurallar.items():
-            # Formun içinde bu isme sahip bir widget var mı?
-            if hasattr(form_instance, oge_adi):
-                widget = getattr(form_instance, oge_adi)
-                
-                try:
-                    if islem == 'GIZLE':
-                        widget.setVisible(False)
-                        print(f"Yetki: {form_kodu} -> {oge_adi} GİZLENDİ.")
-                        
-                    elif islem == 'PASIF':
-                        widget.setEnabled(False)
-                        print(f"Yetki: {form_kodu} -> {oge_adi} PASİF YAPILDI.")
-                        
-                except Exception as e:
-                    print(f"Hata: {oge_adi} üzerinde işlem yapılamadı. ({e})")
-            else:
+        kurallar = YetkiYoneticisi._yetki_cache.get(form_kodu)
+        if not kurallar:
+            return
+
+        harita = YetkiYoneticisi._oge_haritasi(form_instance)
+        for oge_adi, islem in kurallar:
+            widget = harita.get(oge_adi)
+            if widget is None and isinstance(form_instance, QWidget):
+                # Öznitelik değilse objectName ile ara
+                widget = form_instance.findChild(QWidget, oge_adi)
+            if widget is None:
                 # Geliştirici için uyarı (Widget ismini yanlış yazmış olabilirsiniz)
-                print(f"UYARI: {form_kodu} formunda '{oge_adi}' isimli bir nesne bulunamadı.")
\ No newline at end of file
+                logger.debug(f"{form_kodu} formunda '{oge_adi}' isimli bir nesne bulunamadı.")
+                continue
+            try:
+                if islem == 'GIZLE':
+                    widget.setVisible(False)
+                else:
+                    widget.setEnabled(False)
+            except Exception as e:
+                logger.warning(f"Hata: {oge_adi} üzerinde işlem yapılamadı. ({e})")
@@ -1,12 +1,31 @@
 # -*- coding: utf-8 -*-
+"""
+Yıl sonu izin devri.
+Çalışma dört adımdan oluşur:
+  1. izin_bilgi sayfasının tamamı yerel bir anlık görüntüye yazılır
+     (temp/yil_sonu/<kimlik>.json); yazımlar bu görüntüye göre yapılır.
+  2. Yeni bakiyeler pandas ile vektörel hesaplanır ve yalnızca değişen
+     hücrelerden oluşan bir fark listesi çıkarılır (önizleme = deneme çalışması).
+  3. Farklar satır parçaları halinde, parça başına tek batch_update ile yazılır;
+     her parçadan sonra kontrol noktası (<kimlik>.durum.json) güncellenir.
+  4. Yarıda kalan çalışma kaldığı parçadan devam ettirilebilir ya da görüntüdeki
+     eski değerler geri yazılarak geri alınabilir.
+Yazmadan önce sayfa bir kez okunur: görüntüden sonra elle değiştirilmiş
+satırlar çakışma olarak raporlanır ve üzerine yazılmaz.
+Görüntü hücrelerin biçimlenmemiş değerlerini ve formüllerini tutar; geri alma
+sayıları metin olarak değil sayı olarak, formülleri de formül olarak geri yazar.
+"""
 import sys
 import os
-import time
-from datetime import datetime
+import glob
+import json
+import logging
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Tuple
 
 # PySide6 Kütüphaneleri
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QTextEdit, 
-                               QProgressBar, QLabel, QMessageBox, QCheckBox, 
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTextEdit,
+                               QProgressBar, QLabel, QMessageBox, QCheckBox,
                                QGroupBox, QApplication)
 from PySide6.QtCore import Qt, QThread, Signal
 
@@ -18,148 +37,468 @@ if root_dir not in sys.path:
 
 try:
     from google_baglanti import veritabani_getir, InternetBaglantiHatasi
+    from araclar.tarih_araclari import tarih_serisi_coz
+    from araclar.toplu_yazici import araliklari_birlestir
+    from araclar.cache_yonetimi import cache
+    from araclar.log_yonetimi import LogYoneticisi
 except ImportError:
     print("Google bağlantı modülü bulunamadı!")
 
+logger = logging.getLogger("YilSonuDevir")
+
+DEVIR_DIZINI = os.path.join(root_dir, "temp", "yil_sonu")
+PARCA_SATIR = 100  # bir batch_update isteğindeki en fazla satır
+# Hesap biçimlenmemiş değerlerle yapılır; görüntü formülleri de saklar ve geri
+# yazımda Sheets değerleri kullanıcı girmiş gibi yorumlar (sayı sayı, formül formül kalır)
+HESAP_OKUMA = 'UNFORMATTED_VALUE'
+GORUNTU_OKUMA = 'FORMULA'
+YAZMA_SECENEGI = 'USER_ENTERED'
+
+# izin_bilgi sütunları
+TC = "TC_Kimlik"
+DEVIR, HAKEDIS, TOPLAM, KULLANILAN, KALAN = (
+    "Yillik_Devir", "Yillik_Hakedis", "Yillik_Toplam_Hak", "Yillik_Kullanilan", "Yillik_Kalan")
+SUA_HAK, SUA_KULLANILAN, SUA_KALAN, SUA_CARI = (
+    "Sua_Kullanilabilir_Hak", "Sua_Kullanilan", "Sua_Kalan", "Sua_Cari_Yil_Kazanim")
+ZORUNLU_SUTUNLAR = (TC, DEVIR, HAKEDIS, SUA_HAK, SUA_CARI)
+# Personel sütunları
+P_TC, P_BASLAMA = "Kimlik_No", "Baslama_Tarihi"
+
+
+class DevirHatasi(Exception):
+    """Devir planı oluşturulamadığında ya da uygulanamadığında."""
+
+
+class DevirCakismasi(DevirHatasi):
+    """Görüntü alındıktan sonra sayfada elle değiştirilmiş satırlar var."""
+
+    def __init__(self, cakismalar: List[Tuple[int, str, str]]):
+        self.cakismalar = cakismalar  # (satir, tc, sebep)
+        super().__init__(f"{len(cakismalar)} satır görüntüden sonra değiştirilmiş.")
+
+
+# =============================================================================
+# 1. HESAPLAMA (VEKTÖREL)
+# =============================================================================
+def _sayi_serisi(seri):
+    """Sayfa metinlerini tam sayıya çevirir ('12,5' -> 12; boş/hatalı -> 0)."""
+    import pandas as pd
+    metin = seri.astype(str).str.strip().str.replace(',', '.', regex=False)
+    return pd.to_numeric(metin, errors='coerce').fillna(0).astype(float).astype(int)
+
+
+def hizmet_yili_serisi(baslama, bugun: date):
+    """Başlama tarihlerinden tamamlanmış hizmet yılı (tarih yoksa 0)."""
+    tarihler = tarih_serisi_coz(baslama)
+    dolmadi = (tarihler.dt.month > bugun.month) | (
+        (tarihler.dt.month == bugun.month) & (tarihler.dt.day > bugun.day))
+    yil = bugun.year - tarihler.dt.year - dolmadi.astype(int)
+    return yil.fillna(0).astype(int)
+
+
+def devir_hesapla(izin, personel, bugun: date):
+    """
+    izin_bilgi ve Personel DataFrame'lerinden yeni bakiyeleri hesaplar.
+    Dönüş: izin ile aynı indeksli, yalnızca Personel'de bulunan satırları
+    içeren yeni değerler DataFrame'i (sütunlar izin_bilgi'de olanlarla sınırlı).
+
+    Kurallar:
+    - Yıllık: devir = min(kalan, eski hakediş); hakediş hizmet yılına göre
+      (10+ yıl 30, 1-9 yıl 20, aksi 0); toplam = kalan = devir + hakediş; kullanılan = 0
+    - Şua: cari yıl kazanımı kullanılabilir hak ve kalan olur; kullanılan ve cari = 0
+    """
+    import numpy as np
+    import pandas as pd
+
+    tc = izin[TC].astype(str).str.strip()
+    p_tc = personel[P_TC].astype(str).str.strip() if P_TC in personel else pd.Series(dtype=str)
+    baslama_kaynak = personel[P_BASLAMA] if P_BASLAMA in personel else pd.Series("", index=personel.index)
+    # Aynı TC birden fazla kez varsa son satır geçerli
+    baslama = pd.Series(baslama_kaynak.to_numpy(), index=p_tc.to_numpy())
+    baslama = baslama[~baslama.index.duplicated(keep='last')]
+
+    secili = tc.isin(baslama.index)
+    izin, tc = izin[secili], tc[secili]
+    hizmet = hizmet_yili_serisi(baslama.reindex(tc.to_numpy()).reset_index(drop=True), bugun)
+    hizmet.index = izin.index
+
+    def sutun(ad):
+        return _sayi_serisi(izin[ad]) if ad in izin else pd.Series(0, index=izin.index)
+
+    devir = np.minimum(sutun(KALAN), sutun(HAKEDIS))
+    hakedis = pd.Series(np.select([hizmet >= 10, hizmet > 0], [30, 20], 0), index=izin.index)
+    sua = sutun(SUA_CARI)
+    yeni = pd.DataFrame({
+        DEVIR: devir, HAKEDIS: hakedis, TOPLAM: devir + hakedis, KULLANILAN: 0, KALAN: devir + hakedis,
+        SUA_HAK: sua, SUA_KULLANILAN: 0, SUA_KALAN: sua, SUA_CARI: 0,
+    }, index=izin.index)
+    return yeni[[s for s in yeni.columns if s in izin.columns]]
+
+
+def _esit(eski, yeni) -> bool:
+    return str(eski).strip() == str(yeni).strip()
+
+
+def farklari_bul(basliklar: List[str], satirlar: List[List[str]],
+                 personel: List[List[str]], bugun: date) -> List[list]:
+    """
+    Sayfa değerlerinden (başlık satırı hariç) değişecek hücreleri çıkarır.
+    Dönüş: [satir, sutun, eski, yeni] listesi (satir/sutun 1 tabanlı sayfa adresi).
+    """
+    import pandas as pd
+
+    basliklar = [str(b).strip() for b in basliklar]
+    eksik = [s for s in ZORUNLU_SUTUNLAR if s not in basliklar]
+    p_basliklar = [str(b).strip() for b in personel[0]] if personel else []
+    if P_TC not in p_basliklar:
+        eksik.append(P_TC)
+    if eksik:
+        raise DevirHatasi(f"Kritik sütun başlıkları bulunamadı: {', '.join(eksik)}")
+
+    genislik = len(basliklar)
+    izin = pd.DataFrame([(list(r) + [""] * genislik)[:genislik] for r in satirlar],
+                        columns=basliklar, dtype=object)
+    p_genislik = len(p_basliklar)
+    p_df = pd.DataFrame([(list(r) + [""] * p_genislik)[:p_genislik] for r in personel[1:]],
+                        columns=p_basliklar, dtype=object)
+
+    yeni = devir_hesapla(izin, p_df, bugun)
+    sutun_no = {ad: i + 1 for i, ad in enumerate(basliklar)}
+    farklar = []
+    eski = izin.loc[yeni.index, list(yeni.columns)]
+    for ad in yeni.columns:
+        # Karşılaştırma metin olarak yapılır ('20' ile 20 aynı sayılır)
+        degisen = eski[ad].astype(str).str.strip() != yeni[ad].astype(str)
+        for indeks in yeni.index[degisen.to_numpy()]:
+            farklar.append([int(indeks) + 2, sutun_no[ad], eski.at[indeks, ad], int(yeni.at[indeks, ad])])
+    farklar.sort(key=lambda f: (f[0], f[1]))
+    return farklar
+
+
 # =============================================================================
-# WORKER: BATCH UPDATE (TEK SEFERDE YAZMA)
+# 2. ÇALIŞMA (GÖRÜNTÜ, KONTROL NOKTASI, DEVAM, GERİ ALMA)
+# =============================================================================
+class DevirCalismasi:
+    """
+    Tek bir devir çalışması. Görüntü dosyası değişmez; ilerleme ayrı
+    durum dosyasında tutulur, böylece kesilen çalışma kaldığı yerden sürer.
+    """
+
+    HAZIR, YAZILIYOR, TAMAMLANDI, GERI_ALINDI = "hazir", "yaziliyor", "tamamlandi", "geri_alindi"
+
+    def __init__(self, dosya: str, veri: dict, durum: Optional[dict] = None):
+        self.dosya = dosya
+        self.kimlik = veri["kimlik"]
+        self.tarih = veri["tarih"]
+        self.basliklar: List[str] = veri["basliklar"]
+        self.satirlar: List[List[str]] = veri["satirlar"]
+        self.farklar: List[list] = veri["farklar"]
+        self.parca_satir = veri.get("parca_satir", PARCA_SATIR)
+        durum = durum or {}
+        self.durum = durum.get("durum", self.HAZIR)
+        self.tamamlanan = set(durum.get("tamamlanan", []))
+        # Son uygula/geri_al çağrısında atlanan çakışmalar: (satir, tc, sebep)
+        self.atlanan: List[Tuple[int, str, str]] = []
+
+    # --- Oluşturma / yükleme ---
+    @classmethod
+    def olustur(cls, ws_izin, ws_personel, dizin: str = DEVIR_DIZINI,
+                bugun: Optional[date] = None, parca_satir: int = PARCA_SATIR) -> "DevirCalismasi":
+        """Sayfaları okur, görüntüyü diske yazar ve farkları hesaplar (sayfaya yazmaz)."""
+        bugun = bugun or date.today()
+        izin_raw = ws_izin.get_all_values(value_render_option=HESAP_OKUMA)
+        if len(izin_raw) < 2:
+            raise DevirHatasi("İşlenecek veri bulunamadı.")
+        goruntu = ws_izin.get_all_values(value_render_option=GORUNTU_OKUMA)[1:]
+        # Başlama tarihleri metin olarak çözülür (biçimlenmemiş tarih seri numarasıdır)
+        personel_raw = ws_personel.get_all_values()
+        basliklar = [str(b).strip() for b in izin_raw[0]]
+        farklar = farklari_bul(basliklar, izin_raw[1:], personel_raw, bugun)
+        for fark in farklar:
+            # Geri almada yazılacak eski değer: formül varsa formülün kendisi
+            kayit = goruntu[fark[0] - 2] if fark[0] - 2 < len(goruntu) else []
+            fark[2] = kayit[fark[1] - 1] if fark[1] - 1 < len(kayit) else ""
+        kimlik = datetime.now().strftime("devir_%Y%m%d_%H%M%S")
+        veri = {"kimlik": kimlik, "tarih": bugun.isoformat(), "basliklar": basliklar,
+                "satirlar": goruntu, "farklar": farklar, "parca_satir": parca_satir}
+        calisma = cls(os.path.join(dizin, kimlik + ".json"), veri)
+        _json_yaz(calisma.dosya, veri)
+        calisma._durum_kaydet()
+        logger.info(f"Devir görüntüsü alındı: {calisma.dosya} ({len(farklar)} hücre değişecek)")
+        return calisma
+
+    @classmethod
+    def yukle(cls, dosya: str) -> "DevirCalismasi":
+        with open(dosya, 'r', encoding='utf-8') as f:
+            veri = json.load(f)
+        try:
+            with open(_durum_dosyasi(dosya), 'r', encoding='utf-8') as f:
+                durum = json.load(f)
+        except (OSError, ValueError):
+            durum = None
+        return cls(dosya, veri, durum)
+
+    @classmethod
+    def son_calisma(cls, dizin: str = DEVIR_DIZINI) -> Optional["DevirCalismasi"]:
+        """En son oluşturulan çalışma (yoksa None)."""
+        dosyalar = sorted(d for d in glob.glob(os.path.join(dizin, "devir_*.json"))
+                          if not d.endswith(".durum.json"))
+        return cls.yukle(dosyalar[-1]) if dosyalar else None
+
+    # --- Bilgi ---
+    def parcalar(self) -> List[List[list]]:
+        """Farkları en fazla `parca_satir` satırlık parçalara böler."""
+        parcalar, satir_sayisi, onceki = [], 0, None
+        for fark in self.farklar:
+            if fark[0] != onceki:
+                if not parcalar or satir_sayisi == self.parca_satir:
+                    parcalar.append([])
+                    satir_sayisi = 0
+                satir_sayisi += 1
+                onceki = fark[0]
+            parcalar[-1].append(fark)
+        return parcalar
+
+    def tc(self, satir: int) -> str:
+        no = self.basliklar.index(TC)
+        kayit = self.satirlar[satir - 2]
+        return str(kayit[no]).strip() if no < len(kayit) else ""
+
+    def ozet(self) -> Dict:
+        sutunlar: Dict[str, int] = {}
+        for _, sutun, _, _ in self.farklar:
+            ad = self.basliklar[sutun - 1]
+            sutunlar[ad] = sutunlar.get(ad, 0) + 1
+        return {"kimlik": self.kimlik, "durum": self.durum, "satir": len(self.satirlar),
+                "degisen_satir": len({f[0] for f in self.farklar}), "degisen_hucre": len(self.farklar),
+                "parca": len(self.parcalar()), "tamamlanan": len(self.tamamlanan), "sutunlar": sutunlar}
+
+    def onizleme(self, limit: int = 50) -> List[Tuple[str, str, str, int]]:
+        """İlk `limit` değişiklik: (tc, sütun, eski, yeni)."""
+        return [(self.tc(satir), self.basliklar[sutun - 1], eski, yeni)
+                for satir, sutun, eski, yeni in self.farklar[:limit]]
+
+    @property
+    def yarim_kaldi(self) -> bool:
+        return self.durum == self.YAZILIYOR
+
+    @property
+    def geri_alinabilir(self) -> bool:
+        return self.durum in (self.YAZILIYOR, self.TAMAMLANDI)
+
+    # --- Yazma ---
+    def uygula(self, ws, ilerleme: Optional[Callable[[int, int], None]] = None,
+               cakisanlari_atla: bool = False) -> int:
+        """
+        Tamamlanmamış parçaları yazar; her parçadan sonra kontrol noktası kaydedilir.
+        Yazılan hücre sayısını döndürür. Çakışma varsa (ve atlanmıyorsa) hiçbir şey yazılmaz.
+        """
+        if self.durum == self.GERI_ALINDI:
+            raise DevirHatasi("Geri alınmış çalışma yeniden uygulanamaz; yeni önizleme oluşturun.")
+        parcalar = self.parcalar()
+        bekleyen = [i for i in range(len(parcalar)) if i not in self.tamamlanan]
+        guncel = ws.get_all_values(value_render_option=GORUNTU_OKUMA)[1:] if bekleyen else []
+        # Kesintide son parça yazılmış ama kaydedilmemiş olabilir: yeni değeri taşıyan hücre atlanır
+        yazilacak = self._hazirla(guncel, [parcalar[i] for i in bekleyen], ileri=True,
+                                  cakisanlari_atla=cakisanlari_atla)
+
+        self.durum = self.YAZILIYOR
+        self._durum_kaydet()
+        yazilan = 0
+        for sira, (i, hucreler) in enumerate(zip(bekleyen, yazilacak), start=1):
+            if hucreler:
+                ws.batch_update(araliklari_birlestir(hucreler), value_input_option=YAZMA_SECENEGI)
+                yazilan += len(hucreler)
+            self.tamamlanan.add(i)
+            self._durum_kaydet()
+            if ilerleme:
+                ilerleme(sira, len(bekleyen))
+        self.durum = self.TAMAMLANDI
+        self._durum_kaydet()
+        _onbellegi_temizle()
+        return yazilan
+
+    def geri_al(self, ws, ilerleme: Optional[Callable[[int, int], None]] = None,
+                cakisanlari_atla: bool = False) -> int:
+        """
+        Yazılmış hücrelere görüntüdeki eski değerleri geri yazar.
+        Tekrar çağrılması güvenlidir: zaten eski değerde olan hücreler atlanır.
+        """
+        parcalar = self.parcalar()
+        guncel = ws.get_all_values(value_render_option=GORUNTU_OKUMA)[1:]
+        yazilacak = self._hazirla(guncel, parcalar, ileri=False, cakisanlari_atla=cakisanlari_atla)
+        yazilan = 0
+        for sira, hucreler in enumerate(yazilacak, start=1):
+            if hucreler:
+                ws.batch_update(araliklari_birlestir(hucreler), value_input_option=YAZMA_SECENEGI)
+                yazilan += len(hucreler)
+            if ilerleme:
+                ilerleme(sira, len(yazilacak))
+        self.durum = self.GERI_ALINDI
+        self.tamamlanan.clear()
+        self._durum_kaydet()
+        _onbellegi_temizle()
+        return yazilan
+
+    def _hazirla(self, guncel: List[List[str]], parcalar: List[List[list]], ileri: bool,
+                 cakisanlari_atla: bool) -> List[Dict[Tuple[int, int], object]]:
+        """
+        Parçaları sayfanın güncel haliyle karşılaştırır ve yazılacak hücreleri döndürür.
+        Satırın TC'si değişmişse ya da hücre ne eski ne yeni değeri taşıyorsa satır çakışmadır.
+        """
+        tc_no = self.basliklar.index(TC)
+
+        def hucre(satir, sutun):
+            kayit = guncel[satir - 2] if satir - 2 < len(guncel) else []
+            return kayit[sutun - 1] if sutun - 1 < len(kayit) else ""
+
+        cakismalar, cakisan_satirlar = [], set()
+        for parca in parcalar:
+            for satir, sutun, eski, yeni in parca:
+                if satir in cakisan_satirlar:
+                    continue
+                sebep = None
+                if not _esit(hucre(satir, tc_no + 1), self.tc(satir)):
+                    sebep = "satır yeri değişmiş"
+                elif not (_esit(hucre(satir, sutun), eski) or _esit(hucre(satir, sutun), yeni)):
+                    sebep = f"{self.basliklar[sutun - 1]} elle değiştirilmiş"
+                if sebep:
+                    cakisan_satirlar.add(satir)
+                    cakismalar.append((satir, self.tc(satir), sebep))
+        if cakismalar and not cakisanlari_atla:
+            raise DevirCakismasi(cakismalar)
+        self.atlanan = cakismalar
+
+        sonuc = []
+        for parca in parcalar:
+            hucreler = {}
+            for satir, sutun, eski, yeni in parca:
+                hedef = yeni if ileri else eski
+                if satir not in cakisan_satirlar and not _esit(hucre(satir, sutun), hedef):
+                    hucreler[(satir, sutun)] = hedef
+            sonuc.append(hucreler)
+        return sonuc
+
+    def _durum_kaydet(self):
+        _json_yaz(_durum_dosyasi(self.dosya), {
+            "durum": self.durum, "tamamlanan": sorted(self.tamamlanan),
+            "guncelleme": datetime.now().isoformat(timespec='seconds')})
+
+
+def _durum_dosyasi(dosya: str) -> str:
+    return dosya[:-len(".json")] + ".durum.json"
+
+
+def _json_yaz(dosya: str, veri: dict):
+    """Yarım dosya kalmasın diye önce geçici dosyaya yazılıp yer değiştirilir."""
+    os.makedirs(os.path.dirname(dosya), exist_ok=True)
+    gecici = dosya + ".tmp"
+    with open(gecici, 'w', encoding='utf-8') as f:
+        json.dump(veri, f, ensure_ascii=False)
+    os.replace(gecici, dosya)
+
+
+def _onbellegi_temizle():
+    try:
+        if cache:
+            cache.invalidate_pattern("personel:izin_bilgi")
+    except NameError:
+        pass
+
+
+# =============================================================================
+# WORKER: ÖNİZLEME / UYGULAMA / DEVAM / GERİ ALMA
 # =============================================================================
 class DevirWorker(QThread):
     log_sinyali = Signal(str)
     progress_sinyali = Signal(int)
+    calisma_hazir = Signal(object)  # DevirCalismasi
     islem_bitti = Signal()
-    
+
+    ONIZLE, UYGULA, GERI_AL = "onizle", "uygula", "geri_al"
+
+    def __init__(self, islem: str = ONIZLE, calisma: Optional[DevirCalismasi] = None,
+                 cakisanlari_atla: bool = False):
+        super().__init__()
+        self.islem = islem
+        self.calisma = calisma
+        self.cakisanlari_atla = cakisanlari_atla
+        self.cakismalar: List[Tuple[int, str, str]] = []  # işlem çakışma yüzünden durduysa
+
     def run(self):
         try:
             self.log_sinyali.emit("⏳ Veritabanına bağlanılıyor...")
-            ws_personel = veritabani_getir('personel', 'Personel')
             ws_izin = veritabani_getir('personel', 'izin_bilgi')
-            
-            # 1. Verileri Çek
-            self.log_sinyali.emit("📥 Veriler çekiliyor...")
-            tum_personel_raw = ws_personel.get_all_values()
-            tum_izin_raw = ws_izin.get_all_values()
-            
-            if len(tum_izin_raw) < 2:
-                self.log_sinyali.emit("⚠️ İşlenecek veri bulunamadı.")
-                self.islem_bitti.emit()
-                return
-
-            # Başlıkları ve Veriyi Ayır
-            izin_basliklar = tum_izin_raw[0]
-            izin_veriler = tum_izin_raw[1:]
-            
-            personel_basliklar = tum_personel_raw[0]
-            personel_veriler = tum_personel_raw[1:]
-
-            # --- SÜTUN İNDEKSLERİNİ BUL ---
-            def get_idx(headers, name):
-                try: return headers.index(name)
-                except: return -1
-
-            # Yıllık İzin
-            idx_tc = get_idx(izin_basliklar, "TC_Kimlik")
-            idx_devir = get_idx(izin_basliklar, "Yillik_Devir")
-            idx_hakedis = get_idx(izin_basliklar, "Yillik_Hakedis")
-            idx_toplam = get_idx(izin_basliklar, "Yillik_Toplam_Hak")
-            idx_kul = get_idx(izin_basliklar, "Yillik_Kullanilan")
-            idx_kalan = get_idx(izin_basliklar, "Yillik_Kalan")
-            
-            # Şua İzin (YENİ YAPILANDIRMA)
-            idx_sua_hak = get_idx(izin_basliklar, "Sua_Kullanilabilir_Hak")
-            idx_sua_kul = get_idx(izin_basliklar, "Sua_Kullanilan")
-            idx_sua_kal = get_idx(izin_basliklar, "Sua_Kalan")
-            idx_sua_cari = get_idx(izin_basliklar, "Sua_Cari_Yil_Kazanim")
-
-            # Personel Bilgisi
-            p_idx_tc = get_idx(personel_basliklar, "Kimlik_No")
-            p_idx_baslama = get_idx(personel_basliklar, "Baslama_Tarihi")
-
-            # Kontrol
-            if -1 in [idx_tc, idx_devir, idx_hakedis, idx_sua_hak, idx_sua_cari, p_idx_tc]:
-                self.log_sinyali.emit("❌ Kritik sütun başlıkları bulunamadı! Veritabanı yapısını kontrol edin.")
-                self.islem_bitti.emit()
-                return
-
-            # Personel Haritası
-            baslama_map = {}
-            for p in personel_veriler:
-                try: baslama_map[str(p[p_idx_tc]).strip()] = str(p[p_idx_baslama])
-                except: pass
-
-            self.log_sinyali.emit("⚙️ Hesaplamalar yapılıyor...")
-            guncellenmis_veriler = []
-            
-            # --- DÖNGÜ VE HESAPLAMA ---
-            for i, row in enumerate(izin_veriler):
-                yeni_row = list(row) # Kopyala
-                tc = str(row[idx_tc]).strip()
-                
-                if tc not in baslama_map:
-                    guncellenmis_veriler.append(yeni_row)
-                    continue
-
-                try:
-                    # --- A. YILLIK İZİN HESABI ---
-                    eski_hakedis = int(row[idx_hakedis]) if str(row[idx_hakedis]).isdigit() else 0
-                    try: mevcut_kalan = int(float(str(row[idx_kalan]).replace(',', '.')))
-                    except: mevcut_kalan = 0
-
-                    # 1. Yeni Devir (Kalan ile Hakediş'in küçüğü)
-                    yeni_devir = min(mevcut_kalan, eski_hakedis)
-                    
-                    # 2. Yeni Hakediş
-                    hizmet_yili = self._hizmet_yili_hesapla(baslama_map.get(tc))
-                    yeni_hakedis = 30 if hizmet_yili >= 10 else (20 if hizmet_yili > 0 else 0)
-                    
-                    # 3. Yıllık İzin Güncelleme
-                    yeni_row[idx_devir] = yeni_devir
-                    yeni_row[idx_hakedis] = yeni_hakedis
-                    yeni_row[idx_toplam] = yeni_devir + yeni_hakedis
-                    yeni_row[idx_kul] = 0 # Sıfırla
-                    yeni_row[idx_kalan] = yeni_devir + yeni_hakedis
-
-                    # --- B. ŞUA İZNİ HESABI (YENİ MANTIK) ---
-                    # Cari yıl kazanımı -> Yeni yıl hakkı olur
-                    yeni_sua_hak = int(row[idx_sua_cari]) if str(row[idx_sua_cari]).isdigit() else 0
-                    
-                    # Şua İzin Güncelleme
-                    yeni_row[idx_sua_hak] = yeni_sua_hak # Cari -> Hak oldu
-                    yeni_row[idx_sua_kul] = 0            # Sıfırla
-                    yeni_row[idx_sua_kal] = yeni_sua_hak # Henüz kullanılmadı
-                    yeni_row[idx_sua_cari] = 0           # Yeni yıl için boşalt
-
-                    guncellenmis_veriler.append(yeni_row)
-                    
-                    if i % 10 == 0: self.log_sinyali.emit(f"işleniyor... {tc}")
-
-                except Exception as e:
-                    self.log_sinyali.emit(f"Hata ({tc}): {e}")
-                    guncellenmis_veriler.append(row) 
-
-                self.progress_sinyali.emit(int((i+1)/len(izin_veriler)*100))
-
-            # --- TEK SEFERDE YAZMA ---
-            self.log_sinyali.emit("📤 Güncellemeler buluta gönderiliyor...")
-            ws_izin.update("A2", guncellenmis_veriler)
-            
-            self.log_sinyali.emit("✅ Yıl sonu devir işlemi başarıyla tamamlandı!")
-            self.islem_bitti.emit()
-
+            if self.islem == self.ONIZLE:
+                self._onizle(ws_izin)
+            elif self.islem == self.UYGULA:
+                self._uygula(ws_izin)
+            else:
+                self._geri_al(ws_izin)
+        except DevirCakismasi as e:
+            self.cakismalar = e.cakismalar
+            self.log_sinyali.emit(f"❌ {e} Hiçbir hücre yazılmadı:")
+            self._cakismalari_yaz(e.cakismalar)
+        except DevirHatasi as e:
+            self.log_sinyali.emit(f"⚠️ {e}")
         except Exception as e:
             self.log_sinyali.emit(f"❌ KRİTİK HATA: {str(e)}")
+            if self.calisma and self.calisma.yarim_kaldi:
+                self.log_sinyali.emit("ℹ️ Yazılan parçalar kaydedildi; 'Devam Et' ya da 'Geri Al' kullanılabilir.")
+        finally:
+            if self.calisma:
+                self.calisma_hazir.emit(self.calisma)
             self.islem_bitti.emit()
 
-    def _hizmet_yili_hesapla(self, tarih_str):
-        try:
-            for fmt in ("%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y"):
-                try:
-                    baslama = datetime.strptime(str(tarih_str), fmt)
-                    bugun = datetime.now()
-                    return bugun.year - baslama.year - ((bugun.month, bugun.day) < (baslama.month, baslama.day))
-                except: continue
-            return 0
-        except: return 0
+    def _cakismalari_yaz(self, cakismalar):
+        for satir, tc, sebep in cakismalar[:20]:
+            self.log_sinyali.emit(f"   satır {satir} ({tc}): {sebep}")
+        if len(cakismalar) > 20:
+            self.log_sinyali.emit(f"   ... ve {len(cakismalar) - 20} satır daha")
+
+    def _atlananlari_yaz(self):
+        if self.calisma.atlanan:
+            self.log_sinyali.emit(f"⚠️ Elle değiştirilmiş {len(self.calisma.atlanan)} satıra dokunulmadı:")
+            self._cakismalari_yaz(self.calisma.atlanan)
+
+    def _ilerleme(self, sira, toplam):
+        self.progress_sinyali.emit(int(sira / toplam * 100) if toplam else 100)
+
+    def _onizle(self, ws_izin):
+        self.log_sinyali.emit("📥 Veriler çekiliyor, görüntü alınıyor...")
+        ws_personel = veritabani_getir('personel', 'Personel')
+        self.calisma = DevirCalismasi.olustur(ws_izin, ws_personel)
+        ozet = self.calisma.ozet()
+        self.log_sinyali.emit(f"🗂️ Görüntü: {self.calisma.dosya}")
+        self.log_sinyali.emit(
+            f"🔍 ÖNİZLEME: {ozet['satir']} satırın {ozet['degisen_satir']} tanesinde "
+            f"{ozet['degisen_hucre']} hücre değişecek ({ozet['parca']} parça).")
+        for sutun, adet in ozet["sutunlar"].items():
+            self.log_sinyali.emit(f"   {sutun}: {adet}")
+        for tc, sutun, eski, yeni in self.calisma.onizleme():
+            self.log_sinyali.emit(f"   {tc} | {sutun}: {eski or '-'} → {yeni}")
+        if ozet["degisen_hucre"] > 50:
+            self.log_sinyali.emit(f"   ... ve {ozet['degisen_hucre'] - 50} hücre daha")
+        self.progress_sinyali.emit(100)
+
+    def _uygula(self, ws_izin):
+        devam = bool(self.calisma.tamamlanan)
+        self.log_sinyali.emit("▶️ Kaldığı parçadan devam ediliyor..." if devam
+                              else "📤 Değişen hücreler parça parça yazılıyor...")
+        yazilan = self.calisma.uygula(ws_izin, self._ilerleme, self.cakisanlari_atla)
+        self._atlananlari_yaz()
+        self.log_sinyali.emit(f"✅ Yıl sonu devri tamamlandı: {yazilan} hücre yazıldı.")
+        LogYoneticisi.log_ekle("Yıl Sonu", "Devir",
+                               f"{self.calisma.kimlik}: {yazilan} hücre güncellendi.")
+
+    def _geri_al(self, ws_izin):
+        self.log_sinyali.emit("↩️ Görüntüdeki eski değerler geri yazılıyor...")
+        yazilan = self.calisma.geri_al(ws_izin, self._ilerleme, self.cakisanlari_atla)
+        self._atlananlari_yaz()
+        self.log_sinyali.emit(f"✅ Devir geri alındı: {yazilan} hücre eski değerine döndü.")
+        LogYoneticisi.log_ekle("Yıl Sonu", "Geri Alma",
+                               f"{self.calisma.kimlik}: {yazilan} hücre geri alındı.")
+
 
 # =============================================================================
 # GUI SINIFI
@@ -169,80 +508,149 @@ class YilSonuDevirYoneticisi(QWidget):
         super().__init__()
         self.setWindowTitle("Yıl Sonu Devir İşlemleri")
         self.resize(600, 500)
+        self.worker = None
+        self.calisma: Optional[DevirCalismasi] = None
         self.setup_ui()
+        self._son_calismayi_yukle()
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
-        
+
         grp_uyari = QGroupBox("⚠️ DİKKAT: YIL SONU İŞLEMİ")
         grp_uyari.setStyleSheet("QGroupBox { border: 1px solid #e81123; border-radius: 5px; margin-top: 10px; font-weight: bold; color: #e81123; }")
         v_uyari = QVBoxLayout(grp_uyari)
-        
+
         lbl_bilgi = QLabel(
             "Bu işlem <b>YILDA BİR KEZ (Yılbaşında)</b> yapılmalıdır.<br><br>"
             "<b>Yapılacak İşlemler:</b><br>"
             "1. <b>Yıllık İzin:</b> Eski devirler silinir, sadece bu yılın artan hakkı devreder.<br>"
             "2. <b>Şua İzni:</b> 'Cari Yıl Kazanım' sütunundaki hak, 'Kullanılabilir Hak'ka taşınır.<br>"
             "3. <b>Genel:</b> Tüm 'Kullanılan' sayaçları sıfırlanır ve yeni yıl hakedişleri eklenir.<br><br>"
-            "<i>Lütfen işlemden önce yedek alınız!</i>"
+            "<i>Önce <b>Önizle</b> ile değişiklikleri görün. Önizleme sayfanın yerel yedeğini alır; "
+            "yarıda kalan işlem devam ettirilebilir ya da geri alınabilir.</i>"
         )
         lbl_bilgi.setWordWrap(True)
         lbl_bilgi.setStyleSheet("color: #cccccc; font-weight: normal;")
         v_uyari.addWidget(lbl_bilgi)
-        
+
         self.chk_onay = QCheckBox("Riskleri anladım, işlemi onaylıyorum.")
         self.chk_onay.setStyleSheet("color: #e81123; font-weight: bold;")
-        self.chk_onay.stateChanged.connect(self._onay_degisti)
+        self.chk_onay.stateChanged.connect(self._butonlari_guncelle)
         v_uyari.addWidget(self.chk_onay)
-        
+
         layout.addWidget(grp_uyari)
-        
+
         layout.addWidget(QLabel("İşlem Logları:"))
         self.txt_log = QTextEdit()
         self.txt_log.setReadOnly(True)
         self.txt_log.setStyleSheet("background-color: #1e1e1e; color: #00ff00; font-family: Consolas;")
         layout.addWidget(self.txt_log)
-        
+
         self.pbar = QProgressBar()
         self.pbar.setValue(0)
         self.pbar.setVisible(False)
         self.pbar.setStyleSheet("QProgressBar::chunk { background-color: #e81123; }")
         layout.addWidget(self.pbar)
-        
+
+        h_butonlar = QHBoxLayout()
+        self.btn_onizle = QPushButton("🔍 ÖNİZLE")
+        self.btn_onizle.clicked.connect(self._onizle)
+        self.btn_devam = QPushButton("⏯ DEVAM ET")
+        self.btn_devam.clicked.connect(lambda: self._baslat(DevirWorker.UYGULA))
+        self.btn_geri_al = QPushButton("↩ GERİ AL")
+        self.btn_geri_al.clicked.connect(self._geri_al)
+        for btn in (self.btn_onizle, self.btn_devam, self.btn_geri_al):
+            btn.setFixedHeight(36)
+            h_butonlar.addWidget(btn)
+        layout.addLayout(h_butonlar)
+
         self.btn_baslat = QPushButton("🚀 DEVİR İŞLEMİNİ BAŞLAT")
         self.btn_baslat.setFixedHeight(50)
-        self.btn_baslat.setEnabled(False)
-        self.btn_baslat.setStyleSheet("background-color: #333; color: #aaa; font-weight: bold; font-size: 14px;")
-        self.btn_baslat.clicked.connect(self._islemi_baslat)
+        self.btn_baslat.clicked.connect(lambda: self._baslat(DevirWorker.UYGULA))
         layout.addWidget(self.btn_baslat)
+        self._butonlari_guncelle()
 
-    def _onay_degisti(self):
-        if self.chk_onay.isChecked():
-            self.btn_baslat.setEnabled(True)
+    def _son_calismayi_yukle(self):
+        try:
+            calisma = DevirCalismasi.son_calisma()
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Önceki devir çalışması okunamadı: {e}")
+            return
+        if calisma and calisma.durum in (DevirCalismasi.YAZILIYOR, DevirCalismasi.TAMAMLANDI):
+            self.calisma = calisma
+            ozet = calisma.ozet()
+            if calisma.yarim_kaldi:
+                self.txt_log.append(f"⚠️ Yarım kalmış devir var ({calisma.kimlik}): "
+                                    f"{ozet['tamamlanan']}/{ozet['parca']} parça yazıldı.")
+            else:
+                self.txt_log.append(f"ℹ️ Son devir: {calisma.kimlik} (tamamlandı, geri alınabilir).")
+        self._butonlari_guncelle()
+
+    def _butonlari_guncelle(self):
+        onay = self.chk_onay.isChecked()
+        calisiyor = self.worker is not None and self.worker.isRunning()
+        c = self.calisma
+        self.btn_onizle.setEnabled(not calisiyor and not (c and c.yarim_kaldi))
+        self.btn_devam.setEnabled(onay and not calisiyor and bool(c and c.yarim_kaldi))
+        self.btn_geri_al.setEnabled(onay and not calisiyor and bool(c and c.geri_alinabilir))
+        baslat = onay and not calisiyor and bool(c and c.durum == DevirCalismasi.HAZIR and c.farklar)
+        self.btn_baslat.setEnabled(baslat)
+        if baslat:
             self.btn_baslat.setStyleSheet("background-color: #e81123; color: white; font-weight: bold; font-size: 14px;")
         else:
-            self.btn_baslat.setEnabled(False)
             self.btn_baslat.setStyleSheet("background-color: #333; color: #aaa; font-weight: bold; font-size: 14px;")
 
-    def _islemi_baslat(self):
-        self.btn_baslat.setEnabled(False)
-        self.chk_onay.setEnabled(False)
+    def _onizle(self):
+        self.calisma = None
+        self._baslat(DevirWorker.ONIZLE)
+
+    def _geri_al(self):
+        cevap = QMessageBox.question(
+            self, "Geri Al", f"{self.calisma.kimlik} devrinde yazılan hücreler eski değerlerine döndürülecek. Emin misiniz?")
+        if cevap == QMessageBox.Yes:
+            self._baslat(DevirWorker.GERI_AL)
+
+    def _baslat(self, islem, cakisanlari_atla=False):
         self.pbar.setVisible(True)
-        self.txt_log.clear()
-        
-        self.worker = DevirWorker()
+        self.pbar.setValue(0)
+        if islem == DevirWorker.ONIZLE:
+            self.txt_log.clear()
+
+        self.worker = DevirWorker(islem, self.calisma, cakisanlari_atla)
         self.worker.log_sinyali.connect(self.txt_log.append)
         self.worker.progress_sinyali.connect(self.pbar.setValue)
+        self.worker.calisma_hazir.connect(self._calisma_hazir)
         self.worker.islem_bitti.connect(self._islem_bitti)
         self.worker.start()
+        self._butonlari_guncelle()
+
+    def _calisma_hazir(self, calisma):
+        self.calisma = calisma
 
     def _islem_bitti(self):
-        self.chk_onay.setChecked(False)
-        self.chk_onay.setEnabled(True)
-        QMessageBox.information(self, "Bilgi", "İşlem tamamlandı.")
+        islem = self.worker.islem
+        self.worker.wait()
+        if self.worker.cakismalar and self._cakisanlari_atlamayi_sor(islem):
+            # Yarım kalan çalışma elle düzeltilmiş satırlar yüzünden kilitli kalmasın
+            self._baslat(islem, cakisanlari_atla=True)
+            return
+        if islem != DevirWorker.ONIZLE:
+            self.chk_onay.setChecked(False)
+        self._butonlari_guncelle()
+        if islem != DevirWorker.ONIZLE:
+            QMessageBox.information(self, "Bilgi", "İşlem tamamlandı.")
+
+    def _cakisanlari_atlamayi_sor(self, islem):
+        adet = len(self.worker.cakismalar)
+        eylem = "geri alma" if islem == DevirWorker.GERI_AL else "devir"
+        cevap = QMessageBox.question(
+            self, "Çakışan Satırlar",
+            f"{adet} satır görüntü alındıktan sonra elle değiştirilmiş (ayrıntılar logda).\n\n"
+            f"Bu satırlara dokunulmadan {eylem} işlemine devam edilsin mi?")
+        return cevap == QMessageBox.Yes
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     win = YilSonuDevirYoneticisi()
     win.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(app.exec())
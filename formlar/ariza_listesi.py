@@ -9,7 +9,7 @@ from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
                                QLabel, QMessageBox, QMdiSubWindow, QProgressBar, 
                                QAbstractItemView, QMdiArea, QComboBox, QFrame,
                                QGroupBox, QSizePolicy)
-from PySide6.QtCore import Qt, QThread, Signal, QAbstractTableModel
+from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtGui import QFont, QColor
 
 # --- LOGLAMA ---
@@ -28,6 +28,10 @@ try:
     from temalar.tema import TemaYonetimi
     from google_baglanti import veritabani_getir
     from araclar.ortak_araclar import show_error, mdi_pencere_ac
+    from araclar.tarih_araclari import tarih_serisi_coz
+    from araclar.arama_indeksi import SatirKumesiModeli
+    from araclar.liste_filtresi import ListeFiltresi, icerir_kosulu
+    from araclar.tablo_modeli import KayitModeli, dataframe_hazirla
 except ImportError as e:
     print(f"Modül Hatası: {e}")
     # Fallback tanımlar
@@ -42,57 +46,30 @@ except ImportError as e:
         def uygula_fusion_dark(app): pass
 
 # =============================================================================
-# 1. PANDAS VERİ MODELİ (GELİŞMİŞ BAŞLIK YÖNETİMİ)
+# 1. BAŞLIK EŞLEŞTİRME
 # =============================================================================
-class PandasModel(QAbstractTableModel):
-    def __init__(self, data=pd.DataFrame()):
-        super().__init__()
-        self._data = data
-        
-        # Başlık Eşleştirme
-        self.header_map = {
-            "ArizaID":      "Arıza No",
-            "ariza_id":     "Arıza No", 
-            "CihazID":      "Cihaz Kodu",
-            "cihaz_id":     "Cihaz Kodu",
-            "baslangic_tarihi": "Bildirim Tarihi",
-            "Tarih":        "Bildirim Tarihi",
-            "Saat":         "Saat",
-            "Bildiren":     "Bildiren Personel",
-            "ArizaTipi":    "Arıza Türü",
-            "Oncelik":      "Aciliyet",
-            "Konu":         "Arıza Konusu",
-            "Durum":        "Son Durum",
-            "ariza_acikla": "Açıklama",
-            "Rapor":        "Rapor Durumu"
-        }
-
-    def rowCount(self, parent=None):
-        return self._data.shape[0]
-
-    def columnCount(self, parent=None):
-        return self._data.shape[1]
-
-    def data(self, index, role=Qt.DisplayRole):
-        if index.isValid():
-            if role == Qt.DisplayRole:
-                val = self._data.iloc[index.row(), index.column()]
-                return str(val) if pd.notna(val) else ""
-            elif role == Qt.TextAlignmentRole:
-                return Qt.AlignCenter
-        return None
-
-    def headerData(self, col, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            original_header = self._data.columns[col]
-            return self.header_map.get(original_header, original_header)
-        return None
+BASLIKLAR = {
+    "ArizaID":      "Arıza No",
+    "ariza_id":     "Arıza No", 
+    "CihazID":      "Cihaz Kodu",
+    "cihaz_id":     "Cihaz Kodu",
+    "baslangic_tarihi": "Bildirim Tarihi",
+    "Tarih":        "Bildirim Tarihi",
+    "Saat":         "Saat",
+    "Bildiren":     "Bildiren Personel",
+    "ArizaTipi":    "Arıza Türü",
+    "Oncelik":      "Aciliyet",
+    "Konu":         "Arıza Konusu",
+    "Durum":        "Son Durum",
+    "ariza_acikla": "Açıklama",
+    "Rapor":        "Rapor Durumu"
+}
 
 # =============================================================================
 # 2. ARKA PLAN İŞÇİSİ
 # =============================================================================
 class VeriYukleyici(QThread):
-    veri_geldi = Signal(object)
+    veri_geldi = Signal(object, object) # Kayıtlar, sütun adı -> hücre metinleri
     hata_olustu = Signal(str)
     
     def run(self):
@@ -105,7 +82,7 @@ class VeriYukleyici(QThread):
             data = ws_ariza.get_all_values()
             
             if not data or len(data) < 2:
-                self.veri_geldi.emit(pd.DataFrame())
+                self.veri_geldi.emit([], {})
                 return
 
             headers = [str(h).strip() for h in data[0]]
@@ -126,12 +103,13 @@ class VeriYukleyici(QThread):
                 tarih_col = next((c for c in df.columns if c.lower() == "tarih"), None)
                 if tarih_col:
                     try:
-                        df['temp_date'] = pd.to_datetime(df[tarih_col], dayfirst=True, errors='coerce')
+                        df['temp_date'] = tarih_serisi_coz(df[tarih_col])
                         df = df.sort_values(by='temp_date', ascending=False)
                         df = df.drop(columns=['temp_date'])
                     except: pass
 
-            self.veri_geldi.emit(df)
+            # Hücre metinleri burada bir kez üretilir; tablo çizerken hesaplamaz
+            self.veri_geldi.emit(*dataframe_hazirla(df))
             
         except Exception as e:
             logger.error(f"Veri çekme hatası: {e}")
@@ -141,6 +119,9 @@ class VeriYukleyici(QThread):
 # 3. GÖRÜNÜM (UI)
 # =============================================================================
 class ArizaListesiPenceresi(QWidget):
+    # Form yöneticisi: kapatınca havuzda kalır, tekrar açılışta liste yenilenir
+    YENIDEN_KULLANILABILIR = True
+
     def __init__(self, yetki='viewer', kullanici_adi=None):
         super().__init__()
         self.yetki = yetki
@@ -149,8 +130,8 @@ class ArizaListesiPenceresi(QWidget):
         self.setWindowTitle("Arıza Takip Listesi")
         self.resize(1200, 750)
         
-        self.full_df = pd.DataFrame()
-        self.filtered_df = pd.DataFrame()
+        self.sutunlar = []
+        self.model = None
         
         self.setup_ui()
         
@@ -180,16 +161,15 @@ class ArizaListesiPenceresi(QWidget):
         self.combo_durum = QComboBox()
         self.combo_durum.addItems(["Tüm Durumlar", "Açık", "İşlemde", "Kapalı", "Beklemede"])
         self.combo_durum.setMinimumWidth(130)
-        self.combo_durum.currentTextChanged.connect(self.filtre_uygula)
+        self.combo_durum.currentTextChanged.connect(self._durum_filtresi)
         
         self.combo_oncelik = QComboBox()
         self.combo_oncelik.addItems(["Tüm Öncelikler", "Acil (Kritik)", "Yüksek", "Normal", "Düşük"])
         self.combo_oncelik.setMinimumWidth(130)
-        self.combo_oncelik.currentTextChanged.connect(self.filtre_uygula)
+        self.combo_oncelik.currentTextChanged.connect(self._oncelik_filtresi)
 
         self.txt_ara = QLineEdit()
         self.txt_ara.setPlaceholderText("ID, Cihaz, Konu veya Personel ara...")
-        self.txt_ara.textChanged.connect(self.filtre_uygula)
         
         # Yeni Ekle Butonu
         self.btn_yeni = QPushButton(" + Yeni Kayıt")
@@ -227,8 +207,10 @@ class ArizaListesiPenceresi(QWidget):
         self.progress.setVisible(False)
         main_layout.addWidget(self.progress)
 
-        # Tablo
+        # Tablo: kaynak model veri gelince bir kez kurulur, filtreler proxy satırlarını değiştirir
+        self.proxy = SatirKumesiModeli(self)
         self.tablo = QTableView()
+        self.tablo.setModel(self.proxy)
         self.tablo.setAlternatingRowColors(True)
         self.tablo.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.tablo.setSortingEnabled(True)
@@ -242,6 +224,10 @@ class ArizaListesiPenceresi(QWidget):
         self.lbl_info.setStyleSheet("color: #777; font-size: 12px; margin-left: 5px;")
         main_layout.addWidget(self.lbl_info)
 
+        self.filtre = ListeFiltresi(self.proxy)
+        self.filtre.metin_kutusuna_bagla(self.txt_ara)
+        self.filtre.filtrelendi.connect(lambda n: self.lbl_info.setText(f"Toplam {n} kayıt listelendi."))
+
     def verileri_yenile(self):
         self.progress.setVisible(True)
         self.lbl_info.setText("Veriler güncelleniyor...")
@@ -251,36 +237,40 @@ class ArizaListesiPenceresi(QWidget):
         self.worker.hata_olustu.connect(self.hata_yakala)
         self.worker.start()
 
-    def veri_yuklendi(self, df):
+    def veri_yuklendi(self, kayitlar, gosterim):
         self.progress.setVisible(False)
         self.btn_kilit(False)
-        self.full_df = df
-        if df.empty:
+        if not kayitlar:
             self.lbl_info.setText("Kayıt bulunamadı.")
-            self.tablo.setModel(None)
+            if self.model: self.model.kayitlari_ayarla([])
             return
-        self.filtre_uygula()
+        # Sütunlar değişmediyse mevcut model yeniden doldurulur
+        if self.model is None or list(gosterim) != self.sutunlar:
+            self.sutunlar = list(gosterim)
+            self.model = KayitModeli([(BASLIKLAR.get(c, c), c) for c in self.sutunlar], hizalama=Qt.AlignCenter)
+            self.proxy.setSourceModel(self.model)
+            self.filtre.kaynak_modeli_bagla(self.model)
+            self.filtre.metin_alanlari = tuple(self.sutunlar)
+        self._durum_filtresi(uygula=False)
+        self._oncelik_filtresi(uygula=False)
+        self.model.kayitlari_ayarla(kayitlar, list(gosterim.values()))
 
     def filtre_uygula(self):
-        if self.full_df.empty: return
-        df = self.full_df.copy()
-        
-        text = self.txt_ara.text().lower().strip()
-        if text:
-            mask = df.astype(str).apply(lambda x: x.str.lower().str.contains(text, na=False)).any(axis=1)
-            df = df[mask]
-            
+        self.filtre.uygula()
+
+    def _durum_filtresi(self, *args, uygula=True):
         durum = self.combo_durum.currentText()
-        if durum != "Tüm Durumlar" and "Durum" in df.columns:
-            df = df[df["Durum"].astype(str).str.contains(durum, case=False, na=False)]
-            
-        oncelik = self.combo_oncelik.currentText()
-        if oncelik != "Tüm Öncelikler" and "Oncelik" in df.columns:
-            df = df[df["Oncelik"].astype(str).str.contains(oncelik, case=False, na=False)]
+        kosul = None
+        if durum != "Tüm Durumlar" and "Durum" in self.sutunlar:
+            kosul = icerir_kosulu("Durum", durum)
+        self.filtre.kosul_ayarla("durum", kosul, uygula)
 
-        self.filtered_df = df
-        self.tablo.setModel(PandasModel(df))
-        self.lbl_info.setText(f"Toplam {len(df)} kayıt listelendi.")
+    def _oncelik_filtresi(self, *args, uygula=True):
+        oncelik = self.combo_oncelik.currentText()
+        kosul = None
+        if oncelik != "Tüm Öncelikler" and "Oncelik" in self.sutunlar:
+            kosul = icerir_kosulu("Oncelik", oncelik)
+        self.filtre.kosul_ayarla("oncelik", kosul, uygula)
 
     def hata_yakala(self, mesaj):
         self.progress.setVisible(False)
@@ -296,15 +286,11 @@ class ArizaListesiPenceresi(QWidget):
 
     def satir_tiklandi(self, index):
         try:
-            row = index.row()
+            # Proxy satırı -> tam tablodaki satır
+            row = self.proxy.kaynak_satiri(index.row())
             col_name = "ArizaID"
-            
-            if col_name in self.filtered_df.columns:
-                # GÜNCELLEME: FutureWarning önlendi
-                col_index = self.filtered_df.columns.get_loc(col_name)
-                ariza_id = str(self.filtered_df.iloc[row, col_index])
-            else:
-                ariza_id = str(self.filtered_df.iloc[row, 0])
+            col_index = self.sutunlar.index(col_name) if col_name in self.sutunlar else 0
+            ariza_id = self.model.deger(row, col_index)
                 
             self.detay_ac(ariza_id)
         except Exception as e:
@@ -330,7 +316,12 @@ class ArizaListesiPenceresi(QWidget):
         except ImportError:
             show_error("Modül Eksik", "Ariza kayıt modülü (ariza_kayit.py) bulunamadı.", self)
 
+    def yeniden_acildi(self):
+        """Havuzdan tekrar açıldı: eski liste görünürken arıza kayıtları yenilenir."""
+        self.verileri_yenile()
+
     def closeEvent(self, event):
+        self.filtre.durdur()
         if hasattr(self, 'worker') and self.worker.isRunning():
             self.worker.quit()
             self.worker.wait(500)
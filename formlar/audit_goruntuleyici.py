@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+import sys
+import os
+import logging
+from datetime import datetime, timedelta
+
+from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+                               QHeaderView, QPushButton, QLabel, QComboBox, QDateEdit,
+                               QGroupBox, QSizePolicy, QTabWidget, QAbstractItemView)
+from PySide6.QtCore import Qt, QThread, Signal, QDate, QModelIndex
+
+# --- LOGLAMA ---
+logger = logging.getLogger("AuditGoruntuleyici")
+
+# --- YOL AYARLARI ---
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(current_dir)
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
+
+# --- İMPORTLAR ---
+try:
+    from araclar.audit_logger import audit_logger
+    from araclar.tablo_modeli import KayitModeli
+    from araclar.yetki_yonetimi import YetkiYoneticisi
+    from temalar.tema import TemaYonetimi
+except ImportError as e:
+    print(f"Modül Hatası: {e}")
+    class YetkiYoneticisi:
+        @staticmethod
+        def uygula(self, kod): pass
+    class TemaYonetimi:
+        @staticmethod
+        def uygula_fusion_dark(app): pass
+
+# Bir sorguda getirilen olay sayısı; tablo sona kaydırıldıkça sonraki sayfa istenir
+SAYFA_BOYUTU = 200
+TUMU = "Tümü"
+
+# AuditKaydi alanları: (id, timestamp, kullanici, islem_tipi, tablo, kayit_id, detay, basarili, modul)
+OLAY_SUTUNLARI = [
+    ("Zaman",     lambda k: k.timestamp[:19].replace("T", " ")),
+    ("Kullanıcı", 2),
+    ("Modül",     8),
+    ("İşlem",     3),
+    ("Tablo",     4),
+    ("Kayıt",     5),
+    ("Detay",     6),
+    ("Sonuç",     lambda k: "Başarılı" if k.basarili else "HATA"),
+]
+
+OZET_GRUPLARI = {
+    "Gün / Modül":       ("gun", "modul"),
+    "Gün / Kullanıcı":   ("gun", "kullanici"),
+    "Gün / İşlem":       ("gun", "islem_tipi"),
+    "Modül / Kullanıcı": ("modul", "kullanici"),
+}
+OZET_BASLIKLARI = {"gun": "Gün", "modul": "Modül", "kullanici": "Kullanıcı", "islem_tipi": "İşlem"}
+
+
+# =============================================================================
+# 1. ARKA PLAN İŞÇİLERİ
+# =============================================================================
+class OlaySayfasiYukleyici(QThread):
+    """Filtrelere uyan bir sayfa olayı imleçten (once) sonrasından getirir."""
+    sayfa_geldi = Signal(int, object, bool)  # (sorgu no, kayıtlar, devamı var)
+    hata_olustu = Signal(str)
+
+    def __init__(self, sorgu_no, filtreler, once=None):
+        super().__init__()
+        self.sorgu_no = sorgu_no
+        self.filtreler = filtreler
+        self.once = once
+
+    def run(self):
+        try:
+            # Bir fazlası istenir: dönen kayıt sayısı sonraki sayfanın varlığını söyler
+            kayitlar = audit_logger.sorgula(limit=SAYFA_BOYUTU + 1, once=self.once, **self.filtreler)
+            self.sayfa_geldi.emit(self.sorgu_no, kayitlar[:SAYFA_BOYUTU], len(kayitlar) > SAYFA_BOYUTU)
+        except Exception as e:
+            logger.error(f"Audit sorgu hatası: {e}")
+            self.hata_olustu.emit(str(e))
+
+
+class OzetYukleyici(QThread):
+    """Günlük özet satırları ve filtre listeleri (önceden toplanmış tablodan)."""
+    ozet_geldi = Signal(int, object, object)  # (sorgu no, satırlar, filtre değerleri)
+    hata_olustu = Signal(str)
+
+    def __init__(self, sorgu_no, filtreler, grupla):
+        super().__init__()
+        self.sorgu_no = sorgu_no
+        self.filtreler = filtreler
+        self.grupla = grupla
+
+    def run(self):
+        try:
+            f = self.filtreler
+            bitis = f.get("bitis")
+            satirlar = audit_logger.gunluk_sayilar(
+                baslangic=f["baslangic"].date() if f.get("baslangic") else None,
+                bitis=(bitis - timedelta(days=1)).date() if bitis else None,
+                grupla=self.grupla, kullanici=f.get("kullanici"), modul=f.get("modul"),
+                islem_tipi=f.get("islem_tipi"))
+            self.ozet_geldi.emit(self.sorgu_no, satirlar, audit_logger.filtre_degerleri())
+        except Exception as e:
+            logger.error(f"Audit özet hatası: {e}")
+            self.hata_olustu.emit(str(e))
+
+
+# =============================================================================
+# 2. SAYFALI MODEL
+# =============================================================================
+class OlaySayfaModeli(KayitModeli):
+    """
+    Görünüm sona yaklaşınca (canFetchMore / fetchMore) sonraki sayfayı ister;
+    gelen sayfa mevcut satırları yeniden hesaplamadan sona eklenir.
+    """
+    sonraki_sayfa_istendi = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(OLAY_SUTUNLARI, parent=parent)
+        self.devami_var = False
+        self.yukleniyor = False
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.devami_var and not self.yukleniyor
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self.yukleniyor = True
+            self.sonraki_sayfa_istendi.emit()
+
+
+# =============================================================================
+# 3. GÖRÜNÜM (UI)
+# =============================================================================
+class AuditGoruntuleyiciPenceresi(QWidget):
+    # Form yöneticisi: kapatınca havuzda kalır, tekrar açılışta liste yenilenir
+    YENIDEN_KULLANILABILIR = True
+
+    def __init__(self, yetki='viewer', kullanici_adi=None):
+        super().__init__()
+        self.yetki = yetki
+        self.kullanici_adi = kullanici_adi
+        self.setWindowTitle("Denetim Kayıtları")
+        self.resize(1200, 750)
+
+        # Her listelemede artar; eski sorguların geç gelen sonuçları atılır
+        self._sorgu_no = 0
+        self._filtreler = {}
+        self._isciler = set()
+
+        self.setup_ui()
+
+        try:
+            TemaYonetimi.tema_uygula(self)
+        except AttributeError: pass
+
+        YetkiYoneticisi.uygula(self, "audit_goruntuleyici")
+
+        self.listele()
+
+    def setup_ui(self):
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(10, 10, 10, 10)
+        main_layout.setSpacing(10)
+
+        grp_filtre = QGroupBox("Filtreler")
+        grp_filtre.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
+        top_layout = QHBoxLayout(grp_filtre)
+        top_layout.setContentsMargins(15, 20, 15, 15)
+        top_layout.setSpacing(10)
+
+        self.cmb_kullanici = self._filtre_kutusu()
+        self.cmb_modul = self._filtre_kutusu()
+        self.cmb_islem = self._filtre_kutusu()
+
+        self.dt_baslangic = QDateEdit(QDate.currentDate().addDays(-30))
+        self.dt_bitis = QDateEdit(QDate.currentDate())
+        for dt in (self.dt_baslangic, self.dt_bitis):
+            dt.setCalendarPopup(True)
+            dt.setDisplayFormat("dd.MM.yyyy")
+
+        self.btn_listele = QPushButton("Listele")
+        self.btn_listele.setObjectName("btn_listele")
+        self.btn_listele.setCursor(Qt.PointingHandCursor)
+        self.btn_listele.clicked.connect(self.listele)
+
+        for etiket, widget in (("Kullanıcı:", self.cmb_kullanici), ("Modül:", self.cmb_modul),
+                               ("İşlem:", self.cmb_islem), ("Başlangıç:", self.dt_baslangic),
+                               ("Bitiş:", self.dt_bitis)):
+            top_layout.addWidget(QLabel(etiket))
+            top_layout.addWidget(widget)
+        top_layout.addStretch()
+        top_layout.addWidget(self.btn_listele)
+        main_layout.addWidget(grp_filtre)
+
+        self.sekmeler = QTabWidget()
+
+        # --- Olaylar ---
+        self.model = OlaySayfaModeli(self)
+        self.model.sonraki_sayfa_istendi.connect(self._sonraki_sayfa)
+        self.tablo = QTableView()
+        self.tablo.setModel(self.model)
+        self.tablo.setAlternatingRowColors(True)
+        self.tablo.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tablo.verticalHeader().setVisible(False)
+        baslik = self.tablo.horizontalHeader()
+        baslik.setSectionResizeMode(QHeaderView.Interactive)
+        baslik.setStretchLastSection(True)
+        self.tablo.setColumnWidth(0, 150)
+        self.tablo.setColumnWidth(6, 400)
+        self.sekmeler.addTab(self.tablo, "Olaylar")
+
+        # --- Günlük özet ---
+        ozet = QWidget()
+        ozet_layout = QVBoxLayout(ozet)
+        ozet_ust = QHBoxLayout()
+        self.cmb_grupla = QComboBox()
+        self.cmb_grupla.addItems(list(OZET_GRUPLARI))
+        self.cmb_grupla.currentTextChanged.connect(lambda _: self._ozet_yukle())
+        ozet_ust.addWidget(QLabel("Gruplama:"))
+        ozet_ust.addWidget(self.cmb_grupla)
+        ozet_ust.addStretch()
+        ozet_layout.addLayout(ozet_ust)
+        self.ozet_tablo = QTableView()
+        self.ozet_tablo.setAlternatingRowColors(True)
+        self.ozet_tablo.verticalHeader().setVisible(False)
+        self.ozet_tablo.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        ozet_layout.addWidget(self.ozet_tablo)
+        self.ozet_model = None
+        self.sekmeler.addTab(ozet, "Günlük Özet")
+
+        main_layout.addWidget(self.sekmeler)
+
+        self.lbl_info = QLabel("Hazır")
+        self.lbl_info.setStyleSheet("color: #777; font-size: 12px; margin-left: 5px;")
+        main_layout.addWidget(self.lbl_info)
+
+    @staticmethod
+    def _filtre_kutusu():
+        cmb = QComboBox()
+        cmb.setEditable(True)
+        cmb.addItem(TUMU)
+        cmb.setMinimumWidth(130)
+        return cmb
+
+    # --- Filtreler ---
+    def _filtreleri_oku(self):
+        def deger(cmb):
+            metin = cmb.currentText().strip()
+            return None if not metin or metin == TUMU else metin
+
+        bas = self.dt_baslangic.date().toPython()
+        bit = self.dt_bitis.date().toPython()
+        return {
+            "kullanici": deger(self.cmb_kullanici),
+            "modul": deger(self.cmb_modul),
+            "islem_tipi": deger(self.cmb_islem),
+            "baslangic": datetime(bas.year, bas.month, bas.day),
+            # Bitiş günü dahil (sorguda bitiş hariçtir)
+            "bitis": datetime(bit.year, bit.month, bit.day) + timedelta(days=1),
+        }
+
+    def _filtre_listelerini_doldur(self, degerler):
+        for cmb, anahtar in ((self.cmb_kullanici, "kullanici"), (self.cmb_modul, "modul"),
+                             (self.cmb_islem, "islem_tipi")):
+            secili = cmb.currentText()
+            cmb.blockSignals(True)
+            cmb.clear()
+            cmb.addItem(TUMU)
+            cmb.addItems(degerler.get(anahtar, []))
+            cmb.setCurrentText(secili)
+            cmb.blockSignals(False)
+
+    # --- Sorgular ---
+    def _isci_baslat(self, isci):
+        # Referans thread bitene kadar tutulur (yeni sorgu eskisini silmesin)
+        self._isciler.add(isci)
+        isci.finished.connect(lambda i=isci: self._isciler.discard(i))
+        isci.start()
+
+    def listele(self):
+        self._sorgu_no += 1
+        self._filtreler = self._filtreleri_oku()
+        self.model.devami_var = False
+        self.model.yukleniyor = True
+        self.model.kayitlari_ayarla([])
+        self.lbl_info.setText("Kayıtlar getiriliyor...")
+
+        isci = OlaySayfasiYukleyici(self._sorgu_no, self._filtreler)
+        isci.sayfa_geldi.connect(self._sayfa_geldi)
+        isci.hata_olustu.connect(self._hata)
+        self._isci_baslat(isci)
+        self._ozet_yukle()
+
+    def _sonraki_sayfa(self):
+        if not self.model.kayitlar:
+            return
+        isci = OlaySayfasiYukleyici(self._sorgu_no, self._filtreler, once=self.model.kayitlar[-1].imlec)
+        isci.sayfa_geldi.connect(self._sayfa_geldi)
+        isci.hata_olustu.connect(self._hata)
+        self._isci_baslat(isci)
+
+    def _sayfa_geldi(self, sorgu_no, kayitlar, devami_var):
+        if sorgu_no != self._sorgu_no:
+            return
+        self.model.satirlari_ekle(kayitlar)
+        self.model.devami_var = devami_var
+        self.model.yukleniyor = False
+        adet = self.model.rowCount()
+        self.lbl_info.setText(f"{adet} kayıt listelendi" + (" (devamı kaydırdıkça yüklenir)." if devami_var else "."))
+
+    def _ozet_yukle(self):
+        if not self._filtreler:
+            return
+        grupla = OZET_GRUPLARI.get(self.cmb_grupla.currentText(), ("gun", "modul"))
+        isci = OzetYukleyici(self._sorgu_no, self._filtreler, grupla)
+        isci.ozet_geldi.connect(lambda no, satirlar, degerler, g=grupla: self._ozet_geldi(no, satirlar, degerler, g))
+        isci.hata_olustu.connect(self._hata)
+        self._isci_baslat(isci)
+
+    def _ozet_geldi(self, sorgu_no, satirlar, degerler, grupla):
+        if sorgu_no != self._sorgu_no:
+            return
+        sutunlar = [(OZET_BASLIKLARI[g], i) for i, g in enumerate(grupla)] + [("Olay Sayısı", len(grupla))]
+        self.ozet_model = KayitModeli(sutunlar, hizalama=Qt.AlignCenter, parent=self)
+        self.ozet_model.kayitlari_ayarla(satirlar)
+        self.ozet_tablo.setModel(self.ozet_model)
+        self._filtre_listelerini_doldur(degerler)
+
+    def _hata(self, mesaj):
+        self.model.yukleniyor = False
+        self.lbl_info.setText(f"Hata: {mesaj}")
+
+    # --- Form yöneticisi ---
+    def yeniden_acildi(self):
+        self.listele()
+
+    def closeEvent(self, event):
+        for isci in list(self._isciler):
+            isci.wait(2000)
+        super().closeEvent(event)
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    win = AuditGoruntuleyiciPenceresi()
+    win.show()
+    sys.exit(app.exec())
@@ -5,7 +5,7 @@ from datetime import datetime
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QTableWidget, QTableWidgetItem, QHeaderView, QLineEdit,
+    QTableWidget, QTableWidgetItem, QTableView, QHeaderView, QLineEdit,
     QProgressBar, QFrame, QAbstractItemView, QMessageBox, QListWidget, 
     QTabWidget, QDateEdit, QInputDialog, QComboBox, QGroupBox, QCheckBox
 )
@@ -23,6 +23,10 @@ try:
     from google_baglanti import veritabani_getir
     from araclar.ortak_araclar import show_info, show_error, show_question
     from araclar.yetki_yonetimi import YetkiYoneticisi
+    from araclar.arama_indeksi import SatirKumesiModeli
+    from araclar.liste_filtresi import ListeFiltresi
+    from araclar.tablo_modeli import KayitModeli
+    from araclar.tarih_araclari import tarih_coz
 except ImportError as e:
     print(f"Modül Hatası: {e}")
     def veritabani_getir(t, s): return None
@@ -181,7 +185,16 @@ class AyarlarPenceresi(QWidget):
         h_filtre.addWidget(QLabel("Yıl:")); h_filtre.addWidget(self.cmb_tatil_yil); h_filtre.addStretch()
         layout.addLayout(h_filtre)
         
-        self.table_tatil = QTableWidget(0, 2); self.table_tatil.setHorizontalHeaderLabels(["Tarih", "Açıklama"])
+        # Liste bir kez modele yüklenir; yıl filtresi yalnızca gösterilen satırları değiştirir
+        self.model_tatil = KayitModeli([
+            ("Tarih", "Tarih"),
+            ("Açıklama", lambda r: r.get('Resmi_Tatil', r.get('Tatil Adi', ''))),
+        ])
+        self.proxy_tatil = SatirKumesiModeli(self); self.proxy_tatil.setSourceModel(self.model_tatil)
+        self.filtre_tatil = ListeFiltresi(self.proxy_tatil); self.filtre_tatil.kaynak_modeli_bagla(self.model_tatil)
+        self.table_tatil = QTableView(); self.table_tatil.setModel(self.proxy_tatil)
+        self.table_tatil.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_tatil.setSortingEnabled(True)
         self.table_tatil.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         layout.addWidget(self.table_tatil)
         btn_yenile = QPushButton("Yenile"); btn_yenile.clicked.connect(self.tatilleri_yukle)
@@ -289,17 +302,25 @@ class AyarlarPenceresi(QWidget):
 
     def _tatiller_geldi(self, data):
         self.tatiller_data = data
-        # Yıl filtresi vb. işlemleri burada kısaca
-        self._tatil_filtrele()
-
-    def _tatil_filtrele(self):
-        # Basit filtreleme
-        self.table_tatil.setRowCount(0) # Temizle
-        filt = self.tatiller_data # Tam liste (Filtre mantığını basitleştirdim hatayı önlemek için)
-        self.table_tatil.setRowCount(len(filt))
-        for i, r in enumerate(filt):
-            self.table_tatil.setItem(i, 0, QTableWidgetItem(str(r.get('Tarih',''))))
-            self.table_tatil.setItem(i, 1, QTableWidgetItem(str(r.get('Resmi_Tatil', r.get('Tatil Adi','')))))
+
+        # Yıl listesi verideki tarihlerden çıkarılır, mevcut seçim korunur
+        yillar = sorted({str(t.year) for t in (tarih_coz(r.get('Tarih')) for r in data) if t}, reverse=True)
+        secili = self.cmb_tatil_yil.currentText()
+        self.cmb_tatil_yil.blockSignals(True)
+        self.cmb_tatil_yil.clear(); self.cmb_tatil_yil.addItem("Tümü"); self.cmb_tatil_yil.addItems(yillar)
+        self.cmb_tatil_yil.setCurrentText(secili if secili in yillar else "Tümü")
+        self.cmb_tatil_yil.blockSignals(False)
+
+        self._tatil_filtrele(uygula=False)
+        self.model_tatil.kayitlari_ayarla(data)  # filtre model sıfırlanınca uygulanır
+
+    def _tatil_filtrele(self, *args, uygula=True):
+        yil = self.cmb_tatil_yil.currentText()
+        kosul = None
+        if yil and yil != "Tümü":
+            yil = int(yil)
+            kosul = lambda r: getattr(tarih_coz(r.get('Tarih')), 'year', None) == yil
+        self.filtre_tatil.kosul_ayarla("yil", kosul, uygula)
 
     def tatil_ekle(self):
         t = self.date_tatil.date().toString("dd.MM.yyyy"); a = self.txt_tatil_aciklama.text().strip()
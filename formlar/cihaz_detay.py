@@ -32,6 +32,9 @@ try:
     
     from google_baglanti import veritabani_getir, GoogleDriveService
     from araclar.ortak_araclar import show_info, show_error, pencereyi_kapat
+    from araclar.tarih_araclari import tarih_coz
+    from araclar.toplu_yazici import TopluYazici
+    from services.cihaz_arama import cihaz_arama
 except ImportError as e:
     print(f"Modül Hatası: {e}")
     # Fallback
@@ -132,11 +135,8 @@ class GuncellemeIslemi(QThread):
             cell = ws.find(self.cihaz_id)
             if not cell: raise Exception("Cihaz satırı bulunamadı.")
             
-            # Sütun başlıklarını al ve indexle
-            headers = ws.row_values(1)
-            header_map = {h.strip(): i+1 for i, h in enumerate(headers)}
-            
-            updates = []
+            # Güncellemeler başlık adıyla toplanır, bitişik hücreler tek aralıkta yazılır
+            yazici = TopluYazici(ws)
             
             # Form verilerini eşle
             mapping = {
@@ -153,31 +153,25 @@ class GuncellemeIslemi(QThread):
             
             # Basit alanları güncelle
             for db_col, form_key in mapping.items():
-                if db_col in header_map and form_key in self.veri:
-                    updates.append({
-                        'range': f"{chr(64+header_map[db_col])}{cell.row}",
-                        'values': [[self.veri[form_key]]]
-                    })
+                if form_key in self.veri:
+                    yazici.hucre(cell.row, db_col, self.veri[form_key])
 
             # Tarihleri güncelle
             for f in date_fields:
                 key = f.lower() # Form sözlüğündeki anahtar (örn: hizmetegiristarihi)
-                if f in header_map and key in self.veri:
-                     updates.append({
-                        'range': f"{chr(64+header_map[f])}{cell.row}",
-                        'values': [[self.veri[key]]]
-                    })
+                if key in self.veri:
+                    yazici.hucre(cell.row, f, self.veri[key])
 
             # Linkleri güncelle (Img, NDK_Lisans_Belgesi sütunları varsayılıyor)
             # Sütun adları tam eşleşmeli, yoksa atlar
-            if "Img" in header_map and "Resim" in self.linkler:
-                 updates.append({'range': f"{chr(64+header_map['Img'])}{cell.row}", 'values': [[self.linkler['Resim']]]})
+            if "Resim" in self.linkler:
+                yazici.hucre(cell.row, "Img", self.linkler['Resim'])
             
-            if "NDK_Lisans_Belgesi" in header_map and "Belge" in self.linkler:
-                 updates.append({'range': f"{chr(64+header_map['NDK_Lisans_Belgesi'])}{cell.row}", 'values': [[self.linkler['Belge']]]})
+            if "Belge" in self.linkler:
+                yazici.hucre(cell.row, "NDK_Lisans_Belgesi", self.linkler['Belge'])
 
-            if updates:
-                ws.batch_update(updates)
+            yazici.gonder()
+            cihaz_arama.yenilenecek_isaretle()
 
             # 3. Künye Yenileme (Opsiyonel)
             if KunyeOlusturucu:
@@ -586,11 +580,9 @@ class CihazDetayPenceresi(QWidget):
             for key in ["HizmeteGirisTarihi", "BitisTarihi", "GarantiBitisTarihi"]:
                 if key in self.inputs:
                     val = str(veri.get(key, ""))
-                    if val:
-                        try:
-                            d = datetime.strptime(val, "%d.%m.%Y")
-                            self.inputs[key].setDate(d)
-                        except: pass
+                    d = tarih_coz(val)
+                    if d:
+                        self.inputs[key].setDate(d)
             
             # 3. Dosyalar
             self.linkler["Resim"] = str(veri.get("Img", ""))
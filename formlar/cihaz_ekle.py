@@ -31,6 +31,7 @@ try:
     
     from google_baglanti import veritabani_getir, GoogleDriveService
     from araclar.ortak_araclar import show_info, show_error, pencereyi_kapat
+    from services.cihaz_arama import cihaz_arama
 except ImportError as e:
     print(f"Modül Hatası: {e}")
     # Fallback
@@ -167,6 +168,7 @@ class KayitIslemi(QThread):
             ws = veritabani_getir('cihaz', 'Cihazlar')
             if not ws: raise Exception("Veritabanı bağlantısı yok.")
             ws.append_row(self.veri)
+            cihaz_arama.yenilenecek_isaretle()
             self.islem_tamam.emit()
 
         except Exception as e:
@@ -11,7 +11,7 @@ from PySide6.QtWidgets import (
     QLabel, QProgressBar, QAbstractItemView, QComboBox, QFrame,
     QGroupBox, QSizePolicy
 )
-from PySide6.QtCore import Qt, QThread, Signal, QAbstractTableModel
+from PySide6.QtCore import Qt, QThread, Signal
 
 # --- LOGLAMA ---
 logging.basicConfig(level=logging.INFO)
@@ -29,6 +29,10 @@ try:
     from temalar.tema import TemaYonetimi
     from google_baglanti import veritabani_getir
     from araclar.ortak_araclar import show_error, mdi_pencere_ac
+    from araclar.arama_indeksi import SatirKumesiModeli
+    from araclar.liste_filtresi import ListeFiltresi
+    from araclar.tablo_modeli import KayitModeli, gosterim_sutunlari
+    from services.cihaz_arama import cihaz_arama
 except ImportError as e:
     print(f"Modül Hatası: {e}")
     # Fallback tanımlar
@@ -43,69 +47,42 @@ except ImportError as e:
         def uygula_fusion_dark(app): pass
 
 # =============================================================================
-# 1. PANDAS VERİ MODELİ (KORUNDU)
-# =============================================================================
-class PandasModel(QAbstractTableModel):
-    def __init__(self, data=pd.DataFrame()):
-        super().__init__()
-        self._data = data
-
-    def rowCount(self, parent=None):
-        return self._data.shape[0]
-
-    def columnCount(self, parent=None):
-        return self._data.shape[1]
-
-    def data(self, index, role=Qt.DisplayRole):
-        if index.isValid():
-            if role == Qt.DisplayRole:
-                val = self._data.iloc[index.row(), index.column()]
-                return str(val) if pd.notna(val) else ""
-            elif role == Qt.TextAlignmentRole:
-                return Qt.AlignCenter
-        return None
-
-    def headerData(self, col, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._data.columns[col]
-        return None
-
-# =============================================================================
-# 2. ARKA PLAN İŞÇİSİ (KORUNDU)
+# 1. ARKA PLAN İŞÇİSİ
 # =============================================================================
 class VeriYukleyici(QThread):
-    veri_geldi = Signal(object, dict) # DataFrame, Sabitler Sözlüğü
+    veri_geldi = Signal(object, object, object, dict) # Kayıtlar, Sütun Metinleri, AramaIndeksi, Sabitler Sözlüğü
     hata_olustu = Signal(str)
     
+    def __init__(self, force_refresh=False):
+        super().__init__()
+        self.force_refresh = force_refresh
+
     def run(self):
-        df = pd.DataFrame()
+        kayitlar, indeks = [], None
+        gosterim = {}
         sabitler_dict = {"AnaBilimDali": [], "Kaynak": []}
         
-        # --- A) CİHAZLARI ÇEK ---
+        # --- A) CİHAZLARI ÇEK (önbellek + hazır arama indeksi) ---
         try:
-            ws_cihaz = veritabani_getir('cihaz', 'Cihazlar')
-            
-            if ws_cihaz:
-                data = ws_cihaz.get_all_values()
-                if data and len(data) > 1:
-                    headers = [str(h).strip() for h in data[0]]
-                    rows = data[1:]
-                    df = pd.DataFrame(rows, columns=headers)
-                    df = df.fillna("") 
-                    
-                    # İstenen Sütunları Filtrele
-                    istenen_sutunlar = [
-                        "cihaz_id", "Marka", "Model", "Kaynak", 
-                        "SeriNo", "NDKLisansNo", "LisansDurum", 
-                        "AnaBilimDali", "BulunduguBina", "CihazID"
-                    ]
-                    # Sadece mevcut olanları al
-                    mevcut = [c for c in istenen_sutunlar if c in df.columns]
-                    if mevcut:
-                        df = df[mevcut]
-            else:
-                self.hata_olustu.emit("Veritabanı bağlantısı yok.")
-                return
+            kayitlar, indeks = cihaz_arama.hazirla(force_refresh=self.force_refresh)
+            if kayitlar:
+                # DataFrame satır sırası = indeksin satır numaraları
+                df = pd.DataFrame(kayitlar)
+                df.columns = [str(h).strip() for h in df.columns]
+                df = df.fillna("") 
+                
+                # İstenen Sütunları Filtrele
+                istenen_sutunlar = [
+                    "cihaz_id", "Marka", "Model", "Kaynak", 
+                    "SeriNo", "NDKLisansNo", "LisansDurum", 
+                    "AnaBilimDali", "BulunduguBina", "CihazID"
+                ]
+                # Sadece mevcut olanları al
+                mevcut = [c for c in istenen_sutunlar if c in df.columns]
+                if mevcut:
+                    df = df[mevcut]
+                # Hücre metinleri burada bir kez üretilir; tablo çizerken hesaplamaz
+                gosterim = gosterim_sutunlari(df)
 
         except Exception as e:
             self.hata_olustu.emit(f"Cihaz verisi alınamadı: {e}")
@@ -127,12 +104,16 @@ class VeriYukleyici(QThread):
         except Exception:
             pass 
 
-        self.veri_geldi.emit(df, sabitler_dict)
+        self.veri_geldi.emit(kayitlar, gosterim, indeks, sabitler_dict)
 
 # =============================================================================
-# 3. GÖRÜNÜM (UI)
+# 2. GÖRÜNÜM (UI)
 # =============================================================================
 class CihazListesiPenceresi(QWidget):
+    # Form yöneticisi: tablolar form kurulurken önbelleğe çekilir; kapatınca havuzda kalır
+    VERI_BAGIMLILIKLARI = (('cihaz', 'Cihazlar'),)
+    YENIDEN_KULLANILABILIR = True
+
     def __init__(self, yetki='viewer', kullanici_adi=None):
         super().__init__()
         self.yetki = yetki
@@ -141,8 +122,9 @@ class CihazListesiPenceresi(QWidget):
         self.setWindowTitle("Cihaz Envanter Listesi")
         self.resize(1200, 700)
         
-        self.full_df = pd.DataFrame()
-        self.filtered_df = pd.DataFrame()
+        self.sutunlar = []
+        self.model = None
+        self.indeks = None
         
         self.setup_ui()
         
@@ -173,14 +155,13 @@ class CihazListesiPenceresi(QWidget):
 
         self.txt_ara = QLineEdit()
         self.txt_ara.setPlaceholderText("Ara...")
-        self.txt_ara.textChanged.connect(self.filtre_uygula)
         
         # Yenile Butonu
         self.btn_yenile = QPushButton("⟳")
         self.btn_yenile.setObjectName("btn_yenile")
         self.btn_yenile.setFixedHeight(30)
         self.btn_yenile.setStyleSheet("background-color: #28a745; color: white; font-weight: bold; padding: 0 10px;")
-        self.btn_yenile.clicked.connect(self.verileri_yenile)
+        self.btn_yenile.clicked.connect(lambda: self.verileri_yenile(True))
         
         # Yeni Ekle Butonu
         self.btn_yeni_ekle = QPushButton(" + Yeni Cihaz")
@@ -207,7 +188,10 @@ class CihazListesiPenceresi(QWidget):
         main_layout.addWidget(self.progress)
 
         # --- TABLO (QTableView KORUNDU) ---
+        # Kaynak model veri gelince bir kez kurulur; filtreler sadece proxy'nin satırlarını değiştirir
+        self.proxy = SatirKumesiModeli(self)
         self.tablo = QTableView()
+        self.tablo.setModel(self.proxy)
         self.tablo.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.tablo.setSortingEnabled(True)
         self.tablo.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
@@ -217,20 +201,31 @@ class CihazListesiPenceresi(QWidget):
         self.lbl_info = QLabel("Hazır")
         main_layout.addWidget(self.lbl_info)
 
-    def verileri_yenile(self):
+        # Satırlar hazır arama indeksinden gelir; metin kutusu geciktirilerek dinlenir
+        self.filtre = ListeFiltresi(self.proxy)
+        self.filtre.on_secim = self._indeks_secimi
+        self.filtre.metin_kutusuna_bagla(self.txt_ara)
+        self.filtre.filtrelendi.connect(lambda n: self.lbl_info.setText(f"Gösterilen: {n}"))
+
+    def verileri_yenile(self, force_refresh=False):
         self.progress.setVisible(True)
         self.progress.setRange(0, 0)
         self.lbl_info.setText("Yükleniyor...")
-        self.tablo.setModel(None)
         
-        self.worker = VeriYukleyici()
+        self.worker = VeriYukleyici(force_refresh)
         self.worker.veri_geldi.connect(self.veri_yuklendi)
         self.worker.hata_olustu.connect(self.hata_yakala)
         self.worker.start()
 
-    def veri_yuklendi(self, df, sabitler):
+    def veri_yuklendi(self, kayitlar, gosterim, indeks, sabitler):
         self.progress.setVisible(False)
-        self.full_df = df
+        self.indeks = indeks
+        # Sütunlar değişmediyse mevcut model hazır metinlerle yeniden doldurulur
+        if self.model is None or list(gosterim) != self.sutunlar:
+            self.sutunlar = list(gosterim)
+            self.model = KayitModeli([(c, c) for c in self.sutunlar], hizalama=Qt.AlignCenter)
+            self.proxy.setSourceModel(self.model)
+        self.model.kayitlari_ayarla(kayitlar, list(gosterim.values()))
         
         self.combo_abd.blockSignals(True)
         self.combo_kaynak.blockSignals(True)
@@ -250,35 +245,27 @@ class CihazListesiPenceresi(QWidget):
         self.combo_abd.blockSignals(False)
         self.combo_kaynak.blockSignals(False)
         
-        if df.empty:
+        if not kayitlar:
             self.lbl_info.setText("Veri bulunamadı veya boş.")
             return
             
         self.filtre_uygula()
 
     def filtre_uygula(self):
-        if self.full_df.empty: return
-        
-        df = self.full_df.copy()
-        text = self.txt_ara.text().lower().strip()
+        if self.model is None or self.indeks is None: return
+        self.filtre.uygula()
+
+    def _indeks_secimi(self):
+        if self.indeks is None: return None
         abd = self.combo_abd.currentText()
         kaynak = self.combo_kaynak.currentText()
         
-        if abd != "Tümü" and "AnaBilimDali" in df.columns:
-            df = df[df["AnaBilimDali"].astype(str) == abd]
-            
-        if kaynak != "Tümü" and "Kaynak" in df.columns:
-            df = df[df["Kaynak"].astype(str) == kaynak]
-            
-        if text:
-            mask = df.astype(str).apply(lambda x: x.str.lower().str.contains(text, na=False)).any(axis=1)
-            df = df[mask]
-            
-        self.filtered_df = df
-        # PandasModel Kullanımı KORUNDU
-        model = PandasModel(df)
-        self.tablo.setModel(model)
-        self.lbl_info.setText(f"Gösterilen: {len(df)}")
+        # İndeks kesişimi: tablo taranmaz, DataFrame kopyalanmaz
+        return self.indeks.ara(
+            self.txt_ara.text(),
+            AnaBilimDali=abd if abd != "Tümü" else None,
+            Kaynak=kaynak if kaynak != "Tümü" else None,
+        )
 
     def hata_yakala(self, mesaj):
         self.progress.setVisible(False)
@@ -287,20 +274,12 @@ class CihazListesiPenceresi(QWidget):
 
     def satir_tiklandi(self, index):
         try:
-            row = index.row()
-            col_name = "cihaz_id" if "cihaz_id" in self.filtered_df.columns else "CihazID"
-            
-            if col_name in self.filtered_df.columns:
-                # ESKİ KOD (Hata veren):
-                # val = str(self.filtered_df.iloc[row][self.filtered_df.columns.get_loc(col_name)])
-                
-                # YENİ KOD (Düzeltilmiş):
-                # DataFrame üzerinde doğrudan iloc[row, col] kullanımı
-                col_index = self.filtered_df.columns.get_loc(col_name)
-                val = str(self.filtered_df.iloc[row, col_index])
-            else:
-                # Sütun yoksa ilk sütunu al (Burada da aynı mantıkla düzeltme yapılabilir)
-                val = str(self.filtered_df.iloc[row, 0])
+            # Proxy satırı -> tam tablodaki satır
+            row = self.proxy.kaynak_satiri(index.row())
+            col_name = "cihaz_id" if "cihaz_id" in self.sutunlar else "CihazID"
+            # Sütun yoksa ilk sütunu al
+            col_index = self.sutunlar.index(col_name) if col_name in self.sutunlar else 0
+            val = self.model.deger(row, col_index)
                 
             self.detay_ac(val)
         except Exception as e:
@@ -324,7 +303,12 @@ class CihazListesiPenceresi(QWidget):
         except ImportError:
             show_error("Modül Eksik", "Cihaz ekleme modülü bulunamadı.", self)
 
+    def yeniden_acildi(self):
+        """Havuzdan tekrar açıldı: liste önbellekten tazelenir."""
+        self.verileri_yenile()
+
     def closeEvent(self, event):
+        self.filtre.durdur()
         if hasattr(self, 'worker') and self.worker.isRunning():
             self.worker.quit()
             self.worker.wait(500)
@@ -9,7 +9,7 @@ from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
                                QLabel, QFrame, QGraphicsDropShadowEffect, QProgressBar, 
                                QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, 
                                QGridLayout, QScrollArea, QSizePolicy)
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor, QFont, QCursor
 
 # --- LOGLAMA ---
@@ -26,108 +26,14 @@ from araclar.yetki_yonetimi import YetkiYoneticisi
 
 # --- İMPORTLAR ---
 try:
-    from google_baglanti import veritabani_getir
     from araclar.ortak_araclar import show_error
 except ImportError:
-    def veritabani_getir(v, s): return None
     def show_error(t, m, p): print(m)
 
-# =============================================================================
-# 1. WORKER THREAD (TÜM VERİLERİ ÇEKEN MOTOR)
-# =============================================================================
-class DashboardWorker(QThread):
-    # Sinyal: (PersonelSayi, CihazSayi, AcikAriza, YaklasanBakim, SonArizalarListesi, YaklasanKalibrasyonListesi)
-    veri_hazir = Signal(dict)
-    hata_olustu = Signal(str)
-
-    def run(self):
-        ozet = {
-            "toplam_personel": 0,
-            "toplam_cihaz": 0,
-            "aktif_ariza": 0,
-            "yaklasan_bakim": 0,
-            "son_arizalar": [],
-            "yaklasan_kalibrasyon": []
-        }
-        
-        try:
-            # 1. PERSONEL SAYISI
-            ws_p = veritabani_getir('personel', 'Personel')
-            if ws_p:
-                p_data = ws_p.get_all_values()
-                # Başlık hariç satır sayısı (Basit sayım)
-                # İstenirse 'Durum' == 'Aktif' filtresi eklenebilir
-                ozet["toplam_personel"] = len(p_data) - 1 if len(p_data) > 1 else 0
-
-            # 2. CİHAZ SAYISI
-            ws_c = veritabani_getir('cihaz', 'Cihazlar')
-            if ws_c:
-                c_data = ws_c.get_all_values()
-                ozet["toplam_cihaz"] = len(c_data) - 1 if len(c_data) > 1 else 0
-
-            # 3. AÇIK ARIZALAR & SON KAYITLAR
-            ws_a = veritabani_getir('cihaz', 'cihaz_ariza')
-            if ws_a:
-                a_data = ws_a.get_all_records()
-                acik_sayisi = 0
-                son_kayitlar = []
-                
-                # Tersten döngü (En son eklenenler)
-                for row in reversed(a_data):
-                    durum = str(row.get('Durum', '')).strip()
-                    if durum not in ["Kapalı", "İptal", "Çözüldü"]:
-                        acik_sayisi += 1
-                    
-                    # Son 5 arızayı listeye ekle
-                    if len(son_kayitlar) < 5:
-                        son_kayitlar.append({
-                            'id': row.get('ArizaID', '-'),
-                            'cihaz': row.get('CihazID', '-'),
-                            'konu': row.get('Konu', '-'),
-                            'durum': durum,
-                            'tarih': row.get('Tarih', '-')
-                        })
-                
-                ozet["aktif_ariza"] = acik_sayisi
-                ozet["son_arizalar"] = son_kayitlar
-
-            # 4. YAKLAŞAN KALİBRASYONLAR (Önümüzdeki 30 gün)
-            ws_k = veritabani_getir('cihaz', 'Kalibrasyon')
-            if ws_k:
-                k_data = ws_k.get_all_records()
-                bugun = datetime.date.today()
-                yaklasanlar = []
-                
-                for row in k_data:
-                    bitis_str = str(row.get('BitisTarihi', '')).strip()
-                    if bitis_str:
-                        try:
-                            # Tarih formatı kontrolü
-                            for fmt in ("%Y-%m-%d", "%d.%m.%Y"):
-                                try:
-                                    bitis_dt = datetime.datetime.strptime(bitis_str, fmt).date()
-                                    break
-                                except: continue
-                            else:
-                                continue # Format uymazsa atla
-
-                            kalan_gun = (bitis_dt - bugun).days
-                            if 0 <= kalan_gun <= 45: # 45 gün kala uyarı
-                                yaklasanlar.append({
-                                    'cihaz': row.get('CihazID', '-'),
-                                    'bitis': bitis_str,
-                                    'kalan': kalan_gun
-                                })
-                        except: pass
-                
-                # Kalan güne göre sırala
-                yaklasanlar.sort(key=lambda x: x['kalan'])
-                ozet["yaklasan_kalibrasyon"] = yaklasanlar[:10] # İlk 10
-
-            self.veri_hazir.emit(ozet)
+from services.dashboard_service import DashboardAbonelik, VARSAYILAN_YENILEME_SN
 
-        except Exception as e:
-            self.hata_olustu.emit(str(e))
+YONETIM_ALANLARI = ("toplam_personel", "toplam_cihaz", "aktif_ariza", "son_arizalar", "yaklasan_kalibrasyon",
+                    "rke_geciken")
 
 # =============================================================================
 # 2. UI BİLEŞENLERİ (KARTLAR)
@@ -212,7 +118,7 @@ class ModernTable(QTableWidget):
 # 3. ANA PENCERE
 # =============================================================================
 class DashboardPenceresi(QWidget):
-    def __init__(self, yetki='viewer', kullanici_adi=None):
+    def __init__(self, yetki='viewer', kullanici_adi=None, yenileme_sn=VARSAYILAN_YENILEME_SN):
         super().__init__()
         self.yetki = yetki
         self.kullanici_adi = kullanici_adi
@@ -223,7 +129,21 @@ class DashboardPenceresi(QWidget):
         
         self.setup_ui()
         YetkiYoneticisi.uygula(self, "dashboard")
-        self.verileri_yenile()
+
+        # Alan -> o alanı çizen metot (sadece değişen kart/tablo yeniden çizilir)
+        self._cizimler = {
+            "toplam_personel": self.card_personel.set_value,
+            "toplam_cihaz": self.card_cihaz.set_value,
+            "aktif_ariza": self.card_ariza.set_value,
+            "son_arizalar": self._ariza_tablosunu_doldur,
+            "yaklasan_kalibrasyon": self._kalibrasyon_tablosunu_doldur,
+            "rke_geciken": self.card_rke.set_value,
+        }
+        self.abonelik = DashboardAbonelik(YONETIM_ALANLARI, poll_saniye=yenileme_sn, parent=self)
+        self.abonelik.alanlar_degisti.connect(self.verileri_guncelle)
+        self.abonelik.yukleniyor.connect(self._yukleme_durumu)
+        self.abonelik.hata_olustu.connect(self.hata_yakala)
+        self.abonelik.baslat()
 
     def setup_ui(self):
         main_layout = QVBoxLayout(self)
@@ -266,11 +186,13 @@ class DashboardPenceresi(QWidget):
         self.card_cihaz = StatCard("TOPLAM CİHAZ", "0", "📟", "#66bb6a")
         self.card_ariza = StatCard("AÇIK ARIZALAR", "0", "⚠️", "#ef5350")
         self.card_bakim = StatCard("YAKLAŞAN KALİB.", "0", "⏳", "#ffa726")
+        self.card_rke = StatCard("GECİKEN RKE KONTROL", "0", "🛡️", "#ab47bc")
         
         cards_layout.addWidget(self.card_personel)
         cards_layout.addWidget(self.card_cihaz)
         cards_layout.addWidget(self.card_ariza)
         cards_layout.addWidget(self.card_bakim)
+        cards_layout.addWidget(self.card_rke)
         cards_layout.addStretch()
         
         main_layout.addLayout(cards_layout)
@@ -308,29 +230,21 @@ class DashboardPenceresi(QWidget):
         main_layout.addWidget(self.pbar)
 
     def verileri_yenile(self):
-        self.btn_refresh.setEnabled(False)
-        self.btn_refresh.setText("Yükleniyor...")
-        self.pbar.setVisible(True)
+        self.abonelik.yenile(force_refresh=True)
+
+    def _yukleme_durumu(self, yukleniyor):
+        self.btn_refresh.setEnabled(not yukleniyor)
+        self.btn_refresh.setText("Yükleniyor..." if yukleniyor else "⟳ Yenile")
+        self.pbar.setVisible(yukleniyor)
         self.pbar.setRange(0, 0) # Sonsuz döngü
-        
-        self.worker = DashboardWorker()
-        self.worker.veri_hazir.connect(self.verileri_guncelle)
-        self.worker.hata_olustu.connect(self.hata_yakala)
-        self.worker.start()
 
     def verileri_guncelle(self, data):
-        self.pbar.setVisible(False)
-        self.btn_refresh.setEnabled(True)
-        self.btn_refresh.setText("⟳ Yenile")
-        
-        # Kartları Güncelle
-        self.card_personel.set_value(data.get("toplam_personel", 0))
-        self.card_cihaz.set_value(data.get("toplam_cihaz", 0))
-        self.card_ariza.set_value(data.get("aktif_ariza", 0))
-        self.card_bakim.set_value(len(data.get("yaklasan_kalibrasyon", [])))
-        
-        # Arıza Tablosunu Doldur
-        arizalar = data.get("son_arizalar", [])
+        for alan, deger in data.items():
+            cizim = self._cizimler.get(alan)
+            if cizim:
+                cizim(deger)
+
+    def _ariza_tablosunu_doldur(self, arizalar):
         self.tbl_ariza.setRowCount(0)
         for row in arizalar:
             r = self.tbl_ariza.rowCount()
@@ -346,8 +260,8 @@ class DashboardPenceresi(QWidget):
             
             self.tbl_ariza.setItem(r, 4, QTableWidgetItem(str(row['tarih'])))
 
-        # Kalibrasyon Tablosunu Doldur
-        kalibler = data.get("yaklasan_kalibrasyon", [])
+    def _kalibrasyon_tablosunu_doldur(self, kalibler):
+        self.card_bakim.set_value(len(kalibler))
         self.tbl_kalib.setRowCount(0)
         for row in kalibler:
             r = self.tbl_kalib.rowCount()
@@ -363,15 +277,10 @@ class DashboardPenceresi(QWidget):
             self.tbl_kalib.setItem(r, 2, item_kalan)
 
     def hata_yakala(self, err):
-        self.pbar.setVisible(False)
-        self.btn_refresh.setEnabled(True)
-        self.btn_refresh.setText("⟳ Yenile")
         show_error("Veri Hatası", err, self)
 
     def closeEvent(self, event):
-        if hasattr(self, 'worker') and self.worker.isRunning():
-            self.worker.quit()
-            self.worker.wait(500)
+        self.abonelik.kapat()
         event.accept()
 
 if __name__ == "__main__":
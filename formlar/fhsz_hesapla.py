@@ -28,12 +28,17 @@ try:
     from temalar.tema import TemaYonetimi
     from google_baglanti import veritabani_getir, InternetBaglantiHatasi, KimlikDogrulamaHatasi
     from araclar.ortak_araclar import OrtakAraclar, pencereyi_kapat, show_info, show_error, show_question
-    from araclar.hesaplamalar import sua_hak_edis_hesapla, tr_upper, is_gunu_hesapla
-    from gspread.cell import Cell 
+    from araclar.hesaplamalar import sua_hak_edis_hesapla, is_gunu_hesapla
+    from araclar.metin_araclari import tr_upper, tr_upper_seri, sirala_anahtari_seri
+    from araclar.tarih_araclari import tarih_coz, tarih_serisi_coz
+    from araclar.tembel_yukleme import tembel_modul
 except ImportError as e:
     print(f"KRİTİK HATA: Modüller yüklenemedi! {e}")
     sys.exit(1)
 
+# Toplu hücre güncellemesi için (gspread, ilk kayıtta yüklenir)
+_gspread_cell = tembel_modul("gspread.cell")
+
 # =============================================================================
 # DELEGATE SINIFLARI
 # =============================================================================
@@ -159,7 +164,7 @@ class TamKayitWorker(QThread):
                                 yeni = sua_hak_edis_hesapla(totals[tc])
                                 try: mevc = float(str(r[it-1]).replace(',', '.'))
                                 except: mevc = -1
-                                if mevc != yeni: updates.append(Cell(i, it, yeni))
+                                if mevc != yeni: updates.append(_gspread_cell.Cell(i, it, yeni))
                         if updates: ws_izin.update_cells(updates)
             self.islem_bitti.emit()
         except Exception as e: self.hata_olustu.emit(str(e))
@@ -261,7 +266,7 @@ class FHSZHesaplamaPenceresi(QWidget):
                     if 'personel_id' in self.df_izin.columns:
                         self.df_izin['personel_id'] = self.df_izin['personel_id'].astype(str).apply(lambda x: x.split('.')[0] if x else "0")
                     for c in ['Başlama_Tarihi', 'Bitiş_Tarihi']:
-                        if c in self.df_izin.columns: self.df_izin[c] = pd.to_datetime(self.df_izin[c], dayfirst=True, errors='coerce')
+                        if c in self.df_izin.columns: self.df_izin[c] = tarih_serisi_coz(self.df_izin[c])
 
             # Tatiller
             wst = veritabani_getir('sabit', 'Tatiller')
@@ -269,7 +274,7 @@ class FHSZHesaplamaPenceresi(QWidget):
             if wst:
                 dft = pd.DataFrame(wst.get_all_records())
                 if not dft.empty and 'Tarih' in dft.columns:
-                    self.tatil_listesi_np = pd.to_datetime(dft['Tarih'], dayfirst=True, errors='coerce').dropna().dt.strftime('%Y-%m-%d').tolist()
+                    self.tatil_listesi_np = tarih_serisi_coz(dft['Tarih']).dropna().dt.strftime('%Y-%m-%d').tolist()
             
             # Sabitler
             wss = veritabani_getir('sabit', 'Sabitler')
@@ -278,11 +283,15 @@ class FHSZHesaplamaPenceresi(QWidget):
                 dfs = pd.DataFrame(wss.get_all_records())
                 if not dfs.empty:
                     dff = dfs[dfs['Kod'] == 'Gorev_Yeri']
-                    for _, r in dff.iterrows():
-                        b = tr_upper(str(r.get('MenuEleman','')).strip())
-                        ka = tr_upper(str(r.get('Aciklama','')).strip())
-                        k = "A" if ("KOŞULU A" in ka or "KOSULU A" in ka or "A" == ka) else "B"
-                        if b: self.birim_kosul_map[b] = k
+                    bos = pd.Series("", index=dff.index)
+                    birimler = tr_upper_seri(dff.get('MenuEleman', bos)).str.strip()
+                    aciklamalar = tr_upper_seri(dff.get('Aciklama', bos)).str.strip()
+                    kosul_a = (aciklamalar.str.contains("KOŞULU A", regex=False)
+                               | aciklamalar.str.contains("KOSULU A", regex=False)
+                               | (aciklamalar == "A"))
+                    kosullar = kosul_a.map({True: "A", False: "B"})
+                    dolu = birimler != ""
+                    self.birim_kosul_map = dict(zip(birimler[dolu], kosullar[dolu]))
         except Exception as e: show_error("Hata", str(e), self)
 
     def kesisim_izin_gunu_hesapla(self, kimlik, db, de):
@@ -337,7 +346,7 @@ class FHSZHesaplamaPenceresi(QWidget):
 
             if self.df_personel.empty: return
 
-            sorted_df = self.df_personel.sort_values(by="Ad_Soyad")
+            sorted_df = self.df_personel.sort_values(by="Ad_Soyad", key=sirala_anahtari_seri)
 
             for _, row in sorted_df.iterrows():
                 kimlik = str(row.get('Kimlik_No', '')).strip()
@@ -354,8 +363,8 @@ class FHSZHesaplamaPenceresi(QWidget):
                 kisi_bitis = donem_bit
                 
                 if durum == "Pasif":
-                    try: ayrilis_date = datetime.strptime(ayrilis_tarihi_str, "%d.%m.%Y")
-                    except: ayrilis_date = None
+                    ayrilis_gun = tarih_coz(ayrilis_tarihi_str)
+                    ayrilis_date = datetime.combine(ayrilis_gun, datetime.min.time()) if ayrilis_gun else None
                     
                     if ayrilis_date:
                         # Ayrılış, hesaplamanın başlayacağı tarihten bile önceyse -> Listeleme
@@ -28,6 +28,7 @@ try:
     from google_baglanti import veritabani_getir, InternetBaglantiHatasi, KimlikDogrulamaHatasi
     from araclar.ortak_araclar import OrtakAraclar, pencereyi_kapat, show_info, show_error
     from araclar.hesaplamalar import sua_hak_edis_hesapla
+    from araclar.metin_araclari import tr_lower, tr_lower_seri, sirala_anahtari_seri
 except ImportError as e:
     print(f"KRİTİK HATA: Modüller yüklenemedi! {e}")
     sys.exit(1)
@@ -226,9 +227,12 @@ class PuantajRaporPenceresi(QWidget):
             else:
                 aylar = {"Ocak":1, "Şubat":2, "Mart":3, "Nisan":4, "Mayıs":5, "Haziran":6,
                          "Temmuz":7, "Ağustos":8, "Eylül":9, "Ekim":10, "Kasım":11, "Aralık":12}
+                # Türkçe küçük harfle eşlenir ('ARALIK'.title() 'Aralik' olurdu)
+                aylar = {tr_lower(k): v for k, v in aylar.items()}
                 
-                df_temp['Ay_No'] = df_temp[col_donem_db].apply(lambda x: aylar.get(str(x).strip().title(), 0))
-                df_temp = df_temp.sort_values(by=[col_ad, 'Ay_No'])
+                df_temp['Ay_No'] = tr_lower_seri(df_temp[col_donem_db]).str.strip().map(aylar).fillna(0).astype(int)
+                df_temp = df_temp.sort_values(by=[col_ad, 'Ay_No'],
+                                              key=lambda s: sirala_anahtari_seri(s) if s.name == col_ad else s)
                 
                 df_temp['Kumulatif_Saat'] = df_temp.groupby(col_id)[col_saat].cumsum()
                 
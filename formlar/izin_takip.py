@@ -3,7 +3,7 @@ import sys
 import os
 import logging
 import time
-from datetime import datetime
+from datetime import datetime, date
 
 # PySide6 Kütüphaneleri
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
@@ -24,6 +24,7 @@ try:
     from araclar.yetki_yonetimi import YetkiYoneticisi
     from araclar.ortak_araclar import OrtakAraclar, show_info, show_error, show_question, pencereyi_kapat
     from temalar.tema import TemaYonetimi
+    from araclar.tarih_araclari import tarih_coz
     
     # 🚀 YENİ: Service
     from services.personel_service import PersonelService
@@ -45,10 +46,7 @@ class DateTableWidgetItem(QTableWidgetItem):
             return super().__lt__(other)
     
     def _parse(self, t):
-        for f in ("%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y"):
-            try: return datetime.strptime(t, f)
-            except: continue
-        return datetime.min
+        return tarih_coz(t) or date.min
 
 # =============================================================================
 # WORKER: İZİN GEÇMİŞİ
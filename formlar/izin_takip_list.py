@@ -3,7 +3,7 @@ import sys
 import os
 import logging
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
 
 # PySide6 Kütüphaneleri
 from PySide6.QtCore import Qt, QDate, QThread, Signal
@@ -32,6 +32,8 @@ try:
         create_group_box, create_form_layout, kayitlari_getir, 
         add_combo_box, add_date_edit, satir_ekle
     )
+    from araclar.tarih_araclari import tarih_coz
+    from araclar.metin_araclari import katla
 except ImportError as e:
     print(f"KRİTİK HATA: Modüller yüklenemedi! {e}")
 
@@ -49,10 +51,7 @@ class DateTableWidgetItem(QTableWidgetItem):
             return super().__lt__(other)
     
     def _parse(self, t):
-        for f in ("%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y"):
-            try: return datetime.strptime(t, f)
-            except: continue
-        return datetime.min
+        return tarih_coz(t) or date.min
 
 # =============================================================================
 # WORKER: VERİLERİ YÜKLE
@@ -127,10 +126,9 @@ class KayitWorker(QThread):
         try:
             hedef_tc = str(self.data.get('personel_id', '')).strip()
             
-            try:
-                yeni_bas = datetime.strptime(self.data.get('Baslama_Tarihi'), "%d.%m.%Y")
-                yeni_bit = datetime.strptime(self.data.get('Bitis_Tarihi'), "%d.%m.%Y")
-            except ValueError:
+            yeni_bas = tarih_coz(self.data.get('Baslama_Tarihi'))
+            yeni_bit = tarih_coz(self.data.get('Bitis_Tarihi'))
+            if not yeni_bas or not yeni_bit:
                 raise Exception("Tarih formatı hatalı.")
 
             islem_id = str(self.data.get('Id', '')).strip()
@@ -148,12 +146,11 @@ class KayitWorker(QThread):
                     vt_id = str(kayit.get('Id', '')).strip()
                     if self.tip == "guncelle" and vt_id == islem_id: continue
 
-                    try:
-                        vt_bas = datetime.strptime(str(kayit.get('Başlama_Tarihi')), "%d.%m.%Y")
-                        vt_bit = datetime.strptime(str(kayit.get('Bitis_Tarihi')), "%d.%m.%Y")
-                        if (yeni_bas <= vt_bit) and (yeni_bit >= vt_bas):
-                            raise Exception(f"Bu tarihlerde ({vt_bas.strftime('%d.%m')} - {vt_bit.strftime('%d.%m')}) zaten izinli!")
-                    except: continue
+                    vt_bas = tarih_coz(kayit.get('Başlama_Tarihi'))
+                    vt_bit = tarih_coz(kayit.get('Bitiş_Tarihi', kayit.get('Bitis_Tarihi')))
+                    if not vt_bas or not vt_bit: continue
+                    if (yeni_bas <= vt_bit) and (yeni_bit >= vt_bas):
+                        raise Exception(f"Bu tarihlerde ({vt_bas.strftime('%d.%m')} - {vt_bit.strftime('%d.%m')}) zaten izinli!")
 
             # --- 2. KAYIT İŞLEMİ ---
             ws_giris = veritabani_getir('personel', 'izin_giris')
@@ -676,11 +673,11 @@ class IzinGirisPenceresi(QWidget):
             self.table_genel.item(i, 0).setData(Qt.UserRole, row)
 
     def _genel_liste_filtrele(self, text):
-        text = text.lower().strip()
+        text = katla(text).strip()
         filtrelenmis = []
         for row in self.tum_izinler:
-            tc = str(row.get('personel_id', '')).lower()
-            isim = str(row.get('Ad_Soyad', '')).lower()
+            tc = katla(row.get('personel_id', ''))
+            isim = katla(row.get('Ad_Soyad', ''))
             if text in tc or text in isim:
                 filtrelenmis.append(row)
         self._genel_tabloyu_doldur(filtrelenmis)
@@ -1,16 +1,19 @@
 # -*- coding: utf-8 -*-
 import sys
 import os
+import bisect
 import calendar
-from datetime import datetime, timedelta
+from array import array
+from datetime import datetime, timedelta, date
 
 # PySide6 Kütüphaneleri
-from PySide6.QtCore import Qt, QThread, Signal
-from PySide6.QtGui import QColor, QBrush, QFont, QPen, QPainter
+from PySide6.QtCore import Qt, QThread, Signal, QAbstractTableModel, QModelIndex, QDate, QRectF, QMarginsF
+from PySide6.QtGui import QColor, QBrush, QFont, QPen, QPainter, QPdfWriter, QPageSize, QPageLayout
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, 
-    QPushButton, QApplication, QTableWidget, QTableWidgetItem, 
-    QHeaderView, QAbstractItemView, QGridLayout, QStyledItemDelegate
+    QPushButton, QApplication, QTableView, 
+    QHeaderView, QAbstractItemView, QGridLayout, QStyledItemDelegate,
+    QDialog, QDialogButtonBox, QDateEdit, QFormLayout, QFileDialog, QProgressBar
 )
 
 # --- YOL AYARLARI ---
@@ -24,7 +27,8 @@ try:
     from araclar.yetki_yonetimi import YetkiYoneticisi
     from temalar.tema import TemaYonetimi
     from google_baglanti import veritabani_getir
-    from araclar.ortak_araclar import OrtakAraclar, show_error
+    from araclar.tarih_araclari import tablo_tarihleri
+    from araclar.ortak_araclar import OrtakAraclar, show_error, show_info
 except ImportError as e:
     print(f"Modül Hatası: {e}")
 
@@ -48,37 +52,265 @@ class SatirCizgiliDelegate(QStyledItemDelegate):
         painter.drawLine(p1, p2)
         painter.restore()
 
+# =============================================================================
+# KİŞİ BAZLI İZİN ARALIK İNDEKSİ
+# =============================================================================
+class IzinAralikIndeksi:
+    """
+    Her personelin izinlerini başlangıç tarihine göre sıralı tutar.
+    Tarihler ordinal (int) olarak saklanır; bir günün hangi izne denk geldiği
+    bisect ile bulunur. Ayrıca (yıl, ay) -> personel kimlikleri kovaları
+    yükleme sırasında bir kez kurulur, ay değişimi tek bir sözlük erişimidir.
+    """
+
+    def __init__(self, izinler=None):
+        # ad -> (baslangiclar, bitisler, bitis_prefix_max, izin_kayitlari)
+        self._kisiler = {}
+        # Ada göre sıralı personel listesi; kovalar bu listedeki sırayı tutar
+        self._adlar = []
+        # (yil, ay) -> array('I') (sıralı personel sıra numaraları)
+        self._ay_kovalari = {}
+        if izinler:
+            self.yukle(izinler)
+
+    def yukle(self, izinler):
+        gruplar = {}
+        for izin in izinler:
+            gruplar.setdefault(izin['ad'], []).append(izin)
+
+        self._kisiler = {}
+        self._adlar = sorted(gruplar)
+        kovalar = {}
+        for no, ad in enumerate(self._adlar):
+            liste = gruplar[ad]
+            liste.sort(key=lambda i: i['bas'])
+            baslar = [i['bas'].toordinal() for i in liste]
+            bitisler = [i['bit'].toordinal() for i in liste]
+            prefix_max, enb = [], -1
+            for b in bitisler:
+                enb = max(enb, b)
+                prefix_max.append(enb)
+            self._kisiler[ad] = (baslar, bitisler, prefix_max, liste)
+
+            for izin in liste:
+                yil, ay = izin['bas'].year, izin['bas'].month
+                son = (izin['bit'].year, izin['bit'].month)
+                while (yil, ay) <= son:
+                    kova = kovalar.setdefault((yil, ay), [])
+                    # Kişi sırayla işlendiği için tekrar kontrolü son elemana bakmak yeterli
+                    if not kova or kova[-1] != no:
+                        kova.append(no)
+                    yil, ay = (yil + 1, 1) if ay == 12 else (yil, ay + 1)
+
+        self._ay_kovalari = {k: array('I', v) for k, v in kovalar.items()}
+
+    def __len__(self):
+        return len(self._kisiler)
+
+    def kopya(self):
+        """
+        Arka plan thread'leri için anlık görüntü. yukle() yapıları yerinde
+        değiştirmez, yenilerini atar; bu yüzden referansları paylaşmak yeterlidir.
+        """
+        kopya = IzinAralikIndeksi()
+        kopya._kisiler, kopya._adlar, kopya._ay_kovalari = self._kisiler, self._adlar, self._ay_kovalari
+        return kopya
+
+    def turler(self):
+        """İndeksteki izin türleri."""
+        return {izin['tur'] for _, _, _, liste in self._kisiler.values() for izin in liste}
+
+    def aydaki_personeller(self, yil, ay):
+        """O ay en az bir izni olan personelleri ada göre sıralı döndürür."""
+        kova = self._ay_kovalari.get((yil, ay))
+        if not kova:
+            return []
+        adlar = self._adlar
+        return [adlar[i] for i in kova]
+
+    def aylar(self):
+        """İzin bulunan (yıl, ay) anahtarlarını sıralı döndürür."""
+        return sorted(self._ay_kovalari)
+
+    def aralikta_olanlar(self, bas, bit):
+        """[bas, bit] aralığında en az bir izni olan personelleri sıralı döndürür."""
+        bas_o, bit_o = bas.toordinal(), bit.toordinal()
+        sonuc = []
+        for ad, (baslar, _, prefix_max, _) in self._kisiler.items():
+            i = bisect.bisect_right(baslar, bit_o)
+            if i and prefix_max[i - 1] >= bas_o:
+                sonuc.append(ad)
+        sonuc.sort()
+        return sonuc
+
+    def izin_bul(self, ad, gun):
+        """Verilen gün personelin izinli olduğu kaydı döndürür, yoksa None."""
+        kayit = self._kisiler.get(ad)
+        if not kayit:
+            return None
+        baslar, bitisler, prefix_max, liste = kayit
+        gun_o = gun.toordinal() if isinstance(gun, date) else gun
+        j = bisect.bisect_right(baslar, gun_o) - 1
+        # Geriye doğru yalnızca bitişi bu güne yetişebilecek kayıtlara bakılır
+        while j >= 0 and prefix_max[j] >= gun_o:
+            if bitisler[j] >= gun_o:
+                return liste[j]
+            j -= 1
+        return None
+
+    def ay_satirlari(self, yil, ay):
+        """
+        Dışa aktarım için ayın satırlarını sırayla üretir (generator).
+        Her satır: (ad, [izin veya None, ...gün sayısı kadar])
+        """
+        gun_sayisi = calendar.monthrange(yil, ay)[1]
+        ilk = date(yil, ay, 1).toordinal()
+        for ad in self.aydaki_personeller(yil, ay):
+            yield ad, [self.izin_bul(ad, ilk + g) for g in range(gun_sayisi)]
+
+# =============================================================================
+# AYLIK ÇİZELGE MODELİ (HÜCRELER TALEP ANINDA HESAPLANIR)
+# =============================================================================
+class IzinTakvimModel(QAbstractTableModel):
+    """
+    Personel x Gün çizelgesi. QTableWidgetItem üretmez; renk ve ipucu
+    yalnızca görünen hücreler boyanırken indeksten hesaplanır.
+    """
+    VARSAYILAN_RENK = "#868e96"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._indeks = IzinAralikIndeksi()
+        self._renkler = {}
+        self._qcolor_cache = {}
+        self._personeller = []
+        self._brush_weekend = QBrush(QColor("#252525"))
+        self._brush_default = QBrush(QColor("#1e1e1e"))
+
+        bugun = date.today()
+        self.ay_ayarla(bugun.year, bugun.month)
+
+    # --- Veri Besleme ---
+    def izinleri_ayarla(self, izinler):
+        self.beginResetModel()
+        self._indeks.yukle(izinler)
+        self._personelleri_hesapla()
+        self.endResetModel()
+
+    def renkleri_ayarla(self, renk_map):
+        self._renkler = dict(renk_map)
+        self._qcolor_cache = {}
+        if self.rowCount() and self.columnCount():
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
+
+    def ay_ayarla(self, yil, ay):
+        self.beginResetModel()
+        self._yil, self._ay = yil, ay
+        self._gun_sayisi = calendar.monthrange(yil, ay)[1]
+        ilk = date(yil, ay, 1)
+        self._ilk_gun_ordinal = ilk.toordinal()
+        ilk_hafta_gunu = ilk.weekday()
+        self._hafta_sonu = {c for c in range(self._gun_sayisi) if (ilk_hafta_gunu + c) % 7 >= 5}
+        self._personelleri_hesapla()
+        self.endResetModel()
+
+    def _personelleri_hesapla(self):
+        self._personeller = self._indeks.aydaki_personeller(self._yil, self._ay)
+
+    @property
+    def indeks(self):
+        return self._indeks
+
+    def renk_bul(self, izin_turu):
+        qcolor = self._qcolor_cache.get(izin_turu)
+        if qcolor is None:
+            hex_color = self._renkler.get(izin_turu)
+            if hex_color is None:
+                kucuk = izin_turu.lower()
+                hex_color = next((r for t, r in self._renkler.items() if t.lower() == kucuk), self.VARSAYILAN_RENK)
+            qcolor = QColor(hex_color)
+            self._qcolor_cache[izin_turu] = qcolor
+        return qcolor
+
+    def renk_haritasi(self):
+        """İndeksteki her izin türü için {tür: '#rrggbb'} (GUI thread'inde hazırlanır)."""
+        return {tur: self.renk_bul(tur).name() for tur in self._indeks.turler()}
+
+    # --- Qt Model Arayüzü ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._personeller)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._gun_sayisi
+
+    def _hucre_izni(self, index):
+        return self._indeks.izin_bul(self._personeller[index.row()], self._ilk_gun_ordinal + index.column())
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.BackgroundRole:
+            izin = self._hucre_izni(index)
+            if izin:
+                return self.renk_bul(izin['tur'])
+            return self._brush_weekend if index.column() in self._hafta_sonu else self._brush_default
+
+        if role == Qt.DisplayRole:
+            return "X" if self._hucre_izni(index) else ""
+
+        if role == Qt.ForegroundRole:
+            izin = self._hucre_izni(index)
+            return self.renk_bul(izin['tur']) if izin else None
+
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+
+        if role == Qt.ToolTipRole:
+            izin = self._hucre_izni(index)
+            if izin:
+                ad = self._personeller[index.row()]
+                return f"{ad}\n{izin['tur']}\n{izin['bas'].strftime('%d.%m.%Y')} - {izin['bit'].strftime('%d.%m.%Y')}"
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return str(section + 1)
+        if 0 <= section < len(self._personeller):
+            return self._personeller[section]
+        return None
+
 # =============================================================================
 # WORKER 1: İZİN VERİLERİNİ ÇEK
 # =============================================================================
 class TakvimWorker(QThread):
     veri_hazir = Signal(list)
+
+    def __init__(self, force_refresh=False):
+        super().__init__()
+        self.force_refresh = force_refresh
     
     def run(self):
         izinler_listesi = []
         try:
-            ws = veritabani_getir('personel', 'izin_giris')
-            raw_data = ws.get_all_records()
-            
-            for row in raw_data:
+            # Önbellekli okuma: takvim tekrar açıldığında sayfa ve tarih sütunları yeniden işlenmez
+            raw_data, tarihler = tablo_tarihleri('personel', 'izin_giris', ('Başlama_Tarihi', 'Bitiş_Tarihi'),
+                                                 force_refresh=self.force_refresh)
+            baslar, bitisler = tarihler['Başlama_Tarihi'], tarihler['Bitiş_Tarihi']
+
+            for row, bas, bit in zip(raw_data, baslar, bitisler):
+                if not bas or not bit: continue
                 r = {k.strip(): v for k, v in row.items()}
-                try:
-                    s_bas = r.get('Başlama_Tarihi', '').strip()
-                    s_bit = r.get('Bitiş_Tarihi', '').strip()
-                    if not s_bas or not s_bit: continue
-                    
-                    bas = datetime.strptime(s_bas, "%d.%m.%Y").date()
-                    bit = datetime.strptime(s_bit, "%d.%m.%Y").date()
-                    
-                    tur = str(r.get('izin_tipi', 'Diğer')).strip()
-                    
-                    izinler_listesi.append({
-                        "ad": r.get('Ad_Soyad', r.get('personel_id', 'Bilinmiyor')),
-                        "tur": tur,
-                        "bas": bas,
-                        "bit": bit
-                    })
-                except: continue
+                tur = str(r.get('izin_tipi', 'Diğer')).strip()
+
+                izinler_listesi.append({
+                    "ad": r.get('Ad_Soyad', r.get('personel_id', 'Bilinmiyor')),
+                    "tur": tur,
+                    "bas": bas,
+                    "bit": bit
+                })
         except Exception as e:
             print(f"Takvim Veri Hatası: {e}")
             
@@ -105,6 +337,193 @@ class RenkWorker(QThread):
             print(f"Renk Yükleme Hatası: {e}")
         self.renkler_hazir.emit(renk_map)
 
+# =============================================================================
+# WORKER 3: ÇOK AYLI DIŞA AKTARIM (XLSX / PDF)
+# =============================================================================
+AYLAR_TR = ["", "Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran", "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+
+def ay_araligi(bas_yil, bas_ay, bit_yil, bit_ay):
+    """(bas_yil, bas_ay) ile (bit_yil, bit_ay) arasındaki ayları sırayla üretir."""
+    yil, ay = bas_yil, bas_ay
+    while (yil, ay) <= (bit_yil, bit_ay):
+        yield yil, ay
+        yil, ay = (yil + 1, 1) if ay == 12 else (yil, ay + 1)
+
+class TakvimDisaAktarWorker(QThread):
+    """
+    Seçilen ay aralığını tek geçişte dosyaya yazar.
+    XLSX için openpyxl write_only modu, PDF için QPdfWriter kullanılır;
+    her ay satır satır üretilip yazıldığı için bellek ay sayısıyla büyümez.
+    Modelin nesnelerine dokunmaz: indeksin anlık görüntüsü ve {tür: hex}
+    renk haritası başlatılmadan önce GUI thread'inde hazırlanır.
+    """
+    ilerleme = Signal(int)
+    islem_bitti = Signal(bool, str)
+
+    def __init__(self, indeks, renkler, aylar, dosya_yolu):
+        super().__init__()
+        self.indeks = indeks
+        self.renkler = dict(renkler)
+        self._qrenkler = {}
+        self.aylar = list(aylar)
+        self.dosya_yolu = dosya_yolu
+
+    def _hex(self, tur):
+        return self.renkler.get(tur, IzinTakvimModel.VARSAYILAN_RENK)
+
+    def _qrenk(self, tur):
+        renk = self._qrenkler.get(tur)
+        if renk is None:
+            renk = self._qrenkler[tur] = QColor(self._hex(tur))
+        return renk
+
+    def run(self):
+        try:
+            if self.dosya_yolu.lower().endswith('.pdf'):
+                self._pdf_yaz()
+            else:
+                self._xlsx_yaz()
+            self.islem_bitti.emit(True, self.dosya_yolu)
+        except Exception as e:
+            self.islem_bitti.emit(False, str(e))
+
+    def _xlsx_yaz(self):
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import PatternFill, Font, Alignment
+
+        wb = Workbook(write_only=True)
+        dolgu_cache = {}
+        hafta_sonu_dolgu = PatternFill("solid", fgColor="D9D9D9")
+        kalin = Font(bold=True)
+        orta = Alignment(horizontal="center")
+
+        for i, (yil, ay) in enumerate(self.aylar, 1):
+            ws = wb.create_sheet(f"{AYLAR_TR[ay]} {yil}")
+            gun_sayisi = calendar.monthrange(yil, ay)[1]
+            ilk_hafta_gunu = date(yil, ay, 1).weekday()
+            ws.column_dimensions['A'].width = 28
+
+            baslik = [WriteOnlyCell(ws, value="Personel")]
+            for g in range(gun_sayisi):
+                hucre = WriteOnlyCell(ws, value=g + 1)
+                hucre.font = kalin; hucre.alignment = orta
+                if (ilk_hafta_gunu + g) % 7 >= 5: hucre.fill = hafta_sonu_dolgu
+                baslik.append(hucre)
+            baslik[0].font = kalin
+            ws.append(baslik)
+
+            for ad, gunler in self.indeks.ay_satirlari(yil, ay):
+                satir = [ad]
+                for g, izin in enumerate(gunler):
+                    if izin:
+                        tur = izin['tur']
+                        dolgu = dolgu_cache.get(tur)
+                        if dolgu is None:
+                            dolgu = PatternFill("solid", fgColor=self._hex(tur)[1:].upper())
+                            dolgu_cache[tur] = dolgu
+                        hucre = WriteOnlyCell(ws, value=tur[:1].upper())
+                        hucre.fill = dolgu; hucre.alignment = orta
+                        satir.append(hucre)
+                    elif (ilk_hafta_gunu + g) % 7 >= 5:
+                        hucre = WriteOnlyCell(ws, value=None)
+                        hucre.fill = hafta_sonu_dolgu
+                        satir.append(hucre)
+                    else:
+                        satir.append(None)
+                ws.append(satir)
+
+            self.ilerleme.emit(int(i / len(self.aylar) * 100))
+
+        wb.save(self.dosya_yolu)
+
+    def _pdf_yaz(self):
+        writer = QPdfWriter(self.dosya_yolu)
+        writer.setResolution(150)
+        layout = QPageLayout(QPageSize(QPageSize.A4), QPageLayout.Landscape, QMarginsF(10, 10, 10, 10))
+        writer.setPageLayout(layout)
+
+        painter = QPainter(writer)
+        try:
+            sayfa = writer.pageLayout().paintRectPixels(writer.resolution())
+            genislik, yukseklik = sayfa.width(), sayfa.height()
+            ad_genislik = genislik * 0.2
+            satir_yuk = writer.resolution() * 0.18
+            baslik_yuk = satir_yuk * 2
+            hafta_sonu = QColor("#d9d9d9")
+            cizgi = QPen(QColor("#999999"), 1)
+            yazi = QPen(QColor("#000000"))
+            font = QFont("Segoe UI", 7)
+            font_baslik = QFont("Segoe UI", 11, QFont.Bold)
+            ilk_sayfa = True
+
+            for i, (yil, ay) in enumerate(self.aylar, 1):
+                gun_sayisi = calendar.monthrange(yil, ay)[1]
+                ilk_hafta_gunu = date(yil, ay, 1).weekday()
+                hucre_gen = (genislik - ad_genislik) / gun_sayisi
+
+                def sayfa_baslat(devam=False):
+                    nonlocal ilk_sayfa
+                    if not ilk_sayfa:
+                        writer.newPage()
+                    ilk_sayfa = False
+                    painter.setFont(font_baslik)
+                    painter.setPen(yazi)
+                    ek = " (devam)" if devam else ""
+                    painter.drawText(QRectF(0, 0, genislik, baslik_yuk), Qt.AlignCenter, f"Personel İzin Çizelgesi - {AYLAR_TR[ay]} {yil}{ek}")
+                    painter.setFont(font)
+                    y0 = baslik_yuk
+                    for g in range(gun_sayisi):
+                        r = QRectF(ad_genislik + g * hucre_gen, y0, hucre_gen, satir_yuk)
+                        if (ilk_hafta_gunu + g) % 7 >= 5:
+                            painter.fillRect(r, hafta_sonu)
+                        painter.setPen(cizgi); painter.drawRect(r)
+                        painter.setPen(yazi); painter.drawText(r, Qt.AlignCenter, str(g + 1))
+                    return y0 + satir_yuk
+
+                y = sayfa_baslat()
+                for ad, gunler in self.indeks.ay_satirlari(yil, ay):
+                    if y + satir_yuk > yukseklik:
+                        y = sayfa_baslat(devam=True)
+                    painter.setPen(yazi)
+                    painter.drawText(QRectF(2, y, ad_genislik - 4, satir_yuk), Qt.AlignVCenter | Qt.AlignLeft, str(ad))
+                    for g, izin in enumerate(gunler):
+                        r = QRectF(ad_genislik + g * hucre_gen, y, hucre_gen, satir_yuk)
+                        if izin:
+                            painter.fillRect(r, self._qrenk(izin['tur']))
+                        elif (ilk_hafta_gunu + g) % 7 >= 5:
+                            painter.fillRect(r, hafta_sonu)
+                        painter.setPen(cizgi); painter.drawRect(r)
+                    y += satir_yuk
+
+                self.ilerleme.emit(int(i / len(self.aylar) * 100))
+        finally:
+            painter.end()
+
+class DisaAktarDialog(QDialog):
+    """Dışa aktarılacak ay aralığını seçtirir (varsayılan: içinde bulunulan yıl)."""
+
+    def __init__(self, yil, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Çizelgeyi Dışa Aktar")
+        form = QFormLayout(self)
+
+        self.dt_bas = QDateEdit(QDate(yil, 1, 1)); self.dt_bas.setDisplayFormat("MM.yyyy"); self.dt_bas.setCalendarPopup(True)
+        self.dt_bit = QDateEdit(QDate(yil, 12, 1)); self.dt_bit.setDisplayFormat("MM.yyyy"); self.dt_bit.setCalendarPopup(True)
+        form.addRow("Başlangıç Ayı:", self.dt_bas)
+        form.addRow("Bitiş Ayı:", self.dt_bit)
+
+        butonlar = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        butonlar.accepted.connect(self.accept)
+        butonlar.rejected.connect(self.reject)
+        form.addRow(butonlar)
+
+    def aylar(self):
+        b, e = self.dt_bas.date(), self.dt_bit.date()
+        if (b.year(), b.month()) > (e.year(), e.month()):
+            b, e = e, b
+        return list(ay_araligi(b.year(), b.month(), e.year(), e.month()))
+
 # =============================================================================
 # ANA PENCERE
 # =============================================================================
@@ -143,7 +562,7 @@ class IzinTakvimPenceresi(QWidget):
                 font-weight: bold;
                 color: #4dabf7;
             }
-            QTableWidget {
+            QTableView {
                 background-color: #1e1e1e;
                 border: none;
                 gridline-color: transparent; 
@@ -157,7 +576,7 @@ class IzinTakvimPenceresi(QWidget):
                 font-weight: bold;
                 font-size: 12px;
             }
-            /* NOT: QTableWidget::item burada YOK, çünkü Delegate kullanıyoruz. */
+            /* NOT: QTableView::item burada YOK, çünkü Delegate kullanıyoruz. */
             
             QScrollBar:horizontal { border: none; background: #121212; height: 10px; }
             QScrollBar::handle:horizontal { background: #444; min-width: 20px; border-radius: 5px; }
@@ -185,13 +604,17 @@ class IzinTakvimPenceresi(QWidget):
         self.btn_prev = QPushButton("◀ Önceki Ay"); self.btn_prev.setFixedSize(100, 30); self.btn_prev.clicked.connect(self._onceki_ay)
         self.lbl_tarih = QLabel("..."); self.lbl_tarih.setObjectName("Title"); self.lbl_tarih.setAlignment(Qt.AlignCenter)
         self.btn_next = QPushButton("Sonraki Ay ▶"); self.btn_next.setFixedSize(100, 30); self.btn_next.clicked.connect(self._sonraki_ay)
-        self.btn_yenile = QPushButton("⟳ Verileri Yenile"); self.btn_yenile.clicked.connect(self.verileri_yukle)
+        self.btn_yenile = QPushButton("⟳ Verileri Yenile"); self.btn_yenile.clicked.connect(lambda: self.verileri_yukle(force_refresh=True))
+        self.btn_disa_aktar = QPushButton("⤓ Dışa Aktar"); self.btn_disa_aktar.setObjectName("btn_disa_aktar"); self.btn_disa_aktar.clicked.connect(self._disa_aktar)
+        self.pbar = QProgressBar(); self.pbar.setFixedWidth(120); self.pbar.setVisible(False)
         
-        h_top.addWidget(self.btn_prev); h_top.addStretch(); h_top.addWidget(self.lbl_tarih); h_top.addStretch(); h_top.addWidget(self.btn_next); h_top.addSpacing(20); h_top.addWidget(self.btn_yenile)
+        h_top.addWidget(self.btn_prev); h_top.addStretch(); h_top.addWidget(self.lbl_tarih); h_top.addStretch(); h_top.addWidget(self.btn_next); h_top.addSpacing(20); h_top.addWidget(self.btn_yenile); h_top.addWidget(self.btn_disa_aktar); h_top.addWidget(self.pbar)
         main_layout.addWidget(top_bar)
         
-        # TABLO
-        self.table = QTableWidget()
+        # TABLO (Model tabanlı: hücre nesnesi üretilmez)
+        self.model = IzinTakvimModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         
         # 🟢 ÖZEL DELEGATE ATAMASI (Çizgiyi bu çizecek)
         self.table.setItemDelegate(SatirCizgiliDelegate(self.table))
@@ -223,18 +646,20 @@ class IzinTakvimPenceresi(QWidget):
 
     def _renkler_geldi(self, renk_map):
         self.ozel_renkler = renk_map
+        self.model.renkleri_ayarla(renk_map)
         self._lejand_guncelle()
         self.verileri_yukle()
 
-    def verileri_yukle(self):
+    def verileri_yukle(self, force_refresh=False):
         self.btn_yenile.setText("Veriler Yükleniyor...")
         self.btn_yenile.setEnabled(False)
-        self.worker = TakvimWorker()
+        self.worker = TakvimWorker(force_refresh=force_refresh)
         self.worker.veri_hazir.connect(self._veri_geldi)
         self.worker.start()
 
     def _veri_geldi(self, data):
         self.izin_verileri = data
+        self.model.izinleri_ayarla(data)
         self.btn_yenile.setText("⟳ Verileri Yenile")
         self.btn_yenile.setEnabled(True)
         self.cizelgeyi_ciz()
@@ -258,12 +683,6 @@ class IzinTakvimPenceresi(QWidget):
             col += 1
             if col >= max_cols: col = 0; row += 1
 
-    def _renk_bul(self, izin_turu):
-        if izin_turu in self.ozel_renkler: return self.ozel_renkler[izin_turu]
-        for db_tur, db_renk in self.ozel_renkler.items():
-            if db_tur.lower() == izin_turu.lower(): return db_renk
-        return "#868e96"
-
     def _onceki_ay(self):
         self.current_date = (self.current_date.replace(day=1) - timedelta(days=1)).replace(day=1); self.cizelgeyi_ciz()
 
@@ -274,53 +693,37 @@ class IzinTakvimPenceresi(QWidget):
 
     def cizelgeyi_ciz(self):
         yil, ay = self.current_date.year, self.current_date.month
-        gun_sayisi = calendar.monthrange(yil, ay)[1]
-        aylar_tr = ["", "Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran", "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
-        self.lbl_tarih.setText(f"{aylar_tr[ay]} {yil}")
+        self.lbl_tarih.setText(f"{AYLAR_TR[ay]} {yil}")
+        # Sadece model sıfırlanır; hücreler görünür oldukça hesaplanır
+        self.model.ay_ayarla(yil, ay)
 
-        self.table.clear(); self.table.setColumnCount(gun_sayisi)
-        self.table.setHorizontalHeaderLabels([str(i) for i in range(1, gun_sayisi + 1)])
-        
-        ay_basi = datetime(yil, ay, 1).date(); ay_sonu = datetime(yil, ay, gun_sayisi).date()
-        
-        ilgili_personeller = set(); personel_izinleri = {}
-        for izin in self.izin_verileri:
-            if izin['bas'] <= ay_sonu and izin['bit'] >= ay_basi:
-                ad = izin['ad']; ilgili_personeller.add(ad)
-                personel_izinleri.setdefault(ad, []).append(izin)
-        
-        sorted_personel = sorted(list(ilgili_personeller))
-        self.table.setRowCount(len(sorted_personel)); self.table.setVerticalHeaderLabels(sorted_personel)
-        
-        brush_weekend = QBrush(QColor("#252525"))
-        brush_default = QBrush(QColor("#1e1e1e"))
-        
-        for r in range(self.table.rowCount()):
-            for c in range(self.table.columnCount()):
-                gun_tarih = datetime(yil, ay, c + 1).date()
-                bg = brush_weekend if gun_tarih.weekday() >= 5 else brush_default
-                item = QTableWidgetItem(""); item.setBackground(bg)
-                self.table.setItem(r, c, item)
-
-        for row_idx, ad in enumerate(sorted_personel):
-            izinler = personel_izinleri.get(ad, [])
-            for izin in izinler:
-                eff_bas = max(izin['bas'], ay_basi); eff_bit = min(izin['bit'], ay_sonu)
-                start_day = eff_bas.day; end_day = eff_bit.day
-                
-                hex_color = self._renk_bul(izin['tur'])
-                qcolor = QColor(hex_color)
-                
-                for d in range(start_day, end_day + 1):
-                    col_idx = d - 1
-                    item = self.table.item(row_idx, col_idx)
-                    
-                    if item:
-                        item.setText("X")
-                        item.setTextAlignment(Qt.AlignCenter)
-                        item.setBackground(qcolor)
-                        item.setForeground(qcolor) 
-                        item.setToolTip(f"{ad}\n{izin['tur']}\n{izin['bas'].strftime('%d.%m.%Y')} - {izin['bit'].strftime('%d.%m.%Y')}")
+    def _disa_aktar(self):
+        if not len(self.model.indeks):
+            show_info("Bilgi", "Dışa aktarılacak izin verisi yok.", self)
+            return
+        dlg = DisaAktarDialog(self.current_date.year, self)
+        if dlg.exec() != QDialog.Accepted:
+            return
+        aylar = dlg.aylar()
+        varsayilan = f"Izin_Cizelgesi_{aylar[0][0]}_{aylar[0][1]:02d}-{aylar[-1][0]}_{aylar[-1][1]:02d}.xlsx"
+        path, _ = QFileDialog.getSaveFileName(self, "Kaydet", varsayilan, "Excel (*.xlsx);;PDF (*.pdf)")
+        if not path:
+            return
+
+        self.btn_disa_aktar.setEnabled(False)
+        self.pbar.setValue(0); self.pbar.setVisible(True)
+        self.export_worker = TakvimDisaAktarWorker(self.model.indeks.kopya(), self.model.renk_haritasi(), aylar, path)
+        self.export_worker.ilerleme.connect(self.pbar.setValue)
+        self.export_worker.islem_bitti.connect(self._disa_aktarim_bitti)
+        self.export_worker.start()
+
+    def _disa_aktarim_bitti(self, basarili, mesaj):
+        self.btn_disa_aktar.setEnabled(True)
+        self.pbar.setVisible(False)
+        if basarili:
+            show_info("Tamam", f"Çizelge kaydedildi:\n{mesaj}", self)
+        else:
+            show_error("Hata", f"Dışa aktarım başarısız: {mesaj}", self)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -33,6 +33,10 @@ try:
     from temalar.tema import TemaYonetimi
     from google_baglanti import veritabani_getir, GoogleDriveService
     from araclar.ortak_araclar import show_info, show_error, pencereyi_kapat
+    from araclar.tarih_araclari import tarih_coz
+    from araclar.toplu_yazici import a1_araligi
+    from araclar.metin_araclari import katla
+    from services.bakim_planlama import bakim_planlayici
 except ImportError as e:
     print(f"Modül Hatası: {e}")
     # Fallback
@@ -114,11 +118,13 @@ class IslemKaydedici(QThread):
                 # Güncelleme
                 cell = ws.find(self.kayit_id)
                 if cell:
-                    range_str = f"A{cell.row}:J{cell.row}"
+                    range_str = a1_araligi(cell.row, 1, len(self.veri))
                     ws.update(range_str, [self.veri])
                 else:
                     raise Exception("Güncellenecek kayıt veritabanında bulunamadı.")
 
+            # Bakım/kalibrasyon takvimi tabloyu bir sonraki açılışta yeniden çeker
+            bakim_planlayici.yenilenecek_isaretle('cihaz:Kalibrasyon')
             self.islem_tamam.emit()
             
         except Exception as e:
@@ -469,13 +475,12 @@ class KalibrasyonEklePenceresi(QWidget):
             self.tablo.setItem(r, 2, QTableWidgetItem(firma))
             
             item_tarih = QTableWidgetItem(bitis)
-            try:
-                bitis_dt = datetime.datetime.strptime(bitis, "%Y-%m-%d").date()
+            bitis_dt = tarih_coz(bitis)
+            if bitis_dt:
                 kalan = (bitis_dt - datetime.date.today()).days
                 if kalan < 0: item_tarih.setForeground(QColor("#ef5350"))
                 elif kalan < 30: item_tarih.setForeground(QColor("#ffca28"))
                 else: item_tarih.setForeground(QColor("#66bb6a"))
-            except: pass
             self.tablo.setItem(r, 3, item_tarih)
             self.tablo.setItem(r, 4, QTableWidgetItem(durum))
             
@@ -605,12 +610,12 @@ class KalibrasyonEklePenceresi(QWidget):
         show_error("Hata", msg, self)
 
     def tabloyu_filtrele(self, text):
-        text = text.lower()
+        text = katla(text)
         for i in range(self.tablo.rowCount()):
             match = False
             for j in range(self.tablo.columnCount()):
                 item = self.tablo.item(i, j)
-                if item and text in item.text().lower():
+                if item and text in katla(item.text()):
                     match = True
                     break
             self.tablo.setRowHidden(i, not match)
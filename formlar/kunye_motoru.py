@@ -1,14 +1,50 @@
 # formlar/kunye_motoru.py
+import io
 import os
-import qrcode
-from docxtpl import DocxTemplate, InlineImage
-from docx2pdf import convert
-from docx.shared import Mm
 import logging
 
+from araclar.tembel_yukleme import tembel_modul, modul_var_mi
+
+# Kütüphaneler künye ilk üretildiğinde yüklenir; kurulu değillerse modül
+# içe aktarılamaz ve formlar künye özelliğini kapatır (önceki davranış).
+for _kutuphane in ("qrcode", "docxtpl", "docx2pdf"):
+    if not modul_var_mi(_kutuphane):
+        raise ImportError(f"Künye için '{_kutuphane}' kütüphanesi gerekli.")
+
+qrcode = tembel_modul("qrcode")
+_docx2pdf = tembel_modul("docx2pdf")
+# Şablon bir kez ayrıştırılır, her künye önbellekteki kopyadan üretilir
+_sablonlar = tembel_modul("araclar.sablon_onbellegi")
+
+QR_GENISLIGI_MM = 30
+
 # Loglama
 logger = logging.getLogger("KunyeMotoru")
 
+
+def qr_png(veri):
+    """Cihaz özet bilgisini içeren QR kodunun PNG baytları."""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=2,
+    )
+    # QR Kod içeriği: Özet bilgi
+    info_str = f"ID: {veri.get('cihaz_id')}\nMarka: {veri.get('marka')}\nModel: {veri.get('model')}\nSeri: {veri.get('seri_no')}"
+    qr.add_data(info_str)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white")
+    tampon = io.BytesIO()
+    img.save(tampon)
+    return tampon.getvalue()
+
+
+def kunye_hazirla(veri):
+    """Toplu üretimde her künye için süreçte çağrılır: QR kodunu resim olarak ekler."""
+    return veri, {'qr_kodu': qr_png(veri)}
+
+
 class KunyeOlusturucu:
     def __init__(self, sablon_yolu):
         self.sablon_yolu = sablon_yolu
@@ -18,18 +54,8 @@ class KunyeOlusturucu:
 
     def qr_kod_olustur(self, veri):
         """Cihaz verilerini içeren bir QR kod üretir."""
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=2,
-        )
-        # QR Kod içeriği: Özet bilgi
-        info_str = f"ID: {veri.get('cihaz_id')}\nMarka: {veri.get('marka')}\nModel: {veri.get('model')}\nSeri: {veri.get('seri_no')}"
-        qr.add_data(info_str)
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white")
-        img.save(self.gecici_qr)
+        with open(self.gecici_qr, 'wb') as f:
+            f.write(qr_png(veri))
         return self.gecici_qr
 
     def belge_olustur(self, veri_sozlugu, cikis_klasoru=None):
@@ -38,25 +64,16 @@ class KunyeOlusturucu:
         Geriye PDF dosyasının yolunu döndürür.
         """
         try:
-            doc = DocxTemplate(self.sablon_yolu)
-            
-            # QR Kodu oluştur ve sözlüğe ekle (Resim olarak)
+            # QR Kodu oluştur; şablonda {{qr_kodu}} yazan yere resim olarak gelir
             self.qr_kod_olustur(veri_sozlugu)
-            
-            # Word içine resmi gömmek için InlineImage nesnesi
-            # Şablonda {{qr_kodu}} yazan yere resim gelir.
-            qr_img = InlineImage(doc, self.gecici_qr, width=Mm(30))
-            veri_sozlugu['qr_kodu'] = qr_img
-            
-            # Şablonu render et (Jinja2 motoru)
-            doc.render(veri_sozlugu)
-            
-            # Geçici Docx olarak kaydet
-            doc.save(self.gecici_docx)
+
+            # Şablonu render et (Jinja2 motoru) ve geçici Docx olarak kaydet
+            _sablonlar.belge_olustur(self.sablon_yolu, veri_sozlugu, self.gecici_docx,
+                                     {'qr_kodu': self.gecici_qr}, QR_GENISLIGI_MM)
             
             # PDF'e Dönüştür
             try:
-                convert(self.gecici_docx, self.gecici_pdf)
+                _docx2pdf.convert(self.gecici_docx, self.gecici_pdf)
                 sonuc_dosyasi = self.gecici_pdf
             except Exception as e:
                 logger.error(f"PDF Dönüşüm Hatası (Word kurulu mu?): {e}")
@@ -69,6 +86,18 @@ class KunyeOlusturucu:
             logger.error(f"Künye oluşturma hatası: {e}")
             return None
 
+    def toplu_olustur(self, veriler, hedef, surec_sayisi=None, ilerleme=None):
+        """
+        Birden çok cihazın künyesini (ör. bir birimin tüm cihazları) DOCX olarak üretir.
+        Belgeler süreç havuzunda doldurulur; hedef bir klasör ya da '.zip' yoludur.
+        PDF dönüşümü Word'ü tek tek açtığından toplu üretimde yapılmaz.
+        Dönüş: her künye için BelgeSonucu(ad, yol, sure_ms, hata).
+        """
+        isler = [(f"{veri.get('cihaz_id') or 'kunye'}_kunye", veri) for veri in veriler]
+        return _sablonlar.toplu_olustur(self.sablon_yolu, isler, hedef, surec_sayisi=surec_sayisi,
+                                        hazirlayici=kunye_hazirla, resim_genisligi_mm=QR_GENISLIGI_MM,
+                                        ilerleme=ilerleme)
+
     def temizle(self):
         """Geçici dosyaları siler."""
         for f in [self.gecici_docx, self.gecici_pdf, self.gecici_qr]:
@@ -15,19 +15,17 @@ if root_dir not in sys.path:
 
 # --- IMPORTLAR ---
 # DİKKAT: 'from main import AnaPencere' SATIRINI SİLİN!
-from araclar.guvenlik import GuvenlikAraclari
+from services.kimlik_deposu import kimlik_deposu, GIRIS_BASARILI, SIFRE_HATALI
 try:
     from formlar.sifre_degistir import SifreDegistirPenceresi
 except ImportError:
     pass
 
 try:
-    from google_baglanti import veritabani_getir
     from temalar.tema import TemaYonetimi
 except ImportError:
     pass
 
-# ... (GirisWorker sınıfı aynen kalacak) ...
 class GirisWorker(QThread):
     sonuc = Signal(bool, str, str, str)
 
@@ -38,38 +36,19 @@ class GirisWorker(QThread):
 
     def run(self):
         try:
-            ws = veritabani_getir('user', 'user_login')
-            # ...
-            
-            records = ws.get_all_records()
-            
-            for i, user in enumerate(records):
-                vt_kadi = str(user.get('username', '')).strip()
-                vt_sifre_hash = str(user.get('password', '')).strip() # Artık veritabanından HASH geliyor
-                
-                # Kontrol: Kullanıcı adı eşleşiyor mu?
-                if vt_kadi == self.kadi:
-                    
-                    # Şifre Kontrolü (Hashleyerek kıyasla)
-                    if GuvenlikAraclari.dogrula(self.sifre, vt_sifre_hash):
-                        
-                        # --- GİRİŞ BAŞARILI ---
-                        rol = str(user.get('roller', 'user'))
-                        degisim_gerekli = str(user.get('degisim_gerekli', 'HAYIR')).upper()
-                        
-                        if degisim_gerekli == 'EVET':
-                            self.sonuc.emit(True, "CHANGE_REQUIRED", vt_kadi, rol)
-                            return
-                        
-                        # ... (Tarih güncelleme ve OK sinyali aynı) ...
-                        self.sonuc.emit(True, "OK", vt_kadi, rol)
-                        return
-                    else:
-                        # Kullanıcı adı doğru ama şifre yanlış
-                        self.sonuc.emit(False, "Şifre hatalı.", "", "")
-                        return
-            
-            self.sonuc.emit(False, "Kullanıcı bulunamadı.", "", "")
+            # Kullanıcı adı indeksli yerel depo (açılış hazırlığında senkronlanır)
+            durum, kayit = kimlik_deposu.dogrula(self.kadi, self.sifre)
+
+            if durum == GIRIS_BASARILI:
+                if kayit.degisim_gerekli:
+                    self.sonuc.emit(True, "CHANGE_REQUIRED", kayit.kadi, kayit.rol)
+                    return
+                self.sonuc.emit(True, "OK", kayit.kadi, kayit.rol)
+            elif durum == SIFRE_HATALI:
+                # Kullanıcı adı doğru ama şifre yanlış
+                self.sonuc.emit(False, "Şifre hatalı.", "", "")
+            else:
+                self.sonuc.emit(False, "Kullanıcı bulunamadı.", "", "")
 
         except Exception as e:
             self.sonuc.emit(False, f"Hata: {e}", "", "")
@@ -5,7 +5,6 @@ import datetime
 import calendar
 import time
 import logging
-from dateutil.relativedelta import relativedelta 
 
 from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                                QTableWidget, QTableWidgetItem, QHeaderView, 
@@ -22,6 +21,8 @@ logger = logging.getLogger("PeriyodikBakim")
 
 # --- AYARLAR ---
 DRIVE_KLASOR_ID = "1KIYRhomNGppMZCXbqyngT2kH0X8c-GEK" 
+# Tablonun üstündeki iş yükü özetinin kapsadığı hafta sayısı
+YUK_HAFTA_SAYISI = 4
 
 # --- YOL AYARLARI ---
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -33,12 +34,16 @@ if root_dir not in sys.path:
 try:
     from araclar.yetki_yonetimi import YetkiYoneticisi
     from temalar.tema import TemaYonetimi
-    from google_baglanti import veritabani_getir, GoogleDriveService
+    from google_baglanti import veritabani_getir, veritabani_getir_cached, GoogleDriveService
     from araclar.ortak_araclar import show_info, show_error, pencereyi_kapat
+    from araclar.tarih_araclari import tarih_coz
+    from araclar.toplu_yazici import a1_araligi
+    from services.bakim_planlama import bakim_planlayici, plan_satirlari, BAKIM, KALIBRASYON
 except ImportError as e:
     print(f"Modül Hatası: {e}")
     # Fallback
     def veritabani_getir(vt, sayfa): return None
+    def veritabani_getir_cached(vt, sayfa, force_refresh=False): return []
     def show_info(t, m, p): print(m)
     def show_error(t, m, p): print(m)
     def pencereyi_kapat(w): w.close()
@@ -48,65 +53,42 @@ except ImportError as e:
         @staticmethod
         def uygula_fusion_dark(app): pass
 
-# --- YARDIMCI FONKSİYONLAR ---
-def ay_ekle(kaynak_tarih, ay_sayisi):
-    return kaynak_tarih + relativedelta(months=ay_sayisi)
-
 # =============================================================================
 # 1. THREAD SINIFLARI
 # =============================================================================
 class VeriYukleyici(QThread):
-    veri_hazir = Signal(list, dict, list, dict)
+    veri_hazir = Signal(list, dict, list)
     hata_olustu = Signal(str)
     
+    def __init__(self, force_refresh=False):
+        super().__init__()
+        self.force_refresh = force_refresh
+
     def run(self):
         cihaz_listesi_combo = [] 
         cihaz_dict = {}          
         bakimlar = []
-        header_map = {}
         
         try:
-            # 1. CİHAZLARI ÇEK
-            ws_cihaz = veritabani_getir('cihaz', 'Cihazlar')
-            if ws_cihaz:
-                raw_cihaz = ws_cihaz.get_all_values()
-                if len(raw_cihaz) > 1:
-                    headers = [str(h).strip() for h in raw_cihaz[0]]
-                    idx_id = -1; idx_marka = -1; idx_model = -1
-                    
-                    for i, h in enumerate(headers):
-                        if h in ["cihaz_id", "CihazID", "kayit_no"]: idx_id = i
-                        elif h == "Marka": idx_marka = i
-                        elif h == "Model": idx_model = i
-                    
-                    if idx_id != -1:
-                        for row in raw_cihaz[1:]:
-                            if len(row) > idx_id:
-                                c_id = str(row[idx_id]).strip()
-                                c_marka = str(row[idx_marka]).strip() if idx_marka != -1 and len(row) > idx_marka else ""
-                                c_model = str(row[idx_model]).strip() if idx_model != -1 and len(row) > idx_model else ""
-                                
-                                if c_id:
-                                    guzel_isim = f"{c_id} | {c_marka} {c_model}"
-                                    cihaz_listesi_combo.append(guzel_isim)
-                                    cihaz_dict[c_id] = f"{c_marka} {c_model}"
-
-            # 2. BAKIMLARI ÇEK
-            ws_bakim = veritabani_getir('cihaz', 'Periyodik_Bakim')
-            if ws_bakim:
-                raw_bakim = ws_bakim.get_all_values()
-                if len(raw_bakim) > 0:
-                    headers = [str(h).strip() for h in raw_bakim[0]]
-                    for i, h in enumerate(headers):
-                        header_map[h] = i
-                    if len(raw_bakim) > 1:
-                        bakimlar = raw_bakim[1:]
+            # 1. CİHAZLAR (önbellekten)
+            for row in veritabani_getir_cached('cihaz', 'Cihazlar', force_refresh=self.force_refresh) or []:
+                c_id = str(row.get('cihaz_id', row.get('CihazID', row.get('kayit_no', '')))).strip()
+                c_marka = str(row.get('Marka', '')).strip()
+                c_model = str(row.get('Model', '')).strip()
+                if c_id:
+                    guzel_isim = f"{c_id} | {c_marka} {c_model}"
+                    cihaz_listesi_combo.append(guzel_isim)
+                    cihaz_dict[c_id] = f"{c_marka} {c_model}"
+
+            # 2. BAKIM PLANLARI (indeksli takvim; tablolar güncelse tekrar çekilmez)
+            bakim_planlayici.hazirla(force_refresh=self.force_refresh)
+            bakimlar = bakim_planlayici.bakim_kayitlari()
                     
         except Exception as e:
             logger.error(f"Veri yükleme hatası: {e}")
             self.hata_olustu.emit(str(e))
         
-        self.veri_hazir.emit(sorted(cihaz_listesi_combo), cihaz_dict, bakimlar, header_map)
+        self.veri_hazir.emit(sorted(cihaz_listesi_combo), cihaz_dict, bakimlar)
 
 class IslemKaydedici(QThread):
     islem_tamam = Signal()
@@ -124,15 +106,14 @@ class IslemKaydedici(QThread):
 
             if self.tip == "INSERT":
                 ws_bakim.append_rows(self.veri)
+                bakim_planlayici.plan_ekle(self.veri)
             elif self.tip == "UPDATE":
                 satir_no = self.veri[0]
                 yeni_degerler = self.veri[1]
-                # A'dan başlayıp veri uzunluğu kadar git
-                baslangic_col = "A"
-                bitis_col = chr(ord('A') + len(yeni_degerler) - 1)
-                # Eğer Z'yi geçerse bu mantık patlar ama şimdilik yeterli (13 sütun var)
-                range_adresi = f"{baslangic_col}{satir_no}:{bitis_col}{satir_no}"
+                # A'dan başlayıp veri uzunluğu kadar git (Z'den sonrası AA, AB...)
+                range_adresi = a1_araligi(satir_no, 1, len(yeni_degerler))
                 ws_bakim.update(range_name=range_adresi, values=[yeni_degerler])
+                bakim_planlayici.plan_guncelle(satir_no - 2, yeni_degerler)
 
             self.islem_tamam.emit()
         except Exception as e:
@@ -222,6 +203,9 @@ class InfoCard(QGroupBox):
 # 3. ANA PENCERE
 # =============================================================================
 class PeriyodikBakimPenceresi(QWidget):
+    # Form yöneticisi: tablolar form kurulurken önbelleğe çekilir
+    VERI_BAGIMLILIKLARI = (('cihaz', 'Cihazlar'),)
+
     def __init__(self, yetki='viewer', kullanici_adi=None):
         super().__init__()
         self.yetki = yetki
@@ -234,7 +218,6 @@ class PeriyodikBakimPenceresi(QWidget):
         self.control_buttons = {} 
         self.cihaz_sozlugu = {}   
         self.tum_bakimlar = []    
-        self.header_map = {}      
         
         self.secilen_plan_id = None
         self.secilen_dosya = None
@@ -351,10 +334,19 @@ class PeriyodikBakimPenceresi(QWidget):
         
         btn_yenile = QPushButton("⟳")
         btn_yenile.setFixedSize(35, 35)
-        btn_yenile.clicked.connect(self.verileri_yukle)
+        btn_yenile.clicked.connect(lambda: self.verileri_yukle(True))
         # Stil temaya bırakıldı
+
+        self.btn_donem_planla = QPushButton("Sonraki Dönemleri Planla")
+        self.btn_donem_planla.setCursor(Qt.PointingHandCursor)
+        self.btn_donem_planla.clicked.connect(self.donemleri_planla)
+
+        self.lbl_yuk = QLabel("")
+        self.lbl_yuk.setStyleSheet("color: #b0b0b0; font-size: 12px;")
         
+        filter_layout.addWidget(self.lbl_yuk)
         filter_layout.addStretch()
+        filter_layout.addWidget(self.btn_donem_planla)
         filter_layout.addWidget(QLabel("Ay Filtresi:"))
         filter_layout.addWidget(self.cmb_filtre_ay)
         filter_layout.addWidget(btn_yenile)
@@ -455,19 +447,18 @@ class PeriyodikBakimPenceresi(QWidget):
         if self.mevcut_link:
             QDesktopServices.openUrl(QUrl(self.mevcut_link))
 
-    def verileri_yukle(self):
+    def verileri_yukle(self, force_refresh=False):
         self.progress.setVisible(True)
         self.progress.setRange(0, 0)
-        self.loader = VeriYukleyici()
+        self.loader = VeriYukleyici(force_refresh)
         self.loader.veri_hazir.connect(self.veriler_geldi)
         self.loader.hata_olustu.connect(lambda e: self.progress.setVisible(False))
         self.loader.start()
 
-    def veriler_geldi(self, cihazlar_combo, cihaz_dict, bakimlar, header_map):
+    def veriler_geldi(self, cihazlar_combo, cihaz_dict, bakimlar):
         self.progress.setVisible(False)
         self.cihaz_sozlugu = cihaz_dict
         self.tum_bakimlar = bakimlar
-        self.header_map = header_map
         
         self.inputs["Cihaz"].clear()
         self.inputs["Cihaz"].addItem("") 
@@ -475,12 +466,22 @@ class PeriyodikBakimPenceresi(QWidget):
         self.inputs["Cihaz"].setEnabled(True)
             
         self.tabloyu_guncelle()
+        self.yuk_ozetini_guncelle()
+
+    def yuk_ozetini_guncelle(self):
+        bugun = datetime.date.today()
+        sayilar = bakim_planlayici.sayilar(bugun=bugun)
+        haftalar = bakim_planlayici.haftalik_yuk(bugun, bugun + datetime.timedelta(weeks=YUK_HAFTA_SAYISI - 1))
+        yuk = " / ".join(str(h['toplam']) for h in haftalar)
+        self.lbl_yuk.setText(
+            f"Geciken bakım: {sayilar[BAKIM]['geciken']}  |  "
+            f"Süresi dolan kalibrasyon: {sayilar[KALIBRASYON]['geciken']}  |  "
+            f"Haftalık iş yükü ({YUK_HAFTA_SAYISI} hafta): {yuk}"
+        )
 
     def get_val(self, row, header_name, default=""):
-        if header_name in self.header_map:
-            idx = self.header_map[header_name]
-            if idx < len(row): return str(row[idx])
-        return default
+        deger = row.get(header_name, default) if row else default
+        return str(deger)
 
     def tabloyu_guncelle(self):
         self.tablo.setRowCount(0)
@@ -490,10 +491,8 @@ class PeriyodikBakimPenceresi(QWidget):
             tarih = self.get_val(row, "PlanlananTarih", "")
             
             if ay_idx > 0:
-                try:
-                    dt = datetime.datetime.strptime(tarih, "%Y-%m-%d")
-                    if dt.month != ay_idx: continue
-                except: continue
+                dt = tarih_coz(tarih)
+                if not dt or dt.month != ay_idx: continue
             
             r = self.tablo.rowCount()
             self.tablo.insertRow(r)
@@ -688,41 +687,40 @@ class PeriyodikBakimPenceresi(QWidget):
                 self.saver.start()
                 return
 
-        # INSERT
-        tekrar = 1
-        ay_artis = 0
-        if "3 Ay" in periyot: tekrar, ay_artis = 4, 3
-        elif "6 Ay" in periyot: tekrar, ay_artis = 2, 6
-        elif "1 Yıl" in periyot: tekrar, ay_artis = 1, 12
-        
-        base_id = int(time.time())
-        satirlar = []
-        
-        for i in range(tekrar):
-            yeni_tarih = ay_ekle(tarih, i * ay_artis)
-            t_str = yeni_tarih.strftime("%Y-%m-%d")
-            
-            s_durum = durum if i == 0 else "Planlandı"
-            s_dosya = dosya_link if i == 0 else "-"
-            s_yapilan = yapilan if i == 0 else "-"
-            s_aciklama = aciklama if i == 0 else "-"
-            s_tek = teknisyen if i == 0 else "-"
-            
-            # İlk kayıt ve Yapıldı ise işlem tarihini koy
-            s_bakim_t = islem_tarih_str if (i == 0 and s_durum == "Yapıldı") else ""
-            
-            row = [
-                f"P-{base_id + i}", cihaz_id, periyot, f"{i+1}. Bakım",
-                t_str, "Periyodik", s_durum, s_bakim_t, 
-                "Periyodik", s_yapilan, s_aciklama, s_tek, s_dosya
-            ]
-            satirlar.append(row)
+        # INSERT (ilk dönem formdaki değerlerle, sonrakiler 'Planlandı')
+        satirlar = plan_satirlari(cihaz_id, periyot, tarih, int(time.time()), ilk={
+            "Durum": durum, "BakimTarihi": islem_tarih_str, "YapilanIslemler": yapilan,
+            "Açiklama": aciklama, "Teknisyen": teknisyen, "Rapor": dosya_link
+        })
             
         self.saver = IslemKaydedici("INSERT", satirlar)
         self.saver.islem_tamam.connect(self.islem_bitti)
         self.saver.hata_olustu.connect(self.hata_goster)
         self.saver.start()
 
+    def donemleri_planla(self):
+        """Son planı yaklaşan tüm tekrarlı serilerin bir sonraki dönemini tek seferde yazar."""
+        satirlar = bakim_planlayici.donem_planlari(int(time.time()))
+        if not satirlar:
+            show_info("Bilgi", "Yeni dönemi gelen bakım serisi yok.", self)
+            return
+        cihaz_sayisi = len({s[1] for s in satirlar})
+        cevap = QMessageBox.question(
+            self, "Dönem Planlama",
+            f"{cihaz_sayisi} cihaz için {len(satirlar)} yeni bakım planı oluşturulacak. Devam edilsin mi?"
+        )
+        if cevap != QMessageBox.Yes:
+            return
+
+        self.btn_donem_planla.setEnabled(False)
+        self.progress.setVisible(True)
+        self.progress.setRange(0, 0)
+        self.saver = IslemKaydedici("INSERT", satirlar)
+        self.saver.islem_tamam.connect(self.islem_bitti)
+        self.saver.hata_olustu.connect(self.hata_goster)
+        self.saver.finished.connect(lambda: self.btn_donem_planla.setEnabled(True))
+        self.saver.start()
+
     def islem_bitti(self):
         self.progress.setVisible(False)
         self.btn_kaydet.setEnabled(True)
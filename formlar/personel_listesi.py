@@ -11,7 +11,7 @@ from PySide6.QtCore import Qt, QThread, Signal, QSize
 from PySide6.QtGui import QAction, QIcon, QPixmap, QColor, QFont, QBrush
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QTableWidgetItem, QCheckBox, QMenu, QInputDialog, 
+    QTableView, QAbstractItemView, QCheckBox, QMenu, QInputDialog, 
     QApplication, QFrame, QProgressBar, QFileDialog, QPushButton, QGroupBox,
     QHeaderView, QMessageBox
 )
@@ -29,6 +29,9 @@ try:
     from araclar.ortak_araclar import (
         OrtakAraclar, show_info, show_error, show_question, pencereyi_kapat
     )
+    from araclar.arama_indeksi import SatirKumesiModeli
+    from araclar.liste_filtresi import ListeFiltresi, esit_kosulu
+    from araclar.tablo_modeli import KayitModeli
     from temalar.tema import TemaYonetimi
     
     # 🚀 YENİ: Service Katmanı
@@ -197,10 +200,62 @@ class SabitlerWorker(QThread):
         except:
             self.veri_indi.emit(["Tüm Birimler"], ["Tüm Sınıflar"])
 
+# =============================================================================
+# TABLO MODELİ
+# =============================================================================
+# Tabloda gösterilecek sütunların kaynak verideki indeksleri
+# 0=TC, 1=Ad, 4=Hizmet, 5=Ünvan, 6=Görev, 9=Tel
+GORUNEN_SUTUNLAR = [0, 1, 4, 5, 6, 9]
+IDX_RESIM = 19 # Resim URL'sinin olduğu sütun
+DURUM_RENKLERI = [("Aktif", "#4cd964"), ("Pasif", "#ff3b30"), ("İzin", "#ffcc00")]
+
+class PersonelModeli(KayitModeli):
+    """Personel satırları (liste) + avatar ikonları ve renkli durum sütunu."""
+
+    def __init__(self, idx_durum, parent=None):
+        basliklar = ["Foto", "TC Kimlik", "Ad Soyad", "Hizmet Sınıfı", "Ünvan", "Görev Yeri", "Cep Tel", "Durum"]
+        alanlar = [lambda r: ""] + GORUNEN_SUTUNLAR + [self._durum]
+        super().__init__(list(zip(basliklar, alanlar)), hizalamalar={0: Qt.AlignCenter, 7: Qt.AlignCenter},
+                         parent=parent)
+        self.idx_durum = idx_durum
+        self.ikonlar = {}  # kaynak satır -> QIcon
+        self._durum_fontu = QFont("Segoe UI", 9, QFont.Bold)
+        # Durum rengi satır başına bir kez hesaplanır (çizimde metin aranmaz)
+        self.rol_ayarla(Qt.ForegroundRole, 7, self._durum_rengi)
+
+    def _durum(self, row):
+        return row[self.idx_durum] if len(row) > self.idx_durum else "Aktif"
+
+    def _durum_rengi(self, row):
+        durum = str(self._durum(row))
+        for anahtar, renk in DURUM_RENKLERI:
+            if anahtar in durum:
+                return QColor(renk)
+        return QColor(Qt.white)
+
+    def kayitlari_ayarla(self, kayitlar, gosterim=None):
+        self.ikonlar = {}
+        super().kayitlari_ayarla(kayitlar, gosterim)
+
+    def ikon_ayarla(self, satir, pixmap):
+        self.ikonlar[satir] = QIcon(pixmap)
+        self.satir_degisti(satir, [Qt.DecorationRole])
+
+    def rol_verisi(self, satir, sutun, role):
+        if sutun == 0 and role == Qt.DecorationRole:
+            return self.ikonlar.get(satir)
+        if sutun == 7 and role == Qt.FontRole:
+            return self._durum_fontu
+        return None
+
 # =============================================================================
 # PERSONEL LİSTESİ FORMU
 # =============================================================================
 class PersonelListesiPenceresi(QWidget):
+    # Form yöneticisi: tablolar form kurulurken önbelleğe çekilir; kapatınca havuzda kalır
+    VERI_BAGIMLILIKLARI = (('personel', 'Personel'), ('sabit', 'Sabitler'))
+    YENIDEN_KULLANILABILIR = True
+
     def __init__(self, yetki='viewer', kullanici_adi="Sistem"):
         super().__init__()
         self.setWindowTitle("Personel Yönetim Paneli")
@@ -282,9 +337,26 @@ class PersonelListesiPenceresi(QWidget):
         main_layout.addWidget(filter_frame)
 
         # --- 2. TABLO ---
-        # Tablo başlıkları (Ekranda görünecekler)
-        headers = ["Foto", "TC Kimlik", "Ad Soyad", "Hizmet Sınıfı", "Ünvan", "Görev Yeri", "Cep Tel", "Durum"]
-        self.table = OrtakAraclar.create_table(self, headers)
+        # Model veri gelince bir kez doldurulur; filtreler yalnızca proxy'nin satırlarını değiştirir
+        self.model = PersonelModeli(self.idx_durum, self)
+        self.proxy = SatirKumesiModeli(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.table = QTableView(self)
+        self.table.setModel(self.proxy)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setAlternatingRowColors(True)
+        self.table.setShowGrid(False)
+        self.table.setSortingEnabled(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setStyleSheet("""
+            QTableView { border: 1px solid #444; background-color: #1e1e1e; gridline-color: #333; }
+            QHeaderView::section { background-color: #333; color: white; padding: 5px; border: none; font-weight: bold; }
+            QTableView::item { padding: 5px; color: #ddd; }
+            QTableView::item:selected { background-color: #1976d2; color: white; }
+        """)
         self.table.setIconSize(QSize(32, 32)) 
         
         header = self.table.horizontalHeader()
@@ -292,7 +364,7 @@ class PersonelListesiPenceresi(QWidget):
         header.setSectionResizeMode(0, QHeaderView.Fixed)
         self.table.setColumnWidth(0, 50) 
         
-        self.table.cellDoubleClicked.connect(self._detay_ac)
+        self.table.doubleClicked.connect(self._detay_ac)
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self._sag_tik_menu)
         
@@ -311,6 +383,10 @@ class PersonelListesiPenceresi(QWidget):
         footer.addWidget(self.btn_excel)
         main_layout.addLayout(footer)
 
+        self.filtre = ListeFiltresi(self.proxy)
+        self.filtre.kaynak_modeli_bagla(self.model)
+        self.filtre.filtrelendi.connect(lambda n: self.lbl_info.setText(f"Kayıt Sayısı: {n}"))
+
     def _create_filter_btn(self, text, color, func, text_color="white"):
         btn = QPushButton(text)
         btn.setStyleSheet(f"background-color: {color}; color: {text_color}; border: none;")
@@ -356,12 +432,29 @@ class PersonelListesiPenceresi(QWidget):
             self.idx_durum = self.basliklar.index("Durum")
         except ValueError:
             self.idx_durum = 23 # Fallback
-            
-        self._filtrele_tetikle() 
+
+        self._avatarlari_durdur()
+        # Koşullar önce kurulur; model yüklenince filtre kendiliğinden uygulanır
+        self._filtreleri_kur()
+        self.model.idx_durum = self.idx_durum
+        self.model.kayitlari_ayarla(self.ham_veri)
+
+        # Avatarlar filtreden bağımsız olarak bir kez yüklenir (kaynak satır numarasıyla)
+        avatar_queue = []
+        for i, row in enumerate(self.ham_veri):
+            resim_link = row[IDX_RESIM] if len(row) > IDX_RESIM else ""
+            if resim_link: avatar_queue.append((i, resim_link, row[0]))
+        if avatar_queue:
+            self.avatar_thread = AvatarWorker(avatar_queue, self.temp_avatar_dir)
+            self.avatar_thread.resim_hazir.connect(self.model.ikon_ayarla)
+            self.avatar_thread.start()
 
     def _filtrele_tetikle(self):
         if not self.ham_veri: return
-        
+        self._filtreleri_kur()
+        self.filtre.uygula()
+
+    def _filtreleri_kur(self):
         hedef_durum = self.secili_durum_filtresi
         hedef_birim = self.cmb_gorev_yeri.currentText()
         hedef_sinif = self.cmb_hizmet_filtre.currentText()
@@ -375,102 +468,45 @@ class PersonelListesiPenceresi(QWidget):
         
         try: idx_birim = self.basliklar.index("Gorev_Yeri")
         except: idx_birim = 6
-        
-        filtrelenmis = []
-        for row in self.ham_veri:
-            row_sinif = str(row[idx_sinif]).strip() if len(row) > idx_sinif else ""
-            row_birim = str(row[idx_birim]).strip() if len(row) > idx_birim else ""
-            row_durum = str(row[self.idx_durum]).strip() if len(row) > self.idx_durum else "Aktif"
-            
-            # Durum Filtresi
-            if hedef_durum != "Tümü":
-                if hedef_durum == "Aktif":
-                    if row_durum == "Pasif": continue
-                elif hedef_durum not in row_durum: continue
-            
-            # Birim ve Sınıf Filtresi
-            if hedef_birim and hedef_birim != row_birim: continue
-            if hedef_sinif and hedef_sinif != row_sinif: continue
-            
-            filtrelenmis.append(row)
-            
-        self._tabloyu_doldur(filtrelenmis)
 
-    def _tabloyu_doldur(self, veri_seti):
-        self.table.setRowCount(0)
+        # Durum Filtresi
+        durum_kosulu = None
+        if hedef_durum != "Tümü":
+            idx_durum = self.idx_durum
+            def satir_durumu(row):
+                return str(row[idx_durum]).strip() if len(row) > idx_durum else "Aktif"
+            if hedef_durum == "Aktif":
+                durum_kosulu = lambda row: satir_durumu(row) != "Pasif"
+            else:
+                durum_kosulu = lambda row: hedef_durum in satir_durumu(row)
+        self.filtre.kosul_ayarla("durum", durum_kosulu, uygula=False)
         
+        # Birim ve Sınıf Filtresi
+        self.filtre.kosul_ayarla("birim", esit_kosulu(idx_birim, hedef_birim) if hedef_birim else None, uygula=False)
+        self.filtre.kosul_ayarla("sinif", esit_kosulu(idx_sinif, hedef_sinif) if hedef_sinif else None, uygula=False)
+
+    def _avatarlari_durdur(self):
         if self.avatar_thread and self.avatar_thread.isRunning():
             self.avatar_thread.durdur()
             self.avatar_thread.wait()
-        
-        self.table.setRowCount(len(veri_seti))
-        self.lbl_info.setText(f"Kayıt Sayısı: {len(veri_seti)}")
-        
-        avatar_queue = [] 
-        
-        # Tabloda gösterilecek sütunların kaynak verideki indeksleri
-        # [TC, Ad, Hizmet, Ünvan, Görev, Tel] -> Bunların indekslerini bulmak en iyisi
-        # Şimdilik sabit: 0=TC, 1=Ad, 4=Hizmet, 5=Ünvan, 6=Görev, 9=Tel
-        col_indices = [0, 1, 4, 5, 6, 9] 
-        idx_resim = 19 # Resim URL'sinin olduğu sütun
-        
-        for i, row in enumerate(veri_seti):
-            item_foto = QTableWidgetItem()
-            item_foto.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 0, item_foto)
-            
-            # Resim Linki Varsa Kuyruğa Ekle
-            resim_link = row[idx_resim] if len(row) > idx_resim else ""
-            if resim_link: avatar_queue.append((i, resim_link, row[0]))
-            
-            # Diğer Sütunları Doldur
-            for t_col, d_idx in enumerate(col_indices, 1): 
-                val = row[d_idx] if len(row) > d_idx else ""
-                item = QTableWidgetItem(str(val))
-                self.table.setItem(i, t_col, item)
-            
-            # Durum Hücresi (Özel Renklendirme)
-            durum_val = row[self.idx_durum] if len(row) > self.idx_durum else "Aktif"
-            item_durum = QTableWidgetItem(durum_val)
-            item_durum.setTextAlignment(Qt.AlignCenter)
-            
-            fg_color = Qt.white
-            if "Aktif" in durum_val: fg_color = QColor("#4cd964") 
-            elif "Pasif" in durum_val: fg_color = QColor("#ff3b30") 
-            elif "İzin" in durum_val: fg_color = QColor("#ffcc00"); item_durum.setForeground(Qt.black)
-            
-            item_durum.setForeground(fg_color)
-            item_durum.setFont(QFont("Segoe UI", 9, QFont.Bold))
-            
-            self.table.setItem(i, 7, item_durum)
-            
-            # Veriyi sakla (Detay ekranı için)
-            self.table.item(i, 1).setData(Qt.UserRole, row)
-
-        # Avatar yüklemeyi başlat
-        if avatar_queue:
-            self.avatar_thread = AvatarWorker(avatar_queue, self.temp_avatar_dir)
-            self.avatar_thread.resim_hazir.connect(self._avatar_guncelle)
-            self.avatar_thread.start()
 
-    def _avatar_guncelle(self, row, pixmap):
-        try:
-            item = self.table.item(row, 0)
-            if item: item.setIcon(QIcon(pixmap))
-        except: pass
+    def _secili_kayit(self, index=None):
+        """Görünümdeki satırın ham veri satırı (liste)."""
+        if index is None: index = self.table.currentIndex()
+        if not index.isValid(): return None
+        return self.model.kayit(self.proxy.kaynak_satiri(index.row()))
 
     # --- MENU VE DİĞERLERİ ---
     def _sag_tik_menu(self, pos):
         menu = QMenu()
-        r = self.table.currentRow()
-        if r >= 0:
-            item = self.table.item(r, 1) 
-            if item:
-                data = item.data(Qt.UserRole)
+        index = self.table.indexAt(pos)
+        if index.isValid():
+            data = self._secili_kayit(index)
+            if data:
                 tc = data[0]
                 durum = data[self.idx_durum] if len(data) > self.idx_durum else "Aktif"
                 
-                menu.addAction("📝 Detay Görüntüle", lambda: self._detay_ac(r, 0))
+                menu.addAction("📝 Detay Görüntüle", lambda: self._detay_ac(index))
                 menu.addSeparator()
                 menu.addAction("🏖️ İzin Giriş/Takip", lambda: self._izin_formu_ac(data))
                 menu.addSeparator()
@@ -483,10 +519,9 @@ class PersonelListesiPenceresi(QWidget):
                 
         menu.exec(self.table.viewport().mapToGlobal(pos))
 
-    def _detay_ac(self, r, c):
-        item = self.table.item(r, 1)
-        if item:
-            data = item.data(Qt.UserRole)
+    def _detay_ac(self, index):
+        data = self._secili_kayit(index)
+        if data:
             if 'PersonelDetayPenceresi' in globals():
                 self.win_detay = PersonelDetayPenceresi(data, self.yetki, self.kullanici_adi)
                 self.win_detay.veri_guncellendi.connect(self._verileri_yenile)
@@ -518,19 +553,21 @@ class PersonelListesiPenceresi(QWidget):
                 wb = openpyxl.Workbook(); ws = wb.active
                 # Başlıkları Yaz
                 ws.append(["TC Kimlik", "Ad Soyad", "Hizmet Sınıfı", "Ünvan", "Görev Yeri", "Cep Tel", "Durum"])
-                # Verileri Yaz
-                for r in range(self.table.rowCount()):
-                    row_data = []
-                    for c in range(1, 8): # 0. sütun resim olduğu için atlıyoruz
-                        item = self.table.item(r, c)
-                        row_data.append(item.text() if item else "")
-                    ws.append(row_data)
+                # Verileri Yaz (ekrandaki filtre ve sıralamayla)
+                for r in range(self.proxy.rowCount()):
+                    kaynak = self.proxy.kaynak_satiri(r)
+                    ws.append([self.model.deger(kaynak, c) for c in range(1, 8)]) # 0. sütun resim olduğu için atlıyoruz
                 wb.save(path)
                 show_info("Başarılı", "Liste Excel olarak kaydedildi.", self)
             except Exception as e: show_error("Hata", str(e), self)
 
+    def yeniden_acildi(self):
+        """Havuzdan tekrar açıldı: liste önbellekten tazelenir."""
+        self._verileri_yenile()
+
     def closeEvent(self, e):
         if self.avatar_thread: self.avatar_thread.durdur()
+        self.filtre.durdur()
         # Çalışan workerları temizle
         if hasattr(self, 'worker') and self.worker.isRunning(): self.worker.quit()
         if hasattr(self, 'sabit_worker') and self.sabit_worker.isRunning(): self.sabit_worker.quit()
@@ -34,12 +34,16 @@ if parent_dir not in sys.path:
 try:
     from araclar.yetki_yonetimi import YetkiYoneticisi
     from temalar.tema import TemaYonetimi
-    from google_baglanti import veritabani_getir, GoogleDriveService
+    from google_baglanti import veritabani_getir, veritabani_getir_cached, GoogleDriveService
     from araclar.ortak_araclar import show_info, show_error, pencereyi_kapat
+    from araclar.tarih_araclari import tarih_coz
+    from araclar.toplu_yazici import TopluYazici
+    from araclar.metin_araclari import katla
 except ImportError as e:
     print(f"Modül Hatası: {e}")
     # Fallback
     def veritabani_getir(vt, sayfa): return None
+    def veritabani_getir_cached(vt, sayfa, force_refresh=False): return []
     def show_info(t, m, p): print(m)
     def show_error(t, m, p): print(m)
     def pencereyi_kapat(w): w.close()
@@ -49,6 +53,8 @@ except ImportError as e:
         @staticmethod
         def uygula_fusion_dark(app): pass
 
+from services.rke_service import rke_servisi, MUAYENE_SUTUNLARI
+
 # =============================================================================
 # 0. YARDIMCI FONKSİYONLAR
 # =============================================================================
@@ -57,6 +63,15 @@ def envanter_durumunu_belirle(fiziksel, skopi):
     sko_ok = (skopi == "Kullanıma Uygun" or skopi == "Yapılmadı")
     return "Kullanıma Uygun" if fiz_ok and sko_ok else "Kullanıma Uygun Değil"
 
+def envanter_guncellemesi(fiziksel, skopi, skopi_tarihi, aciklama):
+    """Muayeneden sonra rke_list satırına yazılacak değerler."""
+    degisen = {"Durum": envanter_durumunu_belirle(fiziksel, skopi), "Açiklama": aciklama}
+    # Gelecek Kontrol Tarihi Hesapla (Skopi Tarihi + 1 Yıl)
+    if skopi_tarihi:
+        dt_obj = tarih_coz(skopi_tarihi)
+        degisen["KontrolTarihi"] = (dt_obj + relativedelta(years=1)).strftime("%Y-%m-%d") if dt_obj else skopi_tarihi
+    return degisen
+
 # =============================================================================
 # 1. ÖZEL BİLEŞENLER (CHECKABLE COMBOBOX)
 # =============================================================================
@@ -106,67 +121,36 @@ class CheckableComboBox(QComboBox):
 # =============================================================================
 
 class VeriYukleyici(QThread):
-    # Sinyal: RKE_Data, RKE_Combo, RKE_Dict, Muayene_List, Headers, Teknik_Aciklamalar, Personel_Listesi, Sorumlu_Listesi
-    veri_hazir = Signal(list, list, dict, list, list, list, list, list)
+    # Sinyal: RKE_Data, RKE_Combo, RKE_Dict, Teknik_Aciklamalar, Personel_Listesi, Sorumlu_Listesi
+    veri_hazir = Signal(list, list, dict, list, list, list)
     hata_olustu = Signal(str)
 
     def run(self):
         try:
-            rke_data = []
             rke_combo = []
             rke_dict = {} 
-            muayene_listesi = []
-            headers = []
             teknik_aciklamalar = []
-            
-            # Personel listeleri (Geçmişten toplanacak)
-            kontrol_edenler = set()
-            birim_sorumlulari = set()
-
-            # 1. RKE LİSTESİ
-            ws_rke = veritabani_getir('rke', 'rke_list')
-            if ws_rke:
-                rke_data = ws_rke.get_all_records()
-                for row in rke_data:
-                    ekipman_no = str(row.get('EkipmanNo', '')).strip()
-                    cins = str(row.get('KoruyucuCinsi', '')).strip()
-                    if ekipman_no:
-                        display = f"{ekipman_no} | {cins}"
-                        rke_combo.append(display)
-                        rke_dict[display] = ekipman_no
-
-            # 2. MUAYENE GEÇMİŞİ & PERSONEL ANALİZİ
-            ws_muayene = veritabani_getir('rke', 'rke_muayene')
-            if ws_muayene:
-                raw_muayene = ws_muayene.get_all_values()
-                if len(raw_muayene) > 0:
-                    headers = [str(h).strip() for h in raw_muayene[0]]
-                    muayene_listesi = raw_muayene[1:]
-                    
-                    # Sütun indekslerini bul
-                    try: idx_kontrol = headers.index("KontrolEden/Unvani")
-                    except: idx_kontrol = -1
-                    try: idx_sorumlu = headers.index("BirimSorumlusu/Unvani")
-                    except: idx_sorumlu = -1
-                    
-                    # Listeyi tara ve isimleri topla
-                    for row in muayene_listesi:
-                        if idx_kontrol != -1 and len(row) > idx_kontrol:
-                            val = str(row[idx_kontrol]).strip()
-                            if val: kontrol_edenler.add(val)
-                        
-                        if idx_sorumlu != -1 and len(row) > idx_sorumlu:
-                            val = str(row[idx_sorumlu]).strip()
-                            if val: birim_sorumlulari.add(val)
+
+            # 1. RKE LİSTESİ (ortak RKE servisinden; tablolar güncelse indirme yapılmaz)
+            rke_servisi.hazirla()
+            rke_data = rke_servisi.envanter_kayitlari()
+            for row in rke_data:
+                ekipman_no = str(row.get('EkipmanNo', '')).strip()
+                cins = str(row.get('KoruyucuCinsi', '')).strip()
+                if ekipman_no:
+                    display = f"{ekipman_no} | {cins}"
+                    rke_combo.append(display)
+                    rke_dict[display] = ekipman_no
+
+            # 2. PERSONEL (Muayene geçmişinden servisin tuttuğu isimler)
+            kontrol_edenler = rke_servisi.kontrol_edenler()
+            birim_sorumlulari = rke_servisi.birim_sorumlulari()
 
             # 3. SABİTLER (Teknik Açıklamalar)
-            ws_sabit = veritabani_getir('sabit', 'Sabitler')
-            if ws_sabit:
-                sabitler = ws_sabit.get_all_records()
-                for s in sabitler:
-                    if str(s.get('Kod', '')).strip() == "RKE_Teknik":
-                        eleman = str(s.get('MenuEleman', '')).strip()
-                        if eleman: teknik_aciklamalar.append(eleman)
+            for s in veritabani_getir_cached('sabit', 'Sabitler'):
+                if str(s.get('Kod', '')).strip() == "RKE_Teknik":
+                    eleman = str(s.get('MenuEleman', '')).strip()
+                    if eleman: teknik_aciklamalar.append(eleman)
             
             if not teknik_aciklamalar:
                 teknik_aciklamalar = ["Yırtık Yok", "Kurşun Bütünlüğü Tam", "Askılar Sağlam", "Temiz"]
@@ -175,11 +159,9 @@ class VeriYukleyici(QThread):
                 rke_data, 
                 sorted(rke_combo), 
                 rke_dict, 
-                muayene_listesi, 
-                headers, 
                 sorted(teknik_aciklamalar),
-                sorted(list(kontrol_edenler)),
-                sorted(list(birim_sorumlulari))
+                kontrol_edenler,
+                birim_sorumlulari
             )
 
         except Exception as e:
@@ -216,37 +198,21 @@ class KayitWorker(QThread):
                 self.veri['BirimSorumlusu'], self.veri['Not'], drive_link
             ]
             ws_muayene.append_row(satir)
+            rke_servisi.muayene_ekle([dict(zip(MUAYENE_SUTUNLARI, satir))])
 
             # rke_list GÜNCELLEMESİ
             self.progress.emit("Envanter durumu güncelleniyor...")
             ws_list = veritabani_getir('rke', 'rke_list')
             if ws_list:
                 ekipman_no = self.veri['EkipmanNo']
-                cell = ws_list.find(ekipman_no)
-                if cell:
-                    yeni_durum = envanter_durumunu_belirle(self.veri['FizikselDurum'], self.veri['SkopiDurum'])
-                    
-                    # Gelecek Kontrol Tarihi Hesapla (Skopi Tarihi + 1 Yıl)
-                    skopi_tarih_str = self.veri['S_MuayeneTarihi']
-                    gelecek_kontrol_tarihi = ""
-                    if skopi_tarih_str:
-                        try:
-                            dt_obj = datetime.datetime.strptime(skopi_tarih_str, "%Y-%m-%d")
-                            gelecek_kontrol_tarihi = (dt_obj + relativedelta(years=1)).strftime("%Y-%m-%d")
-                        except:
-                            gelecek_kontrol_tarihi = skopi_tarih_str 
-
-                    headers = ws_list.row_values(1)
-                    try: col_tarih = headers.index("KontrolTarihi") + 1
-                    except: col_tarih = -1
-                    try: col_durum = headers.index("Durum") + 1
-                    except: col_durum = -1
-                    try: col_aciklama = headers.index("Açiklama") + 1
-                    except: col_aciklama = -1
-                    
-                    if col_tarih > 0 and gelecek_kontrol_tarihi: ws_list.update_cell(cell.row, col_tarih, gelecek_kontrol_tarihi)
-                    if col_durum > 0: ws_list.update_cell(cell.row, col_durum, yeni_durum)
-                    if col_aciklama > 0: ws_list.update_cell(cell.row, col_aciklama, self.veri['Aciklamalar'])
+                yazici = TopluYazici(ws_list, anahtar_sutun="EkipmanNo")
+                degisen = envanter_guncellemesi(self.veri['FizikselDurum'], self.veri['SkopiDurum'],
+                                                self.veri['S_MuayeneTarihi'], self.veri['Aciklamalar'])
+                degisen = {k: v for k, v in degisen.items() if yazici.sutun_no(k)}
+                # Üç hücre tek istekte yazılır
+                if degisen and yazici.satir_guncelle(ekipman_no, degisen):
+                    yazici.gonder(value_input_option='USER_ENTERED')
+                    rke_servisi.envanter_guncelle({ekipman_no: degisen})
 
             self.finished.emit("Kayıt ve güncelleme başarılı.")
 
@@ -278,19 +244,10 @@ class TopluKayitWorker(QThread):
             ws_list = veritabani_getir('rke', 'rke_list')
             if not ws_muayene or not ws_list: raise Exception("Veritabanı bağlantısı yok.")
             
-            headers = ws_list.row_values(1)
-            try: col_tarih = headers.index("KontrolTarihi") + 1
-            except: col_tarih = -1
-            try: col_durum = headers.index("Durum") + 1
-            except: col_durum = -1
-            try: col_aciklama = headers.index("Açiklama") + 1
-            except: col_aciklama = -1
-            try: col_ekipman_idx = headers.index("EkipmanNo") + 1
-            except: col_ekipman_idx = 2 
-            
-            all_ekipman_nos = ws_list.col_values(col_ekipman_idx)
+            # Satır numaraları EkipmanNo sütununun karma indeksinden bulunur
+            yazici = TopluYazici(ws_list, anahtar_sutun="EkipmanNo")
             rows_to_add = []
-            batch_updates = [] 
+            envanter_degisiklikleri = {}
             base_time = int(time.time())
             
             for idx, ekipman_no in enumerate(self.ekipman_listesi):
@@ -309,30 +266,18 @@ class TopluKayitWorker(QThread):
                 rows_to_add.append(row)
                 
                 # 2. Envanter Güncelleme
-                try:
-                    row_num = all_ekipman_nos.index(ekipman_no) + 1
-                    yeni_genel_durum = envanter_durumunu_belirle(f_durum, s_durum)
-                    
-                    gelecek_kontrol_tarihi = ""
-                    if s_tarih:
-                        try:
-                            dt_obj = datetime.datetime.strptime(s_tarih, "%Y-%m-%d")
-                            gelecek_kontrol_tarihi = (dt_obj + relativedelta(years=1)).strftime("%Y-%m-%d")
-                        except:
-                            gelecek_kontrol_tarihi = s_tarih
-
-                    if col_tarih > 0 and gelecek_kontrol_tarihi: 
-                        batch_updates.append({'range': f"{chr(64+col_tarih)}{row_num}", 'values': [[gelecek_kontrol_tarihi]]})
-                    if col_durum > 0:
-                        batch_updates.append({'range': f"{chr(64+col_durum)}{row_num}", 'values': [[yeni_genel_durum]]})
-                    if col_aciklama > 0:
-                        batch_updates.append({'range': f"{chr(64+col_aciklama)}{row_num}", 'values': [[self.ortak_veri['Aciklamalar']]]})
-                except ValueError: pass
+                degisen = envanter_guncellemesi(f_durum, s_durum, s_tarih, self.ortak_veri['Aciklamalar'])
+                degisen = {k: v for k, v in degisen.items() if yazici.sutun_no(k)}
+                if degisen and yazici.satir_guncelle(ekipman_no, degisen):
+                    envanter_degisiklikleri[ekipman_no] = degisen
 
                 self.progress.emit(idx + 1, len(self.ekipman_listesi))
             
             ws_muayene.append_rows(rows_to_add)
-            if batch_updates: ws_list.batch_update(batch_updates)
+            rke_servisi.muayene_ekle(dict(zip(MUAYENE_SUTUNLARI, row)) for row in rows_to_add)
+            # Bütün envanter hücreleri bitişik aralıklara birleştirilip tek istekte yazılır
+            if yazici.gonder():
+                rke_servisi.envanter_guncelle(envanter_degisiklikleri)
             self.finished.emit()
             
         except Exception as e:
@@ -456,9 +401,9 @@ class RKEMuayenePenceresi(QWidget):
         super().__init__()
         self.yetki = yetki; self.kullanici_adi = kullanici_adi
         self.setWindowTitle("RKE Muayene Girişi"); self.resize(1400, 850)
-        self.rke_data = []; self.rke_dict = {}; self.tum_muayeneler = []; self.teknik_aciklamalar = []
+        self.rke_data = []; self.rke_dict = {}; self.teknik_aciklamalar = []
         self.kontrol_listesi = []; self.sorumlu_listesi = []
-        self.secilen_dosya = None; self.header_map = {}; self.inputs = {}
+        self.secilen_dosya = None; self.inputs = {}
         self.setup_ui()
         YetkiYoneticisi.uygula(self, "rke_muayene")
         self.verileri_yukle()
@@ -595,9 +540,8 @@ class RKEMuayenePenceresi(QWidget):
         self.loader.finished.connect(lambda: self.pbar.setVisible(False))
         self.loader.start()
 
-    def veriler_geldi(self, rke_data, rke_combo, rke_dict, muayene_list, headers, teknik_aciklamalar, kontrol_edenler, birim_sorumlulari):
-        self.rke_data = rke_data; self.rke_dict = rke_dict; self.tum_muayeneler = muayene_list
-        self.header_map = {h.strip(): i for i, h in enumerate(headers)}
+    def veriler_geldi(self, rke_data, rke_combo, rke_dict, teknik_aciklamalar, kontrol_edenler, birim_sorumlulari):
+        self.rke_data = rke_data; self.rke_dict = rke_dict
         self.teknik_aciklamalar = teknik_aciklamalar
         self.kontrol_listesi = kontrol_edenler
         self.sorumlu_listesi = birim_sorumlulari
@@ -615,12 +559,12 @@ class RKEMuayenePenceresi(QWidget):
         self.tabloyu_filtrele()
 
     def tabloyu_filtrele(self):
-        self.tablo.setRowCount(0); ara = self.txt_ara.text().lower(); secilen_abd = self.cmb_filtre_abd.currentText()
+        self.tablo.setRowCount(0); ara = katla(self.txt_ara.text()); secilen_abd = self.cmb_filtre_abd.currentText()
         count = 0
         for row in self.rke_data:
             abd = str(row.get("AnaBilimDali", "")).strip()
             if secilen_abd != "Tüm ABD" and abd != secilen_abd: continue
-            if ara and ara not in " ".join([str(v) for v in row.values()]).lower(): continue
+            if ara and ara not in katla(" ".join([str(v) for v in row.values()])): continue
             r = self.tablo.rowCount(); self.tablo.insertRow(r)
             for i, key in enumerate(self.cols_rke):
                 val = str(row.get(key, "")); item = QTableWidgetItem(val)
@@ -643,19 +587,16 @@ class RKEMuayenePenceresi(QWidget):
         if not secilen_text: return
         ekipman_no = self.rke_dict.get(secilen_text, secilen_text.split('|')[0].strip())
         self.tbl_gecmis.setRowCount(0)
-        idx_ekipman = self.header_map.get("EkipmanNo", -1)
-        if idx_ekipman == -1: return
-        for row in self.tum_muayeneler:
-            if len(row) > idx_ekipman and row[idx_ekipman] == ekipman_no:
-                r = self.tbl_gecmis.rowCount(); self.tbl_gecmis.insertRow(r)
-                def get_v(key): i = self.header_map.get(key, -1); return row[i] if i != -1 else ""
-                self.tbl_gecmis.setItem(r, 0, QTableWidgetItem(get_v("F_MuayeneTarihi")))
-                self.tbl_gecmis.setItem(r, 1, QTableWidgetItem(get_v("S_MuayeneTarihi")))
-                self.tbl_gecmis.setItem(r, 2, QTableWidgetItem(get_v("Aciklamalar")))
-                rapor = get_v("Rapor")
-                link_item = QTableWidgetItem("Link" if "http" in rapor else "-")
-                if "http" in rapor: link_item.setForeground(QColor("#42a5f5")); link_item.setToolTip(rapor)
-                self.tbl_gecmis.setItem(r, 3, link_item)
+        for row in rke_servisi.gecmis(ekipman_no):
+            r = self.tbl_gecmis.rowCount(); self.tbl_gecmis.insertRow(r)
+            def get_v(key): return str(row.get(key, ""))
+            self.tbl_gecmis.setItem(r, 0, QTableWidgetItem(get_v("F_MuayeneTarihi")))
+            self.tbl_gecmis.setItem(r, 1, QTableWidgetItem(get_v("S_MuayeneTarihi")))
+            self.tbl_gecmis.setItem(r, 2, QTableWidgetItem(get_v("Aciklamalar")))
+            rapor = get_v("Rapor")
+            link_item = QTableWidgetItem("Link" if "http" in rapor else "-")
+            if "http" in rapor: link_item.setForeground(QColor("#42a5f5")); link_item.setToolTip(rapor)
+            self.tbl_gecmis.setItem(r, 3, link_item)
 
     def gecmis_satir_tiklandi(self, row, col):
         if col == 3:
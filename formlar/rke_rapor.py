@@ -2,8 +2,11 @@
 import sys
 import os
 import logging
+import shutil
+import tempfile
 import datetime
 from datetime import datetime as dt
+from functools import partial
 
 # Gerekli widget'lar
 from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
@@ -28,11 +31,14 @@ if parent_dir not in sys.path:
     sys.path.append(parent_dir)
 
 from araclar.yetki_yonetimi import YetkiYoneticisi
+from araclar.pdf_hatti import (pdf_olustur, pdf_havuzu_olustur, RaporHatti, SayfaliRapor,
+                               RAPOR_KALITELERI, VARSAYILAN_DPI)
 
 # --- İMPORTLAR ---
 try:
     from google_baglanti import veritabani_getir, GoogleDriveService
     from araclar.ortak_araclar import show_info, show_error, pencereyi_kapat
+    from araclar.tarih_araclari import tarih_coz
 except ImportError:
     def veritabani_getir(vt_tipi, sayfa_adi): return None
     def show_info(t, m, p): print(m)
@@ -41,6 +47,8 @@ except ImportError:
     class GoogleDriveService:
         def upload_file(self, a, b): return None
 
+from services.rke_service import rke_servisi
+
 # RKE Dosyaları için Sabit Klasör ID
 DRIVE_KLASOR_ID = "1KIYRhomNGppMZCXbqyngT2kH0X8c-GEK"
 
@@ -64,15 +72,7 @@ def get_base_css():
         .legal-text { text-align: justify; margin-top: 5px; margin-bottom: 5px; line-height: 1.4; }
     """
 
-def html_genel_rapor(veriler, filtre_ozeti):
-    tarih = datetime.datetime.now().strftime("%d.%m.%Y")
-    html = f"""
-    <html>
-    <head><style>{get_base_css()}</style></head>
-    <body>
-        <h1>RADYASYON KORUYUCU EKİPMAN (RKE) KONTROL RAPORU</h1>
-        <div class="center">Filtre: {filtre_ozeti} | Rapor Tarihi: {tarih}</div>
-        <table>
+_GENEL_TABLO_BASI = """
             <thead>
                 <tr>
                     <th width="15%">Koruyucu Cinsi</th>
@@ -83,24 +83,9 @@ def html_genel_rapor(veriler, filtre_ozeti):
                     <th width="20%">Açıklama</th>
                 </tr>
             </thead>
-            <tbody>
-    """
-    for row in veriler:
-        fiz_text = f"{row['Tarih']}<br>{row['Fiziksel']}"
-        sko_text = f"{row['Tarih']}<br>{row['Skopi']}"
-        html += f"""
-            <tr>
-                <td>{row['Cins']}</td>
-                <td>{row['EkipmanNo']}</td>
-                <td>{row['Pb']}</td>
-                <td>{fiz_text}</td>
-                <td>{sko_text}</td>
-                <td class="left-align">{row['Aciklama']}</td>
-            </tr>
-        """
-    html += """
-            </tbody>
-        </table>
+"""
+
+_GENEL_ALT = """
         <div style="margin-top: 10px; font-size: 9pt; font-style: italic;">
             * Bu form, tek bir oturumda yapılan toplu sayımlar ve kontroller için üretilmiştir.
         </div>
@@ -111,21 +96,9 @@ def html_genel_rapor(veriler, filtre_ozeti):
                 <td><b>Radyasyon Koruma Sorumlusu</b><div class="line">İmza</div></td>
             </tr>
         </table>
-    </body>
-    </html>
-    """
-    return html
+"""
 
-def html_hurda_rapor(veriler, filtre_ozeti):
-    tarih = datetime.datetime.now().strftime("%d.%m.%Y")
-    html = f"""
-    <html>
-    <head><style>{get_base_css()}</style></head>
-    <body>
-        <h1>HURDA (HEK) EKİPMAN TEKNİK RAPORU</h1>
-        <div class="center">Tarih: {tarih}</div>
-        <h2>A. İMHA EDİLECEK EKİPMAN LİSTESİ</h2>
-        <table>
+_HURDA_TABLO_BASI = """
             <thead>
                 <tr>
                     <th width="5%">Sıra</th>
@@ -136,27 +109,9 @@ def html_hurda_rapor(veriler, filtre_ozeti):
                     <th width="35%">Tespit Edilen Uygunsuzluk</th>
                 </tr>
             </thead>
-            <tbody>
-    """
-    for i, row in enumerate(veriler, 1):
-        sorunlar = []
-        if "Değil" in row['Fiziksel']: sorunlar.append(f"Fiziksel: {row['Fiziksel']}")
-        if "Değil" in row['Skopi']: sorunlar.append(f"Skopi: {row['Skopi']}")
-        if row['Aciklama']: sorunlar.append(row['Aciklama'])
-        aciklama_full = " | ".join(sorunlar)
-        html += f"""
-            <tr>
-                <td>{i}</td>
-                <td>{row['Cins']}</td>
-                <td>{row['EkipmanNo']}</td>
-                <td>{row['Birim']}</td>
-                <td>{row['Pb']}</td>
-                <td class="left-align">{aciklama_full}</td>
-            </tr>
-        """
-    html += """
-            </tbody>
-        </table>
+"""
+
+_HURDA_ALT = """
         <h2>B. TEKNİK RAPOR VE TALEP</h2>
         <div class="legal-text">
             Yukarıdaki tabloda kimlik bilgileri belirtilen ekipmanların fiziksel veya radyolojik bütünlüklerini yitirdikleri tespit edilmiştir.
@@ -169,28 +124,48 @@ def html_hurda_rapor(veriler, filtre_ozeti):
                 <td><b>RKS</b><div class="line">İmza</div></td>
             </tr>
         </table>
-    </body>
-    </html>
+"""
+
+def _genel_satir(row):
+    fiz_text = f"{row['Tarih']}<br>{row['Fiziksel']}"
+    sko_text = f"{row['Tarih']}<br>{row['Skopi']}"
+    return (f"<tr><td>{row['Cins']}</td><td>{row['EkipmanNo']}</td><td>{row['Pb']}</td>"
+            f"<td>{fiz_text}</td><td>{sko_text}</td><td class=\"left-align\">{row['Aciklama']}</td></tr>")
+
+def _hurda_satir(i, row):
+    sorunlar = []
+    if "Değil" in row['Fiziksel']: sorunlar.append(f"Fiziksel: {row['Fiziksel']}")
+    if "Değil" in row['Skopi']: sorunlar.append(f"Skopi: {row['Skopi']}")
+    if row['Aciklama']: sorunlar.append(row['Aciklama'])
+    aciklama_full = " | ".join(sorunlar)
+    return (f"<tr><td>{i}</td><td>{row['Cins']}</td><td>{row['EkipmanNo']}</td><td>{row['Birim']}</td>"
+            f"<td>{row['Pb']}</td><td class=\"left-align\">{aciklama_full}</td></tr>")
+
+def sayfali_genel_rapor(veriler, filtre_ozeti, liste=True):
+    """Genel kontrol raporu. liste=False ise satırlar üretici olarak akıtılır (süreç içi çizim)."""
+    tarih = datetime.datetime.now().strftime("%d.%m.%Y")
+    ust = f"""
+        <h1>RADYASYON KORUYUCU EKİPMAN (RKE) KONTROL RAPORU</h1>
+        <div class="center">Filtre: {filtre_ozeti} | Rapor Tarihi: {tarih}</div>
     """
-    return html
-
-def pdf_olustur(html_content, dosya_yolu):
-    try:
-        document = QTextDocument()
-        document.setHtml(html_content)
-        writer = QPdfWriter(dosya_yolu)
-        writer.setPageSize(QPageSize(QPageSize.A4))
-        writer.setResolution(300) 
-        layout = QPageLayout()
-        layout.setPageSize(QPageSize(QPageSize.A4))
-        layout.setOrientation(QPageLayout.Portrait)
-        layout.setMargins(QMarginsF(15, 15, 15, 15)) 
-        writer.setPageLayout(layout)
-        document.print_(writer)
-        return True
-    except Exception as e:
-        print(f"PDF Hatası: {e}")
-        return False
+    satirlar = map(_genel_satir, veriler)
+    return SayfaliRapor(get_base_css(), ust, _GENEL_TABLO_BASI, list(satirlar) if liste else satirlar, _GENEL_ALT)
+
+def sayfali_hurda_rapor(veriler, filtre_ozeti, liste=True):
+    tarih = datetime.datetime.now().strftime("%d.%m.%Y")
+    ust = f"""
+        <h1>HURDA (HEK) EKİPMAN TEKNİK RAPORU</h1>
+        <div class="center">Tarih: {tarih}</div>
+        <h2>A. İMHA EDİLECEK EKİPMAN LİSTESİ</h2>
+    """
+    satirlar = (_hurda_satir(i, row) for i, row in enumerate(veriler, 1))
+    return SayfaliRapor(get_base_css(), ust, _HURDA_TABLO_BASI, list(satirlar) if liste else satirlar, _HURDA_ALT)
+
+def html_genel_rapor(veriler, filtre_ozeti):
+    return sayfali_genel_rapor(veriler, filtre_ozeti).html()
+
+def html_hurda_rapor(veriler, filtre_ozeti):
+    return sayfali_hurda_rapor(veriler, filtre_ozeti).html()
 
 # =============================================================================
 # 2. UI BİLEŞENLERİ (MODERN STİL)
@@ -262,132 +237,91 @@ class RaporVeriYukleyici(QThread):
 
     def run(self):
         try:
-            envanter_map = {}
-            abd_set = set()
-            birim_set = set()
-            tarih_set = set()
-            
-            # Envanter (RKE List)
-            ws_list = veritabani_getir('rke', 'rke_list')
-            if ws_list:
-                all_data = ws_list.get_all_records()
-                for row in all_data:
-                    ekipman_no = str(row.get('EkipmanNo', '')).strip()
-                    abd = str(row.get('AnaBilimDali', '')).strip()
-                    birim = str(row.get('Birim', '')).strip()
-                    cins = str(row.get('KoruyucuCinsi', '')).strip()
-                    pb = str(row.get('KursunEsdegeri', '')).strip()
-                    
-                    if ekipman_no:
-                        envanter_map[ekipman_no] = {'ABD': abd, 'Birim': birim, 'Cins': cins, 'Pb': pb}
-                        if abd: abd_set.add(abd)
-                        if birim: birim_set.add(birim)
-
-            # Muayene
-            birlesik_veri = []
-            ws_muayene = veritabani_getir('rke', 'rke_muayene')
-            if ws_muayene:
-                raw_muayene = ws_muayene.get_all_records()
-                for row in raw_muayene:
-                    ekipman_no = str(row.get('EkipmanNo', '')).strip()
-                    tarih = str(row.get('F_MuayeneTarihi', '')).strip()
-                    fiz = str(row.get('FizikselDurum', '')).strip()
-                    sko = str(row.get('SkopiDurum', '')).strip()
-                    
-                    if tarih: tarih_set.add(tarih)
-
-                    item = {
-                        'EkipmanNo': ekipman_no,
-                        'Tarih': tarih,
-                        'Fiziksel': fiz,
-                        'Skopi': sko,
-                        'KontrolEden': str(row.get('KontrolEden', '')).strip(),
-                        'Aciklama': str(row.get('Aciklamalar', '')).strip(),
-                        'Sonuc': "Kullanıma Uygun"
-                    }
-                    
-                    if "Değil" in item['Fiziksel'] or "Değil" in item['Skopi']:
-                        item['Sonuc'] = "Kullanıma Uygun Değil"
-                        
-                    info = envanter_map.get(ekipman_no, {'ABD': '-', 'Birim': '-', 'Cins': '-', 'Pb': '-'})
-                    item.update(info)
-                    birlesik_veri.append(item)
+            # Envanter ve muayeneler ortak RKE servisinden; tablolar güncelse indirme yapılmaz
+            rke_servisi.hazirla()
+            birlesik_veri, abd_listesi, birim_listesi, sirali_tarih = rke_servisi.rapor_verisi()
 
             headers = ["Ekipman No", "Cins", "Pb", "Birim", "Tarih", "Fiziksel", "Skopi", "Sonuç"]
-            # Tarihleri sırala
-            sirali_tarih = sorted(list(tarih_set), reverse=True)
-            
-            self.veri_hazir.emit(birlesik_veri, headers, sorted(list(abd_set)), sorted(list(birim_set)), sirali_tarih)
+            self.veri_hazir.emit(birlesik_veri, headers, abd_listesi, birim_listesi, sirali_tarih)
 
         except Exception as e:
             self.hata_olustu.emit(str(e))
 
+def _drive_yukleyici():
+    """Her yükleme thread'i kendi Drive istemcisini kullanır."""
+    drive = GoogleDriveService()
+    return lambda dosya_yolu: drive.upload_file(dosya_yolu, DRIVE_KLASOR_ID)
+
 class RaporOlusturucuWorker(QThread):
     log_mesaji = Signal(str)
+    asama_ilerleme = Signal(str, int, int) # (html | pdf | yukleme, tamamlanan, toplam)
     islem_bitti = Signal()
     
-    def __init__(self, mod, veriler, filtreler):
+    def __init__(self, mod, veriler, filtreler, dpi=VARSAYILAN_DPI):
         super().__init__()
         self.mod = mod # 1: Genel, 2: Hurda, 3: Kişi
         self.veriler = veriler
         self.filtreler = filtreler
+        self.dpi = dpi
+        self.hat = None
+
+    def _isleri_hazirla(self, klasor):
+        """(dosya_yolu, html_uretici) listesi. HTML üretimi hattın ilk aşamasında yapılır."""
+        ozet = self.filtreler.get('ozet', '')
+        gun = datetime.datetime.now().strftime('%Y%m%d')
+
+        if self.mod == 1: # Genel
+            if not self.veriler:
+                self.log_mesaji.emit("⚠️ Veri yok.")
+                return []
+            return [(os.path.join(klasor, f"RKE_Genel_{gun}.pdf"), partial(sayfali_genel_rapor, self.veriler, ozet, liste=False))]
+
+        if self.mod == 2: # Hurda
+            hurda_veri = [v for v in self.veriler if "Değil" in v['Sonuc']]
+            if not hurda_veri:
+                self.log_mesaji.emit("⚠️ Hurda kaydı bulunamadı.")
+                return []
+            return [(os.path.join(klasor, f"RKE_Hurda_{gun}.pdf"), partial(sayfali_hurda_rapor, hurda_veri, ozet, liste=False))]
+
+        # Kişi Bazlı
+        gruplar = {}
+        for item in self.veriler:
+            gruplar.setdefault((item['KontrolEden'], item['Tarih']), []).append(item)
+        self.log_mesaji.emit(f"{len(gruplar)} farklı rapor hazırlanıyor...")
+
+        isler = []
+        for (kisi, tarih), liste in gruplar.items():
+            dosya_adi = f"Rapor_{kisi}_{tarih}.pdf".replace(" ", "_")
+            isler.append((os.path.join(klasor, dosya_adi), partial(sayfali_genel_rapor, liste, f"Kontrolör: {kisi} - {tarih}")))
+        return isler
 
     def run(self):
-        drive = GoogleDriveService()
-        temp_files = []
+        klasor = tempfile.mkdtemp(prefix="rke_rapor_")
+        havuz = None
         try:
-            ozet = self.filtreler.get('ozet', '')
-            
-            if self.mod == 1: # Genel
-                dosya_adi = f"RKE_Genel_{datetime.datetime.now().strftime('%Y%m%d')}.pdf"
-                if not self.veriler:
-                    self.log_mesaji.emit("⚠️ Veri yok.")
-                    return
-                html = html_genel_rapor(self.veriler, ozet)
-                if pdf_olustur(html, dosya_adi):
-                    temp_files.append(dosya_adi)
-                    self.log_mesaji.emit(f"Yükleniyor: {dosya_adi}")
-                    link = drive.upload_file(dosya_adi, DRIVE_KLASOR_ID)
-                    self.log_mesaji.emit(f"✅ Drive'a Yüklendi. Link panoya kopyalanabilir.")
-                else:
-                    self.log_mesaji.emit("❌ PDF oluşturulamadı.")
-
-            elif self.mod == 2: # Hurda
-                dosya_adi = f"RKE_Hurda_{datetime.datetime.now().strftime('%Y%m%d')}.pdf"
-                hurda_veri = [v for v in self.veriler if "Değil" in v['Sonuc']]
-                if not hurda_veri:
-                    self.log_mesaji.emit("⚠️ Hurda kaydı bulunamadı.")
-                    return
-                html = html_hurda_rapor(hurda_veri, ozet)
-                if pdf_olustur(html, dosya_adi):
-                    temp_files.append(dosya_adi)
-                    drive.upload_file(dosya_adi, DRIVE_KLASOR_ID)
-                    self.log_mesaji.emit(f"✅ Hurda Raporu Yüklendi.")
-
-            elif self.mod == 3: # Kişi Bazlı
-                gruplar = {}
-                for item in self.veriler:
-                    key = (item['KontrolEden'], item['Tarih'])
-                    if key not in gruplar: gruplar[key] = []
-                    gruplar[key].append(item)
-                
-                self.log_mesaji.emit(f"{len(gruplar)} farklı rapor hazırlanıyor...")
-                
-                for (kisi, tarih), liste in gruplar.items():
-                    dosya_adi = f"Rapor_{kisi}_{tarih}.pdf".replace(" ", "_")
-                    html = html_genel_rapor(liste, f"Kontrolör: {kisi} - {tarih}")
-                    if pdf_olustur(html, dosya_adi):
-                        temp_files.append(dosya_adi)
-                        drive.upload_file(dosya_adi, DRIVE_KLASOR_ID)
-                        self.log_mesaji.emit(f"✅ {dosya_adi} yüklendi.")
+            isler = self._isleri_hazirla(klasor)
+            if not isler:
+                return
+            # Tek dosyada süreç açma maliyeti kazançtan büyük; aynı süreçte çizilir
+            havuz = pdf_havuzu_olustur() if len(isler) > 1 else None
+            self.hat = RaporHatti(dpi=self.dpi, havuz=havuz, yukleyici_fabrikasi=_drive_yukleyici,
+                                  ilerleme=self.asama_ilerleme.emit, log=self.log_mesaji.emit)
+            sonuclar = self.hat.calistir(isler)
+            basarili = sum(1 for _, link, hata in sonuclar if link and not hata)
+            self.log_mesaji.emit(f"{basarili}/{len(isler)} rapor Drive'a yüklendi.")
 
         except Exception as e:
             self.log_mesaji.emit(f"❌ HATA: {e}")
         finally:
-            for f in temp_files: 
-                if os.path.exists(f): os.remove(f)
+            if havuz:
+                havuz.shutdown(cancel_futures=True)
+            shutil.rmtree(klasor, ignore_errors=True)
             self.islem_bitti.emit()
 
+    def durdur(self):
+        if self.hat:
+            self.hat.durdur()
+
 # =============================================================================
 # 4. ANA PENCERE (YENİ DÜZENLİ TASARIM)
 # =============================================================================
@@ -487,6 +421,12 @@ class RKERaporPenceresi(QWidget):
         h_filters.addWidget(ModernInputGroup("Ana Bilim Dalı", self.cmb_abd))
         h_filters.addWidget(ModernInputGroup("Birim", self.cmb_birim))
         h_filters.addWidget(ModernInputGroup("İşlem Tarihi", self.cmb_tarih))
+
+        self.cmb_kalite = QComboBox(); self.cmb_kalite.setMinimumWidth(150)
+        for ad, dpi in RAPOR_KALITELERI.items():
+            self.cmb_kalite.addItem(ad, dpi)
+        self.cmb_kalite.setCurrentIndex(self.cmb_kalite.findData(VARSAYILAN_DPI))
+        h_filters.addWidget(ModernInputGroup("PDF Kalitesi", self.cmb_kalite))
         
         v_right_container.addLayout(h_filters)
 
@@ -556,11 +496,7 @@ class RKERaporPenceresi(QWidget):
         print(f"LOG: {msg}")
 
     def tarih_cevir(self, tarih_str):
-        if not tarih_str: return None
-        for fmt in ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y"):
-            try: return datetime.datetime.strptime(tarih_str, fmt).date()
-            except: continue
-        return None
+        return tarih_coz(tarih_str)
 
     def verileri_cek(self):
         QApplication.setOverrideCursor(Qt.WaitCursor)
@@ -664,11 +600,20 @@ class RKERaporPenceresi(QWidget):
         self.btn_olustur.setText("İşleniyor...")
         QApplication.setOverrideCursor(Qt.WaitCursor)
         
-        self.worker = RaporOlusturucuWorker(mod, self.filtrelenmis_veri, filtreler)
+        self._asamalar = {}
+        self.worker = RaporOlusturucuWorker(mod, self.filtrelenmis_veri, filtreler, dpi=self.cmb_kalite.currentData())
         self.worker.log_mesaji.connect(self.log)
+        self.worker.asama_ilerleme.connect(self.asama_ilerledi)
         self.worker.islem_bitti.connect(self.islem_tamam)
         self.worker.start()
 
+    def asama_ilerledi(self, asama, tamam, toplam):
+        self._asamalar[asama] = (tamam, toplam)
+        etiketler = (("html", "HTML"), ("pdf", "PDF"), ("yukleme", "Drive"))
+        metin = " · ".join(f"{etiket} {self._asamalar[a][0]}/{self._asamalar[a][1]}"
+                           for a, etiket in etiketler if a in self._asamalar)
+        self.btn_olustur.setText(metin)
+
     def islem_tamam(self):
         QApplication.restoreOverrideCursor()
         self.btn_olustur.setEnabled(True)
@@ -680,6 +625,7 @@ class RKERaporPenceresi(QWidget):
             self.loader.quit()
             self.loader.wait(500)
         if hasattr(self, 'worker') and self.worker.isRunning():
+            self.worker.durdur()
             self.worker.quit()
             self.worker.wait(500)
         event.accept()
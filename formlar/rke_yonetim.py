@@ -29,12 +29,15 @@ if parent_dir not in sys.path:
 try:
     from araclar.yetki_yonetimi import YetkiYoneticisi
     from temalar.tema import TemaYonetimi
-    from google_baglanti import veritabani_getir
+    from google_baglanti import veritabani_getir, veritabani_getir_cached
+    from araclar.toplu_yazici import TopluYazici
+    from araclar.metin_araclari import katla
     from araclar.ortak_araclar import show_info, show_error, pencereyi_kapat
 except ImportError as e:
     print(f"Modül Hatası: {e}")
     # Fallback
     def veritabani_getir(vt, sayfa): return None
+    def veritabani_getir_cached(vt, sayfa, force_refresh=False): return []
     def show_info(t, m, p): print(m)
     def show_error(t, m, p): print(m)
     def pencereyi_kapat(w): w.close()
@@ -42,13 +45,16 @@ except ImportError as e:
         @staticmethod
         def uygula_fusion_dark(app): pass
 
+from services.rke_service import rke_servisi
+from services.rke_takvim import rke_takvimi
+
 # =============================================================================
 # 1. WORKER THREADS (ARKA PLAN İŞLEMLERİ)
 # =============================================================================
 
 class RKEVeriYukleyici(QThread):
-    # Sinyal: Sabitler_Dict, RKE_Data, RKE_Headers, Muayene_Data
-    veri_hazir = Signal(dict, list, list, list)
+    # Sinyal: Sabitler_Dict, RKE_Data, RKE_Headers
+    veri_hazir = Signal(dict, list, list)
     hata_olustu = Signal(str)
 
     def run(self):
@@ -62,38 +68,23 @@ class RKEVeriYukleyici(QThread):
                 "Bedeni": {}
             }
             
-            ws_sabit = veritabani_getir('sabit', 'Sabitler')
-            if ws_sabit:
-                kayitlar = ws_sabit.get_all_records()
-                for satir in kayitlar:
-                    kod = str(satir.get('Kod', '')).strip()
-                    eleman = str(satir.get('MenuEleman', '')).strip()
-                    kisaltma = str(satir.get('Aciklama', '')).strip()
-                            
-                    if kod and eleman:
-                        if kod not in sabitler: sabitler[kod] = []
-                        sabitler[kod].append(eleman)
-                        
-                        if kisaltma:
-                            if kod in maps: maps[kod][eleman] = kisaltma
-
-            # 2. RKE LİSTESİ
-            rke_data = []
-            rke_basliklar = []
-            ws_rke = veritabani_getir('rke', 'rke_list')
-            if ws_rke:
-                raw_rke = ws_rke.get_all_values()
-                if len(raw_rke) > 0:
-                    rke_basliklar = [str(h).strip() for h in raw_rke[0]]
-                    rke_data = raw_rke[1:]
-
-            # 3. MUAYENE GEÇMİŞİ
-            muayene_data = []
-            ws_muayene = veritabani_getir('rke', 'rke_muayene')
-            if ws_muayene:
-                muayene_data = ws_muayene.get_all_values()
-
-            self.veri_hazir.emit(maps, rke_data, rke_basliklar, muayene_data)
+            for satir in veritabani_getir_cached('sabit', 'Sabitler'):
+                kod = str(satir.get('Kod', '')).strip()
+                eleman = str(satir.get('MenuEleman', '')).strip()
+                kisaltma = str(satir.get('Aciklama', '')).strip()
+                    
+                if kod and eleman:
+                    if kod not in sabitler: sabitler[kod] = []
+                    sabitler[kod].append(eleman)
+                
+                    if kisaltma:
+                        if kod in maps: maps[kod][eleman] = kisaltma
+
+            # 2. RKE LİSTESİ (ortak RKE servisinden; muayene geçmişi de orada indeksli)
+            rke_servisi.hazirla()
+            rke_basliklar, rke_data = rke_servisi.envanter_tablosu()
+
+            self.veri_hazir.emit(maps, rke_data, rke_basliklar)
 
         except Exception as e:
             self.hata_olustu.emit(f"Veri yükleme hatası: {str(e)}")
@@ -102,11 +93,13 @@ class RKEIslemKaydedici(QThread):
     islem_tamam = Signal()
     hata_olustu = Signal(str)
 
-    def __init__(self, mod, veri, satir_no=None):
+    def __init__(self, mod, veri, satir_no=None, eski_veri=None):
         super().__init__()
         self.mod = mod  # INSERT veya UPDATE
         self.veri = veri
         self.satir_no = satir_no
+        # Satırın formdaki ilk hali; UPDATE'te yalnızca değişen hücreler yazılır
+        self.eski_veri = eski_veri
 
     def run(self):
         try:
@@ -116,13 +109,17 @@ class RKEIslemKaydedici(QThread):
             if self.mod == "INSERT":
                 ws.append_row(self.veri)
             elif self.mod == "UPDATE" and self.satir_no:
-                # A'dan başlayarak veri uzunluğu kadar sütunu güncelle
-                num_cols = len(self.veri)
-                end_col_char = chr(ord('A') + num_cols - 1)
-                if num_cols > 26: end_col_char = "Z" 
-                
-                range_name = f"A{self.satir_no}:{end_col_char}{self.satir_no}"
-                ws.update(range_name=range_name, values=[self.veri])
+                # Dokunulmayan hücreler yeniden yazılmaz: önbellekteki sayıya çevrilmiş
+                # değerler ("0.50" -> 0.5, baştaki sıfırlar) sayfaya geri dönmez
+                eski = self.eski_veri or []
+                yazici = TopluYazici(ws, basliklar=[])
+                for i, deger in enumerate(self.veri):
+                    if i >= len(eski) or str(deger) != str(eski[i]):
+                        yazici.hucre(self.satir_no, i + 1, deger)
+                yazici.gonder()
+
+            # Envanter satırı değişti; servis tabloyu bir sonraki yüklemede yeniden çeker
+            rke_servisi.yenilenecek_isaretle('rke:rke_list')
 
             self.islem_tamam.emit()
         except Exception as e:
@@ -192,6 +189,9 @@ class InfoCard(QGroupBox):
 # =============================================================================
 
 class RKEYonetimPenceresi(QWidget):
+    # Form yöneticisi: tablolar form kurulurken önbelleğe çekilir
+    VERI_BAGIMLILIKLARI = (('rke', 'rke_list'), ('rke', 'rke_muayene'), ('sabit', 'Sabitler'))
+
     def __init__(self, yetki='viewer', kullanici_adi=None):
         super().__init__()
         self.yetki = yetki
@@ -205,9 +205,9 @@ class RKEYonetimPenceresi(QWidget):
         self.sabitler = {}
         self.rke_listesi = []
         self.rke_basliklar = []
-        self.muayene_listesi = []
         self.secili_satir_id = None
         self.secili_satir_index = None 
+        self.secili_satir_degerleri = None
         
         self.inputs = {}
 
@@ -436,11 +436,10 @@ class RKEYonetimPenceresi(QWidget):
         self.loader.finished.connect(lambda: self.pbar.setVisible(False))
         self.loader.start()
 
-    def veriler_geldi(self, sabitler, rke_data, rke_headers, muayene_data):
+    def veriler_geldi(self, sabitler, rke_data, rke_headers):
         self.sabitler = sabitler
         self.rke_listesi = rke_data
         self.rke_basliklar = rke_headers
-        self.muayene_listesi = muayene_data
         
         # Kesin eşleşme ile Combobox Doldurma
         def fill(ui_key, db_key):
@@ -471,20 +470,22 @@ class RKEYonetimPenceresi(QWidget):
     def tabloyu_filtrele(self):
         self.tablo.setRowCount(0)
         f_abd = self.cmb_filtre_abd.currentText()
-        ara = self.txt_ara.text().lower()
+        ara = katla(self.txt_ara.text())
 
         try:
             map_idx = {col: self.rke_basliklar.index(col) for col in self.cols_vt if col in self.rke_basliklar}
         except: return
 
         count = 0
+        bugun = datetime.date.today()
+        idx_ekipman = map_idx.get("EkipmanNo", -1)
         for i, row in enumerate(self.rke_listesi):
             idx_abd = map_idx.get("AnaBilimDali", -1)
             abd_val = row[idx_abd] if idx_abd != -1 and len(row) > idx_abd else ""
             
             if f_abd != "Tüm ABD" and abd_val != f_abd: continue
             
-            full_text = " ".join([str(x) for x in row]).lower()
+            full_text = katla(" ".join([str(x) for x in row]))
             if ara and ara not in full_text: continue
             
             r = self.tablo.rowCount()
@@ -499,6 +500,12 @@ class RKEYonetimPenceresi(QWidget):
                 if col_name == "Durum":
                     if "Değil" in val or "Hurda" in val: item.setForeground(QColor("#ef5350"))
                     else: item.setForeground(QColor("#66bb6a"))
+                elif col_name == "KontrolTarihi" and idx_ekipman != -1 and idx_ekipman < len(row):
+                    # Vade takviminden: kontrolü geçmiş ekipman kırmızı
+                    vade = rke_takvimi.vade(row[idx_ekipman])
+                    if vade and vade < bugun:
+                        item.setForeground(QColor("#ef5350"))
+                        item.setToolTip(f"Kontrol {(bugun - vade).days} gün gecikti")
                 
                 self.tablo.setItem(r, c_idx, item)
             
@@ -552,6 +559,7 @@ class RKEYonetimPenceresi(QWidget):
         item = self.tablo.item(row, 0)
         self.secili_satir_id = item.text()
         self.secili_satir_index = item.data(Qt.UserRole)
+        self.secili_satir_degerleri = None
         
         idx_id = -1
         if "KayitNo" in self.rke_basliklar: idx_id = self.rke_basliklar.index("KayitNo")
@@ -560,6 +568,7 @@ class RKEYonetimPenceresi(QWidget):
         
         bulunan = next((r for r in self.rke_listesi if len(r) > idx_id and r[idx_id] == self.secili_satir_id), None)
         if not bulunan: return
+        self.secili_satir_degerleri = list(bulunan)
         
         def get(col):
             try: return bulunan[self.rke_basliklar.index(col)]
@@ -594,27 +603,17 @@ class RKEYonetimPenceresi(QWidget):
 
     def gecmisi_yukle(self, ekipman_no):
         self.tbl_gecmis.setRowCount(0)
-        if not self.muayene_listesi: return
-        
-        headers = self.muayene_listesi[0]
-        try:
-            idx_ekip = headers.index("EkipmanNo")
-            idx_tarih = headers.index("F_MuayeneTarihi")
-            idx_sonuc = headers.index("FizikselDurum")
-            idx_acik = headers.index("Aciklamalar")
-        except: return
-        
-        for row in self.muayene_listesi[1:]:
-            if len(row) > idx_ekip and row[idx_ekip] == ekipman_no:
-                r = self.tbl_gecmis.rowCount()
-                self.tbl_gecmis.insertRow(r)
-                self.tbl_gecmis.setItem(r, 0, QTableWidgetItem(row[idx_tarih] if len(row)>idx_tarih else ""))
-                self.tbl_gecmis.setItem(r, 1, QTableWidgetItem(row[idx_sonuc] if len(row)>idx_sonuc else ""))
-                self.tbl_gecmis.setItem(r, 2, QTableWidgetItem(row[idx_acik] if len(row)>idx_acik else ""))
+        for row in rke_servisi.gecmis(ekipman_no):
+            r = self.tbl_gecmis.rowCount()
+            self.tbl_gecmis.insertRow(r)
+            self.tbl_gecmis.setItem(r, 0, QTableWidgetItem(str(row.get("F_MuayeneTarihi", ""))))
+            self.tbl_gecmis.setItem(r, 1, QTableWidgetItem(str(row.get("FizikselDurum", ""))))
+            self.tbl_gecmis.setItem(r, 2, QTableWidgetItem(str(row.get("Aciklamalar", ""))))
 
     def temizle(self):
         self.secili_satir_id = None
         self.secili_satir_index = None
+        self.secili_satir_degerleri = None
         
         for widget in self.inputs.values():
             if isinstance(widget, QLineEdit): widget.clear()
@@ -663,7 +662,8 @@ class RKEYonetimPenceresi(QWidget):
         self.pbar.setRange(0, 0)
         self.btn_kaydet.setEnabled(False)
         
-        self.saver = RKEIslemKaydedici(mod, yeni_veri, self.secili_satir_index)
+        eski_veri = self.secili_satir_degerleri if mod == "UPDATE" else None
+        self.saver = RKEIslemKaydedici(mod, yeni_veri, self.secili_satir_index, eski_veri)
         self.saver.islem_tamam.connect(self.islem_basarili)
         self.saver.hata_olustu.connect(lambda e: show_error("Hata", e, self))
         self.saver.start()
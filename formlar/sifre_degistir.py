@@ -4,11 +4,6 @@ import os
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton, QMessageBox)
 from PySide6.QtCore import Qt, QThread, Signal
 
-try:
-    from google_baglanti import veritabani_getir
-except ImportError:
-    pass
-
 # --- YOL AYARLARI ---
 current_dir = os.path.dirname(os.path.abspath(__file__))
 root_dir = os.path.dirname(current_dir)
@@ -16,6 +11,7 @@ if root_dir not in sys.path:
     sys.path.append(root_dir)
     
 from araclar.guvenlik import GuvenlikAraclari
+from services.kimlik_deposu import kimlik_deposu
 
 class SifreGuncelleWorker(QThread):
     sonuc = Signal(bool, str)
@@ -27,19 +23,11 @@ class SifreGuncelleWorker(QThread):
 
     def run(self):
         try:
-            ws = veritabani_getir('user', 'user_login')
-            if not ws:
-                self.sonuc.emit(False, "Veritabanı hatası.")
-                return
-
-            cell = ws.find(self.kadi)
-            if cell:
-                # ŞİFRELEME BURADA
-                yeni_sifre_hash = GuvenlikAraclari.sifrele(self.yeni_sifre)
-                
-                # 3. Sütun: Password (Hashli kaydediyoruz)
-                ws.update_cell(cell.row, 3, yeni_sifre_hash)
-                ws.update_cell(cell.row, 6, "HAYIR") 
+            # ŞİFRELEME BURADA (tuzlu KDF)
+            yeni_sifre_hash = GuvenlikAraclari.sifrele(self.yeni_sifre)
+
+            # Password ve degisim_gerekli sütunları yazılır, yerel kimlik deposu güncellenir
+            if kimlik_deposu.sifre_yaz(self.kadi, yeni_sifre_hash, degisim_gerekli=False):
                 self.sonuc.emit(True, "Şifre başarıyla güncellendi.")
             else:
                 self.sonuc.emit(False, "Kullanıcı bulunamadı.")
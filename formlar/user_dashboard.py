@@ -2,10 +2,11 @@
 import sys
 import os
 import math
+import logging
 from datetime import datetime
 
 # PySide6 Kütüphaneleri
-from PySide6.QtCore import Qt, QThread, Signal, QRectF, QPoint, QSize
+from PySide6.QtCore import Qt, QRectF, QPoint, QSize
 from PySide6.QtGui import QPainter, QColor, QBrush, QPen, QFont, QIcon
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, 
@@ -13,6 +14,8 @@ from PySide6.QtWidgets import (
     QGridLayout, QPushButton, QApplication, QTabWidget
 )
 
+logger = logging.getLogger("UserDashboard")
+
 # --- YOL AYARLARI ---
 current_dir = os.path.dirname(os.path.abspath(__file__))
 root_dir = os.path.dirname(current_dir)
@@ -23,10 +26,14 @@ if root_dir not in sys.path:
 try:
     from araclar.yetki_yonetimi import YetkiYoneticisi
     from temalar.tema import TemaYonetimi
-    from google_baglanti import veritabani_getir
     from araclar.ortak_araclar import OrtakAraclar, show_error
+    from services.dashboard_service import DashboardAbonelik, VARSAYILAN_YENILEME_SN
 except ImportError as e:
     print(f"Modül Hatası: {e}")
+    VARSAYILAN_YENILEME_SN = 300
+
+PERSONEL_ALANLARI = ("toplam_personel", "aktif_personel", "izinli_personel",
+                     "dogum_gunleri", "izindekiler", "birim_dagilimi")
 
 # =============================================================================
 # ÖZEL BİLEŞEN: PASTA GRAFİK (PIE CHART)
@@ -80,101 +87,31 @@ class PastaGrafikWidget(QWidget):
             baslangic_aci += aci_genisligi
             i += 1
 
-# =============================================================================
-# WORKER: VERİ ANALİZİ
-# =============================================================================
-class DashboardWorker(QThread):
-    veri_hazir = Signal(dict)
-    
-    def run(self):
-        analiz = {
-            "toplam_personel": 0,
-            "aktif_personel": 0,
-            "izinli_personel": 0,
-            "dogum_gunleri": [], # [{"ad": "...", "tarih": "..."}, ...]
-            "izindekiler": [],   # [{"ad": "...", "bitis": "..."}, ...]
-            "birim_dagilimi": {} # {"Radyoloji": 5, "Lab": 3}
-        }
-        
-        try:
-            # 1. PERSONEL LİSTESİNİ ÇEK
-            ws_p = veritabani_getir('personel', 'Personel')
-            personeller = ws_p.get_all_records()
-            
-            bugun = datetime.now()
-            bu_ay = bugun.month
-            
-            for p in personeller:
-                # Anahtarları temizle (Boşlukları sil)
-                p = {k.strip(): v for k, v in p.items()}
-                
-                ad = p.get('Ad_Soyad', '')
-                durum = p.get('Durum', 'Aktif')
-                birim = p.get('Hizmet_Sinifi', 'Diğer')
-                dogum_tarihi_str = str(p.get('Dogum_Tarihi', ''))
-                
-                # İstatistikler
-                analiz["toplam_personel"] += 1
-                if durum == "Aktif":
-                    analiz["aktif_personel"] += 1
-                
-                # Birim Dağılımı
-                if birim:
-                    analiz["birim_dagilimi"][birim] = analiz["birim_dagilimi"].get(birim, 0) + 1
-                
-                # Doğum Günü Kontrolü
-                try:
-                    dt = datetime.strptime(dogum_tarihi_str, "%d.%m.%Y")
-                    if dt.month == bu_ay:
-                        analiz["dogum_gunleri"].append({
-                            "ad": ad,
-                            "gun": dt.day,
-                            "tam_tarih": dogum_tarihi_str
-                        })
-                except: pass
-
-            # 2. İZİN DURUMUNU ÇEK (Aktif İzinler)
-            ws_i = veritabani_getir('personel', 'izin_giris')
-            izinler = ws_i.get_all_records()
-            
-            for i in izinler:
-                i = {k.strip(): v for k, v in i.items()}
-                try:
-                    bas = datetime.strptime(i.get('Başlama_Tarihi', ''), "%d.%m.%Y")
-                    bit = datetime.strptime(i.get('Bitiş_Tarihi', ''), "%d.%m.%Y")
-                    
-                    if bas <= bugun <= bit:
-                        analiz["izinli_personel"] += 1
-                        # Personel Adını ID'den veya direk listeden bulmak gerekebilir
-                        # Şimdilik izin tablosunda Ad Soyad varsa onu alalım
-                        ad_soyad = i.get('Ad_Soyad', i.get('personel_id', 'Bilinmiyor'))
-                        analiz["izindekiler"].append({
-                            "ad": ad_soyad,
-                            "donus": bit.strftime("%d.%m.%Y"),
-                            "tur": i.get('İzin_Türü', 'Yıllık')
-                        })
-                except: pass
-                
-            # Doğum günlerini sırala (Güne göre)
-            analiz["dogum_gunleri"].sort(key=lambda x: x["gun"])
-            
-        except Exception as e:
-            print(f"Dashboard Veri Hatası: {e}")
-            
-        self.veri_hazir.emit(analiz)
-
 # =============================================================================
 # ANA PENCERE
 # =============================================================================
 class DashboardPenceresi(QWidget):
-    def __init__(self):
+    def __init__(self, yenileme_sn=VARSAYILAN_YENILEME_SN):
         super().__init__()
         self.setWindowTitle("Yönetici Kontrol Paneli")
         self.resize(1200, 800)
         self.setStyleSheet("background-color: #121212; color: #e0e0e0;")
         
         self.setup_ui()
-        self.verileri_yukle()
+
+        # Alan -> o alanı çizen metot (sadece değişen kart/tablo yeniden çizilir)
+        self._cizimler = {
+            "toplam_personel": lambda v: self._kart_yaz(self.card_total, v),
+            "aktif_personel": lambda v: self._kart_yaz(self.card_active, v),
+            "izinli_personel": lambda v: self._kart_yaz(self.card_leave, v),
+            "dogum_gunleri": self._dogum_tablosunu_doldur,
+            "izindekiler": self._izin_tablosunu_doldur,
+            "birim_dagilimi": self._birim_dagilimini_ciz,
+        }
+        self.abonelik = DashboardAbonelik(PERSONEL_ALANLARI, poll_saniye=yenileme_sn, parent=self)
+        self.abonelik.alanlar_degisti.connect(self._verileri_isles)
+        self.abonelik.hata_olustu.connect(lambda e: logger.warning(f"Dashboard veri hatası: {e}"))
+        self.abonelik.baslat()
 
     def setup_ui(self):
         main_layout = QVBoxLayout(self)
@@ -294,36 +231,37 @@ class DashboardPenceresi(QWidget):
         return table
 
     def verileri_yukle(self):
-        self.worker = DashboardWorker()
-        self.worker.veri_hazir.connect(self._verileri_isles)
-        self.worker.start()
+        self.abonelik.yenile(force_refresh=True)
 
     def _verileri_isles(self, data):
-        # 1. Kartları Güncelle
-        self.card_total.findChild(QLabel, "value_label").setText(str(data["toplam_personel"]))
-        self.card_active.findChild(QLabel, "value_label").setText(str(data["aktif_personel"]))
-        self.card_leave.findChild(QLabel, "value_label").setText(str(data["izinli_personel"]))
-        
-        # 2. Doğum Günleri Tablosu
+        for alan, deger in data.items():
+            cizim = self._cizimler.get(alan)
+            if cizim:
+                cizim(deger)
+
+    def _kart_yaz(self, kart, deger):
+        kart.findChild(QLabel, "value_label").setText(str(deger))
+
+    def _dogum_tablosunu_doldur(self, dogum_gunleri):
         self.table_dogum.setRowCount(0)
-        for d in data["dogum_gunleri"]:
+        for d in dogum_gunleri:
             row = self.table_dogum.rowCount()
             self.table_dogum.insertRow(row)
             self.table_dogum.setItem(row, 0, QTableWidgetItem(str(d["gun"])))
             self.table_dogum.setItem(row, 1, QTableWidgetItem(d["ad"]))
             self.table_dogum.setItem(row, 2, QTableWidgetItem(d["tam_tarih"]))
-            
-        # 3. İzin Tablosu
+
+    def _izin_tablosunu_doldur(self, izindekiler):
         self.table_izin.setRowCount(0)
-        for i in data["izindekiler"]:
+        for i in izindekiler:
             row = self.table_izin.rowCount()
             self.table_izin.insertRow(row)
-            self.table_izin.setItem(row, 0, QTableWidgetItem(i["ad"]))
+            self.table_izin.setItem(row, 0, QTableWidgetItem(str(i["ad"])))
             self.table_izin.setItem(row, 1, QTableWidgetItem(i["donus"]))
             self.table_izin.setItem(row, 2, QTableWidgetItem(i["tur"]))
-            
-        # 4. Pasta Grafik ve Legend
-        self.pie_chart.veri_guncelle(data["birim_dagilimi"])
+
+    def _birim_dagilimini_ciz(self, birim_dagilimi):
+        self.pie_chart.veri_guncelle(birim_dagilimi)
         
         # Legend Temizle
         while self.legend_layout.count():
@@ -334,7 +272,7 @@ class DashboardPenceresi(QWidget):
         colors = self.pie_chart.colors
         row, col = 0, 0
         i = 0
-        for birim, sayi in data["birim_dagilimi"].items():
+        for birim, sayi in birim_dagilimi.items():
             if sayi == 0: continue
             color = colors[i % len(colors)]
             
@@ -354,6 +292,10 @@ class DashboardPenceresi(QWidget):
                 col = 0
                 row += 1
 
+    def closeEvent(self, event):
+        self.abonelik.kapat()
+        event.accept()
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     win = DashboardPenceresi()
@@ -4,21 +4,12 @@ import json
 import logging
 import socket
 import threading
-import gspread
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
 # PySide6 Sinyalleri için
 from PySide6.QtCore import QObject, Signal
 
-# Google Auth Kütüphaneleri
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from google.auth.exceptions import TransportError, RefreshError
-
 
 try:
     from araclar.cache_yonetimi import cache
@@ -38,6 +29,18 @@ except ImportError:
             cache = None
             print("UYARI: cache_yonetimi modülü bulunamadı, önbellekleme devre dışı.")
 
+# Google kütüphaneleri (gspread, google-auth, googleapiclient) açılışta ~250 ms
+# tutar; giriş ekranı beklemesin diye ilk kullanımda yüklenirler.
+from araclar.tembel_yukleme import tembel_modul
+
+gspread = tembel_modul("gspread")
+_google_requests = tembel_modul("google.auth.transport.requests")
+_google_credentials = tembel_modul("google.oauth2.credentials")
+_google_exceptions = tembel_modul("google.auth.exceptions")
+_oauth_flow = tembel_modul("google_auth_oauthlib.flow")
+_drive_discovery = tembel_modul("googleapiclient.discovery")
+_drive_http = tembel_modul("googleapiclient.http")
+
 # Loglama Ayarları
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("GoogleService")
@@ -116,7 +119,7 @@ def _get_credentials():
 
     if os.path.exists(token_path):
         try:
-            creds = Credentials.from_authorized_user_file(token_path, SCOPES)
+            creds = _google_credentials.Credentials.from_authorized_user_file(token_path, SCOPES)
         except Exception:
             logger.warning("Token dosyası bozuk.")
             creds = None
@@ -126,15 +129,15 @@ def _get_credentials():
             try:
                 if not internet_kontrol():
                     raise InternetBaglantiHatasi("Token yenilemek için internet gerekli.")
-                creds.refresh(Request())
-            except (TransportError, RefreshError) as e:
+                creds.refresh(_google_requests.Request())
+            except (_google_exceptions.TransportError, _google_exceptions.RefreshError) as e:
                 logger.error(f"Token yenileme hatası: {e}")
                 raise KimlikDogrulamaHatasi("Oturum süresi doldu.")
         else:
             if not os.path.exists(cred_path):
                 raise FileNotFoundError("credentials.json bulunamadı!")
             
-            flow = InstalledAppFlow.from_client_secrets_file(cred_path, SCOPES)
+            flow = _oauth_flow.InstalledAppFlow.from_client_secrets_file(cred_path, SCOPES)
             creds = flow.run_local_server(port=0)
         
         with open(token_path, 'w') as token:
@@ -168,41 +171,85 @@ def _get_sheets_client():
 # 5. VERİTABANI ERİŞİM FONKSİYONLARI
 # =============================================================================
 
+# Açılmış dosya/sayfa nesneleri: client.open() ve worksheet() birer API
+# çağrısıdır; aynı sayfa için her seferinde tekrarlanmaz.
+_spreadsheet_cache: Dict[str, Any] = {}
+_worksheet_cache: Dict[tuple, Any] = {}
+# Anahtar başına kilit: aynı dosya/tablo iki thread'den aynı anda istenirse
+# ikincisi ilkinin sonucunu bekler, isteği tekrarlamaz.
+_anahtar_kilitleri: Dict[Any, threading.Lock] = {}
+_anahtar_kilitleri_lock = threading.Lock()
+
+
+def _anahtar_kilidi(anahtar) -> threading.Lock:
+    with _anahtar_kilitleri_lock:
+        kilit = _anahtar_kilitleri.get(anahtar)
+        if kilit is None:
+            kilit = _anahtar_kilitleri[anahtar] = threading.Lock()
+        return kilit
+
+
+def _dosya_adi(vt_tipi: str) -> str:
+    if vt_tipi in DB_CONFIG:
+        return DB_CONFIG[vt_tipi]["dosya"]
+    db_map = {
+        'personel': 'itf_personel_vt',
+        'sabit':    'itf_sabit_vt',
+        'cihaz':    'itf_cihaz_vt',
+        'user':     'itf_user_vt',
+        'rke':      'itf_rke_vt'
+    }
+    spreadsheet_name = db_map.get(vt_tipi)
+    if not spreadsheet_name:
+        raise ValueError(f"'{vt_tipi}' için veritabanı tanımı bulunamadı.")
+    return spreadsheet_name
+
+
+def spreadsheet_getir(vt_tipi: str):
+    """Veritabanı dosyasını (Spreadsheet) açar; açılan nesne tekrar kullanılır."""
+    sh = _spreadsheet_cache.get(vt_tipi)
+    if sh is not None:
+        return sh
+
+    client = _get_sheets_client()
+    spreadsheet_name = _dosya_adi(vt_tipi)
+    with _anahtar_kilidi(('dosya', vt_tipi)):
+        sh = _spreadsheet_cache.get(vt_tipi)
+        if sh is None:
+            try:
+                sh = client.open(spreadsheet_name)
+            except gspread.SpreadsheetNotFound:
+                raise VeritabaniBulunamadiHatasi(f"Dosya bulunamadı: {spreadsheet_name}")
+            _spreadsheet_cache[vt_tipi] = sh
+    return sh
+
+
+def baglanti_onbellegini_temizle():
+    """Açık dosya/sayfa nesnelerini unutur (sayfa silinip yeniden açıldıysa vb.)."""
+    _spreadsheet_cache.clear()
+    _worksheet_cache.clear()
+
+
 def veritabani_getir(vt_tipi: str, sayfa_adi: str):
     """
     KLASİK YÖNTEM: Worksheet nesnesini döndürür.
     Veri yazma (append_row, update_cell) işlemleri için bunu kullanın.
-    Cache KULLANMAZ (Worksheet nesnesi hafiftir, asıl yük get_all_records'tadır).
+    Veri cache'i KULLANMAZ; yalnızca açılmış dosya/sayfa nesneleri tekrar
+    kullanılır (asıl yük get_all_records'tadır).
     """
-    spreadsheet_name = None
-    try:
-        client = _get_sheets_client()
-        
-        if vt_tipi in DB_CONFIG:
-            spreadsheet_name = DB_CONFIG[vt_tipi]["dosya"]
-        else:
-            db_map = {
-                'personel': 'itf_personel_vt',
-                'sabit':    'itf_sabit_vt',
-                'cihaz':    'itf_cihaz_vt',
-                'user':     'itf_user_vt',
-                'rke':      'itf_rke_vt'
-            }
-            spreadsheet_name = db_map.get(vt_tipi)
-            
-        if not spreadsheet_name:
-            raise ValueError(f"'{vt_tipi}' için veritabanı tanımı bulunamadı.")
-
-        try:
-            sh = client.open(spreadsheet_name)
-        except gspread.SpreadsheetNotFound:
-            raise VeritabaniBulunamadiHatasi(f"Dosya bulunamadı: {spreadsheet_name}")
+    anahtar = (vt_tipi, sayfa_adi)
+    ws = _worksheet_cache.get(anahtar)
+    if ws is not None:
+        return ws
 
+    try:
+        sh = spreadsheet_getir(vt_tipi)
         try:
             ws = sh.worksheet(sayfa_adi)
-            return ws
         except gspread.WorksheetNotFound:
             raise VeritabaniBulunamadiHatasi(f"Sayfa bulunamadı: {sayfa_adi}")
+        _worksheet_cache[anahtar] = ws
+        return ws
 
     except Exception as e:
         logger.error(f"DB Hatası ({vt_tipi}/{sayfa_adi}): {str(e)}")
@@ -231,13 +278,20 @@ def veritabani_getir_cached(vt_tipi: str, sayfa_adi: str, force_refresh: bool =
         if data is not None:
             return data
 
-    # 2. Cache Miss (veya force refresh) -> Veriyi Çek
-    logger.info(f"Veri güncelleniyor: {cache_key}")
-    ws = veritabani_getir(vt_tipi, sayfa_adi)
-    data = ws.get_all_records()
-    
-    # 3. Cache'e Yaz (Varsayılan 5 dk)
-    cache.set(cache_key, data)
+    with _anahtar_kilidi(cache_key):
+        # Beklerken başka thread (ör. açılış ısıtması) aynı tabloyu yüklediyse onu kullan
+        if not force_refresh:
+            data = cache.get(cache_key)
+            if data is not None:
+                return data
+
+        # 2. Cache Miss (veya force refresh) -> Veriyi Çek
+        logger.info(f"Veri güncelleniyor: {cache_key}")
+        ws = veritabani_getir(vt_tipi, sayfa_adi)
+        data = ws.get_all_records()
+
+        # 3. Cache'e Yaz (Varsayılan 5 dk)
+        cache.set(cache_key, data)
     
     return data
 
@@ -248,7 +302,7 @@ class GoogleDriveService:
     def __init__(self):
         try:
             self.creds = _get_credentials()
-            self.service = build('drive', 'v3', credentials=self.creds)
+            self.service = _drive_discovery.build('drive', 'v3', credentials=self.creds)
         except Exception as e:
             logger.error(f"Drive servisi başlatılamadı: {e}")
             raise GoogleServisHatasi(f"Drive bağlantı hatası: {e}")
@@ -266,7 +320,7 @@ class GoogleDriveService:
                 'parents': [parent_folder_id] if parent_folder_id else []
             }
             
-            media = MediaFileUpload(str(path_obj), resumable=True)
+            media = _drive_http.MediaFileUpload(str(path_obj), resumable=True)
             
             file = self.service.files().create(
                 body=file_metadata, 
@@ -2,7 +2,8 @@
 import sys
 import os
 import json
-import importlib
+import time
+import contextlib
 import logging
 from functools import partial
 
@@ -11,7 +12,7 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QStatusBar, 
     QFrame, QPushButton, QMessageBox, QToolBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 
 # --- LOGLAMA AYARLARI ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -29,6 +30,7 @@ except ImportError:
     pass 
 
 from araclar.yetki_yonetimi import YetkiYoneticisi
+from araclar.audit_logger import audit_logger
 
 # --- MODÜLER IMPORTLAR ---
 try:
@@ -38,6 +40,22 @@ except ImportError as e:
     logger.critical(f"Temel modüller eksik: {e}")
     sys.exit(1)
 
+from araclar.tembel_yukleme import arka_planda_yukle
+from araclar.form_yoneticisi import FormYoneticisi
+
+try:
+    from araclar.acilis_hazirligi import AcilisHazirligi, acilis_zamanlari
+except ImportError as e:
+    logger.warning(f"Açılış hazırlığı yüklenemedi: {e}")
+    AcilisHazirligi = None
+    acilis_zamanlari = None
+
+try:
+    from services.rke_takvim import RKEVadeGorevi, VARSAYILAN_UYARI_GUNU
+except ImportError as e:
+    logger.warning(f"RKE kontrol takvimi yüklenemedi: {e}")
+    RKEVadeGorevi = None
+
 # =============================================================================
 # KONFİGÜRASYON YÜKLEYİCİ
 # =============================================================================
@@ -81,6 +99,37 @@ class AnaPencere(QMainWindow):
         # --- YETKİ KURALINI UYGULA ---
         YetkiYoneticisi.uygula(self, "main_window")
 
+        # Form modülleri boşta önceden yüklenir; kapatılan listeler havuzda tutulur
+        self.form_yoneticisi = FormYoneticisi(
+            self.mdi_area, self.menu_data,
+            form_argumanlari={'yetki': self.yetki, 'kullanici_adi': self.kullanici_adi},
+            parent=self)
+        self.form_yoneticisi.acildi.connect(
+            lambda baslik, sure, tur: self.status_bar.showMessage(f"Açıldı: {baslik} ({sure:.0f} ms)"))
+        self.form_yoneticisi.modulleri_on_yukle()
+
+        # RKE kontrol takvimi: girişte doldurulur, her gece yenilenir
+        self.rke_vade_gorevi = None
+        if RKEVadeGorevi:
+            self.rke_vade_gorevi = RKEVadeGorevi(self)
+            self.rke_vade_gorevi.tamamlandi.connect(self._rke_vade_bildir)
+            self.rke_vade_gorevi.hata_olustu.connect(lambda e: logger.error(f"RKE takvim hatası: {e}"))
+            self.rke_vade_gorevi.baslat()
+
+    def _rke_vade_bildir(self, sayilar):
+        if sayilar.get('geciken') or sayilar.get('yaklasan'):
+            self.status_bar.showMessage(
+                f"RKE: {sayilar['geciken']} ekipmanın kontrolü gecikmiş, "
+                f"{sayilar['yaklasan']} ekipmanın kontrolü {VARSAYILAN_UYARI_GUNU} gün içinde."
+            )
+
+    def closeEvent(self, event):
+        if self.rke_vade_gorevi:
+            self.rke_vade_gorevi.durdur()
+        self.form_yoneticisi.temizle()
+        logger.info(self.form_yoneticisi.gecikme_raporu())
+        event.accept()
+
     def _setup_ui(self):
         """Ana pencere düzeni: Sol Akordeon Menü + Sağ MDI Alanı"""
         central_widget = QWidget()
@@ -185,30 +234,8 @@ class AnaPencere(QMainWindow):
         self.status_bar.showMessage(f"Yükleniyor: {baslik}...")
 
         try:
-            # 2. Modülü Dinamik İçe Aktar
-            modul = importlib.import_module(modul_yolu)
-            
-            # 3. Sınıfı Bul ve Örnekle
-            if not hasattr(modul, sinif_adi):
-                raise AttributeError(f"Modül içinde '{sinif_adi}' sınıfı bulunamadı.")
-                
-            FormSinifi = getattr(modul, sinif_adi)
-            
-            # Parametre aktarımı denemesi
-            try:
-                form_instance = FormSinifi(yetki=self.yetki, kullanici_adi=self.kullanici_adi)
-            except TypeError:
-                try:
-                    form_instance = FormSinifi(yetki=self.yetki)
-                except TypeError:
-                    form_instance = FormSinifi()
-            
-            # 4. MDI Penceresi Olarak Ekle
-            sub = self.mdi_area.addSubWindow(form_instance)
-            sub.setWindowTitle(baslik)
-            sub.showMaximized()
-            
-            self.status_bar.showMessage(f"Açıldı: {baslik}")
+            # İçe aktarma, örnekleme (ya da havuzdan alma) ve MDI'ye ekleme
+            self.form_yoneticisi.form_ac(baslik, modul_yolu, sinif_adi)
 
         except (ImportError, ModuleNotFoundError) as e:
             logger.warning(f"Modül yükleme hatası ({modul_yolu}): {e}")
@@ -231,35 +258,84 @@ class ProgramYoneticisi:
     def __init__(self):
         self.login_window = None
         self.main_window = None
+        self.hazirlik = None
+        self._giris_zamani = None
+        self._hazirlik_bitti = False
+        self._rapor_yazildi = False
 
     def baslat(self):
+        # Bağlantı ve sık kullanılan tablolar, kullanıcı giriş bilgilerini yazarken hazırlanır
+        if AcilisHazirligi:
+            self.hazirlik = AcilisHazirligi()
+            self.hazirlik.tamamlandi.connect(self._hazirlik_tamamlandi)
+            self.hazirlik.start()
         try:
-            self.login_window = LoginPenceresi()
-            self.login_window.giris_basarili.connect(self.ana_pencereyi_ac)
-            self.login_window.show()
+            with self._olc("giris_ekrani"):
+                self.login_window = LoginPenceresi()
+                self.login_window.giris_basarili.connect(self.ana_pencereyi_ac)
+                self.login_window.show()
+            self._giris_zamani = time.perf_counter()
+            # Giriş ekranı çizildikten sonra ağır kütüphaneler boşta yüklenir
+            QTimer.singleShot(0, arka_planda_yukle)
         except Exception as e:
             QMessageBox.critical(None, "Başlatma Hatası", f"Login ekranı açılamadı:\n{e}")
             sys.exit(1)
 
     def ana_pencereyi_ac(self, rol, tc_kimlik):
+        if acilis_zamanlari and self._giris_zamani is not None:
+            acilis_zamanlari.kaydet("kullanici_girisi", time.perf_counter() - self._giris_zamani)
         try:
-            YetkiYoneticisi.yetkileri_yukle(rol)
-            self.main_window = AnaPencere(yetki=rol, kullanici_adi=tc_kimlik)
-            self.main_window.showMaximized()
+            # Kullanıcı belirtilmeyen audit kayıtları (repository yazmaları) bu kullanıcıya yazılır
+            audit_logger.kullanici_ayarla(tc_kimlik)
+            audit_logger.log(islem_tipi='GIRIS', detay=f"Rol: {rol}", modul='Oturum')
+            with self._olc("yetkiler"):
+                YetkiYoneticisi.yetkileri_yukle(rol)
+            with self._olc("ana_pencere"):
+                self.main_window = AnaPencere(yetki=rol, kullanici_adi=tc_kimlik)
+                self.main_window.showMaximized()
             self.login_window = None
+            self._raporu_yaz()
         except Exception as e:
             QMessageBox.critical(None, "Hata", f"Ana pencere yüklenemedi:\n{e}")
             sys.exit(1)
 
+    # --- Açılış süreleri ---
+    @staticmethod
+    def _olc(asama):
+        return acilis_zamanlari.olc(asama) if acilis_zamanlari else contextlib.nullcontext()
+
+    def _hazirlik_tamamlandi(self, hatalar):
+        self._hazirlik_bitti = True
+        if hatalar:
+            logger.warning(f"Açılış hazırlığında {len(hatalar)} aşama başarısız: {', '.join(hatalar)}")
+        self._raporu_yaz()
+
+    def _raporu_yaz(self):
+        """Rapor, ana pencere açılmış ve arka plan hazırlığı bitmişse bir kez yazılır."""
+        if self._rapor_yazildi or not acilis_zamanlari:
+            return
+        if self.main_window is None or (self.hazirlik and not self._hazirlik_bitti):
+            return
+        self._rapor_yazildi = True
+        logger.info(acilis_zamanlari.rapor())
+
+    def durdur(self):
+        # Hazırlık sürerken program kapatılırsa thread'in bitmesi beklenir
+        if self.hazirlik and self.hazirlik.isRunning():
+            self.hazirlik.wait(5000)
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     
-    try:
-        TemaYonetimi.uygula_fusion_dark(app)
-    except:
-        pass
-    
     yonetici = ProgramYoneticisi()
+    with yonetici._olc("tema"):
+        try:
+            TemaYonetimi.uygula_fusion_dark(app)
+        except:
+            pass
+    
     yonetici.baslat()
     
-    sys.exit(app.exec())
\ No newline at end of file
+    kod = app.exec()
+    yonetici.durdur()
+    sys.exit(kod)
\ No newline at end of file
@@ -6,12 +6,14 @@ from typing import List, Dict, Optional, Any
 try:
     from google_baglanti import veritabani_getir, veritabani_getir_cached
     from araclar.cache_yonetimi import cache
+    from araclar.audit_logger import audit_logger
 except ImportError:
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from google_baglanti import veritabani_getir, veritabani_getir_cached
     from araclar.cache_yonetimi import cache
+    from araclar.audit_logger import audit_logger
 
 logger = logging.getLogger("PersonelRepository")
 
@@ -47,9 +49,13 @@ class PersonelRepository:
             ws = veritabani_getir(self.vt_tipi, self.sayfa_adi)
             ws.append_row(personel_data)
             self._invalidate_cache()
+            self._denetle('PERSONEL_EKLEME', self.sayfa_adi, personel_data[0] if personel_data else None,
+                          f"Yeni personel: {personel_data[1] if len(personel_data) > 1 else ''}")
             return True
         except Exception as e:
             logger.error(f"Personel ekleme hatası: {e}")
+            self._denetle('PERSONEL_EKLEME', self.sayfa_adi, personel_data[0] if personel_data else None,
+                          str(e), basarili=False)
             raise e
 
     # -------------------------------------------------------------------------
@@ -94,10 +100,13 @@ class PersonelRepository:
 
             # 5. İşlem bitti, cache'i temizle
             self._invalidate_cache()
+            self._denetle('PERSONEL_GUNCELLEME', self.sayfa_adi, tc_kimlik,
+                          ", ".join(f"{k}={v}" for k, v in guncel_veri.items()))
             return True
 
         except Exception as e:
             logger.error(f"Güncelleme hatası ({tc_kimlik}): {e}")
+            self._denetle('PERSONEL_GUNCELLEME', self.sayfa_adi, tc_kimlik, str(e), basarili=False)
             return False
 
     def delete(self, tc_kimlik: str) -> bool:
@@ -108,12 +117,24 @@ class PersonelRepository:
             if cell:
                 ws.delete_rows(cell.row)
                 self._invalidate_cache()
+                self._denetle('PERSONEL_SILME', self.sayfa_adi, tc_kimlik)
                 return True
             return False
         except Exception as e:
             logger.error(f"Silme hatası: {e}")
+            self._denetle('PERSONEL_SILME', self.sayfa_adi, tc_kimlik, str(e), basarili=False)
             return False
 
+    @staticmethod
+    def _denetle(islem_tipi: str, tablo: str, kayit_id, detay: str = None, basarili: bool = True):
+        """Yazma işlemini yerel audit kaydına ekler (kullanıcı: oturumdaki kullanıcı)."""
+        try:
+            audit_logger.log(islem_tipi=islem_tipi, tablo=tablo, kayit_id=kayit_id,
+                             detay=detay, basarili=basarili, modul="Personel")
+        except Exception as e:
+            # Audit hatası yazma işlemini bozmamalı
+            logger.warning(f"Audit kaydı eklenemedi ({islem_tipi}): {e}")
+
     def _invalidate_cache(self):
         """Bu repository ile ilgili cache'i temizler."""
         if cache:
@@ -143,9 +164,13 @@ class PersonelRepository:
             ws = veritabani_getir(self.vt_tipi, 'izin_giris')
             ws.append_row(izin_verisi)
             self._invalidate_cache() # Cache temizle
+            self._denetle('IZIN_EKLEME', 'izin_giris', izin_verisi[0] if izin_verisi else None,
+                          " | ".join(str(v) for v in izin_verisi[2:8]))
             return True
         except Exception as e:
             logger.error(f"İzin ekleme hatası: {e}")
+            self._denetle('IZIN_EKLEME', 'izin_giris', izin_verisi[0] if izin_verisi else None,
+                          str(e), basarili=False)
             raise e
 
     def bakiye_guncelle(self, tc_kimlik: str, kolon_adi: str, miktar: int, islem: str = "dus") -> bool:
@@ -172,6 +197,8 @@ class PersonelRepository:
             yeni_deger = mevcut_deger + miktar if islem == "dus" else max(0, mevcut_deger - miktar)
             
             ws.update_cell(cell.row, col_idx, yeni_deger)
+            self._denetle('BAKIYE_GUNCELLEME', 'izin_bilgi', tc_kimlik,
+                          f"{kolon_adi}: {mevcut_deger} -> {yeni_deger} ({islem})")
             
             # Eğer Yıllık veya Şua izniyse, Kalan hakkı da güncellemek gerekir
             # (Bu mantık Service katmanında daha detaylı yönetilebilir ama basitçe burada da yapılabilir)
@@ -180,6 +207,7 @@ class PersonelRepository:
             return True
         except Exception as e:
             logger.error(f"Bakiye güncelleme hatası: {e}")
+            self._denetle('BAKIYE_GUNCELLEME', 'izin_bilgi', tc_kimlik, str(e), basarili=False)
             return False
 
     def izin_durum_guncelle(self, kayit_id: str, yeni_durum: str) -> bool:
@@ -194,8 +222,10 @@ class PersonelRepository:
                 col_idx = headers.index('Durum') + 1
                 ws.update_cell(cell.row, col_idx, yeni_durum)
                 self._invalidate_cache()
+                self._denetle('IZIN_DURUM_GUNCELLEME', 'izin_giris', kayit_id, f"Durum: {yeni_durum}")
                 return True
             return False
         except Exception as e:
             logger.error(f"İzin durum güncelleme hatası: {e}")
+            self._denetle('IZIN_DURUM_GUNCELLEME', 'izin_giris', kayit_id, str(e), basarili=False)
             return False
\ No newline at end of file
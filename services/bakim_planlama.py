@@ -0,0 +1,459 @@
+# -*- coding: utf-8 -*-
+import bisect
+import heapq
+import logging
+import threading
+from collections import Counter
+from datetime import date
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+from dateutil.relativedelta import relativedelta
+
+try:
+    from google_baglanti import veritabani_getir_cached
+    from araclar.cache_yonetimi import cache
+    from araclar.tarih_araclari import tarih_coz
+    from services.tablo_toplayici import TabloToplayici
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from google_baglanti import veritabani_getir_cached
+    from araclar.cache_yonetimi import cache
+    from araclar.tarih_araclari import tarih_coz
+    from services.tablo_toplayici import TabloToplayici
+
+logger = logging.getLogger("BakimPlanlama")
+
+# Periyodik_Bakim sayfasının sütun sırası (formun append_rows ile yazdığı sıra)
+BAKIM_SUTUNLARI = ("PlanID", "cihaz_id", "BakimPeriyodu", "BakimSirasi", "PlanlananTarih",
+                   "Bakim", "Durum", "BakimTarihi", "BakimTipi", "YapilanIslemler",
+                   "Açiklama", "Teknisyen", "Rapor")
+# Periyot metni -> ay (Tek Seferlik planlar tekrarlanmaz)
+PERIYOT_AYLARI = {"3 Ay": 3, "6 Ay": 6, "1 Yıl": 12, "2 Yıl": 24, "3 Yıl": 36}
+# Takvimde vadesi beklenmeyen durumlar
+KAPALI_BAKIM_DURUMLARI = ("Yapıldı", "İptal")
+IPTAL = "İptal"
+
+BAKIM, KALIBRASYON = "bakim", "kalibrasyon"
+# Yeni dönem, serinin son planı bu kadar gün içindeyse üretilir
+VARSAYILAN_UFUK_GUNU = 60
+
+
+# =============================================================================
+# 1. YARDIMCILAR
+# =============================================================================
+def periyot_ayi(periyot) -> Optional[int]:
+    """'6 Ay', '1 Yıl' gibi periyot metnini aya çevirir; tekrar etmiyorsa None."""
+    metin = str(periyot or "")
+    for anahtar, ay in PERIYOT_AYLARI.items():
+        if anahtar in metin:
+            return ay
+    return None
+
+
+def tekrar_tarihleri(bas_tarih: date, ay: int, adet: int) -> List[date]:
+    """Başlangıçtan itibaren `ay` aralıklı `adet` tarih (ay sonları kaymaz)."""
+    return [bas_tarih + relativedelta(months=i * ay) for i in range(adet)]
+
+
+def plan_satirlari(cihaz_id: str, periyot: str, bas_tarih: date, plan_no: int,
+                   ilk: Optional[Dict[str, Any]] = None, bas_sira: int = 1,
+                   adet: Optional[int] = None) -> List[List[str]]:
+    """
+    Bir cihazın bir yıllık (veya `adet` dönemlik) bakım planı satırları.
+    İlk dönemin durum/işlem alanları `ilk` ile verilir; sonrakiler 'Planlandı'.
+    """
+    ay = periyot_ayi(periyot)
+    if adet is None:
+        adet = max(1, 12 // ay) if ay else 1
+    tarihler = tekrar_tarihleri(bas_tarih, ay or 0, adet)
+    ilk = ilk or {}
+
+    satirlar = []
+    for i, tarih in enumerate(tarihler):
+        degerler = ilk if i == 0 else {}
+        satirlar.append([
+            f"P-{plan_no + i}", cihaz_id, periyot, f"{bas_sira + i}. Bakım",
+            tarih.strftime("%Y-%m-%d"), "Periyodik", degerler.get("Durum", "Planlandı"),
+            degerler.get("BakimTarihi", ""), "Periyodik", degerler.get("YapilanIslemler", "-"),
+            degerler.get("Açiklama", "-"), degerler.get("Teknisyen", "-"), degerler.get("Rapor", "-")
+        ])
+    return satirlar
+
+
+def _sira_no(metin) -> int:
+    """'3. Bakım' -> 3"""
+    bas = str(metin or "").split('.')[0].strip()
+    return int(bas) if bas.isdigit() else 0
+
+
+def _hafta(ordinal: int) -> int:
+    """Gün sırasının ait olduğu haftanın pazartesisi."""
+    return ordinal - date.fromordinal(ordinal).weekday()
+
+
+def _azalt(sayac: Counter, anahtar):
+    sayac[anahtar] -= 1
+    if sayac[anahtar] <= 0:
+        del sayac[anahtar]
+
+
+# =============================================================================
+# 2. VADE İNDEKSLERİ
+# =============================================================================
+class _VadeIndeksi(TabloToplayici):
+    """
+    Vadeye göre sıralı (ordinal, anahtar, cihaz) listesi ve haftalık iş yükü
+    sayacı. Alt sınıflar satır farklarını vade ekleme/çıkarmaya çevirir.
+    """
+    tur = ""
+
+    def __init__(self):
+        super().__init__()
+        self.vadeler: List[tuple] = []
+        # Haftanın pazartesisi (ordinal) -> vade adedi
+        self.haftalar = Counter()
+        # cihaz -> {(ordinal, anahtar)}
+        self.cihaz_vadeleri: Dict[str, Counter] = {}
+
+    def _vade_ekle(self, kayit: tuple):
+        bisect.insort(self.vadeler, kayit)
+        self.haftalar[_hafta(kayit[0])] += 1
+        self.cihaz_vadeleri.setdefault(kayit[2], Counter())[kayit[:2]] += 1
+
+    def _vade_cikar(self, kayit: tuple):
+        i = bisect.bisect_left(self.vadeler, kayit)
+        if i < len(self.vadeler) and self.vadeler[i] == kayit:
+            del self.vadeler[i]
+            _azalt(self.haftalar, _hafta(kayit[0]))
+            vadeler = self.cihaz_vadeleri[kayit[2]]
+            _azalt(vadeler, kayit[:2])
+            if not vadeler:
+                del self.cihaz_vadeleri[kayit[2]]
+
+    def aralik(self, bas: Optional[int], bit: int) -> List[tuple]:
+        """[bas, bit) aralığındaki vadeler (bas None ise en baştan)."""
+        i = bisect.bisect_left(self.vadeler, (bas,)) if bas is not None else 0
+        j = bisect.bisect_left(self.vadeler, (bit,))
+        return self.vadeler[i:j]
+
+    def sayi(self, bas: Optional[int], bit: int) -> int:
+        i = bisect.bisect_left(self.vadeler, (bas,)) if bas is not None else 0
+        return bisect.bisect_left(self.vadeler, (bit,)) - i
+
+
+class _BakimIndeksi(_VadeIndeksi):
+    """Açık (yapılmamış, iptal edilmemiş) her plan satırı bir vadedir."""
+    vt_tipi, sayfa_adi = 'cihaz', 'Periyodik_Bakim'
+    tur = BAKIM
+
+    def __init__(self):
+        super().__init__()
+        # cihaz -> Counter((ordinal, sira_no, periyot)) : tekrarlanan planların serisi
+        self.seriler: Dict[str, Counter] = {}
+
+    @staticmethod
+    def _cihaz(row) -> str:
+        return str(row.get('cihaz_id', '')).strip()
+
+    def _uygula(self, row, ekle: bool):
+        cihaz = self._cihaz(row)
+        dt = tarih_coz(row.get('PlanlananTarih'))
+        if not cihaz or not dt:
+            return
+        durum = str(row.get('Durum', '')).strip()
+        if durum not in KAPALI_BAKIM_DURUMLARI:
+            kayit = (dt.toordinal(), str(row.get('PlanID', '')).strip(), cihaz)
+            self._vade_ekle(kayit) if ekle else self._vade_cikar(kayit)
+
+        periyot = str(row.get('BakimPeriyodu', '')).strip()
+        if durum != IPTAL and periyot_ayi(periyot):
+            seri_anahtari = (dt.toordinal(), _sira_no(row.get('BakimSirasi')), periyot)
+            if ekle:
+                self.seriler.setdefault(cihaz, Counter())[seri_anahtari] += 1
+            elif cihaz in self.seriler:
+                _azalt(self.seriler[cihaz], seri_anahtari)
+                if not self.seriler[cihaz]:
+                    del self.seriler[cihaz]
+
+    def _ekle(self, row):
+        self._uygula(row, True)
+
+    def _cikar(self, row):
+        self._uygula(row, False)
+
+
+class _KalibrasyonIndeksi(_VadeIndeksi):
+    """Cihaz başına tek vade: iptal edilmemiş en geç bitiş tarihli kalibrasyon."""
+    vt_tipi, sayfa_adi = 'cihaz', 'Kalibrasyon'
+    tur = KALIBRASYON
+
+    def __init__(self):
+        super().__init__()
+        # cihaz -> Counter((bitis_ordinal, kayit_id))
+        self.bitisler: Dict[str, Counter] = {}
+        # cihaz -> vade listesindeki kaydı
+        self.vade: Dict[str, tuple] = {}
+
+    @staticmethod
+    def _kayit_id(row) -> str:
+        for sutun in ('KalibrasyonID', 'KayitID', 'ID'):
+            if sutun in row:
+                return str(row[sutun]).strip()
+        return str(next(iter(row.values()), '')).strip()
+
+    def _uygula(self, row, ekle: bool):
+        cihaz = str(row.get('CihazID', '')).strip()
+        dt = tarih_coz(row.get('BitisTarihi'))
+        if not cihaz or not dt or str(row.get('Durum', '')).strip() == IPTAL:
+            return
+        anahtar = (dt.toordinal(), self._kayit_id(row))
+        if ekle:
+            self.bitisler.setdefault(cihaz, Counter())[anahtar] += 1
+        elif cihaz in self.bitisler:
+            _azalt(self.bitisler[cihaz], anahtar)
+            if not self.bitisler[cihaz]:
+                del self.bitisler[cihaz]
+
+        # Cihazın kalibrasyon sayısı az; en geç bitiş yeniden bulunur
+        eski = self.vade.pop(cihaz, None)
+        yeni = (*max(self.bitisler[cihaz]), cihaz) if cihaz in self.bitisler else None
+        if eski != yeni:
+            if eski:
+                self._vade_cikar(eski)
+            if yeni:
+                self._vade_ekle(yeni)
+        if yeni:
+            self.vade[cihaz] = yeni
+
+    def _ekle(self, row):
+        self._uygula(row, True)
+
+    def _cikar(self, row):
+        self._uygula(row, False)
+
+
+# =============================================================================
+# 3. PLANLAMA SERVİSİ
+# =============================================================================
+class BakimPlanlayici:
+    """
+    Kalibrasyon ve periyodik bakım planlarının vade takvimi.
+    Tablolar önbellek üzerinden bir kez indekslenir, sonra yalnızca değişen
+    satırlar işlenir. Tarih aralığı sorguları ikili aramayla, haftalık iş
+    yükü ise hazır tutulan hafta sayaçlarından cevaplanır.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        """Singleton: Bakım, kalibrasyon ve dashboard ekranları aynı indeksi kullanır."""
+        if not cls._instance:
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = super(BakimPlanlayici, cls).__new__(cls)
+                    cls._instance._init_planlayici()
+        return cls._instance
+
+    def _init_planlayici(self):
+        self._veri_lock = threading.RLock()
+        self.bakim = _BakimIndeksi()
+        self.kalibrasyon = _KalibrasyonIndeksi()
+        self._tablolar = {t.anahtar: t for t in (self.bakim, self.kalibrasyon)}
+
+        if cache:
+            cache.add_listener(self._cache_degisti)
+            for anahtar in self._tablolar:
+                kayitlar = cache.get(anahtar)
+                if kayitlar is not None:
+                    self._tabloyu_isle(anahtar, kayitlar)
+
+    # --- Önbellek olayları ---
+    def _cache_degisti(self, olay: str, key: str, value: Any):
+        if olay == 'set':
+            if key in self._tablolar:
+                self._tabloyu_isle(key, value)
+        elif olay == 'invalidate':
+            if key in self._tablolar:
+                self._tablolar[key].guncel = False
+        elif olay == 'clear':
+            for tablo in self._tablolar.values():
+                tablo.guncel = False
+
+    def _tabloyu_isle(self, anahtar: str, kayitlar: List[Dict]):
+        tablo = self._tablolar[anahtar]
+        with self._veri_lock:
+            if tablo.yuklendi and tablo.son_kayitlar is kayitlar:
+                tablo.guncel = True
+                return
+            if tablo.guncelle(kayitlar or []):
+                logger.debug(f"Bakım takvimi güncellendi: {anahtar}")
+
+    # --- Veri hazırlama ---
+    def hazirla(self, force_refresh: bool = False):
+        """
+        Eksik veya süresi dolmuş tabloları (önbellek üzerinden) çeker.
+        Arka plan thread'inden çağrılmalıdır; tablolar güncelse hemen döner.
+        """
+        for anahtar, tablo in self._tablolar.items():
+            if tablo.guncel and not force_refresh:
+                continue
+            kayitlar = veritabani_getir_cached(tablo.vt_tipi, tablo.sayfa_adi, force_refresh=force_refresh)
+            self._tabloyu_isle(anahtar, kayitlar)
+
+    def hazir_mi(self) -> bool:
+        return all(t.yuklendi for t in self._tablolar.values())
+
+    def yenilenecek_isaretle(self, anahtar: str):
+        """Form indekse işlenemeyen bir değişiklik yazdıysa tablo sonraki açılışta yeniden çekilir."""
+        if cache:
+            cache.invalidate(anahtar)
+        else:
+            self._tablolar[anahtar].guncel = False
+
+    # --- Yazma sonrası artımlı güncelleme ---
+    def _satir_sozlugu(self, degerler: List[Any]) -> Dict:
+        # Sayfanın gerçek başlıkları biliniyorsa onlar kullanılır
+        kayitlar = self.bakim.son_kayitlar
+        basliklar = list(kayitlar[0].keys()) if kayitlar else list(BAKIM_SUTUNLARI)
+        return dict(zip(basliklar, degerler))
+
+    def _onbellege_yaz(self, tablo, kayitlar):
+        # Aynı liste nesnesi yazıldığı için servisin kendi dinleyicisi farkı tekrar almaz
+        if cache:
+            cache.set(tablo.anahtar, kayitlar)
+
+    def plan_ekle(self, satirlar: Iterable[List[Any]]):
+        """Periyodik_Bakim sayfasına eklenen satırları (liste olarak) indekse işler."""
+        with self._veri_lock:
+            if not self.bakim.yuklendi:
+                return
+            kayitlar = [self._satir_sozlugu(s) for s in satirlar]
+            self._onbellege_yaz(self.bakim, self.bakim.satirlari_ekle(kayitlar))
+
+    def plan_guncelle(self, sira: int, degerler: List[Any]):
+        """Sayfadaki `sira`. planın (0 tabanlı, başlık hariç) yeni değerlerini işler."""
+        with self._veri_lock:
+            if not self.bakim.yuklendi or not 0 <= sira < len(self.bakim.son_kayitlar):
+                self.yenilenecek_isaretle(self.bakim.anahtar)
+                return
+            yeni = {**self.bakim.son_kayitlar[sira], **self._satir_sozlugu(degerler)}
+            self._onbellege_yaz(self.bakim, self.bakim.satir_degistir(sira, yeni))
+
+    # --- Kayıtlar ---
+    def bakim_kayitlari(self) -> List[Dict]:
+        """Periyodik_Bakim kayıtları (sayfadaki sırayla; kayıt i -> sayfa satırı i + 2)."""
+        with self._veri_lock:
+            return list(self.bakim.son_kayitlar)
+
+    # --- Vade sorguları ---
+    def _indeksler(self, tur: Optional[str]):
+        return [t for t in (self.bakim, self.kalibrasyon) if tur is None or t.tur == tur]
+
+    @staticmethod
+    def _kayitlar(secilen: Iterable[tuple], bugun: int) -> List[Dict]:
+        return [{'tur': tur, 'anahtar': anahtar, 'cihaz': cihaz,
+                 'tarih': date.fromordinal(vade), 'kalan': vade - bugun}
+                for vade, tur, anahtar, cihaz in secilen]
+
+    def _aralik(self, bas: Optional[int], bit: int, tur: Optional[str], limit: Optional[int]):
+        with self._veri_lock:
+            parcalar = [[(v, t.tur, a, c) for v, a, c in t.aralik(bas, bit)] for t in self._indeksler(tur)]
+        birlesik = heapq.merge(*parcalar)
+        return list(birlesik)[:limit] if limit else list(birlesik)
+
+    def aralik(self, bas: date, bit: date, tur: Optional[str] = None,
+               limit: Optional[int] = None, bugun: Optional[date] = None) -> List[Dict]:
+        """[bas, bit] tarihleri arasındaki bakım/kalibrasyon vadeleri (tarihe göre sıralı)."""
+        b = (bugun or date.today()).toordinal()
+        return self._kayitlar(self._aralik(bas.toordinal(), bit.toordinal() + 1, tur, limit), b)
+
+    def gecikenler(self, tur: Optional[str] = None, bugun: Optional[date] = None,
+                   limit: Optional[int] = None) -> List[Dict]:
+        """Vadesi geçmiş planlar ve süresi dolmuş kalibrasyonlar (en eskisi önce)."""
+        b = (bugun or date.today()).toordinal()
+        return self._kayitlar(self._aralik(None, b, tur, limit), b)
+
+    def yaklasanlar(self, gun: int = 45, tur: Optional[str] = None, bugun: Optional[date] = None,
+                    limit: Optional[int] = None) -> List[Dict]:
+        """Bugünden itibaren `gun` gün içindeki vadeler."""
+        b = (bugun or date.today()).toordinal()
+        return self._kayitlar(self._aralik(b, b + gun + 1, tur, limit), b)
+
+    def sayilar(self, gun: int = 45, bugun: Optional[date] = None) -> Dict[str, Dict[str, int]]:
+        """Tür başına geciken / yaklaşan adetleri (liste oluşturmadan)."""
+        b = (bugun or date.today()).toordinal()
+        with self._veri_lock:
+            return {t.tur: {'geciken': t.sayi(None, b), 'yaklasan': t.sayi(b, b + gun + 1)}
+                    for t in self._indeksler(None)}
+
+    def cihaz_takvimi(self, cihaz_id: str, bugun: Optional[date] = None) -> List[Dict]:
+        """Bir cihazın açık bakım planları ve kalibrasyon vadesi."""
+        b = (bugun or date.today()).toordinal()
+        cihaz = str(cihaz_id).strip()
+        with self._veri_lock:
+            secilen = sorted((v, t.tur, a, cihaz) for t in self._indeksler(None)
+                             for v, a in t.cihaz_vadeleri.get(cihaz, Counter()).elements())
+        return self._kayitlar(secilen, b)
+
+    def haftalik_yuk(self, bas: date, bit: date, tur: Optional[str] = None) -> List[Dict]:
+        """
+        [bas, bit] arasındaki her hafta (pazartesiden) için vade adetleri.
+        Hafta sayaçları hazır tutulduğu için süre satır sayısından bağımsızdır.
+        """
+        hafta = _hafta(bas.toordinal())
+        son = bit.toordinal()
+        sonuc = []
+        with self._veri_lock:
+            indeksler = self._indeksler(tur)
+            while hafta <= son:
+                satir = {'hafta': date.fromordinal(hafta)}
+                for t in indeksler:
+                    satir[t.tur] = t.haftalar.get(hafta, 0)
+                satir['toplam'] = sum(t.haftalar.get(hafta, 0) for t in indeksler)
+                sonuc.append(satir)
+                hafta += 7
+        return sonuc
+
+    # --- Dönem üretimi ---
+    def donem_planlari(self, plan_no: int, ufuk_gun: int = VARSAYILAN_UFUK_GUNU,
+                       bugun: Optional[date] = None) -> List[List[str]]:
+        """
+        Son planı `ufuk_gun` içinde biten her tekrarlı serinin bir sonraki
+        dönemini toplu üretir. Bir cihazın farklı periyotlu serileri (ör. 3 ve
+        12 aylık) ayrı ayrı yenilenir. Geride kalmış seriler kendi ritimlerinde
+        ilerletilir; yeni dönem, eski vadelerden bugüne denk gelen ya da bugünden
+        sonraki ilk vadeyle başlar. Satırlar Periyodik_Bakim sütun sırasındadır;
+        PlanID'ler `plan_no`dan başlayarak artar.
+        """
+        bugun = bugun or date.today()
+        sinir = bugun.toordinal() + ufuk_gun
+        with self._veri_lock:
+            # (cihaz, periyot) -> serinin son planı (vade, sıra)
+            son_planlar: Dict[Tuple[str, str], Tuple[int, int]] = {}
+            for cihaz, seri in self.bakim.seriler.items():
+                for vade, sira, periyot in seri:
+                    anahtar = (cihaz, periyot)
+                    if anahtar not in son_planlar or (vade, sira) > son_planlar[anahtar]:
+                        son_planlar[anahtar] = (vade, sira)
+        sonlar = [(cihaz, (vade, sira, periyot)) for (cihaz, periyot), (vade, sira) in son_planlar.items()]
+
+        satirlar = []
+        for cihaz, (son_vade, son_sira, periyot) in sorted(sonlar):
+            if son_vade > sinir:
+                continue
+            ay = periyot_ayi(periyot)
+            son = date.fromordinal(son_vade)
+            adim = 1
+            while son + relativedelta(months=adim * ay) < bugun:
+                adim += 1
+            bas = son + relativedelta(months=adim * ay)
+            yeni = plan_satirlari(cihaz, periyot, bas, plan_no + len(satirlar), bas_sira=son_sira + 1)
+            satirlar.extend(yeni)
+        return satirlar
+
+
+# Global erişim noktası
+bakim_planlayici = BakimPlanlayici()
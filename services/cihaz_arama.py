@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    from google_baglanti import veritabani_getir_cached
+    from araclar.cache_yonetimi import cache
+    from araclar.arama_indeksi import AramaIndeksi
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from google_baglanti import veritabani_getir_cached
+    from araclar.cache_yonetimi import cache
+    from araclar.arama_indeksi import AramaIndeksi
+
+logger = logging.getLogger("CihazArama")
+
+CIHAZ_TABLOSU = 'cihaz:Cihazlar'
+# Serbest metinle aranan sütunlar
+ARAMA_SUTUNLARI = ("cihaz_id", "Marka", "Model", "SeriNo", "NDKLisansNo", "AnaBilimDali")
+# Combo filtrelerinin tam eşleştiği sütunlar
+ESITLIK_SUTUNLARI = ("AnaBilimDali", "Kaynak")
+
+
+class CihazAramaServisi:
+    """
+    Cihazlar tablosunun arama indeksi.
+    Tablo önbelleğe her yazıldığında indeks arka planda (yazan thread'de) bir
+    kez kurulur; formlar kayıt listesiyle eşleşen hazır indeksi alır.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        """Singleton: Cihaz listesi ve seçim ekranları aynı indeksi kullanır."""
+        if not cls._instance:
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = super(CihazAramaServisi, cls).__new__(cls)
+                    cls._instance._init_servis()
+        return cls._instance
+
+    def _init_servis(self):
+        self._veri_lock = threading.RLock()
+        # (kayıt listesi, indeks): indeksin satır numaraları bu listenin sırasıdır
+        self._durum: Tuple[Optional[List[Dict]], Optional[AramaIndeksi]] = (None, None)
+
+        if cache:
+            cache.add_listener(self._cache_degisti)
+            kayitlar = cache.get(CIHAZ_TABLOSU)
+            if kayitlar is not None:
+                self._indeksle(kayitlar)
+
+    def _cache_degisti(self, olay: str, key: str, value: Any):
+        if olay == 'set' and key == CIHAZ_TABLOSU:
+            self._indeksle(value)
+
+    def _indeksle(self, kayitlar: List[Dict]) -> Tuple[List[Dict], AramaIndeksi]:
+        with self._veri_lock:
+            if self._durum[0] is kayitlar:
+                return self._durum
+            kayitlar = kayitlar or []
+            self._durum = (kayitlar, AramaIndeksi(kayitlar, ARAMA_SUTUNLARI, ESITLIK_SUTUNLARI))
+            logger.debug(f"Cihaz arama indeksi kuruldu: {len(kayitlar)} kayıt")
+            return self._durum
+
+    def hazirla(self, force_refresh: bool = False) -> Tuple[List[Dict], AramaIndeksi]:
+        """
+        Cihazlar tablosunu (önbellek üzerinden) alır ve eşleşen indeksi döndürür.
+        Arka plan thread'inden çağrılmalıdır.
+        """
+        kayitlar = veritabani_getir_cached('cihaz', 'Cihazlar', force_refresh=force_refresh)
+        return self._indeksle(kayitlar)
+
+    def yenilenecek_isaretle(self):
+        """Cihaz eklendi/güncellendi: tablo sonraki açılışta yeniden çekilir."""
+        if cache:
+            cache.invalidate(CIHAZ_TABLOSU)
+
+
+# Global erişim noktası
+cihaz_arama = CihazAramaServisi()
@@ -0,0 +1,528 @@
+# -*- coding: utf-8 -*-
+import bisect
+import logging
+import threading
+from collections import Counter
+from datetime import date
+from typing import Dict, List, Optional, Any, Iterable, Callable
+
+from PySide6.QtCore import QObject, QThread, QTimer, Signal
+
+try:
+    from google_baglanti import veritabani_getir_cached
+    from araclar.cache_yonetimi import cache
+    from araclar.tarih_araclari import tarih_coz
+    from services.tablo_toplayici import TabloToplayici
+    from services.rke_takvim import rke_takvimi, RKE_VADE_KAYNAGI
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from google_baglanti import veritabani_getir_cached
+    from araclar.cache_yonetimi import cache
+    from araclar.tarih_araclari import tarih_coz
+    from services.tablo_toplayici import TabloToplayici
+    from services.rke_takvim import rke_takvimi, RKE_VADE_KAYNAGI
+
+logger = logging.getLogger("DashboardService")
+
+KAPALI_ARIZA_DURUMLARI = ("Kapalı", "İptal", "Çözüldü")
+# Panoların kaynak tablolarının önbellek süresini kontrol etme aralığı (saniye, 0: kapalı)
+VARSAYILAN_YENILEME_SN = 300
+# RKE vade takviminden beslenen özet alanları
+RKE_ALANLARI = ("rke_geciken", "rke_yaklasan")
+
+
+# =============================================================================
+# 1. TABLO TOPLAYICILARI (SATIR KATKILARI)
+# =============================================================================
+class _PersonelToplayici(TabloToplayici):
+    vt_tipi, sayfa_adi = 'personel', 'Personel'
+    alanlar = ("toplam_personel", "aktif_personel", "birim_dagilimi", "dogum_gunleri")
+
+    def __init__(self):
+        super().__init__()
+        self.toplam = 0
+        self.durumlar = Counter()
+        self.birimler = Counter()
+        # ay -> Counter((gun, ad, tarih_metni))
+        self.dogum_gunleri: Dict[int, Counter] = {}
+
+    def _uygula(self, row, k):
+        self.toplam += k
+        self.durumlar[row.get('Durum', 'Aktif')] += k
+        birim = row.get('Hizmet_Sinifi', 'Diğer')
+        if birim:
+            self.birimler[birim] += k
+            if self.birimler[birim] <= 0:
+                del self.birimler[birim]
+
+        tarih_str = str(row.get('Dogum_Tarihi', ''))
+        dt = tarih_coz(tarih_str)
+        if dt:
+            ay = self.dogum_gunleri.setdefault(dt.month, Counter())
+            anahtar = (dt.day, row.get('Ad_Soyad', ''), tarih_str)
+            ay[anahtar] += k
+            if ay[anahtar] <= 0:
+                del ay[anahtar]
+
+    def _ekle(self, row):
+        self._uygula(row, 1)
+
+    def _cikar(self, row):
+        self._uygula(row, -1)
+
+
+class _CihazToplayici(TabloToplayici):
+    vt_tipi, sayfa_adi = 'cihaz', 'Cihazlar'
+    alanlar = ("toplam_cihaz",)
+
+    def __init__(self):
+        super().__init__()
+        self.toplam = 0
+
+    def _ekle(self, row):
+        self.toplam += 1
+
+    def _cikar(self, row):
+        self.toplam -= 1
+
+
+class _ArizaToplayici(TabloToplayici):
+    vt_tipi, sayfa_adi = 'cihaz', 'cihaz_ariza'
+    alanlar = ("aktif_ariza", "son_arizalar")
+
+    def __init__(self):
+        super().__init__()
+        self.acik = 0
+
+    def _acik_mi(self, row):
+        return str(row.get('Durum', '')).strip() not in KAPALI_ARIZA_DURUMLARI
+
+    def _ekle(self, row):
+        if self._acik_mi(row):
+            self.acik += 1
+
+    def _cikar(self, row):
+        if self._acik_mi(row):
+            self.acik -= 1
+
+
+class _KalibrasyonToplayici(TabloToplayici):
+    vt_tipi, sayfa_adi = 'cihaz', 'Kalibrasyon'
+    alanlar = ("yaklasan_kalibrasyon",)
+
+    def __init__(self):
+        super().__init__()
+        # Bitiş tarihine göre sıralı: (ordinal, cihaz, bitis_metni)
+        self.bitisler: List[tuple] = []
+
+    def _kayit(self, row):
+        bitis_str = str(row.get('BitisTarihi', '')).strip()
+        dt = tarih_coz(bitis_str)
+        if not dt:
+            return None
+        return (dt.toordinal(), str(row.get('CihazID', '-')), bitis_str)
+
+    def _ekle(self, row):
+        kayit = self._kayit(row)
+        if kayit:
+            bisect.insort(self.bitisler, kayit)
+
+    def _cikar(self, row):
+        kayit = self._kayit(row)
+        if kayit:
+            i = bisect.bisect_left(self.bitisler, kayit)
+            if i < len(self.bitisler) and self.bitisler[i] == kayit:
+                del self.bitisler[i]
+
+
+class _IzinToplayici(TabloToplayici):
+    vt_tipi, sayfa_adi = 'personel', 'izin_giris'
+    alanlar = ("izinli_personel", "izindekiler")
+
+    def __init__(self):
+        super().__init__()
+        # (bas_ordinal, bit_ordinal, ad, tur) -> adet
+        self.izinler = Counter()
+        self._bugun_cache = (None, None)
+
+    def _kayit(self, row):
+        bas = tarih_coz(row.get('Başlama_Tarihi'))
+        bit = tarih_coz(row.get('Bitiş_Tarihi'))
+        if not bas or not bit:
+            return None
+        ad = row.get('Ad_Soyad', row.get('personel_id', 'Bilinmiyor'))
+        tur = row.get('İzin_Türü', 'Yıllık')
+        return (bas.toordinal(), bit.toordinal(), ad, tur)
+
+    def _ekle(self, row):
+        kayit = self._kayit(row)
+        if kayit:
+            self.izinler[kayit] += 1
+            self._bugun_cache = (None, None)
+
+    def _cikar(self, row):
+        kayit = self._kayit(row)
+        if kayit:
+            self.izinler[kayit] -= 1
+            if self.izinler[kayit] <= 0:
+                del self.izinler[kayit]
+            self._bugun_cache = (None, None)
+
+    def gune_gore(self, gun: date) -> List[Dict]:
+        """O gün izinde olanlar. Aynı gün için sonuç yeniden hesaplanmaz."""
+        gun_o = gun.toordinal()
+        if self._bugun_cache[0] == gun_o:
+            return self._bugun_cache[1]
+        liste = []
+        for (bas, bit, ad, tur), adet in self.izinler.items():
+            if bas <= gun_o <= bit:
+                for _ in range(adet):
+                    liste.append({"ad": ad, "donus": date.fromordinal(bit).strftime("%d.%m.%Y"), "tur": tur})
+        self._bugun_cache = (gun_o, liste)
+        return liste
+
+
+# =============================================================================
+# 2. SERVİS (TEK DOĞRULUK KAYNAĞI)
+# =============================================================================
+class DashboardService:
+    """
+    Yönetim ve personel panolarının ortak veri kaynağı.
+    Sayaçlar bellekte hazır tutulur ve önbellek (cache) değiştikçe
+    ilgili tablo için artımlı olarak güncellenir. Pano açılışı sadece
+    bu sayaçları okur.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        """Singleton: İki pano da aynı örneği kullanır."""
+        if not cls._instance:
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = super(DashboardService, cls).__new__(cls)
+                    cls._instance._init_service()
+        return cls._instance
+
+    def _init_service(self):
+        self._veri_lock = threading.RLock()
+        self.personel = _PersonelToplayici()
+        self.cihaz = _CihazToplayici()
+        self.ariza = _ArizaToplayici()
+        self.kalibrasyon = _KalibrasyonToplayici()
+        self.izin = _IzinToplayici()
+        self._tablolar = {t.anahtar: t for t in (self.personel, self.cihaz, self.ariza, self.kalibrasyon, self.izin)}
+        # Özet alanı -> sürüm numarası (değiştikçe artar)
+        self._surumler: Dict[str, int] = {}
+        # Özet alanı -> kaynak tablo anahtarı
+        self._alan_tablolari = {alan: t.anahtar for t in self._tablolar.values() for alan in t.alanlar}
+        self._okuyucular = {
+            "toplam_personel": lambda: self.personel.toplam,
+            "aktif_personel": lambda: self.personel.durumlar.get("Aktif", 0),
+            "birim_dagilimi": lambda: dict(self.personel.birimler),
+            "dogum_gunleri": self.dogum_gunleri,
+            "toplam_cihaz": lambda: self.cihaz.toplam,
+            "aktif_ariza": lambda: self.ariza.acik,
+            "son_arizalar": self.son_arizalar,
+            "yaklasan_kalibrasyon": self.yaklasan_kalibrasyonlar,
+            "izinli_personel": lambda: len(self.izin.gune_gore(date.today())),
+            "izindekiler": self.izindekiler,
+            "rke_geciken": lambda: rke_takvimi.sayilar()['geciken'],
+            "rke_yaklasan": lambda: rke_takvimi.sayilar()['yaklasan'],
+        }
+        self._alan_tablolari.update({alan: RKE_VADE_KAYNAGI for alan in RKE_ALANLARI})
+        self._dinleyiciler: List[Callable[[str, Any], None]] = []
+
+        if cache:
+            cache.add_listener(self._cache_degisti)
+            # Servis oluşmadan önce önbelleğe girmiş tablolar varsa onlarla başla
+            for anahtar in self._tablolar:
+                kayitlar = cache.get(anahtar)
+                if kayitlar is not None:
+                    self._tabloyu_isle(anahtar, kayitlar)
+        rke_takvimi.abone_ol(self._rke_vadeleri_degisti)
+
+    # --- Önbellek olayları ---
+    def _cache_degisti(self, olay: str, key: str, value: Any):
+        if olay == 'set':
+            if key in self._tablolar:
+                self._tabloyu_isle(key, value)
+        elif olay == 'invalidate':
+            tablo = self._tablolar.get(key)
+            if tablo:
+                tablo.guncel = False
+                self._bildir('eskidi', [key])
+        elif olay == 'clear':
+            for tablo in self._tablolar.values():
+                tablo.guncel = False
+            self._bildir('eskidi', list(self._tablolar))
+
+    def _tabloyu_isle(self, anahtar: str, kayitlar: List[Dict]) -> List[str]:
+        """Tabloya farkı uygular ve değişen özet alanlarını döndürür."""
+        tablo = self._tablolar[anahtar]
+        with self._veri_lock:
+            if tablo.yuklendi and tablo.son_kayitlar is kayitlar:
+                tablo.guncel = True
+                return []
+            if not tablo.guncelle(kayitlar or []):
+                return []
+            for alan in tablo.alanlar:
+                self._surumler[alan] = self._surumler.get(alan, 0) + 1
+        logger.debug(f"Dashboard sayaçları güncellendi: {anahtar}")
+        self._bildir('degisti', list(tablo.alanlar))
+        return list(tablo.alanlar)
+
+    def _rke_vadeleri_degisti(self):
+        with self._veri_lock:
+            for alan in RKE_ALANLARI:
+                self._surumler[alan] = self._surumler.get(alan, 0) + 1
+        self._bildir('degisti', list(RKE_ALANLARI))
+
+    # --- Abonelikler ---
+    def abone_ol(self, callback: Callable[[str, Any], None]):
+        """
+        callback(olay, deger) şeklinde çağrılır:
+        'degisti' -> değişen özet alanları, 'eskidi' -> geçersizlenen tablo anahtarları.
+        Çağrı, veriyi değiştiren thread'den yapılır.
+        """
+        with self._veri_lock:
+            if callback not in self._dinleyiciler:
+                self._dinleyiciler.append(callback)
+
+    def abonelikten_cik(self, callback: Callable[[str, Any], None]):
+        with self._veri_lock:
+            if callback in self._dinleyiciler:
+                self._dinleyiciler.remove(callback)
+
+    def _bildir(self, olay: str, deger: Any):
+        with self._veri_lock:
+            dinleyiciler = list(self._dinleyiciler)
+        for callback in dinleyiciler:
+            try:
+                callback(olay, deger)
+            except Exception as e:
+                logger.error(f"Dashboard abonesi hatası: {e}")
+
+    # --- Veri hazırlama ---
+    def hazirla(self, anahtarlar: Optional[Iterable[str]] = None, force_refresh: bool = False) -> List[str]:
+        """
+        Eksik veya süresi dolmuş tabloları (önbellek üzerinden) çeker.
+        Arka plan thread'inden çağrılmalıdır. Değişen özet alanlarını döndürür.
+        """
+        degisen = []
+        for anahtar in (anahtarlar or self._tablolar.keys()):
+            if anahtar == RKE_VADE_KAYNAGI:
+                # RKE tabloları kendi servisinde tutulur; değişiklik takvim aboneliğiyle gelir
+                rke_takvimi.tazele(force_refresh)
+                continue
+            tablo = self._tablolar[anahtar]
+            # TTL dolmuşsa cache.get kaydı geçersizler ('invalidate' olayı tabloyu eskitir)
+            if tablo.guncel and not force_refresh and (not cache or cache.get(anahtar) is not None):
+                continue
+            kayitlar = veritabani_getir_cached(tablo.vt_tipi, tablo.sayfa_adi, force_refresh=force_refresh)
+            # Cache 'set' olayı farkı zaten uyguladıysa burada iş yapılmaz
+            degisen.extend(self._tabloyu_isle(anahtar, kayitlar))
+        return degisen
+
+    def hazir_mi(self, anahtarlar: Optional[Iterable[str]] = None) -> bool:
+        return all(rke_takvimi.hazir_mi() if a == RKE_VADE_KAYNAGI else self._tablolar[a].yuklendi
+                   for a in (anahtarlar or self._tablolar.keys()))
+
+    def surum(self, alan: str) -> int:
+        return self._surumler.get(alan, 0)
+
+    def tablolar_icin(self, alanlar: Iterable[str]) -> List[str]:
+        """Verilen özet alanlarının beslendiği tablo anahtarları."""
+        return sorted({self._alan_tablolari[a] for a in alanlar})
+
+    def alan_degeri(self, alan: str) -> Any:
+        """Tek bir özet alanının güncel değeri (bellekten okunur)."""
+        with self._veri_lock:
+            return self._okuyucular[alan]()
+
+    # --- Özet sorguları ---
+    def yaklasan_kalibrasyonlar(self, gun: int = 45, limit: int = 10, bugun: Optional[date] = None) -> List[Dict]:
+        bugun = bugun or date.today()
+        b = bugun.toordinal()
+        with self._veri_lock:
+            bitisler = self.kalibrasyon.bitisler
+            i = bisect.bisect_left(bitisler, (b,))
+            j = bisect.bisect_right(bitisler, (b + gun, chr(0x10FFFF)))
+            secilen = bitisler[i:min(j, i + limit)] if limit else bitisler[i:j]
+        return [{'cihaz': cihaz, 'bitis': metin, 'kalan': ordn - b} for ordn, cihaz, metin in secilen]
+
+    def son_arizalar(self, adet: int = 5) -> List[Dict]:
+        with self._veri_lock:
+            son = self.ariza.son_kayitlar[-adet:] if adet else []
+        sonuc = []
+        for row in reversed(son):
+            sonuc.append({
+                'id': row.get('ArizaID', '-'),
+                'cihaz': row.get('CihazID', '-'),
+                'konu': row.get('Konu', '-'),
+                'durum': str(row.get('Durum', '')).strip(),
+                'tarih': row.get('Tarih', '-')
+            })
+        return sonuc
+
+    def dogum_gunleri(self, ay: Optional[int] = None) -> List[Dict]:
+        ay = ay or date.today().month
+        with self._veri_lock:
+            kayitlar = sorted(self.personel.dogum_gunleri.get(ay, Counter()).elements())
+        return [{"ad": ad, "gun": gun, "tam_tarih": metin} for gun, ad, metin in kayitlar]
+
+    def izindekiler(self, gun: Optional[date] = None) -> List[Dict]:
+        with self._veri_lock:
+            return list(self.izin.gune_gore(gun or date.today()))
+
+    def yonetim_ozeti(self) -> Dict[str, Any]:
+        """formlar/dashboard.py kartları ve tabloları için özet."""
+        with self._veri_lock:
+            return {
+                "toplam_personel": self.personel.toplam,
+                "toplam_cihaz": self.cihaz.toplam,
+                "aktif_ariza": self.ariza.acik,
+                "son_arizalar": self.son_arizalar(),
+                "yaklasan_kalibrasyon": self.yaklasan_kalibrasyonlar()
+            }
+
+    def personel_ozeti(self) -> Dict[str, Any]:
+        """formlar/user_dashboard.py için personel analizi."""
+        with self._veri_lock:
+            izindekiler = self.izindekiler()
+            return {
+                "toplam_personel": self.personel.toplam,
+                "aktif_personel": self.personel.durumlar.get("Aktif", 0),
+                "izinli_personel": len(izindekiler),
+                "dogum_gunleri": self.dogum_gunleri(),
+                "izindekiler": izindekiler,
+                "birim_dagilimi": dict(self.personel.birimler)
+            }
+
+
+# Global erişim noktası
+dashboard_servisi = DashboardService()
+
+
+# =============================================================================
+# 3. QT ABONELİĞİ (PANOLAR İÇİN)
+# =============================================================================
+class _YenilemeWorker(QThread):
+    """Abone olunan tabloları arka planda çeker; değişiklikler servis sinyalleriyle gelir."""
+    hata_olustu = Signal(str)
+
+    def __init__(self, tablolar, force_refresh=False):
+        super().__init__()
+        self.tablolar = tablolar
+        self.force_refresh = force_refresh
+
+    def run(self):
+        try:
+            dashboard_servisi.hazirla(self.tablolar, force_refresh=self.force_refresh)
+        except Exception as e:
+            self.hata_olustu.emit(str(e))
+
+
+class DashboardAbonelik(QObject):
+    """
+    Bir panonun ilgilendiği özet alanlarına aboneliği.
+    Önbellekteki tablolar (yerel kayıt veya arka plan senkronu ile) değiştiğinde
+    sadece değeri gerçekten değişen alanlar `alanlar_degisti` ile yayınlanır.
+    Ayrıca `poll_saniye` aralığıyla önbellek süresi (TTL) dolmuş tablolar yeniden
+    çekilir (0: kapalı); güncel tablolar için ağa gidilmez.
+    """
+    alanlar_degisti = Signal(dict)   # {alan: yeni_deger}
+    yukleniyor = Signal(bool)
+    hata_olustu = Signal(str)
+    _servis_olayi = Signal(str, object)
+
+    def __init__(self, alanlar, poll_saniye=VARSAYILAN_YENILEME_SN, parent=None):
+        super().__init__(parent)
+        self.alanlar = list(alanlar)
+        self.tablolar = dashboard_servisi.tablolar_icin(self.alanlar)
+        self._son_degerler: Dict[str, Any] = {}
+        self._worker = None
+        self._bekleyen = None  # Worker çalışırken gelen yenileme isteği (force_refresh)
+
+        # Servis bildirimleri başka thread'den gelebilir; sinyal ile GUI thread'ine taşınır
+        self._servis_olayi.connect(self._olay_isle)
+        dashboard_servisi.abone_ol(self._servis_bildirimi)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.timeout.connect(self._poll)
+        self.poll_araligi_ayarla(poll_saniye)
+
+        # Peş peşe gelen geçersizlemeleri tek çekime indirir
+        self._eskime_timer = QTimer(self)
+        self._eskime_timer.setSingleShot(True)
+        self._eskime_timer.setInterval(500)
+        self._eskime_timer.timeout.connect(lambda: self.yenile(False))
+
+    def poll_araligi_ayarla(self, saniye):
+        self.poll_saniye = saniye
+        if saniye and saniye > 0:
+            self._poll_timer.start(int(saniye * 1000))
+        else:
+            self._poll_timer.stop()
+
+    def baslat(self):
+        """Bellekteki değerleri hemen yayınlar, eksik tabloları arka planda çeker."""
+        self._son_degerler.clear()
+        self._degerleri_yayinla(self.alanlar)
+        self.yenile(False)
+
+    def yenile(self, force_refresh=True):
+        if self._worker and self._worker.isRunning():
+            self._bekleyen = bool(self._bekleyen) or force_refresh
+            return
+        self._worker = _YenilemeWorker(self.tablolar, force_refresh)
+        self._worker.hata_olustu.connect(self.hata_olustu)
+        self._worker.finished.connect(self._yenileme_bitti)
+        self.yukleniyor.emit(True)
+        self._worker.start()
+
+    def _yenileme_bitti(self):
+        self.yukleniyor.emit(False)
+        if self._bekleyen is not None:
+            force, self._bekleyen = self._bekleyen, None
+            self.yenile(force)
+
+    def _poll(self):
+        # Gün değişimi gibi tablo dışı değişiklikler de bu sırada yakalanır
+        self._degerleri_yayinla(self.alanlar)
+        # Zorla çekilmez: yalnızca TTL'i dolmuş ya da geçersizlenmiş tablolar yenilenir
+        self.yenile(False)
+
+    def _servis_bildirimi(self, olay, deger):
+        try:
+            self._servis_olayi.emit(olay, deger)
+        except RuntimeError:
+            # Qt nesnesi silinmiş (pencere kapandı)
+            dashboard_servisi.abonelikten_cik(self._servis_bildirimi)
+
+    def _olay_isle(self, olay, deger):
+        if olay == 'degisti':
+            self._degerleri_yayinla([a for a in deger if a in self.alanlar])
+        elif olay == 'eskidi' and any(t in self.tablolar for t in deger):
+            self._eskime_timer.start()
+
+    def _degerleri_yayinla(self, alanlar):
+        degisen = {}
+        for alan in alanlar:
+            deger = dashboard_servisi.alan_degeri(alan)
+            if alan not in self._son_degerler or self._son_degerler[alan] != deger:
+                self._son_degerler[alan] = deger
+                degisen[alan] = deger
+        if degisen:
+            self.alanlar_degisti.emit(degisen)
+
+    def kapat(self):
+        dashboard_servisi.abonelikten_cik(self._servis_bildirimi)
+        self._poll_timer.stop()
+        self._eskime_timer.stop()
+        if self._worker and self._worker.isRunning():
+            self._worker.quit()
+            self._worker.wait(500)
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+Giriş için kullanıcı adına göre indekslenmiş yerel kimlik deposu.
+- user_login sayfası diskte (temp/kimlik_onbellegi.json) yalnızca giriş
+  için gereken sütunlarla ve dosyanın Drive sürüm damgasıyla saklanır.
+- Senkron: damga değişmediyse sayfa indirilmez; değiştiyse indirilen
+  satırlar indeksle karşılaştırılıp yalnızca değişen kullanıcılar güncellenir.
+- Giriş, indeksteki kayıtla yerelde doğrulanır; internet yoksa diskteki
+  son indeksle çevrimdışı giriş yapılır.
+- Eski biçimli (ya da düşük maliyetli) hash'ler başarılı girişte arka
+  planda yeni KDF hash'iyle değiştirilir (şifre değişimi bekleyen
+  kullanıcılar hariç; onların şifresi zaten SifreDegistir'de yazılır).
+"""
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    from google_baglanti import veritabani_getir, spreadsheet_getir, InternetBaglantiHatasi
+    from araclar.guvenlik import GuvenlikAraclari
+except ImportError:
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from google_baglanti import veritabani_getir, spreadsheet_getir, InternetBaglantiHatasi
+    from araclar.guvenlik import GuvenlikAraclari
+
+logger = logging.getLogger("KimlikDeposu")
+
+_KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KIMLIK_ONBELLEK_DOSYASI = os.path.join(_KOK_DIZIN, "temp", "kimlik_onbellegi.json")
+KULLANICI_SAYFASI = ('user', 'user_login')
+# Son senkrondan bu kadar süre geçmeden yapılan girişte damga bile sorulmaz (sn)
+SENKRON_ARALIGI_SN = 300
+# Yerel kopyayla devam edilebilecek hatalar (requests/socket hataları OSError'dur);
+# yetki ya da sayfa hataları girişe yükseltilir
+BAGLANTI_HATALARI = (InternetBaglantiHatasi, OSError)
+
+# Sayfa başlıkları; başlık bulunamazsa eski sabit sütun numaraları kullanılır
+SUTUN_KADI, SUTUN_SIFRE, SUTUN_ROL, SUTUN_DEGISIM = "username", "password", "roller", "degisim_gerekli"
+VARSAYILAN_SUTUNLAR = {SUTUN_KADI: 1, SUTUN_SIFRE: 3, SUTUN_DEGISIM: 6}
+
+# dogrula() sonuçları
+GIRIS_BASARILI = "OK"
+SIFRE_HATALI = "SIFRE_HATALI"
+KULLANICI_YOK = "KULLANICI_YOK"
+
+
+class KimlikKaydi(NamedTuple):
+    kadi: str
+    sifre_hash: str
+    rol: str
+    degisim_gerekli: bool
+    satir: int  # sayfadaki satır numarası (1: başlık)
+
+
+def satirlari_indeksle(degerler: List[List[str]]) -> Tuple[Dict[str, int], Dict[str, KimlikKaydi]]:
+    """get_all_values çıktısını (başlık dahil) sütun haritası ve kadi -> kayıt indeksine çevirir."""
+    if not degerler:
+        return dict(VARSAYILAN_SUTUNLAR), {}
+    basliklar = [str(b).strip() for b in degerler[0]]
+    sutunlar = dict(VARSAYILAN_SUTUNLAR)
+    sutunlar.update({ad: basliklar.index(ad) + 1 for ad in (SUTUN_KADI, SUTUN_SIFRE, SUTUN_ROL, SUTUN_DEGISIM)
+                     if ad in basliklar})
+
+    def hucre(satir, ad, varsayilan=""):
+        no = sutunlar.get(ad)
+        return str(satir[no - 1]).strip() if no and no <= len(satir) else varsayilan
+
+    indeks: Dict[str, KimlikKaydi] = {}
+    for i, satir in enumerate(degerler[1:], start=2):
+        kadi = hucre(satir, SUTUN_KADI)
+        if not kadi or kadi in indeks:
+            continue  # aynı kullanıcı adı tekrar ederse (eski döngü gibi) ilk satır geçerli
+        indeks[kadi] = KimlikKaydi(kadi, hucre(satir, SUTUN_SIFRE), hucre(satir, SUTUN_ROL, "user") or "user",
+                                   hucre(satir, SUTUN_DEGISIM, "HAYIR").upper() == "EVET", i)
+    return sutunlar, indeks
+
+
+class KimlikDeposu:
+    def __init__(self, dosya: str = KIMLIK_ONBELLEK_DOSYASI):
+        self.dosya = dosya
+        self._kilit = threading.RLock()
+        self._kayitlar: Dict[str, KimlikKaydi] = {}
+        self._sutunlar: Dict[str, int] = dict(VARSAYILAN_SUTUNLAR)
+        self._surum: Optional[str] = None
+        self._diskten_yuklendi = False
+        self._son_senkron: Optional[float] = None  # time.monotonic()
+        self.cevrimdisi = False
+
+    # --- Disk önbelleği ---
+    def _diskten_yukle(self):
+        with self._kilit:
+            if self._diskten_yuklendi:
+                return
+            self._diskten_yuklendi = True
+            try:
+                with open(self.dosya, 'r', encoding='utf-8') as f:
+                    veri = json.load(f)
+                self._kayitlar = {k[0]: KimlikKaydi(k[0], k[1], k[2], bool(k[3]), int(k[4]))
+                                  for k in veri.get("kullanicilar", [])}
+                self._sutunlar.update(veri.get("sutunlar", {}))
+                self._surum = veri.get("surum")
+            except (OSError, ValueError, TypeError, IndexError) as e:
+                logger.debug(f"Kimlik önbelleği okunamadı: {e}")
+
+    def _diske_yaz(self):
+        with self._kilit:
+            veri = {
+                "surum": self._surum,
+                "kayit_tarihi": datetime.now().isoformat(timespec='seconds'),
+                "sutunlar": self._sutunlar,
+                "kullanicilar": [list(k) for k in self._kayitlar.values()],
+            }
+        try:
+            os.makedirs(os.path.dirname(self.dosya), exist_ok=True)
+            gecici = self.dosya + ".tmp"
+            # Şifre hash'leri içerir: yalnızca dosya sahibi okuyabilir
+            tanitici = os.open(gecici, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(tanitici, 'w', encoding='utf-8') as f:
+                json.dump(veri, f, ensure_ascii=False)
+            os.replace(gecici, self.dosya)
+        except OSError as e:
+            logger.warning(f"Kimlik önbelleği yazılamadı: {e}")
+
+    # --- Senkron ---
+    def kayitlari_guncelle(self, degerler: List[List[str]], surum: Optional[str]) -> List[str]:
+        """İndirilen satırları indeksle karşılaştırır; değişen kullanıcı adlarını döndürür."""
+        sutunlar, yeni = satirlari_indeksle(degerler)
+        with self._kilit:
+            eski = self._kayitlar
+            degisenler = sorted(k for k in set(eski) | set(yeni) if eski.get(k) != yeni.get(k))
+            if degisenler:
+                kayitlar = dict(eski)
+                for kadi in degisenler:
+                    if kadi in yeni:
+                        kayitlar[kadi] = yeni[kadi]
+                    else:
+                        kayitlar.pop(kadi, None)
+                self._kayitlar = kayitlar
+            self._sutunlar = sutunlar
+            self._surum = surum
+            self._son_senkron = time.monotonic()
+            self.cevrimdisi = False
+        return degisenler
+
+    def senkronize(self, zorla: bool = False) -> List[str]:
+        """
+        Dosyanın sürüm damgasını kontrol eder; değiştiyse (ya da `zorla`)
+        sayfayı indirip indeksi günceller. Bağlantı hatalarını yükseltir.
+        """
+        self._diskten_yukle()
+        with self._kilit:
+            sh = spreadsheet_getir(KULLANICI_SAYFASI[0])
+            surum = sh.get_lastUpdateTime() if sh is not None else None
+            if not zorla and surum is not None and surum == self._surum:
+                self._son_senkron = time.monotonic()
+                self.cevrimdisi = False
+                logger.debug(f"Kullanıcı listesi güncel (sürüm {surum}), sayfa indirilmedi.")
+                return []
+
+            ws = veritabani_getir(*KULLANICI_SAYFASI)
+            degisenler = self.kayitlari_guncelle(ws.get_all_values(), surum)
+            self._diske_yaz()
+        logger.info(f"Kullanıcı listesi senkronlandı: {len(degisenler)} kullanıcı değişti.")
+        return degisenler
+
+    def _tazele(self, en_fazla_yas: Optional[float]) -> bool:
+        """İndeks `en_fazla_yas` saniyeden eskiyse senkronlar; senkron denendiyse True."""
+        self._diskten_yukle()
+        if (en_fazla_yas is not None and self._son_senkron is not None
+                and time.monotonic() - self._son_senkron < en_fazla_yas):
+            return False
+        try:
+            self.senkronize()
+        except BAGLANTI_HATALARI as e:
+            with self._kilit:
+                self.cevrimdisi = True
+                bos = not self._kayitlar
+            if bos:
+                raise ConnectionError(f"Kullanıcı listesine erişilemedi ve yerel kopya yok: {e}")
+            logger.warning(f"Kullanıcı listesi senkronlanamadı, yerel kopyayla devam ediliyor: {e}")
+        return True
+
+    def bul(self, kadi: str) -> Optional[KimlikKaydi]:
+        self._diskten_yukle()
+        return self._kayitlar.get(str(kadi).strip())
+
+    # --- Giriş ---
+    def dogrula(self, kadi: str, sifre: str) -> Tuple[str, Optional[KimlikKaydi]]:
+        """
+        Kullanıcıyı yerel indeksle doğrular: (GIRIS_BASARILI | SIFRE_HATALI |
+        KULLANICI_YOK, kayıt). Kayıt bulunamaz ya da şifre tutmazsa indeks
+        eski olabileceği için bir kez senkronlanıp yeniden denenir.
+        """
+        senkronlandi = self._tazele(SENKRON_ARALIGI_SN)
+        kayit = self.bul(kadi)
+        if kayit is None or not GuvenlikAraclari.dogrula(sifre, kayit.sifre_hash):
+            if not senkronlandi and self._tazele(None):
+                kayit = self.bul(kadi)
+            if kayit is None:
+                return KULLANICI_YOK, None
+            if not GuvenlikAraclari.dogrula(sifre, kayit.sifre_hash):
+                return SIFRE_HATALI, kayit
+
+        if self.cevrimdisi:
+            logger.info(f"'{kayit.kadi}' çevrimdışı (yerel kopyayla) giriş yaptı.")
+        elif not kayit.degisim_gerekli and GuvenlikAraclari.yeniden_hash_gerekli(kayit.sifre_hash):
+            # Girişi bekletmemek için arka planda; giriş penceresi bu sırada kapanabilir.
+            # Değişim bekleyen kullanıcıda SifreDegistir'in yazdığı hash'i ezebileceği için yapılmaz
+            threading.Thread(target=self.yeniden_hashle, args=(kayit.kadi, sifre),
+                             name="YenidenHash", daemon=True).start()
+        return GIRIS_BASARILI, kayit
+
+    def yeniden_hashle(self, kadi: str, sifre: str) -> bool:
+        """Doğrulanmış şifreyi güncel KDF maliyetiyle yeniden hashleyip kaydeder."""
+        try:
+            return self.sifre_yaz(kadi, GuvenlikAraclari.sifrele(sifre))
+        except Exception as e:
+            # Bir sonraki girişte yeniden denenir
+            logger.warning(f"'{kadi}' şifre hash'i yükseltilemedi: {e}")
+            return False
+
+    # --- Yazma ---
+    def _satir_bul(self, ws, kadi: str) -> Optional[int]:
+        """İndeksteki satır numarasını doğrular; satırlar kaymışsa sayfada arar."""
+        sutun = self._sutunlar.get(SUTUN_KADI, 1)
+        kayit = self.bul(kadi)
+        if kayit is not None and str(ws.cell(kayit.satir, sutun).value or "").strip() == kadi:
+            return kayit.satir
+        hucre = ws.find(kadi, in_column=sutun)
+        return hucre.row if hucre else None
+
+    def sifre_yaz(self, kadi: str, sifre_hash: str, degisim_gerekli: Optional[bool] = None) -> bool:
+        """
+        Şifre hash'ini (ve istenirse değişim bayrağını) sayfaya yazar, yerel
+        indeksi günceller. Kullanıcı sayfada yoksa False döner.
+        """
+        ws = veritabani_getir(*KULLANICI_SAYFASI)
+        satir = self._satir_bul(ws, kadi)
+        if satir is None:
+            return False
+        ws.update_cell(satir, self._sutunlar.get(SUTUN_SIFRE, 3), sifre_hash)
+        if degisim_gerekli is not None:
+            ws.update_cell(satir, self._sutunlar.get(SUTUN_DEGISIM, 6), "EVET" if degisim_gerekli else "HAYIR")
+
+        with self._kilit:
+            eski = self._kayitlar.get(kadi)
+            if eski is not None:
+                self._kayitlar = dict(self._kayitlar)
+                self._kayitlar[kadi] = eski._replace(
+                    sifre_hash=sifre_hash, satir=satir,
+                    degisim_gerekli=eski.degisim_gerekli if degisim_gerekli is None else degisim_gerekli)
+                # Sayfa değişti; bir sonraki damga kontrolü tam indirme yapar
+                self._surum = None
+        self._diske_yaz()
+        return True
+
+
+kimlik_deposu = KimlikDeposu()
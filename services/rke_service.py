@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+import bisect
+import logging
+import threading
+from collections import Counter
+from datetime import date
+from typing import Dict, List, Optional, Any, Iterable, Tuple, Callable, Set
+
+from dateutil.relativedelta import relativedelta
+
+try:
+    from google_baglanti import veritabani_getir_cached
+    from araclar.cache_yonetimi import cache
+    from araclar.tarih_araclari import tarih_coz
+    from services.tablo_toplayici import TabloToplayici
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from google_baglanti import veritabani_getir_cached
+    from araclar.cache_yonetimi import cache
+    from araclar.tarih_araclari import tarih_coz
+    from services.tablo_toplayici import TabloToplayici
+
+logger = logging.getLogger("RKEService")
+
+# rke_muayene sayfasının sütun sırası (formların append_row ile yazdığı sıra)
+MUAYENE_SUTUNLARI = ("KayitNo", "EkipmanNo", "F_MuayeneTarihi", "FizikselDurum",
+                     "S_MuayeneTarihi", "SkopiDurum", "Aciklamalar", "KontrolEden/Unvani",
+                     "BirimSorumlusu/Unvani", "Not", "Rapor")
+# Son muayeneden bir sonraki kontrole kadar geçen süre
+KONTROL_PERIYODU = relativedelta(years=1)
+
+
+def muayene_sonucu(fiziksel, skopi) -> str:
+    """Fiziksel veya skopi muayenesinden biri olumsuzsa ekipman kullanıma uygun değildir."""
+    if "Değil" in str(fiziksel) or "Değil" in str(skopi):
+        return "Kullanıma Uygun Değil"
+    return "Kullanıma Uygun"
+
+
+def _ekipman_no(row: Dict) -> str:
+    return str(row.get('EkipmanNo', '')).strip()
+
+
+def _azalt(sayac: Counter, anahtar):
+    sayac[anahtar] -= 1
+    if sayac[anahtar] <= 0:
+        del sayac[anahtar]
+
+
+# =============================================================================
+# 1. TABLO İNDEKSLERİ
+# =============================================================================
+class _RKEIndeksi(TabloToplayici):
+    """Dashboard toplayıcılarıyla aynı fark mantığı; değişen ekipmanları da biriktirir."""
+
+    def __init__(self):
+        super().__init__()
+        # Son bildirimden bu yana durumu değişen ekipmanlar
+        self.degisenler: Set[str] = set()
+
+
+class _EnvanterIndeksi(_RKEIndeksi):
+    vt_tipi, sayfa_adi = 'rke', 'rke_list'
+
+    def __init__(self):
+        super().__init__()
+        self.ekipmanlar: Dict[str, Dict] = {}
+        self.abd = Counter()
+        self.birimler = Counter()
+
+    def _ekle(self, row):
+        no = _ekipman_no(row)
+        if not no:
+            return
+        self.ekipmanlar[no] = row
+        self.degisenler.add(no)
+        abd = str(row.get('AnaBilimDali', '')).strip()
+        birim = str(row.get('Birim', '')).strip()
+        if abd: self.abd[abd] += 1
+        if birim: self.birimler[birim] += 1
+
+    def _cikar(self, row):
+        no = _ekipman_no(row)
+        if not no:
+            return
+        if self.ekipmanlar.get(no) == row:
+            del self.ekipmanlar[no]
+        self.degisenler.add(no)
+        abd = str(row.get('AnaBilimDali', '')).strip()
+        birim = str(row.get('Birim', '')).strip()
+        if abd: _azalt(self.abd, abd)
+        if birim: _azalt(self.birimler, birim)
+
+
+class _MuayeneIndeksi(_RKEIndeksi):
+    vt_tipi, sayfa_adi = 'rke', 'rke_muayene'
+
+    def __init__(self):
+        super().__init__()
+        # EkipmanNo -> muayene tarihine göre sıralı geçmiş (en yenisi sonda)
+        self.gecmis: Dict[str, List[Dict]] = {}
+        # EkipmanNo -> son muayene / sonraki kontrol görünümü
+        self.son: Dict[str, Dict] = {}
+        self.tarihler = Counter()
+        self.kontrol_edenler = Counter()
+        self.sorumlular = Counter()
+
+    @staticmethod
+    def _sira(row) -> tuple:
+        tarih = tarih_coz(row.get('F_MuayeneTarihi')) or tarih_coz(row.get('S_MuayeneTarihi'))
+        return (tarih.toordinal() if tarih else 0, str(row.get('KayitNo', '')))
+
+    @staticmethod
+    def _son_gorunum(no, row) -> Dict:
+        fiziksel = tarih_coz(row.get('F_MuayeneTarihi'))
+        skopi = tarih_coz(row.get('S_MuayeneTarihi'))
+        # Kayıt formu gibi: sonraki kontrol skopi tarihinden, yoksa fiziksel tarihten sayılır
+        baz = skopi or fiziksel
+        return {
+            'EkipmanNo': no,
+            'SonMuayene': fiziksel or skopi,
+            'Fiziksel': str(row.get('FizikselDurum', '')).strip(),
+            'Skopi': str(row.get('SkopiDurum', '')).strip(),
+            'Sonuc': muayene_sonucu(row.get('FizikselDurum', ''), row.get('SkopiDurum', '')),
+            'SonrakiKontrol': baz + KONTROL_PERIYODU if baz else None,
+        }
+
+    def _son_guncelle(self, no):
+        self.degisenler.add(no)
+        liste = self.gecmis.get(no)
+        if liste:
+            self.son[no] = self._son_gorunum(no, liste[-1])
+        else:
+            self.son.pop(no, None)
+
+    def _sayaclar(self, row, k):
+        for sayac, sutun in ((self.tarihler, 'F_MuayeneTarihi'),
+                             (self.kontrol_edenler, 'KontrolEden/Unvani'),
+                             (self.sorumlular, 'BirimSorumlusu/Unvani')):
+            deger = str(row.get(sutun, '')).strip()
+            if deger:
+                if k > 0: sayac[deger] += 1
+                else: _azalt(sayac, deger)
+
+    def _ekle(self, row):
+        self._sayaclar(row, 1)
+        no = _ekipman_no(row)
+        if not no:
+            return
+        bisect.insort(self.gecmis.setdefault(no, []), row, key=self._sira)
+        self._son_guncelle(no)
+
+    def _cikar(self, row):
+        self._sayaclar(row, -1)
+        no = _ekipman_no(row)
+        liste = self.gecmis.get(no)
+        if not liste:
+            return
+        sira = self._sira(row)
+        i = bisect.bisect_left(liste, sira, key=self._sira)
+        while i < len(liste) and self._sira(liste[i]) == sira:
+            if liste[i] == row:
+                del liste[i]
+                break
+            i += 1
+        if not liste:
+            del self.gecmis[no]
+        self._son_guncelle(no)
+
+
+# =============================================================================
+# 2. SERVİS
+# =============================================================================
+class RKEService:
+    """
+    RKE envanteri ve muayene geçmişinin ortak, indeksli kopyası.
+    Envanter, muayene, rapor ve dashboard ekranları tabloları buradan okur;
+    önbellek değiştikçe indeksler artımlı güncellenir, formların yazdığı
+    muayeneler de tablo yeniden indirilmeden işlenir.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        """Singleton: Bütün RKE formları aynı indeksi kullanır."""
+        if not cls._instance:
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = super(RKEService, cls).__new__(cls)
+                    cls._instance._init_service()
+        return cls._instance
+
+    def _init_service(self):
+        self._veri_lock = threading.RLock()
+        self.envanter = _EnvanterIndeksi()
+        self.muayene = _MuayeneIndeksi()
+        self._tablolar = {t.anahtar: t for t in (self.envanter, self.muayene)}
+        # (envanter sürümü, muayene sürümü) -> birleşik rapor verisi
+        self._rapor_onbellek: Tuple[Optional[tuple], Any] = (None, None)
+        self._dinleyiciler: List[Callable[[Set[str]], None]] = []
+
+        if cache:
+            cache.add_listener(self._cache_degisti)
+            for anahtar in self._tablolar:
+                kayitlar = cache.get(anahtar)
+                if kayitlar is not None:
+                    self._tabloyu_isle(anahtar, kayitlar)
+
+    # --- Önbellek olayları ---
+    def _cache_degisti(self, olay: str, key: str, value: Any):
+        if olay == 'set':
+            if key in self._tablolar:
+                self._tabloyu_isle(key, value)
+        elif olay == 'invalidate':
+            if key in self._tablolar:
+                self._tablolar[key].guncel = False
+        elif olay == 'clear':
+            for tablo in self._tablolar.values():
+                tablo.guncel = False
+
+    def _tabloyu_isle(self, anahtar: str, kayitlar: List[Dict]):
+        tablo = self._tablolar[anahtar]
+        with self._veri_lock:
+            if tablo.yuklendi and tablo.son_kayitlar is kayitlar:
+                tablo.guncel = True
+                return
+            if tablo.guncelle(kayitlar or []):
+                logger.debug(f"RKE indeksi güncellendi: {anahtar}")
+        self._bildir()
+
+    # --- Abonelikler ---
+    def abone_ol(self, callback: Callable[[Set[str]], None]):
+        """callback(ekipman_nolari): envanter satırı ya da son muayenesi değişen ekipmanlar."""
+        with self._veri_lock:
+            if callback not in self._dinleyiciler:
+                self._dinleyiciler.append(callback)
+
+    def abonelikten_cik(self, callback: Callable[[Set[str]], None]):
+        with self._veri_lock:
+            if callback in self._dinleyiciler:
+                self._dinleyiciler.remove(callback)
+
+    def _bildir(self):
+        # Kilit bırakıldıktan sonra çağrılır; aboneler servisi tekrar sorgulayabilir
+        with self._veri_lock:
+            degisenler = self.envanter.degisenler | self.muayene.degisenler
+            self.envanter.degisenler = set()
+            self.muayene.degisenler = set()
+            dinleyiciler = list(self._dinleyiciler)
+        if not degisenler:
+            return
+        for callback in dinleyiciler:
+            try:
+                callback(degisenler)
+            except Exception as e:
+                logger.error(f"RKE abonesi hatası: {e}")
+
+    # --- Veri hazırlama ---
+    def hazirla(self, force_refresh: bool = False):
+        """
+        Eksik veya süresi dolmuş tabloları (önbellek üzerinden) çeker.
+        Arka plan thread'inden çağrılmalıdır; tablolar güncelse hemen döner.
+        """
+        for anahtar, tablo in self._tablolar.items():
+            # TTL dolmuşsa cache.get kaydı geçersizler ('invalidate' olayı tabloyu eskitir)
+            if tablo.guncel and not force_refresh and (not cache or cache.get(anahtar) is not None):
+                continue
+            kayitlar = veritabani_getir_cached(tablo.vt_tipi, tablo.sayfa_adi, force_refresh=force_refresh)
+            self._tabloyu_isle(anahtar, kayitlar)
+
+    def hazir_mi(self) -> bool:
+        return all(t.yuklendi for t in self._tablolar.values())
+
+    def yenilenecek_isaretle(self, anahtar: str):
+        """Form sayfaya indekse işlenemeyen bir değişiklik yazdıysa tablo sonraki açılışta yeniden çekilir."""
+        if cache:
+            cache.invalidate(anahtar)
+        else:
+            self._tablolar[anahtar].guncel = False
+
+    # --- Yazma sonrası artımlı güncelleme ---
+    def _onbellege_yaz(self, tablo, kayitlar):
+        # Aynı liste nesnesi yazıldığı için servisin kendi dinleyicisi farkı tekrar almaz
+        if cache:
+            cache.set(tablo.anahtar, kayitlar)
+
+    def muayene_ekle(self, kayitlar: Iterable[Dict]):
+        """rke_muayene sayfasına eklenen satırları indekse işler."""
+        kayitlar = list(kayitlar)
+        with self._veri_lock:
+            if not self.muayene.yuklendi:
+                # Henüz indirilmemiş tabloya kısmi veri eklenmez
+                return
+            self._onbellege_yaz(self.muayene, self.muayene.satirlari_ekle(kayitlar))
+        self._bildir()
+
+    def envanter_guncelle(self, degisiklikler: Dict[str, Dict[str, Any]]):
+        """
+        rke_list sayfasında güncellenen hücreleri indekse işler.
+        degisiklikler: {EkipmanNo: {sütun: yeni_değer}}
+        """
+        with self._veri_lock:
+            if not self.envanter.yuklendi or not degisiklikler:
+                return
+            kalan = dict(degisiklikler)
+            kayitlar = self.envanter.son_kayitlar
+            for sira, row in enumerate(kayitlar):
+                degerler = kalan.pop(_ekipman_no(row), None)
+                if degerler:
+                    kayitlar = self.envanter.satir_degistir(sira, {**row, **degerler})
+                if not kalan:
+                    break
+            self._onbellege_yaz(self.envanter, kayitlar)
+        self._bildir()
+
+    # --- Envanter sorguları ---
+    def envanter_kayitlari(self) -> List[Dict]:
+        """rke_list kayıtları (sayfadaki sırayla)."""
+        with self._veri_lock:
+            return list(self.envanter.son_kayitlar)
+
+    def envanter_tablosu(self) -> Tuple[List[str], List[List[str]]]:
+        """rke_list'i başlık + metin satırları olarak döndürür (satır i -> sayfa satırı i + 2)."""
+        with self._veri_lock:
+            kayitlar = self.envanter.son_kayitlar
+            if not kayitlar:
+                return [], []
+            anahtarlar = list(kayitlar[0].keys())
+            satirlar = [[str(row.get(k, '')) for k in anahtarlar] for row in kayitlar]
+            return [str(k).strip() for k in anahtarlar], satirlar
+
+    def ekipman(self, ekipman_no: str) -> Optional[Dict]:
+        with self._veri_lock:
+            return self.envanter.ekipmanlar.get(str(ekipman_no).strip())
+
+    def ekipman_nolari(self) -> List[str]:
+        with self._veri_lock:
+            return list(self.envanter.ekipmanlar)
+
+    def sonraki_kontrol(self, ekipman_no: str) -> Optional[date]:
+        """
+        Ekipmanın bir sonraki kontrol tarihi: son muayeneden hesaplanır, hiç
+        muayenesi yoksa envanterdeki KontrolTarihi kullanılır.
+        Envanterde olmayan ve hurdaya ayrılan ekipmanlar için None döner.
+        """
+        no = str(ekipman_no).strip()
+        with self._veri_lock:
+            env = self.envanter.ekipmanlar.get(no)
+            if not env or "Hurda" in str(env.get('Durum', '')):
+                return None
+            son = self.muayene.son.get(no)
+            if son and son['SonrakiKontrol']:
+                return son['SonrakiKontrol']
+            return tarih_coz(env.get('KontrolTarihi'))
+
+    # --- Muayene sorguları ---
+    def gecmis(self, ekipman_no: str) -> List[Dict]:
+        """Ekipmanın muayeneleri, eskiden yeniye."""
+        with self._veri_lock:
+            return list(self.muayene.gecmis.get(str(ekipman_no).strip(), ()))
+
+    def son_muayene(self, ekipman_no: str) -> Optional[Dict]:
+        """Son muayene sonucu ve sonraki kontrol tarihi."""
+        with self._veri_lock:
+            return self.muayene.son.get(str(ekipman_no).strip())
+
+    def son_durumlar(self) -> List[Dict]:
+        """Muayenesi olan bütün ekipmanların son durumu."""
+        with self._veri_lock:
+            return list(self.muayene.son.values())
+
+    def kontrol_edenler(self) -> List[str]:
+        with self._veri_lock:
+            return sorted(self.muayene.kontrol_edenler)
+
+    def birim_sorumlulari(self) -> List[str]:
+        with self._veri_lock:
+            return sorted(self.muayene.sorumlular)
+
+    def rapor_verisi(self) -> Tuple[List[Dict], List[str], List[str], List[str]]:
+        """
+        Muayene kayıtlarını envanter bilgisiyle birleştirir.
+        Dönüş: (birlesik_kayitlar, abd_listesi, birim_listesi, tarihler (yeniden eskiye))
+        İki tablo da değişmedikçe aynı sonuç yeniden kullanılır.
+        """
+        with self._veri_lock:
+            surum = (self.envanter.surum, self.muayene.surum)
+            if self._rapor_onbellek[0] == surum:
+                return self._rapor_onbellek[1]
+
+            bos = {'ABD': '-', 'Birim': '-', 'Cins': '-', 'Pb': '-'}
+            bilgiler = {}
+            birlesik = []
+            for row in self.muayene.son_kayitlar:
+                no = _ekipman_no(row)
+                info = bilgiler.get(no)
+                if info is None:
+                    env = self.envanter.ekipmanlar.get(no)
+                    info = bilgiler[no] = {
+                        'ABD': str(env.get('AnaBilimDali', '')).strip(),
+                        'Birim': str(env.get('Birim', '')).strip(),
+                        'Cins': str(env.get('KoruyucuCinsi', '')).strip(),
+                        'Pb': str(env.get('KursunEsdegeri', '')).strip(),
+                    } if env else bos
+                fiz = str(row.get('FizikselDurum', '')).strip()
+                sko = str(row.get('SkopiDurum', '')).strip()
+                item = {
+                    'EkipmanNo': no,
+                    'Tarih': str(row.get('F_MuayeneTarihi', '')).strip(),
+                    'Fiziksel': fiz,
+                    'Skopi': sko,
+                    'KontrolEden': str(row.get('KontrolEden/Unvani', '')).strip(),
+                    'Aciklama': str(row.get('Aciklamalar', '')).strip(),
+                    'Sonuc': muayene_sonucu(fiz, sko),
+                }
+                item.update(info)
+                birlesik.append(item)
+
+            sonuc = (birlesik, sorted(self.envanter.abd), sorted(self.envanter.birimler),
+                     sorted(self.muayene.tarihler, reverse=True))
+            self._rapor_onbellek = (surum, sonuc)
+            return sonuc
+
+
+rke_servisi = RKEService()
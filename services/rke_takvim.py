@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+import bisect
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Callable, Iterable
+
+from PySide6.QtCore import QObject, QThread, QTimer, Signal
+
+try:
+    from services.rke_service import rke_servisi
+except ImportError:
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from services.rke_service import rke_servisi
+
+logger = logging.getLogger("RKETakvim")
+
+# Dashboard'un bu kaynağa verdiği tablo anahtarı (rke_list + rke_muayene)
+RKE_VADE_KAYNAGI = "rke:vade"
+# "Yaklaşan kontrol" penceresi (gün)
+VARSAYILAN_UYARI_GUNU = 30
+# Gece yenilemesinin saati (gün dönümünden sonra)
+GECE_YENILEME_SAATI = (0, 5)
+
+
+# =============================================================================
+# 1. VADE İNDEKSİ
+# =============================================================================
+class RKEVadeTakvimi:
+    """
+    Ekipmanların bir sonraki kontrol tarihine göre sıralı indeksi.
+    RKE servisinden yalnızca durumu değişen ekipmanlar bildirilir; her biri
+    indekste O(log n) aramayla yer değiştirir. Geciken / N gün içinde
+    kontrolü gelen sorguları O(log n + k) ile cevaplanır.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        """Singleton: Formlar ve dashboard aynı indeksi kullanır."""
+        if not cls._instance:
+            with cls._lock:
+                if not cls._instance:
+                    cls._instance = super(RKEVadeTakvimi, cls).__new__(cls)
+                    cls._instance._init_takvim()
+        return cls._instance
+
+    def _init_takvim(self):
+        self._veri_lock = threading.RLock()
+        # Sıralı (vade_ordinal, ekipman_no) listesi ve ekipman -> vade eşlemesi
+        self._vadeler: List[tuple] = []
+        self._vade: Dict[str, int] = {}
+        self._dinleyiciler: List[Callable[[], None]] = []
+
+        rke_servisi.abone_ol(self._rke_degisti)
+        # Servis takvimden önce yüklendiyse mevcut ekipmanlarla başla
+        self._rke_degisti(rke_servisi.ekipman_nolari())
+
+    # --- İndeks bakımı ---
+    def _rke_degisti(self, ekipman_nolari: Iterable[str]):
+        # Servis bildirimi kendi kilidini bıraktıktan sonra yapar; kilit sırası hep takvim -> servis
+        degisti = False
+        with self._veri_lock:
+            for no in ekipman_nolari:
+                tarih = rke_servisi.sonraki_kontrol(no)
+                degisti |= self._yerlestir(no, tarih.toordinal() if tarih else None)
+            dinleyiciler = list(self._dinleyiciler) if degisti else []
+        for callback in dinleyiciler:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"RKE takvim abonesi hatası: {e}")
+
+    def _yerlestir(self, no: str, vade: Optional[int]) -> bool:
+        eski = self._vade.get(no)
+        if eski == vade:
+            return False
+        if eski is not None:
+            i = bisect.bisect_left(self._vadeler, (eski, no))
+            if i < len(self._vadeler) and self._vadeler[i] == (eski, no):
+                del self._vadeler[i]
+            del self._vade[no]
+        if vade is not None:
+            bisect.insort(self._vadeler, (vade, no))
+            self._vade[no] = vade
+        return True
+
+    def abone_ol(self, callback: Callable[[], None]):
+        """callback(): indekste en az bir vade değiştiğinde çağrılır."""
+        with self._veri_lock:
+            if callback not in self._dinleyiciler:
+                self._dinleyiciler.append(callback)
+
+    def abonelikten_cik(self, callback: Callable[[], None]):
+        with self._veri_lock:
+            if callback in self._dinleyiciler:
+                self._dinleyiciler.remove(callback)
+
+    def tazele(self, force_refresh: bool = False):
+        """
+        Kaynak tabloları (önbellek üzerinden) çeker. Tablolar fark alınarak
+        işlendiği için yalnızca yeni muayene satırlarının ekipmanları
+        yeniden yerleştirilir. Arka plan thread'inden çağrılmalıdır.
+        """
+        rke_servisi.hazirla(force_refresh=force_refresh)
+
+    def hazir_mi(self) -> bool:
+        return rke_servisi.hazir_mi()
+
+    # --- Sorgular ---
+    def _araligi_al(self, bas: Optional[int], bit: int, limit: Optional[int]) -> List[tuple]:
+        with self._veri_lock:
+            i = bisect.bisect_left(self._vadeler, (bas,)) if bas is not None else 0
+            j = bisect.bisect_left(self._vadeler, (bit,))
+            if limit:
+                j = min(j, i + limit)
+            return self._vadeler[i:j]
+
+    def _kayitlar(self, secilen: List[tuple], bugun: int) -> List[Dict]:
+        sonuc = []
+        for vade, no in secilen:
+            env = rke_servisi.ekipman(no) or {}
+            sonuc.append({
+                'ekipman': no,
+                'cins': str(env.get('KoruyucuCinsi', '')).strip(),
+                'birim': str(env.get('Birim', '')).strip(),
+                'vade': date.fromordinal(vade),
+                'kalan': vade - bugun,
+            })
+        return sonuc
+
+    def gecikenler(self, bugun: Optional[date] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Kontrol tarihi geçmiş ekipmanlar (en eskisi önce)."""
+        b = (bugun or date.today()).toordinal()
+        return self._kayitlar(self._araligi_al(None, b, limit), b)
+
+    def yaklasanlar(self, gun: int = VARSAYILAN_UYARI_GUNU, bugun: Optional[date] = None,
+                    limit: Optional[int] = None) -> List[Dict]:
+        """Bugünden itibaren `gun` gün içinde kontrolü gelen ekipmanlar."""
+        b = (bugun or date.today()).toordinal()
+        return self._kayitlar(self._araligi_al(b, b + gun + 1, limit), b)
+
+    def sayilar(self, gun: int = VARSAYILAN_UYARI_GUNU, bugun: Optional[date] = None) -> Dict[str, int]:
+        """Geciken / yaklaşan adetleri (liste oluşturmadan, iki ikili arama)."""
+        b = (bugun or date.today()).toordinal()
+        with self._veri_lock:
+            i = bisect.bisect_left(self._vadeler, (b,))
+            j = bisect.bisect_left(self._vadeler, (b + gun + 1,))
+        return {'geciken': i, 'yaklasan': j - i}
+
+    def vade(self, ekipman_no: str) -> Optional[date]:
+        with self._veri_lock:
+            vade = self._vade.get(str(ekipman_no).strip())
+        return date.fromordinal(vade) if vade is not None else None
+
+
+# Global erişim noktası
+rke_takvimi = RKEVadeTakvimi()
+
+
+# =============================================================================
+# 2. GİRİŞTE VE GECE YENİLEME
+# =============================================================================
+class _TazelemeWorker(QThread):
+    hata_olustu = Signal(str)
+
+    def __init__(self, force_refresh):
+        super().__init__()
+        self.force_refresh = force_refresh
+
+    def run(self):
+        try:
+            rke_takvimi.tazele(self.force_refresh)
+        except Exception as e:
+            self.hata_olustu.emit(str(e))
+
+
+class RKEVadeGorevi(QObject):
+    """
+    Oturum açılınca takvimi arka planda doldurur ve her gece yeniden çeker.
+    Bittiğinde güncel geciken / yaklaşan sayıları `tamamlandi` ile yayınlanır.
+    """
+    tamamlandi = Signal(dict)
+    hata_olustu = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._worker = None
+        self._gece_timer = QTimer(self)
+        self._gece_timer.setSingleShot(True)
+        self._gece_timer.timeout.connect(self._gece_calis)
+
+    def baslat(self):
+        """Giriş anı: önbellekte yoksa tablolar çekilir, sonra gece yenilemesi kurulur."""
+        self._calistir(False)
+        self._geceyi_kur()
+
+    def _geceyi_kur(self):
+        simdi = datetime.now()
+        hedef = simdi.replace(hour=GECE_YENILEME_SAATI[0], minute=GECE_YENILEME_SAATI[1],
+                              second=0, microsecond=0)
+        if hedef <= simdi:
+            hedef += timedelta(days=1)
+        self._gece_timer.start(int((hedef - simdi).total_seconds() * 1000))
+
+    def _gece_calis(self):
+        self._calistir(True)
+        self._geceyi_kur()
+
+    def _calistir(self, force_refresh):
+        if self._worker and self._worker.isRunning():
+            return
+        self._worker = _TazelemeWorker(force_refresh)
+        self._worker.hata_olustu.connect(self.hata_olustu)
+        self._worker.finished.connect(lambda: self.tamamlandi.emit(rke_takvimi.sayilar()))
+        self._worker.start()
+
+    def durdur(self):
+        self._gece_timer.stop()
+        if self._worker and self._worker.isRunning():
+            self._worker.quit()
+            self._worker.wait(500)
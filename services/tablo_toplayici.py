@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+from collections import Counter
+from typing import Dict, List
+
+
+class TabloToplayici:
+    """
+    Bir tablonun önbellekteki kayıtlarından türetilen sayaç/indeksleri tutar
+    (dashboard toplayıcıları, RKE ve bakım planı indeksleri).
+    Yeni veri geldiğinde eski ve yeni satırların farkı alınır; yalnızca
+    eklenen/silinen satırlar işlenir (değişmeyen satırlar tekrar parse edilmez).
+    Formların sayfaya yazdığı satırlar da tablo yeniden çekilmeden işlenebilir.
+    """
+    vt_tipi = ""
+    sayfa_adi = ""
+    # Bu tablo değişince etkilenen özet alanları
+    alanlar: tuple = ()
+
+    def __init__(self):
+        self._satirlar = Counter()
+        self.son_kayitlar: List[Dict] = []
+        self.yuklendi = False
+        self.guncel = False
+        # Her değişiklikte artar (türetilmiş verinin önbelleği için)
+        self.surum = 0
+
+    @property
+    def anahtar(self) -> str:
+        return f"{self.vt_tipi}:{self.sayfa_adi}"
+
+    @staticmethod
+    def _parmak_izi(row: Dict) -> tuple:
+        return tuple((str(k).strip(), v) for k, v in row.items())
+
+    def guncelle(self, kayitlar: List[Dict]) -> bool:
+        """Farkı uygular. Bir değişiklik olduysa True döner."""
+        yeni = Counter(self._parmak_izi(r) for r in kayitlar)
+        silinen = self._satirlar - yeni
+        eklenen = yeni - self._satirlar
+
+        for fp, adet in silinen.items():
+            row = dict(fp)
+            for _ in range(adet):
+                self._cikar(row)
+        for fp, adet in eklenen.items():
+            row = dict(fp)
+            for _ in range(adet):
+                self._ekle(row)
+
+        degisti = bool(silinen or eklenen) or not self.yuklendi
+        self._satirlar = yeni
+        self.son_kayitlar = kayitlar
+        self.yuklendi = True
+        self.guncel = True
+        if degisti:
+            self.surum += 1
+        return degisti
+
+    def satirlari_ekle(self, satirlar: List[Dict]) -> List[Dict]:
+        """Sayfanın sonuna yazılan satırları işler; yeni kayıt listesini döndürür."""
+        for row in satirlar:
+            fp = self._parmak_izi(row)
+            self._satirlar[fp] += 1
+            self._ekle(dict(fp))
+        self.son_kayitlar = list(self.son_kayitlar) + list(satirlar)
+        self.surum += 1
+        return self.son_kayitlar
+
+    def satir_degistir(self, sira: int, yeni: Dict) -> List[Dict]:
+        """Sayfadaki `sira`. kaydı (0 tabanlı) yeni değerlerle değiştirir."""
+        eski_fp = self._parmak_izi(self.son_kayitlar[sira])
+        yeni_fp = self._parmak_izi(yeni)
+        self._satirlar[eski_fp] -= 1
+        if self._satirlar[eski_fp] <= 0:
+            del self._satirlar[eski_fp]
+        self._cikar(dict(eski_fp))
+        self._satirlar[yeni_fp] += 1
+        self._ekle(dict(yeni_fp))
+        kayitlar = list(self.son_kayitlar)
+        kayitlar[sira] = yeni
+        self.son_kayitlar = kayitlar
+        self.surum += 1
+        return kayitlar
+
+    def _ekle(self, row: Dict):
+        raise NotImplementedError
+
+    def _cikar(self, row: Dict):
+        raise NotImplementedError
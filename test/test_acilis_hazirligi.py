@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import google_baglanti
+from araclar.acilis_hazirligi import AcilisHazirligi, AcilisZamanlayici
+from araclar.cache_yonetimi import cache
+
+
+class _YavasSayfa:
+    def __init__(self, kayitlar):
+        self.kayitlar = kayitlar
+        self.cekim = 0
+
+    def get_all_records(self):
+        self.cekim += 1
+        time.sleep(0.05)
+        return self.kayitlar
+
+
+class TestAcilisHazirligi(unittest.TestCase):
+
+    def setUp(self):
+        self.sayfa = _YavasSayfa([{'Rol': 'admin', 'Form_Kodu': 'main_window', 'Oge_Adi': 'btn_x', 'Islem': 'GIZLE'}])
+        self.dosya = Mock()
+        self.dosya.worksheet.return_value = self.sayfa
+        self.istemci = Mock()
+        self.istemci.open.return_value = self.dosya
+        google_baglanti.baglanti_onbellegini_temizle()
+        cache.invalidate_pattern('sabit:')
+        self.addCleanup(google_baglanti.baglanti_onbellegini_temizle)
+        self.addCleanup(cache.invalidate_pattern, 'sabit:')
+        yama = patch('google_baglanti._get_sheets_client', return_value=self.istemci)
+        yama.start()
+        self.addCleanup(yama.stop)
+
+    def test_asamalar_olculur_ve_tablolar_onbellege_alinir(self):
+        zamanlayici = AcilisZamanlayici()
+        hazirlik = AcilisHazirligi(sayfalar=[('sabit', 'Sabitler')], tablolar=[('sabit', 'Rol_Yetkileri')],
+                                   yetkiler=False, kimlikler=False, zamanlayici=zamanlayici)
+        with patch('araclar.acilis_hazirligi._get_sheets_client', return_value=self.istemci):
+            hazirlik.run()
+
+        self.assertEqual(set(zamanlayici.sureler()),
+                         {'istemci', 'dosya:sabit', 'sayfa:Sabitler', 'tablo:Rol_Yetkileri'})
+        self.assertIn('tablo:Rol_Yetkileri', zamanlayici.rapor())
+        # Dosya bir kez açılır; sonraki erişimler açık nesneyi kullanır
+        google_baglanti.veritabani_getir('sabit', 'Sabitler')
+        self.istemci.open.assert_called_once()
+        self.assertEqual(google_baglanti.veritabani_getir_cached('sabit', 'Rol_Yetkileri'), self.sayfa.kayitlar)
+        self.assertEqual(self.sayfa.cekim, 1)
+
+    def test_eszamanli_istekler_tek_cekim_yapar(self):
+        sonuclar = []
+        threadler = [threading.Thread(target=lambda: sonuclar.append(
+            google_baglanti.veritabani_getir_cached('sabit', 'Rol_Yetkileri'))) for _ in range(3)]
+        for t in threadler:
+            t.start()
+        for t in threadler:
+            t.join()
+        self.assertEqual(len(sonuclar), 3)
+        self.assertEqual(self.sayfa.cekim, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
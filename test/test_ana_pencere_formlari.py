@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import sys
+import types
+import unittest
+from unittest.mock import patch
+
+from PySide6.QtWidgets import QApplication, QMdiArea, QWidget
+
+from araclar.form_yoneticisi import FormYoneticisi
+
+# Qt kullanan bütün test modülleri aynı QApplication'ı kurar/kullanır; toplanma sırası önemsizdir
+app = QApplication.instance() or QApplication([])
+
+
+class ListeFormu(QWidget):
+    VERI_BAGIMLILIKLARI = (('cihaz', 'Cihazlar'),)
+    YENIDEN_KULLANILABILIR = True
+
+    def __init__(self, yetki='viewer', kullanici_adi=None):
+        super().__init__()
+        self.yetki = yetki
+        self.yenilenme = 0
+
+    def yeniden_acildi(self):
+        self.yenilenme += 1
+
+
+class KayitFormu(QWidget):
+    def __init__(self):
+        super().__init__()
+
+
+class TestFormYoneticisi(unittest.TestCase):
+
+    def setUp(self):
+        modul = types.ModuleType("test_formlari")
+        modul.ListeFormu, modul.KayitFormu = ListeFormu, KayitFormu
+        sys.modules["test_formlari"] = modul
+        self.addCleanup(sys.modules.pop, "test_formlari", None)
+        self.mdi = QMdiArea()
+        self.yonetici = FormYoneticisi(self.mdi, {}, {'yetki': 'admin', 'kullanici_adi': 'x'}, havuz_boyutu=1)
+
+    def _kapat(self, sub):
+        sub.close()
+        app.processEvents()
+
+    def test_liste_formu_havuzdan_tekrar_acilir(self):
+        with patch('google_baglanti.veritabani_getir_cached') as cek:
+            sub = self.yonetici.form_ac("Liste", "test_formlari", "ListeFormu")
+            form = sub.widget()
+            self.assertEqual(form.yetki, 'admin')
+            self._kapat(sub)
+            cek.assert_called_with('cihaz', 'Cihazlar')
+
+        self.assertEqual(self.yonetici.havuzdakiler(), [("test_formlari", "ListeFormu")])
+        sub = self.yonetici.form_ac("Liste", "test_formlari", "ListeFormu")
+        self.assertIs(sub.widget(), form)
+        self.assertEqual(form.yenilenme, 1)
+        self.assertFalse(form.isHidden())
+        app.processEvents()
+        self.assertEqual([t for _, t in self.yonetici.gecikmeler()["Liste"]], ["hazir", "havuz"])
+
+    def test_kayit_formu_ve_havuz_siniri(self):
+        sub = self.yonetici.form_ac("Kayıt", "test_formlari", "KayitFormu")
+        self._kapat(sub)
+        self.assertEqual(self.yonetici.havuzdakiler(), [])
+
+        with patch('google_baglanti.veritabani_getir_cached'):
+            ilk = self.yonetici.form_ac("Liste", "test_formlari", "ListeFormu")
+            self._kapat(ilk)
+            ikinci = self.yonetici.form_ac("Liste 2", "test_formlari", "ListeFormu")
+        # Havuzdaki örnek ikinci açılışta kullanıldı; havuz boşaldı
+        self.assertEqual(self.yonetici.havuzdakiler(), [])
+        self._kapat(ikinci)
+        self.assertEqual(len(self.yonetici.havuzdakiler()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
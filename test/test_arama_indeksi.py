@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtWidgets import QApplication
+
+from araclar.arama_indeksi import AramaIndeksi, SatirKumesiModeli, katla
+
+app = QApplication.instance() or QApplication([])
+
+KAYITLAR = [
+    {'cihaz_id': 'RAD-001', 'Marka': 'Siemens', 'Model': 'Ysio Max', 'AnaBilimDali': 'Radyoloji', 'Kaynak': 'Bağış'},
+    {'cihaz_id': 'RAD-002', 'Marka': 'Şimadzu', 'Model': 'MobileDart', 'AnaBilimDali': 'İç Hastalıkları', 'Kaynak': 'Satın Alma'},
+    {'cihaz_id': 'NUK-010', 'Marka': 'SIEMENS', 'Model': 'Symbia', 'AnaBilimDali': 'Nükleer Tıp', 'Kaynak': 'Satın Alma'},
+]
+
+
+class _Model(QAbstractTableModel):
+    def rowCount(self, parent=QModelIndex()):
+        return len(KAYITLAR)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 2
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            return KAYITLAR[index.row()][('cihaz_id', 'Marka')[index.column()]]
+        return None
+
+
+class TestAramaIndeksi(unittest.TestCase):
+
+    def setUp(self):
+        self.indeks = AramaIndeksi(KAYITLAR, ("cihaz_id", "Marka", "Model", "AnaBilimDali"),
+                                   ("AnaBilimDali", "Kaynak"))
+
+    def test_turkce_katlama_ve_onek(self):
+        self.assertEqual(katla("IŞIK İĞNE"), "isik igne")
+        self.assertEqual(self.indeks.ara("siem"), {0, 2})
+        self.assertEqual(self.indeks.ara("şim"), {1})
+        self.assertEqual(self.indeks.ara("ic hast"), {1})
+        self.assertEqual(self.indeks.ara("RAD-00"), {0, 1})
+        self.assertEqual(self.indeks.ara("yok"), set())
+        self.assertIsNone(self.indeks.ara("  ", Kaynak=None))
+
+    def test_esitlik_kesisimi(self):
+        self.assertEqual(self.indeks.ara("", Kaynak="Satın Alma"), {1, 2})
+        self.assertEqual(self.indeks.ara("siemens", Kaynak="Satın Alma"), {2})
+
+    def test_proxy_satirlari_ve_siralama(self):
+        proxy = SatirKumesiModeli()
+        proxy.setSourceModel(_Model())
+        self.assertEqual(proxy.rowCount(), 3)
+
+        proxy.satirlari_ayarla(self.indeks.ara("siemens"))
+        self.assertEqual([proxy.kaynak_satiri(i) for i in range(proxy.rowCount())], [0, 2])
+        proxy.sort(0, Qt.DescendingOrder)
+        self.assertEqual(proxy.data(proxy.index(0, 0)), 'RAD-001')
+        self.assertEqual(proxy.mapFromSource(proxy.sourceModel().index(2, 1)).row(), 1)
+        self.assertFalse(proxy.mapFromSource(proxy.sourceModel().index(1, 0)).isValid())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+
+from araclar.audit_logger import AuditLogger
+
+
+class TestAuditLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.db = os.path.join(tempfile.mkdtemp(), "audit.db")
+        self.audit = AuditLogger(self.db, saklama_ay=12)
+        self.addCleanup(self.audit.bosalt, 1)
+
+    def _doldur(self):
+        for ay in (1, 2, 3):
+            for gun in range(1, 6):
+                self.audit.log(f"k{gun % 2}", "GUNCELLEME", "Personel", f"tc{gun}",
+                               zaman=datetime(2026, ay, gun, 12, 0))
+        self.assertTrue(self.audit.bosalt(5))
+
+    def test_wal_ve_aylik_bolumler(self):
+        self._doldur()
+        with sqlite3.connect(self.db) as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            tablolar = {a for (a,) in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        self.assertTrue({"audit_log_202601", "audit_log_202602", "audit_log_202603"} <= tablolar)
+        self.assertEqual(self.audit.istatistik()["yazilan"], 15)
+
+    def test_filtreler_ve_imlecle_sayfalama(self):
+        self._doldur()
+        self.assertEqual(len(self.audit.sorgula(kullanici="k1", limit=100)), 9)
+        gecmis = self.audit.kayit_gecmisi("Personel", "tc2")
+        self.assertEqual([k.timestamp[:7] for k in gecmis], ["2026-03", "2026-02", "2026-01"])
+        aralik = self.audit.sorgula(baslangic=datetime(2026, 2, 3), bitis=datetime(2026, 3, 2))
+        self.assertEqual(len(aralik), 4)
+
+        sayfalar, once = [], None
+        while True:
+            sayfa = self.audit.sorgula(limit=4, once=once)
+            if not sayfa:
+                break
+            sayfalar.extend(sayfa)
+            once = sayfa[-1].imlec
+        self.assertEqual(len(sayfalar), 15)
+        self.assertEqual(sayfalar, sorted(sayfalar, key=lambda k: k.imlec, reverse=True))
+        self.assertEqual(self.audit.get_kullanici_loglari("k0", limit=2)[0][1], "GUNCELLEME")
+
+    def test_gunluk_ozet_ve_modul_filtresi(self):
+        self._doldur()
+        for i in range(3):
+            self.audit.log("k1", "Ekleme", modul="Cihaz", zaman=datetime(2026, 3, 5, 9, i))
+        self.assertTrue(self.audit.bosalt(5))
+
+        self.assertEqual(len(self.audit.sorgula(modul="Cihaz")), 3)
+        self.assertIn(("2026-03-05", "Cihaz", 3), self.audit.gunluk_sayilar())
+        self.assertEqual(self.audit.gunluk_sayilar(grupla=("kullanici",), baslangic=date(2026, 3, 1)),
+                         [("k0", 2), ("k1", 6)])
+        self.assertEqual(self.audit.filtre_degerleri()["islem_tipi"], ["Ekleme", "GUNCELLEME"])
+
+    def test_bakim_eski_bolumleri_siler(self):
+        self._doldur()
+        silinen = self.audit.bakim(simdi=datetime(2027, 2, 15))
+        self.assertEqual(silinen, ["audit_log_202601"])
+        self.assertEqual(len(self.audit.sorgula(limit=100)), 10)
+
+    def test_repository_yazmalari_denetlenir(self):
+        from repositories.personel_repository import PersonelRepository
+        ws = MagicMock()
+        self.audit.kullanici_ayarla("ali")
+        with patch('repositories.personel_repository.audit_logger', self.audit), \
+                patch('repositories.personel_repository.veritabani_getir', return_value=ws):
+            PersonelRepository().create(["123", "Ayşe Yılmaz"])
+        kayit = self.audit.kayit_gecmisi("Personel", "123")[0]
+        self.assertEqual((kayit.kullanici, kayit.islem_tipi, kayit.basarili), ("ali", "PERSONEL_EKLEME", True))
+
+
+if __name__ == '__main__':
+    unittest.main()
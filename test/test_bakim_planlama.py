@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import unittest
+from datetime import date
+
+from araclar.cache_yonetimi import cache
+from services.bakim_planlama import (bakim_planlayici, plan_satirlari, tekrar_tarihleri,
+                                     BAKIM_SUTUNLARI, BAKIM, KALIBRASYON)
+
+BUGUN = date(2026, 3, 4)  # Çarşamba
+
+
+def _plan(plan_id, cihaz, tarih, durum="Planlandı", periyot="6 Ay", sira="1. Bakım"):
+    return dict(zip(BAKIM_SUTUNLARI, [plan_id, cihaz, periyot, sira, tarih, "Periyodik",
+                                      durum, "", "Periyodik", "-", "-", "-", "-"]))
+
+
+def _kalibrasyon(kid, cihaz, bitis, durum="Tamamlandı"):
+    return {'KalibrasyonID': kid, 'CihazID': cihaz, 'BitisTarihi': bitis, 'Durum': durum}
+
+
+class TestBakimPlanlama(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear_all()
+        cache.set('cihaz:Periyodik_Bakim', [
+            _plan('P-1', 'C1', '2025-09-01', durum="Yapıldı"),
+            _plan('P-2', 'C1', '2026-03-01'),                          # gecikmiş
+            _plan('P-3', 'C2', '2026-03-10', periyot="3 Ay"),
+            _plan('P-4', 'C3', '2026-03-11', durum="İptal"),
+        ])
+        cache.set('cihaz:Kalibrasyon', [
+            _kalibrasyon('K-1', 'C1', '2025-03-20'),
+            _kalibrasyon('K-2', 'C1', '2026-03-20'),                   # C1'in güncel vadesi
+            _kalibrasyon('K-3', 'C2', '2026-02-01'),
+        ])
+
+    def test_aralik_ve_haftalik_yuk(self):
+        self.assertEqual([(g['tur'], g['anahtar']) for g in bakim_planlayici.gecikenler(bugun=BUGUN)],
+                         [(KALIBRASYON, 'K-3'), (BAKIM, 'P-2')])
+        yaklasan = bakim_planlayici.yaklasanlar(30, bugun=BUGUN)
+        self.assertEqual([(y['cihaz'], y['kalan']) for y in yaklasan], [('C2', 6), ('C1', 16)])
+        self.assertEqual(bakim_planlayici.sayilar(30, bugun=BUGUN),
+                         {BAKIM: {'geciken': 1, 'yaklasan': 1}, KALIBRASYON: {'geciken': 1, 'yaklasan': 1}})
+
+        haftalar = bakim_planlayici.haftalik_yuk(BUGUN, date(2026, 3, 22))
+        self.assertEqual([h['hafta'] for h in haftalar], [date(2026, 3, 2), date(2026, 3, 9), date(2026, 3, 16)])
+        self.assertEqual([h['toplam'] for h in haftalar], [0, 1, 1])
+        self.assertEqual([t['anahtar'] for t in bakim_planlayici.cihaz_takvimi('C1')], ['P-2', 'K-2'])
+
+    def test_yazilan_planlar_artimli_islenir(self):
+        bakim_planlayici.plan_guncelle(1, ['P-2', 'C1', '6 Ay', '2. Bakım', '2026-03-01', 'Periyodik',
+                                           'Yapıldı', '2026-03-02', 'Periyodik', '-', '-', '-', '-'])
+        self.assertEqual(bakim_planlayici.sayilar(30, bugun=BUGUN)[BAKIM]['geciken'], 0)
+
+        satirlar = plan_satirlari('C4', '3 Ay', date(2026, 1, 31), 100, ilk={"Durum": "Yapıldı"})
+        self.assertEqual([s[4] for s in satirlar], ['2026-01-31', '2026-04-30', '2026-07-31', '2026-10-31'])
+        bakim_planlayici.plan_ekle(satirlar)
+        self.assertEqual(len(bakim_planlayici.bakim_kayitlari()), 8)
+        self.assertIs(cache.get('cihaz:Periyodik_Bakim'), bakim_planlayici.bakim.son_kayitlar)
+        self.assertEqual(len(bakim_planlayici.cihaz_takvimi('C4')), 3)
+
+    def test_donem_planlari(self):
+        satirlar = bakim_planlayici.donem_planlari(500, ufuk_gun=30, bugun=BUGUN)
+        # C1 (6 Ay, son plan 2026-03-01) ve C2 (3 Ay, 2026-03-10); iptal edilen C3 serisi yok
+        self.assertEqual([(s[0], s[1], s[3], s[4]) for s in satirlar], [
+            ('P-500', 'C1', '2. Bakım', '2026-09-01'), ('P-501', 'C1', '3. Bakım', '2027-03-01'),
+            ('P-502', 'C2', '2. Bakım', '2026-06-10'), ('P-503', 'C2', '3. Bakım', '2026-09-10'),
+            ('P-504', 'C2', '4. Bakım', '2026-12-10'), ('P-505', 'C2', '5. Bakım', '2027-03-10'),
+        ])
+        self.assertEqual(tekrar_tarihleri(date(2024, 2, 29), 12, 2), [date(2024, 2, 29), date(2025, 2, 28)])
+
+    def test_ayni_cihazin_farkli_periyotlu_serileri_ayri_yenilenir(self):
+        cache.set('cihaz:Periyodik_Bakim', [
+            _plan('P-1', 'C1', '2026-03-10', periyot="3 Ay", sira="4. Bakım"),
+            _plan('P-2', 'C1', '2024-12-01', periyot="1 Yıl", sira="2. Bakım"),  # geride kalmış
+            _plan('P-3', 'C1', '2023-12-01', periyot="1 Yıl", sira="1. Bakım"),
+        ])
+        satirlar = bakim_planlayici.donem_planlari(700, ufuk_gun=30, bugun=BUGUN)
+        self.assertEqual([(s[2], s[3], s[4]) for s in satirlar], [
+            ('1 Yıl', '3. Bakım', '2026-12-01'),
+            ('3 Ay', '5. Bakım', '2026-06-10'), ('3 Ay', '6. Bakım', '2026-09-10'),
+            ('3 Ay', '7. Bakım', '2026-12-10'), ('3 Ay', '8. Bakım', '2027-03-10'),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
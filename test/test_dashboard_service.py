@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from PySide6.QtWidgets import QApplication
+
+from araclar.cache_yonetimi import cache
+from services.dashboard_service import dashboard_servisi, DashboardAbonelik
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestDashboardService(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear_all()
+        self.bugun = date.today()
+
+    def _personel(self, ad, durum="Aktif", birim="Radyoloji"):
+        return {'Ad_Soyad': ad, 'Durum': durum, 'Hizmet_Sinifi': birim,
+                'Dogum_Tarihi': self.bugun.replace(day=1).strftime("%d.%m.%Y")}
+
+    def test_personel_artimli(self):
+        liste = [self._personel('Ayşe'), self._personel('Ali', 'Pasif', 'Lab')]
+        cache.set('personel:Personel', liste)
+        ozet = dashboard_servisi.personel_ozeti()
+        self.assertEqual(ozet['toplam_personel'], 2)
+        self.assertEqual(ozet['aktif_personel'], 1)
+        self.assertEqual(ozet['birim_dagilimi'], {'Radyoloji': 1, 'Lab': 1})
+        self.assertEqual(len(ozet['dogum_gunleri']), 2)
+
+        # Bir satır değişir, bir satır silinir
+        cache.set('personel:Personel', [self._personel('Ali', 'Aktif', 'Lab')])
+        ozet = dashboard_servisi.personel_ozeti()
+        self.assertEqual(ozet['toplam_personel'], 1)
+        self.assertEqual(ozet['aktif_personel'], 1)
+        self.assertEqual(ozet['birim_dagilimi'], {'Lab': 1})
+
+    def test_izindekiler(self):
+        fmt = "%d.%m.%Y"
+        cache.set('personel:izin_giris', [
+            {'Ad_Soyad': 'Ayşe', 'Başlama_Tarihi': (self.bugun - timedelta(days=2)).strftime(fmt),
+             'Bitiş_Tarihi': self.bugun.strftime(fmt), 'İzin_Türü': 'Rapor'},
+            {'Ad_Soyad': 'Ali', 'Başlama_Tarihi': (self.bugun + timedelta(days=3)).strftime(fmt),
+             'Bitiş_Tarihi': (self.bugun + timedelta(days=5)).strftime(fmt)},
+        ])
+        izinli = dashboard_servisi.izindekiler()
+        self.assertEqual([i['ad'] for i in izinli], ['Ayşe'])
+        self.assertEqual(izinli[0]['tur'], 'Rapor')
+
+    def test_ariza_ve_kalibrasyon(self):
+        cache.set('cihaz:cihaz_ariza', [
+            {'ArizaID': str(i), 'CihazID': 'C1', 'Durum': 'Açık' if i % 2 else 'Kapalı'} for i in range(8)
+        ])
+        cache.set('cihaz:Kalibrasyon', [
+            {'CihazID': 'K1', 'BitisTarihi': (self.bugun + timedelta(days=10)).strftime("%Y-%m-%d")},
+            {'CihazID': 'K2', 'BitisTarihi': (self.bugun + timedelta(days=3)).strftime("%d.%m.%Y")},
+            {'CihazID': 'K3', 'BitisTarihi': (self.bugun + timedelta(days=90)).strftime("%d.%m.%Y")},
+            {'CihazID': 'K4', 'BitisTarihi': (self.bugun - timedelta(days=1)).strftime("%d.%m.%Y")},
+        ])
+        ozet = dashboard_servisi.yonetim_ozeti()
+        self.assertEqual(ozet['aktif_ariza'], 4)
+        self.assertEqual([a['id'] for a in ozet['son_arizalar']], ['7', '6', '5', '4', '3'])
+        self.assertEqual([(k['cihaz'], k['kalan']) for k in ozet['yaklasan_kalibrasyon']], [('K2', 3), ('K1', 10)])
+
+    def test_surum_sadece_degisince_artar(self):
+        cache.set('cihaz:Cihazlar', [{'CihazID': 'C1'}])
+        surum = dashboard_servisi.surum('toplam_cihaz')
+        cache.set('cihaz:Cihazlar', [{'CihazID': 'C1'}])
+        self.assertEqual(dashboard_servisi.surum('toplam_cihaz'), surum)
+        cache.set('cihaz:Cihazlar', [{'CihazID': 'C1'}, {'CihazID': 'C2'}])
+        self.assertEqual(dashboard_servisi.surum('toplam_cihaz'), surum + 1)
+        self.assertEqual(dashboard_servisi.yonetim_ozeti()['toplam_cihaz'], 2)
+
+    def test_hazirla_guncel_tabloyu_ttl_dolana_kadar_cekmez(self):
+        with patch('services.dashboard_service.veritabani_getir_cached', return_value=[]) as cek:
+            cache.set('cihaz:Cihazlar', [{'CihazID': 'C1'}])
+            dashboard_servisi.hazirla(['cihaz:Cihazlar'])
+            cek.assert_not_called()
+            cache.set('cihaz:Cihazlar', [{'CihazID': 'C1'}], ttl_seconds=-1)
+            dashboard_servisi.hazirla(['cihaz:Cihazlar'])
+        cek.assert_called_once_with('cihaz', 'Cihazlar', force_refresh=False)
+
+
+class TestDashboardAbonelik(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear_all()
+        self.abonelik = DashboardAbonelik(["toplam_cihaz", "aktif_ariza"], poll_saniye=0)
+        self.gelenler = []
+        self.abonelik.alanlar_degisti.connect(self.gelenler.append)
+
+    def tearDown(self):
+        self.abonelik.kapat()
+
+    def test_sadece_degisen_alan_yayinlanir(self):
+        cache.set('cihaz:Cihazlar', [{'CihazID': 'Y1'}, {'CihazID': 'Y2'}, {'CihazID': 'Y3'}])
+        self.assertEqual(self.gelenler[-1], {'toplam_cihaz': 3})
+
+        # Arıza tablosu değişti ama açık arıza sayısı aynı -> yayın yok
+        cache.set('cihaz:cihaz_ariza', [{'ArizaID': '1', 'Durum': 'Açık'}])
+        adet = len(self.gelenler)
+        cache.set('cihaz:cihaz_ariza', [{'ArizaID': '2', 'Durum': 'Açık'}])
+        self.assertEqual(len(self.gelenler), adet)
+
+        # Abone olunmayan alan yayınlanmaz
+        cache.set('personel:Personel', [{'Ad_Soyad': 'Ayşe'}])
+        self.assertEqual(len(self.gelenler), adet)
+
+    def test_periyodik_yenileme_zorla_cekmez(self):
+        with patch.object(self.abonelik, 'yenile') as yenile:
+            self.abonelik._poll()
+        yenile.assert_called_once_with(False)
+
+    def test_tablolar(self):
+        self.assertEqual(self.abonelik.tablolar, ['cihaz:Cihazlar', 'cihaz:cihaz_ariza'])
+
+
+if __name__ == '__main__':
+    unittest.main()
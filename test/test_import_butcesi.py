@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import os
+import unittest
+
+from araclar.import_suresi import cozumle, ihlaller, importtime_olc, toplam_ms
+from araclar.tembel_yukleme import tembel_modul
+
+ORNEK_CIKTI = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   encodings
+import time:       500 |       2500 |     gspread
+import time:       300 |       2800 |   google_baglanti
+import time:       200 |       3000 | main
+"""
+
+
+class TestImportButcesi(unittest.TestCase):
+
+    def test_cikti_cozumlenir_ve_ihlaller_bulunur(self):
+        kayitlar = cozumle(ORNEK_CIKTI)
+        self.assertEqual(toplam_ms(kayitlar, "main"), 3.0)
+        self.assertEqual(kayitlar[1].derinlik, 2)
+        self.assertEqual(len(ihlaller(kayitlar, "main", butce_ms=2)), 2)
+        self.assertEqual(ihlaller(kayitlar, "main", butce_ms=5, yasaklar=()), [])
+
+    def test_main_acilista_agir_kutuphane_yuklemez(self):
+        # Süre makineye bağlı; varsayılan çalıştırmada yalnızca yüklenen modüller denetlenir
+        kayitlar = importtime_olc("main")
+        self.assertEqual(ihlaller(kayitlar, "main", butce_ms=None), [])
+
+    @unittest.skipUnless(os.environ.get("IMPORT_BUTCESI_OLC"), "süre ölçümü için IMPORT_BUTCESI_OLC=1")
+    def test_main_acilis_butcesi(self):
+        kayitlar = importtime_olc("main", tekrar=3)
+        self.assertEqual(ihlaller(kayitlar, "main", yasaklar=()), [])
+
+    def test_tembel_modul_ilk_eriside_yuklenir(self):
+        modul = tembel_modul("json.decoder")
+        self.assertIn("yüklenmedi", repr(modul))
+        self.assertTrue(hasattr(modul, "JSONDecoder"))
+        self.assertIn("yüklü", repr(modul))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from formlar.izin_takvim import IzinAralikIndeksi, TakvimDisaAktarWorker, ay_araligi
+
+
+class TestIzinAralikIndeksi(unittest.TestCase):
+
+    def setUp(self):
+        self.indeks = IzinAralikIndeksi([
+            {'ad': 'Ayşe', 'tur': 'Yıllık', 'bas': date(2026, 1, 28), 'bit': date(2026, 2, 3)},
+            {'ad': 'Ayşe', 'tur': 'Rapor', 'bas': date(2026, 2, 20), 'bit': date(2026, 2, 21)},
+            {'ad': 'Mehmet', 'tur': 'Şua', 'bas': date(2026, 3, 1), 'bit': date(2026, 3, 5)},
+        ])
+
+    def test_ay_kesisimi(self):
+        """Aya taşan izinler o ayın personel listesine girer"""
+        self.assertEqual(self.indeks.aralikta_olanlar(date(2026, 2, 1), date(2026, 2, 28)), ['Ayşe'])
+        self.assertEqual(self.indeks.aralikta_olanlar(date(2026, 1, 1), date(2026, 3, 31)), ['Ayşe', 'Mehmet'])
+        self.assertEqual(self.indeks.aralikta_olanlar(date(2026, 4, 1), date(2026, 4, 30)), [])
+
+    def test_gun_sorgusu(self):
+        self.assertEqual(self.indeks.izin_bul('Ayşe', date(2026, 2, 3))['tur'], 'Yıllık')
+        self.assertEqual(self.indeks.izin_bul('Ayşe', date(2026, 2, 21))['tur'], 'Rapor')
+        self.assertIsNone(self.indeks.izin_bul('Ayşe', date(2026, 2, 4)))
+        self.assertIsNone(self.indeks.izin_bul('Yok', date(2026, 2, 4)))
+
+    def test_ay_kovalari(self):
+        """Ay sınırını aşan izin her iki ayın kovasına da düşer"""
+        self.assertEqual(self.indeks.aydaki_personeller(2026, 1), ['Ayşe'])
+        self.assertEqual(self.indeks.aydaki_personeller(2026, 2), ['Ayşe'])
+        self.assertEqual(self.indeks.aydaki_personeller(2026, 3), ['Mehmet'])
+        self.assertEqual(self.indeks.aydaki_personeller(2025, 12), [])
+        self.assertEqual(self.indeks.aylar(), [(2026, 1), (2026, 2), (2026, 3)])
+
+    def test_ay_satirlari(self):
+        satirlar = list(self.indeks.ay_satirlari(2026, 2))
+        self.assertEqual(len(satirlar), 1)
+        ad, gunler = satirlar[0]
+        self.assertEqual(len(gunler), 28)
+        self.assertEqual([g + 1 for g, izin in enumerate(gunler) if izin], [1, 2, 3, 20, 21])
+
+    def test_disa_aktarim_anlik_goruntuyle_calisir(self):
+        kopya = self.indeks.kopya()
+        self.assertEqual(kopya.turler(), {'Yıllık', 'Rapor', 'Şua'})
+        self.indeks.yukle([{'ad': 'Can', 'tur': 'Yıllık', 'bas': date(2026, 2, 1), 'bit': date(2026, 2, 1)}])
+        self.assertEqual(kopya.aydaki_personeller(2026, 2), ['Ayşe'])
+
+        from openpyxl import load_workbook
+        yol = os.path.join(tempfile.mkdtemp(), "cizelge.xlsx")
+        worker = TakvimDisaAktarWorker(kopya, {'Yıllık': '#ff0000'}, [(2026, 2)], yol)
+        worker.run()
+        satir = list(load_workbook(yol).active.iter_rows(min_row=2, values_only=False))[0]
+        self.assertEqual(satir[0].value, 'Ayşe')
+        self.assertEqual(satir[1].fill.fgColor.rgb[-6:], 'FF0000')    # Yıllık: haritadan
+        self.assertEqual(satir[20].fill.fgColor.rgb[-6:], '868E96')   # Rapor: varsayılan renk
+
+    def test_ay_araligi(self):
+        self.assertEqual(list(ay_araligi(2025, 11, 2026, 2)), [(2025, 11), (2025, 12), (2026, 1), (2026, 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
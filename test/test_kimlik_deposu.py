@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from araclar.guvenlik import GuvenlikAraclari
+from services.kimlik_deposu import (GIRIS_BASARILI, KULLANICI_YOK, SIFRE_HATALI, KimlikDeposu,
+                                    satirlari_indeksle)
+
+BASLIK = ['username', 'ad', 'password', 'roller', 'tarih', 'degisim_gerekli']
+
+
+class _Sayfa:
+    def __init__(self, degerler):
+        self.degerler = degerler
+        self.indirme = 0
+
+    def get_all_values(self):
+        self.indirme += 1
+        return [list(s) for s in self.degerler]
+
+    def cell(self, satir, sutun):
+        return SimpleNamespace(value=self.degerler[satir - 1][sutun - 1])
+
+    def find(self, deger, in_column=None):
+        for i, satir in enumerate(self.degerler, start=1):
+            if satir[in_column - 1] == deger:
+                return SimpleNamespace(row=i)
+        return None
+
+    def update_cell(self, satir, sutun, deger):
+        self.degerler[satir - 1][sutun - 1] = deger
+
+
+class TestGuvenlikAraclari(unittest.TestCase):
+
+    def test_kdf_tuzlu_ve_eski_hash_dogrulanir(self):
+        h1, h2 = GuvenlikAraclari.sifrele("gizli", 1000), GuvenlikAraclari.sifrele("gizli", 1000)
+        self.assertNotEqual(h1, h2)
+        self.assertTrue(GuvenlikAraclari.dogrula("gizli", h1))
+        self.assertFalse(GuvenlikAraclari.dogrula("yanlis", h1))
+        eski = GuvenlikAraclari.eski_hash("gizli")
+        self.assertTrue(GuvenlikAraclari.dogrula("gizli", eski))
+        self.assertTrue(GuvenlikAraclari.yeniden_hash_gerekli(eski))
+        self.assertTrue(GuvenlikAraclari.yeniden_hash_gerekli(h1))
+        self.assertFalse(GuvenlikAraclari.yeniden_hash_gerekli(GuvenlikAraclari.sifrele("gizli")))
+        self.assertGreaterEqual(GuvenlikAraclari.maliyet_olc(hedef_ms=1, ornek_iterasyon=1000, tekrar=1), 100_000)
+
+    def test_bozuk_kayitli_hash_reddedilir(self):
+        # ASCII dışı karakter TypeError vermemeli; aşırı maliyet hesaplanmamalı
+        self.assertFalse(GuvenlikAraclari.dogrula("gizli", "şifre" * 13))
+        _, _, tuz, ozet = GuvenlikAraclari.sifrele("gizli", 1000).split('$')
+        with patch('araclar.guvenlik.hashlib.pbkdf2_hmac') as turet:
+            for maliyet in ("999999999999", "0"):
+                self.assertFalse(GuvenlikAraclari.dogrula("gizli", f"pbkdf2_sha256${maliyet}${tuz}${ozet}"))
+        turet.assert_not_called()
+
+
+class TestKimlikDeposu(unittest.TestCase):
+
+    def setUp(self):
+        self.sayfa = _Sayfa([
+            BASLIK,
+            ['ali', 'Ali', GuvenlikAraclari.eski_hash('123'), 'admin', '', 'HAYIR'],
+            ['veli', 'Veli', GuvenlikAraclari.sifrele('abc'), 'user', '', 'EVET'],
+        ])
+        self.dosya = Mock()
+        self.dosya.get_lastUpdateTime.return_value = "s1"
+        klasor = tempfile.mkdtemp()
+        self.yol = os.path.join(klasor, "kimlik.json")
+        self.depo = KimlikDeposu(self.yol)
+        for ad, deger in (('spreadsheet_getir', self.dosya), ('veritabani_getir', self.sayfa)):
+            yama = patch(f'services.kimlik_deposu.{ad}', return_value=deger)
+            yama.start()
+            self.addCleanup(yama.stop)
+
+    def test_indeks_sutunlari_basliktan_alir(self):
+        sutunlar, indeks = satirlari_indeksle(self.sayfa.degerler)
+        self.assertEqual(sutunlar['password'], 3)
+        self.assertEqual(indeks['veli'].satir, 3)
+        self.assertTrue(indeks['veli'].degisim_gerekli)
+
+    def test_damga_degismediyse_indirmez_ve_delta_uygular(self):
+        self.assertEqual(self.depo.senkronize(), ['ali', 'veli'])
+        self.assertEqual(self.depo.senkronize(), [])
+        self.assertEqual(self.sayfa.indirme, 1)
+        self.sayfa.degerler[2][3] = 'admin'
+        self.dosya.get_lastUpdateTime.return_value = "s2"
+        self.assertEqual(self.depo.senkronize(), ['veli'])
+        self.assertEqual(self.depo.bul('veli').rol, 'admin')
+
+    def test_giris_ve_eski_hash_yukseltme(self):
+        self.depo.senkronize()
+        with patch('services.kimlik_deposu.threading.Thread') as thread:
+            self.assertEqual(self.depo.dogrula('ali', '123')[0], GIRIS_BASARILI)
+        thread.assert_called_once()
+        self.assertEqual(self.depo.dogrula('ali', 'yanlis')[0], SIFRE_HATALI)
+        self.assertEqual(self.depo.dogrula('yok', '1')[0], KULLANICI_YOK)
+
+        self.assertTrue(self.depo.yeniden_hashle('ali', '123'))
+        yeni = self.sayfa.degerler[1][2]
+        self.assertTrue(yeni.startswith('pbkdf2_sha256$'))
+        self.assertEqual(self.depo.bul('ali').sifre_hash, yeni)
+        self.assertFalse(GuvenlikAraclari.yeniden_hash_gerekli(yeni))
+
+    def test_degisim_bekleyen_kullanici_arka_planda_hashlenmez(self):
+        self.sayfa.degerler[2][2] = GuvenlikAraclari.eski_hash('abc')
+        self.depo.senkronize()
+        with patch('services.kimlik_deposu.threading.Thread') as thread:
+            durum, kayit = self.depo.dogrula('veli', 'abc')
+        self.assertEqual(durum, GIRIS_BASARILI)
+        self.assertTrue(kayit.degisim_gerekli)
+        thread.assert_not_called()
+
+    def test_baglanti_disi_senkron_hatasi_yutulmaz(self):
+        self.depo.senkronize()
+        with patch('services.kimlik_deposu.spreadsheet_getir', side_effect=ValueError("tanım yok")):
+            with self.assertRaises(ValueError):
+                KimlikDeposu(self.yol).dogrula('veli', 'abc')
+
+    def test_cevrimdisi_giris_diskteki_kopyayla(self):
+        self.depo.senkronize()
+        ikinci = KimlikDeposu(self.yol)
+        with patch('services.kimlik_deposu.spreadsheet_getir', side_effect=ConnectionError("internet yok")):
+            durum, kayit = ikinci.dogrula('veli', 'abc')
+        self.assertEqual(durum, GIRIS_BASARILI)
+        self.assertTrue(kayit.degisim_gerekli)
+        self.assertTrue(ikinci.cevrimdisi)
+
+        bos = KimlikDeposu(self.yol + ".yok")
+        with patch('services.kimlik_deposu.spreadsheet_getir', side_effect=ConnectionError("internet yok")):
+            with self.assertRaises(ConnectionError):
+                bos.dogrula('veli', 'abc')
+
+    def test_sifre_yaz_kaymis_satiri_bulur(self):
+        self.depo.senkronize()
+        self.sayfa.degerler.insert(1, ['yeni', '', '', 'user', '', 'HAYIR'])
+        self.assertTrue(self.depo.sifre_yaz('veli', 'h', degisim_gerekli=False))
+        self.assertEqual(self.sayfa.degerler[3][2], 'h')
+        self.assertEqual(self.sayfa.degerler[3][5], 'HAYIR')
+        self.assertEqual(self.depo.bul('veli').satir, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import time
+import unittest
+
+from PySide6.QtWidgets import QApplication
+
+from araclar.arama_indeksi import SatirKumesiModeli
+from araclar.liste_filtresi import ListeFiltresi, esit_kosulu, icerir_kosulu
+from araclar.tablo_modeli import KayitModeli
+
+app = QApplication.instance() or QApplication([])
+
+KAYITLAR = [
+    {'ArizaID': 'A-1', 'Konu': 'Işık yanmıyor', 'Durum': 'Açık'},
+    {'ArizaID': 'A-2', 'Konu': 'Kablo kopuk', 'Durum': 'Kapalı'},
+    {'ArizaID': 'A-3', 'Konu': 'ışık titriyor', 'Durum': 'İşlemde'},
+    {'ArizaID': 'A-4', 'Konu': 'Ekran', 'Durum': 'Açık'},
+]
+
+
+def _olaylari_isle(sure=1.0):
+    bitis = time.monotonic() + sure
+    while time.monotonic() < bitis:
+        app.processEvents()
+        time.sleep(0.01)
+
+
+class TestListeFiltresi(unittest.TestCase):
+
+    def setUp(self):
+        self.model = KayitModeli([("No", "ArizaID"), ("Konu", "Konu"), ("Durum", "Durum")])
+        self.model.kayitlari_ayarla(KAYITLAR)
+        self.proxy = SatirKumesiModeli()
+        self.proxy.setSourceModel(self.model)
+        self.filtre = ListeFiltresi(self.proxy, metin_alanlari=("ArizaID", "Konu"), gecikme_ms=20)
+        self.filtre.kayitlari_ayarla(KAYITLAR)
+
+    def _gorunen(self):
+        return [self.model.deger(self.proxy.kaynak_satiri(r), 0) for r in range(self.proxy.rowCount())]
+
+    def test_metin_geciktirilir_ve_kosullarla_kesisir(self):
+        self.filtre.metni_ayarla("ISIK")
+        self.assertEqual(self.proxy.rowCount(), 4)  # henüz uygulanmadı
+        _olaylari_isle(0.2)
+        self.assertEqual(self._gorunen(), ['A-1', 'A-3'])
+
+        self.filtre.kosul_ayarla("durum", icerir_kosulu("Durum", "açık"))
+        self.assertEqual(self._gorunen(), ['A-1'])
+        self.filtre.metni_ayarla("")
+        self.filtre.kosul_ayarla("durum", esit_kosulu("Durum", "Açık"))
+        self.assertEqual(self._gorunen(), ['A-1', 'A-4'])
+
+    def test_buyuk_listede_arka_planda_suzer(self):
+        self.filtre.esik = 0
+        sonuclar = []
+        self.filtre.filtrelendi.connect(sonuclar.append)
+        self.filtre.metni_ayarla("kablo")
+        self.filtre.metni_ayarla("ekran")
+        self.filtre.uygula()
+        _olaylari_isle()
+        self.filtre.durdur()
+        # Yalnızca son isteğin sonucu görünüme ulaşır
+        self.assertEqual(sonuclar, [1])
+        self.assertEqual(self._gorunen(), ['A-4'])
+
+    def test_arka_plan_suzmesi_surerken_degisen_satirlar_yeniden_suzulur(self):
+        self.filtre.kaynak_modeli_bagla(self.model)
+        self.filtre.esik = 0
+        self.filtre.metni_ayarla("ışık")
+        self.filtre.uygula()  # arka plan taraması başladı
+        self.model.satirlari_ekle([{'ArizaID': 'A-5', 'Konu': 'Fiş', 'Durum': 'Açık'}])
+        self.model.satir_guncelle(1, {'ArizaID': 'A-2', 'Konu': 'Işık kablosu', 'Durum': 'Kapalı'})
+        _olaylari_isle(0.3)
+        self.filtre.durdur()
+        self.assertEqual(self._gorunen(), ['A-1', 'A-2', 'A-3'])
+
+
+if __name__ == '__main__':
+    unittest.main()
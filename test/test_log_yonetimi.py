@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from araclar.log_yonetimi import LOG_BASLIKLARI, LogGonderici
+
+
+class TestLogGonderici(unittest.TestCase):
+
+    def setUp(self):
+        self.dosya = os.path.join(tempfile.mkdtemp(), "log_kuyrugu.jsonl")
+        self.ws = MagicMock()
+        self.ws.row_values.return_value = []
+
+    def _gonderici(self, **kw):
+        gonderici = LogGonderici(self.dosya, aralik=60, **kw)
+        self.addCleanup(gonderici.durdur, 1)
+        return gonderici
+
+    def test_parti_tek_append_rows_ve_tek_baslik_kontrolu(self):
+        gonderici = self._gonderici()
+        with patch('araclar.log_yonetimi.veritabani_getir', return_value=self.ws):
+            for i in range(5):
+                gonderici.ekle([str(i)])
+            self.assertTrue(gonderici.bosalt(5))
+            gonderici.ekle(["5"])
+            self.assertTrue(gonderici.bosalt(5))
+
+        self.ws.append_row.assert_called_once_with(LOG_BASLIKLARI)
+        self.ws.row_values.assert_called_once_with(1)
+        self.assertEqual(self.ws.append_rows.call_args_list[0].args[0], [[str(i)] for i in range(5)])
+        self.assertEqual(self.ws.append_rows.call_count, 2)
+        self.assertEqual(gonderici.istatistik()["gonderilen"], 6)
+        self.assertFalse(os.path.exists(self.dosya))
+
+    def test_cevrimdisi_satirlar_dosyada_kalir_ve_sonra_gonderilir(self):
+        gonderici = self._gonderici()
+        with patch('araclar.log_yonetimi.veritabani_getir', side_effect=ConnectionError("internet yok")):
+            gonderici.ekle(["a"])
+            gonderici.ekle(["b"])
+            self.assertFalse(gonderici.bosalt(5))
+            gonderici.durdur(1)
+        self.assertEqual(gonderici.istatistik()["basarisiz_gonderim"], 2)
+        self.assertTrue(os.path.exists(self.dosya))
+
+        sonraki = self._gonderici()
+        with patch('araclar.log_yonetimi.veritabani_getir', return_value=self.ws):
+            sonraki.ekle(["c"])
+            self.assertTrue(sonraki.bosalt(5))
+        self.assertEqual(self.ws.append_rows.call_args.args[0], [["a"], ["b"], ["c"]])
+
+    def test_cevrimdisiyken_dolu_parti_beklemeyi_atlamaz(self):
+        gonderici = self._gonderici(parti_boyutu=2)
+        baglanti = MagicMock(side_effect=ConnectionError("internet yok"))
+        with patch('araclar.log_yonetimi.veritabani_getir', baglanti), \
+                patch.object(gonderici, '_dosyaya_yaz', wraps=gonderici._dosyaya_yaz) as yeniden_yaz:
+            for i in range(20):
+                gonderici.ekle([str(i)])
+                time.sleep(0.02)
+            time.sleep(0.2)
+            self.assertEqual(baglanti.call_count, 1)
+            self.assertEqual(yeniden_yaz.call_count, 0)
+            gonderici.durdur(1)
+        with open(self.dosya, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 20)
+
+    def test_bosta_thread_donmez(self):
+        gonderici = LogGonderici(self.dosya, aralik=0.05)
+        self.addCleanup(gonderici.durdur, 1)
+        with patch('araclar.log_yonetimi.veritabani_getir', return_value=self.ws):
+            gonderici.ekle(["a"])
+            self.assertTrue(gonderici.bosalt(5))
+            with patch.object(gonderici._uyandir, 'wait', wraps=gonderici._uyandir.wait) as bekle:
+                time.sleep(0.3)
+            # Bekleyen satır yokken süresiz beklenir (en fazla zaten başlamış bir bekleme)
+            self.assertLessEqual(bekle.call_count, 1)
+            gonderici.ekle(["b"])
+            self.assertTrue(gonderici.bosalt(5))
+        self.assertEqual(self.ws.append_rows.call_count, 2)
+
+    def test_kuyruk_doluysa_geri_basinc_ve_dusurme(self):
+        gonderici = self._gonderici(kapasite=2)
+        with patch.object(gonderici, '_baslat'):
+            sonuclar = [gonderici.ekle([str(i)]) for i in range(3)]
+        self.assertEqual(sonuclar, [True, True, False])
+        istatistik = gonderici.istatistik()
+        self.assertEqual((istatistik["geri_basinc"], istatistik["dusurulen"], istatistik["kuyrukta"]), (1, 1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
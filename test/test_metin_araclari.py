@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import pandas as pd
+
+from araclar.metin_araclari import (tr_upper, tr_lower, katla, tr_sirala, tr_upper_seri,
+                                    katla_seri, sirala_anahtari_seri)
+
+
+class TestMetinAraclari(unittest.TestCase):
+
+    def test_buyuk_kucuk_harf(self):
+        self.assertEqual(tr_upper("istanbul ığdır çöşü"), "İSTANBUL IĞDIR ÇÖŞÜ")
+        self.assertEqual(tr_lower("IŞIK İZMİR"), "ışık izmir")
+        self.assertEqual(katla("Çalışma KOŞULU A"), "calisma kosulu a")
+
+    def test_turkce_siralama(self):
+        adlar = ["Zeynep", "çiğdem", "Cem", "İlker", "Ilgaz", "Ömer", "oya", "Şule", "Sinan"]
+        self.assertEqual(tr_sirala(adlar),
+                         ["Cem", "çiğdem", "Ilgaz", "İlker", "oya", "Ömer", "Sinan", "Şule", "Zeynep"])
+        kayitlar = [{'ad': 'Ünal'}, {'ad': 'Uğur'}]
+        self.assertEqual([k['ad'] for k in tr_sirala(kayitlar, key=lambda k: k['ad'])], ['Uğur', 'Ünal'])
+
+    def test_seri_karsiliklari(self):
+        seri = pd.Series(["izmir", None, "Işık"])
+        self.assertEqual(tr_upper_seri(seri).tolist(), ["İZMİR", "", "IŞIK"])
+        self.assertEqual(katla_seri(seri).tolist(), ["izmir", "", "isik"])
+        df = pd.DataFrame({'Ad_Soyad': ["Çetin", "Ceren", "Derya"]})
+        self.assertEqual(df.sort_values("Ad_Soyad", key=sirala_anahtari_seri)['Ad_Soyad'].tolist(),
+                         ["Ceren", "Çetin", "Derya"])
+
+
+if __name__ == '__main__':
+    unittest.main()
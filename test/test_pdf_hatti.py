@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+from unittest.mock import patch
+
+from araclar.pdf_hatti import RaporHatti
+
+
+class TestRaporHatti(unittest.TestCase):
+
+    def test_yukleyici_olusturulamazsa_hat_kilitlenmez(self):
+        def fabrika():
+            raise ConnectionError("Drive oturumu açılamadı")
+
+        hat = RaporHatti(yukleyici_fabrikasi=fabrika, kuyruk_boyu=1, yukleme_is_parcacigi=2)
+        isler = [(f"rapor_{i}.pdf", lambda: "<p>rapor</p>") for i in range(6)]
+        sonuc = {}
+        with patch('araclar.pdf_hatti.rapor_pdf_yaz', return_value=True):
+            thread = threading.Thread(target=lambda: sonuc.update(liste=hat.calistir(isler)), daemon=True)
+            thread.start()
+            thread.join(5)
+        self.assertFalse(thread.is_alive(), "rapor hattı kilitlendi")
+        self.assertEqual(len(sonuc["liste"]), 6)
+        self.assertTrue(all(link is None and "Drive oturumu" in hata for _, link, hata in sonuc["liste"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import unittest
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from araclar.cache_yonetimi import cache
+from services.rke_service import rke_servisi, MUAYENE_SUTUNLARI
+
+
+def _muayene(kayit, ekipman, f_tarih, fiz="Kullanıma Uygun", s_tarih="", sko="Yapılmadı", kontrol="Ali"):
+    return dict(zip(MUAYENE_SUTUNLARI, [kayit, ekipman, f_tarih, fiz, s_tarih, sko, "", kontrol, "Veli", "", "-"]))
+
+
+class TestRKEService(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear_all()
+        cache.set('rke:rke_list', [
+            {'KayitNo': '1', 'EkipmanNo': 'RKE-ÖN-1', 'AnaBilimDali': 'Radyoloji', 'Birim': 'Anjio',
+             'KoruyucuCinsi': 'Önlük', 'KursunEsdegeri': 0.5, 'Durum': ''},
+            {'KayitNo': '2', 'EkipmanNo': 'RKE-TR-1', 'AnaBilimDali': 'Kardiyoloji', 'Birim': 'Kateter',
+             'KoruyucuCinsi': 'Tiroid', 'KursunEsdegeri': 0.35, 'Durum': ''},
+        ])
+        cache.set('rke:rke_muayene', [
+            _muayene('M-2', 'RKE-ÖN-1', '2024-03-01', s_tarih='2024-03-02', sko='Kullanıma Uygun Değil'),
+            _muayene('M-1', 'RKE-ÖN-1', '01.02.2023'),
+            _muayene('M-3', 'RKE-XX-9', '2024-01-10', kontrol='Ayşe'),
+        ])
+
+    def test_gecmis_sirali_ve_son_muayene(self):
+        self.assertEqual([m['KayitNo'] for m in rke_servisi.gecmis('RKE-ÖN-1')], ['M-1', 'M-2'])
+        son = rke_servisi.son_muayene('RKE-ÖN-1')
+        self.assertEqual(son['Sonuc'], 'Kullanıma Uygun Değil')
+        self.assertEqual(son['SonrakiKontrol'], date(2025, 3, 2))
+        self.assertIsNone(rke_servisi.son_muayene('RKE-TR-1'))
+        self.assertEqual(rke_servisi.kontrol_edenler(), ['Ali', 'Ayşe'])
+
+    def test_rapor_verisi_birlesim(self):
+        birlesik, abd, birim, tarihler = rke_servisi.rapor_verisi()
+        self.assertEqual(len(birlesik), 3)
+        self.assertEqual(birlesik[0]['Cins'], 'Önlük')
+        self.assertEqual(birlesik[0]['Pb'], '0.5')
+        self.assertEqual(birlesik[2]['ABD'], '-')
+        self.assertEqual([b['KontrolEden'] for b in birlesik], ['Ali', 'Ali', 'Ayşe'])
+        self.assertEqual(abd, ['Kardiyoloji', 'Radyoloji'])
+        self.assertEqual(tarihler[0], '2024-03-01')
+        # Tablolar değişmedikçe aynı sonuç döner
+        self.assertIs(rke_servisi.rapor_verisi(), rke_servisi.rapor_verisi())
+
+    def test_muayene_ekle_artimli(self):
+        rke_servisi.muayene_ekle([_muayene('M-4', 'RKE-TR-1', '2024-05-05', fiz='Kullanıma Uygun Değil')])
+        rke_servisi.envanter_guncelle({'RKE-TR-1': {'Durum': 'Kullanıma Uygun Değil'}})
+
+        self.assertEqual(rke_servisi.son_muayene('RKE-TR-1')['SonrakiKontrol'], date(2025, 5, 5))
+        self.assertEqual(rke_servisi.ekipman('RKE-TR-1')['Durum'], 'Kullanıma Uygun Değil')
+        # Önbellek de güncel listeyi tutar
+        self.assertEqual(len(cache.get('rke:rke_muayene')), 4)
+
+        # Sayfa yeniden çekildiğinde aynı satır ikinci kez eklenmez
+        cache.set('rke:rke_muayene', list(cache.get('rke:rke_muayene')))
+        self.assertEqual(len(rke_servisi.gecmis('RKE-TR-1')), 1)
+
+    def test_envanter_tablosu(self):
+        basliklar, satirlar = rke_servisi.envanter_tablosu()
+        self.assertEqual(basliklar[:2], ['KayitNo', 'EkipmanNo'])
+        self.assertEqual(satirlar[1][1], 'RKE-TR-1')
+        self.assertEqual(satirlar[1][5], '0.35')
+
+
+    def test_guncelleme_yalnizca_degisen_hucreleri_yazar(self):
+        from formlar.rke_yonetim import RKEIslemKaydedici
+        ws = MagicMock()
+        eski = ['1', 'RKE-ÖN-1', '007', '0.5']
+        kaydedici = RKEIslemKaydedici("UPDATE", ['1', 'RKE-ÖN-2', '007', '0.5'], 5, eski)
+        with patch('formlar.rke_yonetim.veritabani_getir', return_value=ws):
+            kaydedici.run()
+        ws.batch_update.assert_called_once()
+        self.assertEqual(ws.batch_update.call_args.args[0], [{'range': 'B5', 'values': [['RKE-ÖN-2']]}])
+        ws.update.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
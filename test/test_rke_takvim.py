@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import unittest
+from datetime import date, timedelta
+
+from PySide6.QtWidgets import QApplication
+
+from araclar.cache_yonetimi import cache
+from services.rke_service import rke_servisi, MUAYENE_SUTUNLARI
+from services.rke_takvim import rke_takvimi
+from services.dashboard_service import dashboard_servisi
+
+app = QApplication.instance() or QApplication([])
+
+
+def _muayene(kayit, ekipman, s_tarih):
+    return dict(zip(MUAYENE_SUTUNLARI, [kayit, ekipman, s_tarih, "Kullanıma Uygun", s_tarih,
+                                        "Kullanıma Uygun", "", "Ali", "Veli", "", "-"]))
+
+
+class TestRKETakvim(unittest.TestCase):
+
+    def setUp(self):
+        cache.clear_all()
+        self.bugun = date.today()
+        fmt = "%Y-%m-%d"
+        yil_once = lambda gun: (self.bugun - timedelta(days=365 - gun)).strftime(fmt)
+        cache.set('rke:rke_list', [
+            {'EkipmanNo': 'E1', 'Birim': 'Anjio', 'Durum': ''},
+            {'EkipmanNo': 'E2', 'Birim': 'Anjio', 'Durum': ''},
+            {'EkipmanNo': 'E3', 'Birim': 'Lab', 'Durum': '',
+             'KontrolTarihi': (self.bugun + timedelta(days=10)).strftime("%d.%m.%Y")},
+            {'EkipmanNo': 'E4', 'Birim': 'Lab', 'Durum': 'Hurda'},
+        ])
+        cache.set('rke:rke_muayene', [
+            _muayene('M1', 'E1', yil_once(-20)),   # 20 gün gecikmiş
+            _muayene('M2', 'E2', yil_once(60)),    # 60 gün sonra
+            _muayene('M3', 'E4', yil_once(-5)),    # hurda: takvimde yok
+        ])
+
+    def test_geciken_ve_yaklasan(self):
+        gecikenler = rke_takvimi.gecikenler()
+        self.assertEqual([g['ekipman'] for g in gecikenler], ['E1'])
+        self.assertLess(gecikenler[0]['kalan'], 0)
+        self.assertEqual([y['ekipman'] for y in rke_takvimi.yaklasanlar(30)], ['E3'])
+        self.assertEqual([y['ekipman'] for y in rke_takvimi.yaklasanlar(90)], ['E3', 'E2'])
+        self.assertEqual(rke_takvimi.sayilar(30), {'geciken': 1, 'yaklasan': 1})
+        self.assertIsNone(rke_takvimi.vade('E4'))
+
+    def test_yeni_muayene_artimli_ve_dashboard(self):
+        surum = dashboard_servisi.surum('rke_geciken')
+        rke_servisi.muayene_ekle([_muayene('M9', 'E1', self.bugun.strftime("%Y-%m-%d"))])
+
+        self.assertEqual(rke_takvimi.gecikenler(), [])
+        self.assertGreater(rke_takvimi.vade('E1'), self.bugun + timedelta(days=360))
+        self.assertGreater(dashboard_servisi.surum('rke_geciken'), surum)
+        self.assertEqual(dashboard_servisi.alan_degeri('rke_geciken'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
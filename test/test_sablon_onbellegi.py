@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from docxtpl import DocxTemplate
+
+from araclar.sablon_onbellegi import SablonOnbellegi, belge_olustur, toplu_olustur
+
+SABLON = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      "sablonlar", "personel_ozluk_sablon.docx")
+
+
+def govde(icerik: bytes) -> bytes:
+    return zipfile.ZipFile(io.BytesIO(icerik)).read("word/document.xml")
+
+
+class TestSablonOnbellegi(unittest.TestCase):
+
+    def setUp(self):
+        self.dizin = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dizin, True)
+
+    def test_onbellekten_uretim_docxtpl_ile_ayni(self):
+        veri = {"Ad_Soyad": "Ayşe Yılmaz", "Kimlik_No": "123"}
+        duz = DocxTemplate(SABLON)
+        duz.render(dict(veri))
+        tampon = io.BytesIO()
+        duz.save(tampon)
+
+        ilk = belge_olustur(SABLON, veri)
+        ikinci = belge_olustur(SABLON, {"Ad_Soyad": "Ali Veli"})
+        self.assertEqual(govde(ilk), govde(tampon.getvalue()))
+        self.assertIn("Ali Veli".encode(), govde(ikinci))
+        self.assertNotIn("Ayşe".encode(), govde(ikinci))
+
+    def test_dosya_degisince_yeniden_yuklenir(self):
+        kopya = os.path.join(self.dizin, "sablon.docx")
+        shutil.copy(SABLON, kopya)
+        onbellek = SablonOnbellegi()
+        ilk = onbellek.sablon(kopya)
+        self.assertIs(onbellek.sablon(kopya), ilk)
+        os.utime(kopya, ns=(0, 0))
+        self.assertIsNot(onbellek.sablon(kopya), ilk)
+        self.assertEqual(onbellek.istatistik(), {"isabet": 1, "yukleme": 2, "sablon": 1})
+
+    def test_toplu_uretim_zip_ve_sureler(self):
+        isler = [("Ali Veli", {"Ad_Soyad": "Ali Veli"}), ("Ali Veli", {"Ad_Soyad": "Ali Veli 2"}),
+                 ("a/b", {"Ad_Soyad": "Can"})]
+        ilerleme = []
+        hedef = os.path.join(self.dizin, "ozluk.zip")
+        sonuclar = toplu_olustur(SABLON, isler, hedef, surec_sayisi=1,
+                                 ilerleme=lambda t, n: ilerleme.append((t, n)))
+        self.assertEqual([s.ad for s in sonuclar], ["Ali Veli.docx", "Ali Veli_2.docx", "a_b.docx"])
+        self.assertTrue(all(s.hata is None and s.sure_ms > 0 for s in sonuclar))
+        self.assertEqual(ilerleme[-1], (3, 3))
+        with zipfile.ZipFile(hedef) as arsiv:
+            self.assertEqual(sorted(arsiv.namelist()), ["Ali Veli.docx", "Ali Veli_2.docx", "a_b.docx"])
+            self.assertIn(b"Ali Veli 2", govde(arsiv.read("Ali Veli_2.docx")))
+
+        # Sıra eklenen ad başka bir belgenin adıyla çakışmamalı
+        hedef = os.path.join(self.dizin, "cakisan.zip")
+        isler = [("a", {"Ad_Soyad": "1"}), ("a", {"Ad_Soyad": "2"}), ("a_2", {"Ad_Soyad": "3"})]
+        sonuclar = toplu_olustur(SABLON, isler, hedef, surec_sayisi=1)
+        self.assertEqual([s.ad for s in sonuclar], ["a.docx", "a_2.docx", "a_2_2.docx"])
+        with zipfile.ZipFile(hedef) as arsiv:
+            self.assertEqual(len(arsiv.namelist()), 3)
+
+    def test_toplu_uretim_surec_havuzunda_klasore(self):
+        isler = [(f"p{i}", {"Ad_Soyad": f"Kişi {i}"}) for i in range(8)]
+        sonuclar = toplu_olustur(SABLON, isler, self.dizin, surec_sayisi=2)
+        self.assertEqual([s.hata for s in sonuclar], [None] * 8)
+        self.assertEqual(sorted(os.listdir(self.dizin)), sorted(f"p{i}.docx" for i in range(8)))
+        with open(os.path.join(self.dizin, "p7.docx"), "rb") as f:
+            self.assertIn("Kişi 7".encode(), govde(f.read()))
+
+
+if __name__ == '__main__':
+    unittest.main()
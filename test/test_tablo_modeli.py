@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import pandas as pd
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+
+from araclar.arama_indeksi import SatirKumesiModeli
+from araclar.tablo_modeli import KayitModeli, dataframe_hazirla
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestTabloModeli(unittest.TestCase):
+
+    def setUp(self):
+        df = pd.DataFrame({'cihaz_id': ['C1', 'C2', 'C3'], 'Marka': ['Siemens', None, 'Çelik']})
+        kayitlar, gosterim = dataframe_hazirla(df)
+        self.model = KayitModeli([(c, c) for c in gosterim], hizalamalar={1: Qt.AlignCenter})
+        self.model.kayitlari_ayarla(kayitlar, list(gosterim.values()))
+        self.model.rol_ayarla(Qt.ToolTipRole, 0, lambda k: f"Cihaz {k['cihaz_id']}")
+        self.proxy = SatirKumesiModeli()
+        self.proxy.setSourceModel(self.model)
+
+    def test_hazir_metinler_ve_roller(self):
+        self.assertEqual(self.model.sutun_degerleri(1), ['Siemens', '', 'Çelik'])
+        self.assertEqual(self.model.data(self.model.index(2, 0), Qt.ToolTipRole), 'Cihaz C3')
+        self.assertEqual(self.model.data(self.model.index(0, 1), Qt.TextAlignmentRole), Qt.AlignCenter)
+        self.assertIsNone(self.model.data(self.model.index(0, 0), Qt.TextAlignmentRole))
+
+    def test_artimli_ekleme_silme_proxy_kumesini_kaydirir(self):
+        self.proxy.sort(1, Qt.AscendingOrder)
+        self.proxy.satirlari_ayarla({0, 2})
+
+        self.model.satirlari_ekle([{'cihaz_id': 'C0', 'Marka': 'Canon'}], konum=0)
+        self.assertEqual(self.model.deger(0, 0), 'C0')
+        self.assertEqual(self.model.data(self.model.index(0, 0), Qt.ToolTipRole), 'Cihaz C0')
+        # Yeni satır gösterilir, eski satırlar bir kayar; Türkçe sıralama korunur
+        self.assertEqual([self.proxy.data(self.proxy.index(r, 1)) for r in range(3)], ['Canon', 'Çelik', 'Siemens'])
+
+        self.model.satirlari_sil(1)  # C1
+        self.assertEqual([self.proxy.data(self.proxy.index(r, 0)) for r in range(2)], ['C0', 'C3'])
+
+        self.model.satir_guncelle(0, {'cihaz_id': 'C0', 'Marka': 'Toshiba'})
+        self.assertEqual(self.model.sutun_degerleri(1), ['Toshiba', '', 'Çelik'])
+        # Görünen satırlar değişmez; yeniden sıralamada güncel anahtar kullanılır
+        self.proxy.sort(1, Qt.AscendingOrder)
+        self.assertEqual([self.proxy.data(self.proxy.index(r, 1)) for r in range(2)], ['Çelik', 'Toshiba'])
+
+    def test_gosterim_hazir_degilse_ilk_eriside_uretilir(self):
+        model = KayitModeli([("No", 0), ("Ad", lambda r: r[1].upper())])
+        model.kayitlari_ayarla([[1, 'a'], [2, 'b']])
+        self.assertEqual(model.data(model.index(1, 1)), 'B')
+        model.satirlari_ekle([[3, 'c']])
+        self.assertEqual(model.sutun_degerleri(1), ['A', 'B', 'C'])
+
+
+if __name__ == '__main__':
+    unittest.main()
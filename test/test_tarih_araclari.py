@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+import unittest
+from datetime import date, datetime
+
+import pandas as pd
+
+from araclar.tarih_araclari import tarih_coz, tarih_formati_bul, tarih_listesi_coz, tarih_serisi_coz
+
+
+class TestTarihAraclari(unittest.TestCase):
+
+    def test_tekil_bicimler(self):
+        self.assertEqual(tarih_coz("05.01.2024"), date(2024, 1, 5))
+        self.assertEqual(tarih_coz("2024-01-05"), date(2024, 1, 5))
+        self.assertEqual(tarih_coz("05/01/2024"), date(2024, 1, 5))
+        self.assertEqual(tarih_coz("5.1.2024"), date(2024, 1, 5))
+        self.assertEqual(tarih_coz(" 2024-01-05 00:00:00"), date(2024, 1, 5))
+        self.assertEqual(tarih_coz(datetime(2024, 1, 5, 10, 30)), date(2024, 1, 5))
+
+    def test_hatali_degerler(self):
+        for deger in (None, "", "  ", "31.02.2024", "abc", "2024/13/01"):
+            self.assertIsNone(tarih_coz(deger), deger)
+
+    def test_bicim_tespiti(self):
+        self.assertEqual(tarih_formati_bul(["", "01.02.2024", "15.03.2024"]), "%d.%m.%Y")
+        self.assertEqual(tarih_formati_bul(["2024-02-01"]), "%Y-%m-%d")
+        self.assertIsNone(tarih_formati_bul(["01.02.2024", "2024-02-01"]))
+        self.assertIsNone(tarih_formati_bul([]))
+
+    def test_sutun_cozumleme(self):
+        degerler = ["01.02.2024", "", None, "2024-03-04", "01.02.2024", "xx"]
+        beklenen = [date(2024, 2, 1), None, None, date(2024, 3, 4), date(2024, 2, 1), None]
+        self.assertEqual(tarih_listesi_coz(degerler), beklenen)
+
+        seri = tarih_serisi_coz(pd.Series(degerler, index=range(5, 11)))
+        self.assertEqual(list(seri.index), list(range(5, 11)))
+        self.assertEqual([d.date() if not pd.isna(d) else None for d in seri], beklenen)
+
+
+if __name__ == '__main__':
+    unittest.main()
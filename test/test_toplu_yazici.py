@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from araclar.toplu_yazici import sutun_harfi, a1_araligi, araliklari_birlestir, TopluYazici
+
+
+class _SahteSayfa:
+    def __init__(self, basliklar, satirlar):
+        self.basliklar = basliklar
+        self.satirlar = satirlar
+        self.istekler = []
+        self.col_cagri = 0
+
+    def row_values(self, no):
+        return list(self.basliklar)
+
+    def col_values(self, no):
+        self.col_cagri += 1
+        return [self.basliklar[no - 1]] + [r[no - 1] for r in self.satirlar]
+
+    def batch_update(self, veri, **kwargs):
+        self.istekler.append(veri)
+
+
+class TestTopluYazici(unittest.TestCase):
+
+    def test_sutun_harfi(self):
+        self.assertEqual([sutun_harfi(n) for n in (1, 26, 27, 52, 53, 702, 703)],
+                         ['A', 'Z', 'AA', 'AZ', 'BA', 'ZZ', 'AAA'])
+        self.assertEqual(a1_araligi(2, 1, 28), 'A2:AB2')
+        self.assertEqual(a1_araligi(5, 30), 'AD5')
+        with self.assertRaises(ValueError):
+            sutun_harfi(0)
+
+    def test_bitisik_hucreler_birlesir(self):
+        hucreler = {(2, 3): 'a', (2, 4): 'b', (2, 7): 'x',
+                    (3, 3): 'c', (3, 4): 'd',
+                    (5, 3): 'e', (5, 4): 'f'}
+        self.assertEqual(araliklari_birlestir(hucreler), [
+            {'range': 'C2:D3', 'values': [['a', 'b'], ['c', 'd']]},
+            {'range': 'G2', 'values': [['x']]},
+            {'range': 'C5:D5', 'values': [['e', 'f']]},
+        ])
+
+    def test_tek_istek_ve_indeks(self):
+        basliklar = [f"S{i}" for i in range(1, 31)]
+        basliklar[1], basliklar[27] = "EkipmanNo", "Durum"
+        satirlar = [[""] * 30 for _ in range(3000)]
+        for i, r in enumerate(satirlar):
+            r[1] = f"RKE-{i}"
+        ws = _SahteSayfa(basliklar, satirlar)
+
+        yazici = TopluYazici(ws, anahtar_sutun="EkipmanNo")
+        for i in range(3000):
+            self.assertEqual(yazici.satir_guncelle(f"RKE-{i}", {"Durum": "Uygun", "Yok": 1}), i + 2)
+        self.assertIsNone(yazici.satir_guncelle("RKE-YOK", {"Durum": "x"}))
+
+        self.assertEqual(yazici.gonder(), 1)
+        self.assertEqual(ws.col_cagri, 1)
+        self.assertEqual(len(ws.istekler), 1)
+        self.assertEqual(ws.istekler[0][0]['range'], 'AB2:AB3001')
+        self.assertEqual(len(yazici), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
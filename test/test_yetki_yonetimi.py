@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from araclar import yetki_yonetimi
+from araclar.yetki_yonetimi import YetkiYoneticisi, kurallari_derle
+
+SATIRLAR = [
+    {'Rol': 'user', 'Form_Kodu': 'main_window', 'Oge_Adi': 'btn_ayarlar', 'Islem': 'gizle'},
+    {'Rol': 'user', 'Form_Kodu': 'personel_listesi', 'Oge_Adi': 'btn_sil', 'Islem': 'PASIF'},
+    {'Rol': 'admin', 'Form_Kodu': 'main_window', 'Oge_Adi': 'btn_x', 'Islem': 'GIZLE'},
+    {'Rol': 'user', 'Form_Kodu': '', 'Oge_Adi': 'btn_y', 'Islem': 'GIZLE'},
+]
+
+
+class TestYetkiYoneticisi(unittest.TestCase):
+
+    def setUp(self):
+        self.klasor = tempfile.TemporaryDirectory()
+        self.addCleanup(self.klasor.cleanup)
+        dosya = os.path.join(self.klasor.name, "yetki.json")
+        self.sayfa = Mock()
+        self.sayfa.get_all_records.return_value = list(SATIRLAR)
+        self.surum = "2026-01-01T00:00:00Z"
+        for yama in (patch.object(yetki_yonetimi, 'YETKI_ONBELLEK_DOSYASI', dosya),
+                     patch.object(yetki_yonetimi, 'veritabani_getir', return_value=self.sayfa),
+                     patch.object(YetkiYoneticisi, '_uzak_surum', side_effect=lambda: self.surum)):
+            yama.start()
+            self.addCleanup(yama.stop)
+        self._sifirla()
+        self.addCleanup(self._sifirla)
+
+    @staticmethod
+    def _sifirla():
+        YetkiYoneticisi._kurallar, YetkiYoneticisi._surum, YetkiYoneticisi._hazir = {}, None, False
+        YetkiYoneticisi._yetki_cache = {}
+
+    def test_rol_ve_form_bazinda_derlenir(self):
+        kurallar = kurallari_derle(SATIRLAR)
+        self.assertEqual(kurallar[('user', 'main_window')], (('btn_ayarlar', 'GIZLE'),))
+        self.assertEqual(len(kurallar), 3)
+
+        YetkiYoneticisi.yetkileri_yukle('user')
+        self.assertEqual(set(YetkiYoneticisi._yetki_cache), {'main_window', 'personel_listesi'})
+
+    def test_surum_degismediyse_sayfa_indirilmez(self):
+        YetkiYoneticisi.kurallari_hazirla()
+        self.assertEqual(self.sayfa.get_all_records.call_count, 1)
+
+        # Yeni oturum: kurallar diskten gelir, damga aynı olduğu için indirme yok
+        self._sifirla()
+        YetkiYoneticisi.yetkileri_yukle('admin')
+        self.assertEqual(self.sayfa.get_all_records.call_count, 1)
+        self.assertEqual(YetkiYoneticisi._yetki_cache, {'main_window': (('btn_x', 'GIZLE'),)})
+
+        # Sayfa değişti: yalnızca değişen (rol, form) demeti yenilenir
+        self.surum = "2026-02-01T00:00:00Z"
+        self.sayfa.get_all_records.return_value = SATIRLAR[:2] + [
+            {'Rol': 'admin', 'Form_Kodu': 'main_window', 'Oge_Adi': 'btn_x', 'Islem': 'PASIF'}]
+        onceki = YetkiYoneticisi._kurallar[('user', 'main_window')]
+        self.assertEqual(YetkiYoneticisi.yenile(), [('admin', 'main_window')])
+        self.assertIs(YetkiYoneticisi._kurallar[('user', 'main_window')], onceki)
+        self.assertEqual(YetkiYoneticisi._yetki_cache, {'main_window': (('btn_x', 'PASIF'),)})
+
+
+if __name__ == '__main__':
+    unittest.main()
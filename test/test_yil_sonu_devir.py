@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from araclar.yil_sonu_islemleri import DevirCakismasi, DevirCalismasi, DevirWorker, farklari_bul
+
+IZIN_BASLIKLARI = ["TC_Kimlik", "Ad", "Yillik_Devir", "Yillik_Hakedis", "Yillik_Toplam_Hak",
+                   "Yillik_Kullanilan", "Yillik_Kalan", "Sua_Kullanilabilir_Hak", "Sua_Kullanilan",
+                   "Sua_Kalan", "Sua_Cari_Yil_Kazanim"]
+PERSONEL = [["Kimlik_No", "Baslama_Tarihi"],
+            ["1", "01.03.2010"],   # 15 yıl
+            ["2", "15.06.2024"],   # 1 yıl
+            ["3", "10.12.2025"]]   # 0 yıl
+
+
+class SahteSayfa:
+    """
+    get_all_values / batch_update taklidi. Hücreler türleriyle (sayı, metin, formül)
+    saklanır; formüller yalnızca FORMULA okumasında görünür, değer okumasında
+    `hesaplanan`daki sonuç döner. hata_sirasi'ndaki yazımda bağlantı kopar.
+    """
+
+    def __init__(self, degerler, hesaplanan=None, hata_sirasi=None):
+        self.degerler = [list(r) for r in degerler]
+        self.hesaplanan = hesaplanan or {}
+        self.hata_sirasi = hata_sirasi
+        self.cagrilar = []
+
+    def get_all_values(self, value_render_option=None):
+        if value_render_option == 'FORMULA':
+            return [list(r) for r in self.degerler]
+        return [[self.hesaplanan.get(d, d) if isinstance(d, str) and d.startswith('=') else d for d in r]
+                for r in self.degerler]
+
+    def batch_update(self, veri, value_input_option=None):
+        if len(self.cagrilar) + 1 == self.hata_sirasi:
+            self.hata_sirasi = None
+            raise ConnectionError("bağlantı koptu")
+        self.cagrilar.append((veri, value_input_option))
+        for aralik in veri:
+            bas = aralik['range'].split(':')[0]
+            sutun = ord(bas[0]) - 64
+            satir = int(bas[1:])
+            for i, degerler in enumerate(aralik['values']):
+                for j, deger in enumerate(degerler):
+                    self.degerler[satir - 1 + i][sutun - 1 + j] = deger
+
+
+def izin_sayfasi():
+    # Ali'nin toplam hakkı formül (=C2+D2 -> 35)
+    return [IZIN_BASLIKLARI,
+            ["1", "Ali", 5, 30, "=C2+D2", 10, 25, 5, 5, 0, 8],
+            ["2", "Ayşe", 0, 20, 20, 18, 2, 0, 0, 0, 0],
+            ["3", "Can", 0, 0, 0, 0, 0, 0, 0, 0, 0],
+            ["9", "Ayrılan", 1, 1, 1, 1, 1, 1, 1, 1, 1]]
+
+
+def sayfa(**kw):
+    return SahteSayfa(izin_sayfasi(), hesaplanan={"=C2+D2": 35}, **kw)
+
+
+class TestYilSonuDevir(unittest.TestCase):
+
+    def setUp(self):
+        self.dizin = tempfile.mkdtemp()
+
+    def _olustur(self, ws, parca_satir=1):
+        return DevirCalismasi.olustur(ws, MagicMock(get_all_values=lambda: PERSONEL), self.dizin,
+                                      bugun=date(2026, 1, 2), parca_satir=parca_satir)
+
+    def test_hesaplama_yalnizca_degisen_hucreler(self):
+        sayfa = izin_sayfasi()
+        farklar = farklari_bul(sayfa[0], sayfa[1:], PERSONEL, date(2026, 1, 2))
+        yeni = {(s, IZIN_BASLIKLARI[c - 1]): y for s, c, _, y in farklar}
+        # Ali: devir=min(25, 30)=25, 15 yıl -> 30, şua cari 8 -> hak
+        self.assertEqual([yeni[(2, k)] for k in ("Yillik_Devir", "Yillik_Toplam_Hak", "Sua_Kalan")], [25, 55, 8])
+        self.assertNotIn((2, "Yillik_Hakedis"), yeni)
+        # Ayşe: devir=min(2, 20)=2, hakediş 20 aynı kalır
+        self.assertEqual(yeni[(3, "Yillik_Kalan")], 22)
+        # Can değişmez, personelde olmayan satıra dokunulmaz
+        self.assertFalse([f for f in farklar if f[0] in (4, 5)])
+
+    def test_onizleme_sayfaya_yazmaz_uygulama_parcali(self):
+        ws = sayfa()
+        calisma = self._olustur(ws)
+        self.assertEqual(ws.cagrilar, [])
+        self.assertTrue(os.path.exists(calisma.dosya))
+        self.assertEqual(calisma.ozet()["parca"], 2)
+
+        yazilan = calisma.uygula(ws)
+        self.assertEqual(yazilan, len(calisma.farklar))
+        self.assertEqual(len(ws.cagrilar), 2)
+        self.assertEqual({secenek for _, secenek in ws.cagrilar}, {'USER_ENTERED'})
+        self.assertEqual((ws.degerler[1][4], ws.degerler[1][6]), (55, 55))
+        self.assertEqual(DevirCalismasi.yukle(calisma.dosya).durum, DevirCalismasi.TAMAMLANDI)
+
+    def test_yarim_kalan_calisma_devam_eder_ve_geri_alinir(self):
+        ws = sayfa(hata_sirasi=2)
+        calisma = self._olustur(ws)
+        with self.assertRaises(ConnectionError):
+            calisma.uygula(ws)
+
+        yuklenen = DevirCalismasi.son_calisma(self.dizin)
+        self.assertTrue(yuklenen.yarim_kaldi)
+        self.assertEqual(yuklenen.tamamlanan, {0})
+        yuklenen.uygula(ws)
+        self.assertEqual(len(ws.cagrilar), 2)
+        self.assertEqual(ws.degerler[2][6], 22)
+
+        yuklenen.geri_al(ws)
+        # Sayılar sayı, formül formül olarak geri döner
+        self.assertEqual(ws.degerler, izin_sayfasi())
+        self.assertEqual([type(d) for d in ws.degerler[1]], [type(d) for d in izin_sayfasi()[1]])
+        self.assertEqual(yuklenen.durum, DevirCalismasi.GERI_ALINDI)
+
+    def test_elle_degisen_satir_cakisma_olur(self):
+        ws = sayfa()
+        calisma = self._olustur(ws)
+        ws.degerler[1][6] = 24  # Ali'nin kalanı görüntüden sonra değişti
+        with self.assertRaises(DevirCakismasi) as hata:
+            calisma.uygula(ws)
+        self.assertEqual(hata.exception.cakismalar[0][:2], (2, "1"))
+        self.assertEqual(ws.cagrilar, [])
+
+        calisma.uygula(ws, cakisanlari_atla=True)
+        self.assertEqual(ws.degerler[1][6], 24)
+        self.assertEqual(ws.degerler[2][6], 22)
+
+    def test_yarim_kalan_calisma_cakisma_atlanarak_geri_alinir(self):
+        ws = sayfa(hata_sirasi=2)
+        calisma = self._olustur(ws)
+        with self.assertRaises(ConnectionError):
+            calisma.uygula(ws)
+        ws.degerler[1][6] = 40  # yazılan parçadaki satır elle düzeltildi
+
+        with patch('araclar.yil_sonu_islemleri.veritabani_getir', return_value=ws), \
+                patch('araclar.yil_sonu_islemleri.LogYoneticisi'):
+            worker = DevirWorker(DevirWorker.GERI_AL, calisma)
+            worker.run()
+            self.assertEqual(worker.cakismalar[0][:2], (2, "1"))
+            self.assertTrue(calisma.yarim_kaldi)
+
+            worker = DevirWorker(DevirWorker.GERI_AL, calisma, cakisanlari_atla=True)
+            worker.run()
+        self.assertEqual(worker.cakismalar, [])
+        self.assertEqual([c[:2] for c in calisma.atlanan], [(2, "1")])
+        self.assertEqual(ws.degerler[1][6], 40)
+        self.assertEqual(calisma.durum, DevirCalismasi.GERI_ALINDI)
+
+
+if __name__ == '__main__':
+    unittest.main()